@@ -1,10 +1,29 @@
 # clean.py
+import argparse
 import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 
 INPUT_JSON = "applicant_data.json"
 OUTPUT_JSON = "cleaned_applicant_data.json"  # do NOT overwrite raw
 
+# --workers: records are cleaned in chunks of CHUNK_SIZE across this many processes
+CHUNK_SIZE = 2000
+WORKERS = os.cpu_count() or 1
+
+
+# ---------- patterns (compiled once; every record runs through them) ----------
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+_CONTEXT_RE = re.compile(
+    r"(start|starting|begins?|beginning|program begins|term|semester|matriculat|enroll|enrollment|cohort)",
+    re.I,
+)
+_SEASON_YEAR_RE = re.compile(r"\b(spring|summer|fall|autumn|winter)\b\W*(20\d{2})\b", re.I)
+_MONTH_PAT = r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:t)?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+_MONTH_YEAR_RE = re.compile(rf"\b{_MONTH_PAT}\b\W*(20\d{{2}})\b", re.I)
+
 
 # ---------- helpers ----------
 _TERM_ALIASES = {
@@ -35,8 +54,8 @@ def _clean_text(s: str | None) -> str | None:
     """Normalize whitespace + strip + remove any remnant HTML tags."""
     if s is None:
         return None
-    s = re.sub(r"<[^>]+>", "", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _TAG_RE.sub("", s)
+    s = _SPACE_RE.sub(" ", s).strip()
     return s if s else None
 
 
@@ -87,18 +106,16 @@ def _extract_start_term_year(*texts: str | None) -> tuple[str | None, str | None
     if not hay:
         return None, None
 
-    ctx_pat = r"(start|starting|begins?|beginning|program begins|term|semester|matriculat|enroll|enrollment|cohort)"
-    if not re.search(ctx_pat, hay, flags=re.I):
+    if not _CONTEXT_RE.search(hay):
         return None, None
 
-    m = re.search(r"\b(spring|summer|fall|autumn|winter)\b\W*(20\d{2})\b", hay, flags=re.I)
+    m = _SEASON_YEAR_RE.search(hay)
     if m:
         season = m.group(1).lower()
         year = m.group(2)
         return _TERM_ALIASES.get(season), year
 
-    month_pat = r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:t)?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
-    my = re.search(rf"\b{month_pat}\b\W*(20\d{{2}})\b", hay, flags=re.I)
+    my = _MONTH_YEAR_RE.search(hay)
     if my:
         month = my.group(1).lower()
         year = my.group(2)
@@ -108,7 +125,31 @@ def _extract_start_term_year(*texts: str | None) -> tuple[str | None, str | None
 
 
 # ---------- main cleaning ----------
-def clean_data(records: list[dict]) -> list[dict]:
+# expected final schema
+REQUIRED_KEYS = [
+    "program",
+    "university",
+    "comments",
+    "date_posted",
+    "entry_url",
+    "applicant_status",
+    "accepted_date",
+    "rejected_date",
+    "start_term",
+    "start_year",
+    "US/International",
+    "gre_total",
+    "gre_v",
+    "gre_aw",
+    "degree_level",
+    "degree",
+    "GPA",
+    "source_url",
+    "scraped_at",
+]
+
+
+def clean_record(r: dict) -> dict:
     """
     Output fields EXACTLY as requested:
       program, university, comments, date_posted, entry_url, applicant_status,
@@ -116,106 +157,96 @@ def clean_data(records: list[dict]) -> list[dict]:
       US/International, gre_total, gre_v, gre_aw, degree_level, degree, GPA,
       source_url, scraped_at
     """
-    cleaned: list[dict] = []
-
-    # expected final schema
-    required_keys = [
-        "program",
-        "university",
-        "comments",
-        "date_posted",
-        "entry_url",
-        "applicant_status",
-        "accepted_date",
-        "rejected_date",
-        "start_term",
-        "start_year",
-        "US/International",
-        "gre_total",
-        "gre_v",
-        "gre_aw",
-        "degree_level",
-        "degree",
-        "GPA",
-        "source_url",
-        "scraped_at",
-    ]
-
-    for r in records:
-        # 1) start from raw record
-        program = _clean_text(r.get("program_name_raw") or r.get("program"))
-        university = _clean_text(r.get("university_raw") or r.get("university"))
-        comments = _clean_text(r.get("comments"))
-
-        # 2) normalize scalar/string-ish fields
-        date_posted = _normalize_none(r.get("date_posted"))
-        entry_url = _normalize_none(r.get("entry_url"))
-        applicant_status = _normalize_none(r.get("applicant_status"))
-        accepted_date = _normalize_none(r.get("accepted_date"))
-        rejected_date = _normalize_none(r.get("rejected_date"))
-
-        start_term = _normalize_none(r.get("start_term"))
-        start_year = _normalize_none(r.get("start_year"))
-
-        gre_total = _normalize_none(r.get("gre_total"))
-        gre_v = _normalize_none(r.get("gre_v"))
-        gre_aw = _normalize_none(r.get("gre_aw"))
-
-        degree_level = _normalize_none(r.get("degree_level"))
-        degree = _normalize_none(r.get("degree"))
-
-        gpa_raw = r.get("gpa") if "gpa" in r else r.get("GPA")
-        GPA = _normalize_none(gpa_raw)
-
-        source_url = _normalize_none(r.get("source_url"))
-        scraped_at = _normalize_none(r.get("scraped_at"))
-
-        # 3) US/International mapping (from raw is_international)
-        usintl_raw = r.get("is_international")
-        usintl = _normalize_us_international(usintl_raw)
-
-        # 4) infer start_term/start_year only if missing
-        if start_term is None or start_year is None:
-            term2, year2 = _extract_start_term_year(
-                comments,
-                applicant_status,
-                program,
-                university,
-            )
-            if start_term is None and term2 is not None:
-                start_term = term2
-            if start_year is None and year2 is not None:
-                start_year = year2
-
-        out = {
-            "program": program,                 # keep ORIGINAL program name (traceability)
-            "university": university,
-            "comments": comments,
-            "date_posted": date_posted,
-            "entry_url": entry_url,
-            "applicant_status": applicant_status,
-            "accepted_date": accepted_date,
-            "rejected_date": rejected_date,
-            "start_term": start_term,
-            "start_year": start_year,
-            "US/International": usintl,
-            "gre_total": gre_total,
-            "gre_v": gre_v,
-            "gre_aw": gre_aw,
-            "degree_level": degree_level,
-            "degree": degree,
-            "GPA": GPA,
-            "source_url": source_url,
-            "scraped_at": scraped_at,
-        }
-
-        # Guarantee all required keys exist
-        for k in required_keys:
-            out.setdefault(k, None)
-
-        cleaned.append(out)
-
-    return cleaned
+    # 1) start from raw record
+    program = _clean_text(r.get("program_name_raw") or r.get("program"))
+    university = _clean_text(r.get("university_raw") or r.get("university"))
+    comments = _clean_text(r.get("comments"))
+
+    # 2) normalize scalar/string-ish fields
+    date_posted = _normalize_none(r.get("date_posted"))
+    entry_url = _normalize_none(r.get("entry_url"))
+    applicant_status = _normalize_none(r.get("applicant_status"))
+    accepted_date = _normalize_none(r.get("accepted_date"))
+    rejected_date = _normalize_none(r.get("rejected_date"))
+
+    start_term = _normalize_none(r.get("start_term"))
+    start_year = _normalize_none(r.get("start_year"))
+
+    gre_total = _normalize_none(r.get("gre_total"))
+    gre_v = _normalize_none(r.get("gre_v"))
+    gre_aw = _normalize_none(r.get("gre_aw"))
+
+    degree_level = _normalize_none(r.get("degree_level"))
+    degree = _normalize_none(r.get("degree"))
+
+    gpa_raw = r.get("gpa") if "gpa" in r else r.get("GPA")
+    GPA = _normalize_none(gpa_raw)
+
+    source_url = _normalize_none(r.get("source_url"))
+    scraped_at = _normalize_none(r.get("scraped_at"))
+
+    # 3) US/International mapping (from raw is_international)
+    usintl_raw = r.get("is_international")
+    usintl = _normalize_us_international(usintl_raw)
+
+    # 4) infer start_term/start_year only if missing
+    if start_term is None or start_year is None:
+        term2, year2 = _extract_start_term_year(
+            comments,
+            applicant_status,
+            program,
+            university,
+        )
+        if start_term is None and term2 is not None:
+            start_term = term2
+        if start_year is None and year2 is not None:
+            start_year = year2
+
+    out = {
+        "program": program,                 # keep ORIGINAL program name (traceability)
+        "university": university,
+        "comments": comments,
+        "date_posted": date_posted,
+        "entry_url": entry_url,
+        "applicant_status": applicant_status,
+        "accepted_date": accepted_date,
+        "rejected_date": rejected_date,
+        "start_term": start_term,
+        "start_year": start_year,
+        "US/International": usintl,
+        "gre_total": gre_total,
+        "gre_v": gre_v,
+        "gre_aw": gre_aw,
+        "degree_level": degree_level,
+        "degree": degree,
+        "GPA": GPA,
+        "source_url": source_url,
+        "scraped_at": scraped_at,
+    }
+
+    # Guarantee all required keys exist
+    for k in REQUIRED_KEYS:
+        out.setdefault(k, None)
+
+    return out
+
+
+def _clean_chunk(records: list[dict]) -> list[dict]:
+    """Process-pool task: clean one chunk of records."""
+    return [clean_record(r) for r in records]
+
+
+def clean_data(records: list[dict], workers: int = 1, chunk_size: int = CHUNK_SIZE) -> list[dict]:
+    """
+    Clean every record (see clean_record). With workers > 1, chunks of chunk_size
+    records are cleaned across that many processes and merged back in input
+    order, so the output is identical to a single-process run.
+    """
+    if workers <= 1 or len(records) <= chunk_size:
+        return _clean_chunk(records)
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return [row for rows in ex.map(_clean_chunk, chunks) for row in rows]
 
 
 def save_data(records: list[dict], out_path: str = OUTPUT_JSON) -> None:
@@ -235,7 +266,11 @@ def load_data(path: str = INPUT_JSON) -> list[dict]:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean applicant_data.json into cleaned_applicant_data.json")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help=f"cleaning processes (default: {WORKERS}, one per CPU)")
+    args = parser.parse_args()
     data = load_data(INPUT_JSON)
-    cleaned = clean_data(data)
+    cleaned = clean_data(data, workers=args.workers)
     save_data(cleaned, OUTPUT_JSON)
     print(f"Cleaned {len(cleaned)} records -> {OUTPUT_JSON}")
\ No newline at end of file
@@ -2,16 +2,27 @@
 import json
 import os
 import re
+import sys
 import time
 import socket
 from datetime import datetime, timezone
-from urllib.request import Request, urlopen
 from urllib.error import HTTPError, URLError
 from urllib.parse import urljoin, urlparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 from bs4 import BeautifulSoup
 
+# The fetch, cache, journal and field-spec helpers are module_5's (module_5/src, stdlib only),
+# so both scrapers run the same code
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "module_5"))
+from src import html_archive, record_journal, survey_backfill
+from src.html_archive import HtmlArchive
+from src.http_cache import HttpCache, url_class
+from src.http_pool import HttpPool
+from src.record_journal import RecordJournal
+from src.retry_policy import CircuitBreaker, RetryBudget, backoff_delay
+from src.result_schema import RESULT_EXTRACTOR, clean_label_value
+
 # -----------------------------
 # Config
 # -----------------------------
@@ -21,18 +32,34 @@ OUTPUT_JSON = "applicant_data.json"
 # IMPORTANT: used by save/load defaults below
 CHECKPOINT_PATH = OUTPUT_JSON
 
+# checkpoints append to this NDJSON journal (see module_5/src/record_journal.py) instead of rewriting
+# applicant_data.json; it is compacted into CHECKPOINT_PATH at the end of the run
+JOURNAL_PATH = "applicant_data.jsonl"
+JOURNAL_GZIP = False       # write JOURNAL_PATH + ".gz"
+JOURNAL_FSYNC = True       # fsync at every chunk boundary
+
 USER_AGENT = "Mozilla/5.0"
 TIMEOUT_S = 30
 
-# Survey pages (serial)
+# Survey pages (serial unless BACKFILL_SHARDS > 1)
 SURVEY_PAGES = 1550
 DELAY_BETWEEN_SURVEY_PAGES_S = 0.25
 
+# Backfill: split the survey pages into this many ranges fetched concurrently
+# (survey_backfill.py); DELAY_BETWEEN_SURVEY_PAGES_S still spaces every page fetch,
+# and each shard checkpoints its pages in BACKFILL_DIR so a failed shard is retried alone
+BACKFILL_SHARDS = 1
+BACKFILL_DIR = survey_backfill.CHECKPOINT_DIR
+
 # Detail pages (parallel)
 FETCH_DETAILS = True
 MAX_WORKERS = 8          # 6–10 is usually safe; higher may get throttled
 RETRIES = 3
-BACKOFF_S = 1.5
+BACKOFF_S = 0.5          # full-jitter exponential backoff between retries (see retry_policy.py)
+BACKOFF_CAP_S = 30
+RETRY_BUDGET = RetryBudget(ratio=0.2)        # retries may add at most 20% to the request count
+RETRY_BREAKER = CircuitBreaker(threshold=0.5, open_s=15)  # pause every fetch during an outage
+MISSING_STATUSES = (404, 410)
 
 # Chunking / checkpointing
 CHUNK_SURVEY_PAGES = 25                  # scrape this many survey pages, then parallel-fetch their details
@@ -41,32 +68,124 @@ DETAIL_FUTURE_TIMEOUT_S = 60             # per-result-page future timeout (avoid
 # -----------------------------
 # Helpers: HTTP
 # -----------------------------
+# keep-alive connections per host + gzip/deflate transfer (see http_pool.py)
+HTTP_POOL = HttpPool(user_agent=USER_AGENT, timeout=TIMEOUT_S, max_idle_per_host=MAX_WORKERS * 2)
+
+
+# on-disk conditional cache (see http_cache.py), off unless --cache: /result pages come
+# from disk within their TTL, survey pages are revalidated with ETag/Last-Modified
+# (304 = served from disk). It grows to HTTP_CACHE_MAX_BYTES, so it is opt-in.
+USE_HTTP_CACHE = False
+HTTP_CACHE_PATH = "http_cache.sqlite3"
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024
+HTTP_CACHE = None
+
+
+def _http_cache() -> HttpCache | None:
+    """Open the page cache on first use (so importing this script creates no files)."""
+    global HTTP_CACHE
+    if USE_HTTP_CACHE and HTTP_CACHE is None:
+        HTTP_CACHE = HttpCache(HTTP_CACHE_PATH, max_bytes=HTTP_CACHE_MAX_BYTES)
+    return HTTP_CACHE if USE_HTTP_CACHE else None
+
+
+# append-only raw HTML archive (see html_archive.py), off unless --archive: every downloaded
+# page is kept so `python scrape.py --reparse` can rebuild applicant_data.json after parser
+# fixes, offline. Nothing is ever evicted, so it is opt-in.
+ARCHIVE_HTML = False
+ARCHIVE_DIR = "html_archive"
+ARCHIVE = None
+
+
+def _html_archive() -> HtmlArchive | None:
+    """Open the archive on first use (so importing this script creates no files)."""
+    global ARCHIVE
+    if ARCHIVE_HTML and ARCHIVE is None:
+        ARCHIVE = HtmlArchive(ARCHIVE_DIR)
+    return ARCHIVE if ARCHIVE_HTML else None
+
+
 def _fetch_html(url: str, timeout: int = TIMEOUT_S) -> str:
-    req = Request(url, headers={"User-Agent": USER_AGENT})
-    with urlopen(req, timeout=timeout) as resp:
-        return resp.read().decode("utf-8", errors="ignore")
+    cache = _http_cache()
+    if cache is not None:
+        return cache.fetch_html(HTTP_POOL, url, timeout=timeout)
+    return HTTP_POOL.fetch_html(url, timeout=timeout)
 
 
-def _safe_fetch_html(url: str) -> str | None:
+def _print_http_stats() -> None:
+    s = HTTP_POOL.stats()
+    print(f"[http] requests={s['requests']} connections={s['connections_opened']} "
+          f"reuse_ratio={s['reuse_ratio']:.2f} bytes_wire={s['bytes_wire']} bytes_saved={s['bytes_saved']}")
+    print(f"[retry] {RETRY_BUDGET.summary()} breaker {RETRY_BREAKER.summary()}")
+    if _http_cache() is not None:
+        c = HTTP_CACHE.stats()
+        print(f"[cache] fresh_hits={c['fresh_hits']} revalidated_304={c['revalidated']} misses={c['misses']} "
+              f"hit_ratio={c['hit_ratio']:.2f} pages={c['pages']} bytes_on_disk={c['bytes_on_disk']}")
+
+
+class FetchError(Exception):
+    """A page could not be fetched: HTTP error status, network error or timeout."""
+
+    def __init__(self, url: str, reason: str, status: int | None = None):
+        super().__init__(f"{reason} ({url})")
+        self.url = url
+        self.reason = reason  # short error class, e.g. "HTTP 503" or "timeout"
+        self.status = status
+
+    @property
+    def missing(self) -> bool:
+        """The page does not exist (404/410); retrying will not help."""
+        return self.status in MISSING_STATUSES
+
+
+def _fetch_page(url: str) -> str:
+    """
+    Fetch through RETRY_BREAKER, raising FetchError once retries are used up.
+    Between attempts sleep a full-jitter exponential backoff, but only while
+    RETRY_BUDGET has retries left; a 404/410 is never retried.
+    """
+    RETRY_BUDGET.on_request()
     for attempt in range(1, RETRIES + 1):
+        RETRY_BREAKER.wait()
         try:
-            return _fetch_html(url)
-        except (HTTPError, URLError, socket.timeout, TimeoutError) as e:
-            print(f"[fetch fail {attempt}/{RETRIES}] {url} :: {e}")
-            time.sleep(BACKOFF_S * attempt)
-    return None
+            html = _fetch_html(url)
+        except HTTPError as e:
+            error = FetchError(url, f"HTTP {e.code}", e.code)
+            RETRY_BREAKER.record(error.missing)
+            if error.missing:
+                print(f"[fetch missing] {url} :: {e}")
+                raise error from e
+        except (URLError, socket.timeout, TimeoutError) as e:
+            RETRY_BREAKER.record(False)
+            is_timeout = isinstance(e, (socket.timeout, TimeoutError))
+            error = FetchError(url, "timeout" if is_timeout else "network error")
+        else:
+            RETRY_BREAKER.record(True)
+            archive = _html_archive()
+            if archive is not None:
+                archive.append(url, html)  # unchanged pages are skipped
+            return html
+        print(f"[fetch fail {attempt}/{RETRIES}] {url} :: {error.reason}")
+        if attempt == RETRIES:
+            break
+        if not RETRY_BUDGET.try_spend():
+            print(f"[retry budget] exhausted; giving up on {url}")
+            break
+        time.sleep(backoff_delay(attempt, BACKOFF_S, BACKOFF_CAP_S))
+    raise error
+
+
+def _safe_fetch_html(url: str) -> str | None:
+    """``_fetch_page``, with None instead of FetchError (survey pages)."""
+    try:
+        return _fetch_page(url)
+    except FetchError:
+        return None
 
 
 # -----------------------------
 # Helpers: cleaning/normalizing
 # -----------------------------
-LABEL_GARBAGE = {
-    "GRE General:", "GRE Verbal:", "Analytical Writing:", "Notes",
-    "Undergrad GPA", "Degree Type", "Degree's Country of Origin",
-    "Timeline", "Admissions", "Results", "Logo"
-}
-
-
 def _normalize_none(s: str | None) -> str | None:
     if s is None:
         return None
@@ -106,45 +225,6 @@ def _valid_result_url(url: str | None) -> bool:
         return False
 
 
-def _clean_bad_label_values(v: str | None) -> str | None:
-    """Drop obvious label-as-value artifacts."""
-    if v is None:
-        return None
-    t = v.strip()
-    if not t:
-        return None
-    if t in LABEL_GARBAGE:
-        return None
-    if t.endswith(":") and len(t) <= 25:
-        return None
-    return t
-
-
-def _extract_float(s: str | None) -> str | None:
-    """Extract a float-like number from a string (e.g., GPA 3.41, AW 4.0)."""
-    if not s:
-        return None
-    m = re.search(r"(\d+(?:\.\d+)?)", s)
-    return m.group(1) if m else None
-
-
-def _extract_int(s: str | None) -> str | None:
-    """Extract first integer from a string."""
-    if not s:
-        return None
-    m = re.search(r"(\d+)", s)
-    return m.group(1) if m else None
-
-
-def _zero_to_none(s: str | None) -> str | None:
-    if s is None:
-        return None
-    t = s.strip()
-    if t in {"0", "0.0", "0.00"}:
-        return None
-    return t
-
-
 def _degree_level(degree_type: str | None) -> str | None:
     """Rubric wants Masters vs PhD. Map common doctoral degrees into 'PhD'."""
     if not degree_type:
@@ -275,78 +355,28 @@ def _parse_result_page(entry_url: str) -> dict:
     Returns ONLY fields we want to merge into the raw record.
     NOTE: We DO NOT include 'origin' in output.
     We compute boolean is_international from origin internally, then discard origin.
+    Raises FetchError when the page cannot be fetched, so a failed fetch is
+    never mistaken for a page without data (see _mark_detail_failed).
     """
-    html = _safe_fetch_html(entry_url)
-    if not html:
-        return {
-            "degree": None,
-            "degree_level": None,
-            "is_international": None,
-            "gpa": None,
-            "gre_total": None,
-            "gre_v": None,
-            "gre_aw": None,
-            "detail_comments": None,
-            "start_term": None,
-            "start_year": None,
-        }
+    return _parse_result_html(_fetch_page(entry_url))
 
-    soup = BeautifulSoup(html, "html.parser")
-    lines = soup.get_text("\n", strip=True).splitlines()
 
-    def get_after(label: str) -> str | None:
-        for i, ln in enumerate(lines):
-            if ln.strip() == label and i + 1 < len(lines):
-                return _normalize_none(lines[i + 1])
-        return None
+def _parse_result_html(html: str) -> dict:
+    """Parse the HTML of a /result/<id> page (shared by live scraping and --reparse)."""
+    lines = BeautifulSoup(html, "html.parser").get_text("\n", strip=True).splitlines()
 
-    degree = _normalize_none(get_after("Degree Type"))
-    origin = _normalize_none(get_after("Degree's Country of Origin"))
-
-    notes = _normalize_none(get_after("Notes"))
-    if notes and notes.strip() in LABEL_GARBAGE:
-        notes = None
-
-    # These labels are often absent on GradCafe; keep None if missing
-    start_term = _normalize_none(get_after("Term"))
-    start_year = _normalize_none(get_after("Year"))
-
-    gpa_raw = _clean_bad_label_values(_zero_to_none(get_after("Undergrad GPA")))
-    gre_total_raw = _clean_bad_label_values(_zero_to_none(get_after("GRE General:")))
-    gre_v_raw = _clean_bad_label_values(_zero_to_none(get_after("GRE Verbal:")))
-    gre_aw_raw = _clean_bad_label_values(_zero_to_none(get_after("Analytical Writing:")))
-
-    gpa = _extract_float(gpa_raw)
-    gre_total = _extract_int(gre_total_raw)
-    gre_v = _extract_int(gre_v_raw)
-    gre_aw = _extract_float(gre_aw_raw)
-
-    # Compute boolean only; do not keep origin in dataset
-    is_international = None
-    if origin:
-        # keep it strict: only "American" maps to False, everything else -> True
-        is_international = (origin.strip().lower() != "american")
-
-    return {
-        "degree": degree,
-        "degree_level": _degree_level(degree),
-        "is_international": is_international,
-        "gpa": gpa,
-        "gre_total": gre_total,
-        "gre_v": gre_v,
-        "gre_aw": gre_aw,
-        "detail_comments": notes,
-        "start_term": start_term,
-        "start_year": start_year,
-    }
+    # One pass over the text lines for every field in result_schema.RESULT_FIELDS
+    detail = RESULT_EXTRACTOR(lines)
+    detail["degree_level"] = _degree_level(detail["degree"])
+    return detail
 
 
 # -----------------------------
 # I/O
 # -----------------------------
 def save_data(records: list[dict], out_path: str = CHECKPOINT_PATH) -> None:
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(records, f, indent=2, ensure_ascii=False)
+    # temp file + rename: a crash never leaves a half-written JSON file
+    record_journal.write_json_atomic(records, out_path)
 
 
 def load_data(path: str = CHECKPOINT_PATH) -> list[dict]:
@@ -354,9 +384,59 @@ def load_data(path: str = CHECKPOINT_PATH) -> list[dict]:
         return json.load(f)
 
 
+# journal of the current scrape_data run (None outside a run)
+JOURNAL: RecordJournal | None = None
+
+
+def _journal_path() -> str:
+    return JOURNAL_PATH + ".gz" if JOURNAL_GZIP else JOURNAL_PATH
+
+
+def _add_record(records: list[dict], rec: dict) -> int:
+    records.append(rec)
+    if JOURNAL is not None:
+        JOURNAL.add(len(records) - 1, rec)
+    return len(records) - 1
+
+
+def _checkpoint(records: list[dict], label: str = "[checkpoint]") -> None:
+    if JOURNAL is not None:
+        JOURNAL.commit()
+        print(f"{label} {len(records)} rows journaled -> {JOURNAL.path}")
+
+
 # -----------------------------
 # Parallel detail fetch (for a subset of records)
 # -----------------------------
+def _apply_detail(r: dict, extra: dict) -> None:
+    # Prefer detail notes over list-page comments
+    if extra.get("detail_comments"):
+        r["comments"] = extra["detail_comments"]
+
+    # overwrite detail fields (raw storage); is_international is always the raw boolean
+    for k in (*RESULT_EXTRACTOR.fields, "degree_level"):
+        if k != "detail_comments":
+            r[k] = extra.get(k)
+
+    # final safety
+    for k in ["gpa", "gre_total", "gre_v", "gre_aw"]:
+        r[k] = clean_label_value(r.get(k))
+    r["detail_error"] = None
+
+
+def _mark_detail_failed(r: dict, reason: str) -> None:
+    """Detail page could not be fetched: detail fields None, detail_error says why."""
+    _apply_detail(r, {**RESULT_EXTRACTOR.empty(), "degree_level": None})
+    r["detail_error"] = reason
+
+
+# record keys _apply_detail may change (what a journal "detail" line holds)
+DETAIL_KEYS = (
+    "comments", *(k for k in RESULT_EXTRACTOR.fields if k != "detail_comments"),
+    "degree_level", "detail_error",
+)
+
+
 def _fetch_details_for_indices(records: list[dict], indices: list[int]) -> tuple[int, int]:
     """
     Fetch detail pages in parallel for only the records at `indices`.
@@ -382,29 +462,19 @@ def _fetch_details_for_indices(records: list[dict], indices: list[int]) -> tuple
             i, url = future_map[fut]
             try:
                 extra = fut.result(timeout=DETAIL_FUTURE_TIMEOUT_S)
+            except FetchError as e:
+                failed += 1
+                _mark_detail_failed(records[i], e.reason)
             except Exception as e:
                 failed += 1
                 print(f"[details worker error] {url} :: {e}")
-                continue
-
-            r = records[i]
-
-            # Prefer detail notes over list-page comments
-            if extra.get("detail_comments"):
-                r["comments"] = extra["detail_comments"]
-
-            # overwrite detail fields (raw storage)
-            for k in ["degree", "degree_level", "gpa", "gre_total", "gre_v", "gre_aw", "start_term", "start_year"]:
-                r[k] = extra.get(k)
-
-            # IMPORTANT: always set raw boolean; no origin gating
-            r["is_international"] = extra.get("is_international")
-
-            # final safety
-            for k in ["gpa", "gre_total", "gre_v", "gre_aw"]:
-                r[k] = _clean_bad_label_values(r.get(k))
-
-            updated += 1
+                _mark_detail_failed(records[i], "timeout" if isinstance(e, TimeoutError)
+                                    else type(e).__name__)
+            else:
+                _apply_detail(records[i], extra)
+                updated += 1
+            if JOURNAL is not None:
+                JOURNAL.detail(i, {k: records[i].get(k) for k in DETAIL_KEYS})
 
     return updated, failed
 
@@ -412,39 +482,84 @@ def _fetch_details_for_indices(records: list[dict], indices: list[int]) -> tuple
 # -----------------------------
 # Main scrape pipeline (CHUNKED)
 # -----------------------------
+def _survey_rows(page: int) -> list[dict] | None:
+    # parsed rows of one survey page; None if it could not be fetched
+    url = f"{BASE_URL}?page={page}"
+    html = _safe_fetch_html(url)
+    return _parse_survey_page(html, url) if html else None
+
+
+def _survey_pages():
+    # (page, rows) in page order: one page after another, or from concurrent shards
+    pages = range(1, SURVEY_PAGES + 1)
+    if BACKFILL_SHARDS > 1:
+        print(f"[backfill] {BACKFILL_SHARDS} shards, checkpoints in {BACKFILL_DIR}")
+        yield from survey_backfill.backfill(pages, _survey_rows, BACKFILL_SHARDS, BACKFILL_DIR,
+                                            min_interval_s=DELAY_BETWEEN_SURVEY_PAGES_S)
+        return
+    for page in pages:
+        yield page, _survey_rows(page)
+        time.sleep(DELAY_BETWEEN_SURVEY_PAGES_S)
+
+
+REQUIRED_KEYS = [
+    "program_name_raw", "university_raw", "comments", "date_posted", "entry_url",
+    "applicant_status", "accepted_date", "rejected_date",
+    "start_term", "start_year", "is_international",
+    "gre_total", "gre_v", "gre_aw", "degree_level", "degree", "gpa",
+    "source_url", "scraped_at", "detail_error",
+]
+
+
 def scrape_data(resume: bool = True) -> None:
+    global JOURNAL
     records: list[dict] = []
     seen_urls: set[str] = set()
-
-    # Resume: load existing and build de-dupe set (canonicalized)
-    if resume and os.path.exists(CHECKPOINT_PATH):
+    chunk_new_indices: list[int] = []
+    from_json = False
+
+    # Resume: replay the journal of an interrupted run, else load the last compacted JSON
+    if resume and os.path.exists(_journal_path()):
+        records, enriched, _ = record_journal.replay(_journal_path())
+        chunk_new_indices = [i for i in range(len(records)) if i not in enriched]
+        print(f"[resume] replayed {len(records)} rows ({len(chunk_new_indices)} without details) "
+              f"from {_journal_path()}")
+    elif resume and os.path.exists(CHECKPOINT_PATH):
         try:
             records = load_data(CHECKPOINT_PATH)
-            for r in records:
-                u = _canonical_result_url(r.get("entry_url"))
-                r["entry_url"] = u  # keep file consistent too
-                if u:
-                    seen_urls.add(u)
+            from_json = True
             print(f"[resume] loaded {len(records)} existing rows from {CHECKPOINT_PATH}")
         except Exception:
             records = []
-            seen_urls = set()
+    elif os.path.exists(_journal_path()):
+        os.remove(_journal_path())
+    if not resume:
+        survey_backfill.discard(BACKFILL_DIR)
+
+    # de-dupe set (canonicalized)
+    for r in records:
+        u = _canonical_result_url(r.get("entry_url"))
+        r["entry_url"] = u  # keep file consistent too
+        if u:
+            seen_urls.add(u)
+
+    JOURNAL = RecordJournal(JOURNAL_PATH, compress=JOURNAL_GZIP, fsync=JOURNAL_FSYNC)
+    if from_json:
+        # the journal starts from the compacted JSON, so compaction keeps those rows
+        for i, r in enumerate(records):
+            JOURNAL.add(i, r)
+        JOURNAL.commit()
 
-    chunk_new_indices: list[int] = []
     total_failed_details = 0
 
     try:
-        for page in range(1, SURVEY_PAGES + 1):
-            url = f"{BASE_URL}?page={page}"
-            print(f"[survey] page {page}/{SURVEY_PAGES}: {url}")
+        for page, page_records in _survey_pages():
+            print(f"[survey] page {page}/{SURVEY_PAGES}: {BASE_URL}?page={page}")
 
-            html = _safe_fetch_html(url)
-            if not html:
+            if page_records is None:
                 print("  -> skipped (fetch failed)")
                 continue
 
-            page_records = _parse_survey_page(html, url)
-
             added = 0
             for rec in page_records:
                 u = _canonical_result_url(rec.get("entry_url"))
@@ -455,8 +570,7 @@ def scrape_data(resume: bool = True) -> None:
                 if u:
                     seen_urls.add(u)
 
-                records.append(rec)
-                chunk_new_indices.append(len(records) - 1)
+                chunk_new_indices.append(_add_record(records, rec))
                 added += 1
 
             print(
@@ -471,22 +585,16 @@ def scrape_data(resume: bool = True) -> None:
                 total_failed_details += failed
                 print(f"[details] chunk done: updated={updated}, failed={failed}, total_failed_details={total_failed_details}")
                 chunk_new_indices = []
-
-                save_data(records, CHECKPOINT_PATH)
-                print(f"[checkpoint] saved {len(records)} rows -> {CHECKPOINT_PATH}")
+                _checkpoint(records)
 
             # Periodic checkpoint even if details off
             if page % CHUNK_SURVEY_PAGES == 0 and not FETCH_DETAILS:
-                save_data(records, CHECKPOINT_PATH)
-                print(f"[checkpoint] saved {len(records)} rows -> {CHECKPOINT_PATH}")
-
-            time.sleep(DELAY_BETWEEN_SURVEY_PAGES_S)
+                _checkpoint(records)
 
     except KeyboardInterrupt:
         # Graceful exit: save what we have so far
         print("\n[interrupt] Ctrl-C received. Saving checkpoint...")
-        save_data(records, CHECKPOINT_PATH)
-        print(f"[interrupt] saved {len(records)} rows -> {CHECKPOINT_PATH}")
+        _checkpoint(records, "[interrupt]")
         # still attempt details for pending chunk? NO—keep it simple/fast on interrupt.
 
     # Final: if any remaining new records not yet detail-fetched, do them now
@@ -496,24 +604,116 @@ def scrape_data(resume: bool = True) -> None:
         total_failed_details += failed
         print(f"[details] final done: updated={updated}, failed={failed}, total_failed_details={total_failed_details}")
 
-    # Defensive: ensure all expected keys exist
-    required_keys = [
-        "program_name_raw", "university_raw", "comments", "date_posted", "entry_url",
-        "applicant_status", "accepted_date", "rejected_date",
-        "start_term", "start_year", "is_international",
-        "gre_total", "gre_v", "gre_aw", "degree_level", "degree", "gpa",
-        "source_url", "scraped_at",
-    ]
+    # fold the journal into applicant_data.json (missing keys filled with None)
+    JOURNAL.close()
+    journal_path, lines, JOURNAL = JOURNAL.path, JOURNAL.lines, None
+    records = record_journal.compact(journal_path, CHECKPOINT_PATH, REQUIRED_KEYS)
+    print(f"[final] compacted {lines} journal lines into {len(records)} records -> {CHECKPOINT_PATH}")
+    print(f"[final] total_failed_details={total_failed_details}")
+    _print_http_stats()
+
+
+# -----------------------------
+# Re-parse from the HTML archive (no network)
+# -----------------------------
+REPARSE_WORKERS = os.cpu_count() or 1
+
+
+def _survey_page_no(url: str) -> int:
+    m = re.search(r"[?&]page=(\d+)", url)
+    return int(m.group(1)) if m else 0
+
+
+def _reparse_survey(job: tuple[str, dict]) -> list[dict]:
+    root, entry = job
+    rows = _parse_survey_page(html_archive.read_entry(root, entry), entry["url"])
+    for r in rows:
+        r["scraped_at"] = entry["fetched_at"]
+    return rows
+
+
+def _reparse_detail(job: tuple[str, dict]) -> dict:
+    root, entry = job
+    return _parse_result_html(html_archive.read_entry(root, entry))
+
+
+def _map_jobs(fn, jobs: list, workers: int) -> list:
+    # ordered results; in-process for one worker
+    if workers <= 1 or len(jobs) <= 1:
+        return [fn(j) for j in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(fn, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def reparse_archive(archive_dir: str = ARCHIVE_DIR, out_path: str = CHECKPOINT_PATH,
+                    workers: int = REPARSE_WORKERS) -> list[dict]:
+    """
+    Rebuild applicant_data.json from archived HTML only: latest copy of every
+    survey page (page 1 first, same de-dupe as scrape_data) plus archived
+    /result/<id> pages for the details. Parsing runs across `workers` processes.
+    """
+    t0 = time.perf_counter()
+    latest = html_archive.latest_entries(archive_dir)
+    surveys = sorted(
+        (e for u, e in latest.items() if url_class(u) == "survey" and _survey_page_no(u)),
+        key=lambda e: _survey_page_no(e["url"]),
+    )
+    print(f"[reparse] {len(surveys)} survey pages in {archive_dir} (workers={workers})")
+
+    records: list[dict] = []
+    seen_urls: set[str] = set()
+    for page_records in _map_jobs(_reparse_survey, [(archive_dir, e) for e in surveys], workers):
+        for rec in page_records:
+            u = _canonical_result_url(rec.get("entry_url"))
+            rec["entry_url"] = u
+            if u and u in seen_urls:
+                continue
+            if u:
+                seen_urls.add(u)
+            records.append(rec)
+
+    with_detail = [i for i, r in enumerate(records) if r["entry_url"] in latest]
+    jobs = [(archive_dir, latest[records[i]["entry_url"]]) for i in with_detail]
+    for i, extra in zip(with_detail, _map_jobs(_reparse_detail, jobs, workers)):
+        _apply_detail(records[i], extra)
+
     for r in records:
-        for k in required_keys:
+        for k in REQUIRED_KEYS:
             r.setdefault(k, None)
-
-    save_data(records, CHECKPOINT_PATH)
-    print(f"[final] saved {len(records)} records -> {CHECKPOINT_PATH}")
-    print(f"[final] total_failed_details={total_failed_details}")
+    save_data(records, out_path)
+    print(f"[reparse] saved {len(records)} records ({len(with_detail)} with details) -> {out_path} "
+          f"in {time.perf_counter() - t0:.1f}s")
+    return records
 
 
 if __name__ == "__main__":
-    # If you deleted applicant_data.json and want a clean run, set resume=False.
-    # Otherwise, resume=True is safe (de-dupes by entry_url).
-    scrape_data(resume=True)
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scrape GradCafe survey + result pages.")
+    parser.add_argument("--reparse", action="store_true",
+                        help=f"rebuild {CHECKPOINT_PATH} from the HTML archive (no network)")
+    parser.add_argument("--workers", type=int, default=REPARSE_WORKERS, help="processes used by --reparse")
+    parser.add_argument("--cache", nargs="?", const=HTTP_CACHE_PATH, default=None, metavar="PATH",
+                        help=f"keep fetched pages in an on-disk HTTP cache (default path: {HTTP_CACHE_PATH})")
+    parser.add_argument("--archive", nargs="?", const=ARCHIVE_DIR, default=None, metavar="DIR",
+                        help=f"append every downloaded page to an HTML archive for --reparse "
+                             f"(default dir: {ARCHIVE_DIR})")
+    parser.add_argument("--gzip-journal", action="store_true", help=f"gzip the checkpoint journal ({JOURNAL_PATH}.gz)")
+    parser.add_argument("--no-fsync", action="store_true", help="do not fsync the journal at chunk boundaries")
+    parser.add_argument("--shards", type=int, default=BACKFILL_SHARDS,
+                        help="fetch the survey pages as this many concurrent page ranges")
+    cli = parser.parse_args()
+    USE_HTTP_CACHE = cli.cache is not None
+    HTTP_CACHE_PATH = cli.cache or HTTP_CACHE_PATH
+    ARCHIVE_HTML = cli.archive is not None
+    ARCHIVE_DIR = cli.archive or ARCHIVE_DIR
+    JOURNAL_GZIP = cli.gzip_journal
+    JOURNAL_FSYNC = not cli.no_fsync
+    BACKFILL_SHARDS = cli.shards
+
+    if cli.reparse:
+        reparse_archive(ARCHIVE_DIR, workers=cli.workers)
+    else:
+        # If you deleted applicant_data.json and want a clean run, set resume=False.
+        # Otherwise, resume=True is safe (de-dupes by entry_url).
+        scrape_data(resume=True)
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Throughput of clean_update.clean_data over synthetic raw records.
+
+Generates ``--rows`` raw update records (seeded: HTML fragments and stray
+whitespace in the text, start terms in the comments some of the time, every
+spelling of is_international and GPA), cleans them with each ``--workers``
+count, and prints records/second. Every run's JSON output is compared byte
+for byte (by SHA-256) with the first worker count's output.
+
+Usage (from module_5/):
+
+    python -m benchmarks.bench_clean --rows 31000 1000000 --workers 1 4
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+
+from src import clean_update
+from src.applicant_record import ApplicantRecord
+
+_COMMENTS = (
+    "Starting Fall 2026 cohort. <i>Excited</i>!",
+    "Program begins Aug 2026",
+    "I wrote 'Fall 2026' but this is unrelated chatter.",
+    "  funded   offer,\n  see <b>notes</b>  ",
+    "Enrollment in spring 2027, deferred one term",
+    "",
+    None,
+)
+_STATUS = ("Accepted on 29 Jan", "Rejected on 3 Feb", "Interview", "Wait listed on 1 Mar", None)
+_INTL = (True, False, None, "true", "false", "International", "American")
+
+
+def synthetic_records(n: int, seed: int = 0) -> list[dict]:
+    """``n`` raw records in the scrape JSON schema, the same ones for a given seed."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        rec = {
+            "program_name_raw": f"  <b>Program {i % 700}</b>   ",
+            "university_raw": f"  University   of {i % 300} ",
+            "comments": rng.choice(_COMMENTS),
+            "date_posted": f" 2026-0{1 + i % 9}-1{i % 10} ",
+            "entry_url": f" https://www.thegradcafe.com/result/{1_000_000 - i} ",
+            "applicant_status": rng.choice(_STATUS),
+            "accepted_date": rng.choice(("29 Jan", "", None)),
+            "rejected_date": rng.choice(("3 Feb", "", None)),
+            "start_term": rng.choice(("Fall", None, None)),
+            "start_year": rng.choice(("2026", None, None)),
+            "is_international": rng.choice(_INTL),
+            "gre_total": rng.choice((str(rng.randint(290, 340)), None)),
+            "gre_v": rng.choice((str(rng.randint(140, 170)), None)),
+            "gre_aw": rng.choice((f"{rng.randint(2, 12) / 2:.1f}", None)),
+            "degree_level": rng.choice(("Masters", "PhD", None)),
+            "degree": rng.choice(("MS", "PhD", None)),
+            "source_url": f"https://www.thegradcafe.com/survey/?page={1 + i // 20}",
+            "scraped_at": "2026-02-10T00:00:00+00:00",
+        }
+        rec["gpa" if i % 5 else "GPA"] = rng.choice((f"{rng.uniform(2.5, 4.0):.2f}", None))
+        out.append(rec)
+    return out
+
+
+def _digest(rows: list[ApplicantRecord]) -> str:
+    """SHA-256 of the JSON save_data writes, encoded piece by piece (1M rows are ~600 MB)."""
+    encoder = json.JSONEncoder(indent=2, ensure_ascii=False, default=ApplicantRecord.to_clean_dict)
+    h = hashlib.sha256()
+    for piece in encoder.iterencode(rows):
+        h.update(piece.encode("utf-8"))
+    return h.hexdigest()
+
+
+def main() -> None:
+    """Clean each record count with each worker count and print the throughput."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[31_000, 1_000_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--chunk-size", type=int, default=clean_update.CHUNK_SIZE)
+    args = parser.parse_args()
+
+    for n in args.rows:
+        records = synthetic_records(n)
+        reference = None
+        for workers in args.workers:
+            t0 = time.perf_counter()
+            rows = clean_update.clean_data(records, workers=workers, chunk_size=args.chunk_size)
+            elapsed = time.perf_counter() - t0
+            digest = _digest(rows)
+            del rows
+            reference = reference or digest
+            print(
+                f"rows={n} workers={workers} {elapsed:.2f}s {n / elapsed:,.0f} rows/s "
+                f"identical={digest == reference}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+End-to-end crawler throughput against the local stand-in, with and without faults.
+
+Each profile runs ``scrape_data`` over ``--pages`` survey pages of a fresh
+stand-in (``BASE_URL`` points at it; the database holds nothing, so every row
+is new and its detail page is fetched). The ``faulty`` profile adds lognormal
+latency, 503s, 429s with ``Retry-After``, dropped connections and slow
+bodies, all drawn from ``--seed``, so two runs see the same faults. Prints
+rows/second, requests answered, faults injected and rows left without details.
+``--rate``, ``--max-rate`` and ``--max-workers`` override the crawler's
+polite defaults, which only a stand-in should be crawled above.
+
+Usage (from module_5/):
+
+    python -m benchmarks.bench_crawl --pages 20 --modes chunked pipelined
+    python -m benchmarks.bench_crawl --pages 60 --modes chunked backfill --no-details
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import src.scrape_update as su
+from src.rate_control import AdaptiveController
+from src.result_index import ResultIdIndex
+from src.retry_policy import CircuitBreaker, RetryBudget
+from benchmarks.standin_server import Faults, start_in_thread
+
+
+def _profiles(seed: int) -> dict[str, Faults]:
+    return {
+        "clean": Faults(seed=seed),
+        "faulty": Faults(latency="lognormal", latency_sigma=0.8, error_rate=0.03,
+                         throttle_rate=0.01, retry_after_s=0.5, reset_rate=0.01,
+                         slow_body_rate=0.02, slow_body_s=0.5, seed=seed),
+    }
+
+
+def _run(mode: str, backend: str, pages: int, latency_s: float, faults: Faults) -> str:
+    server = start_in_thread(latency_s=latency_s, faults=faults)
+    workdir = tempfile.mkdtemp(prefix="bench_crawl_")
+    su.BASE_URL = server.base_url + "/survey/"
+    su.CRAWL_MODE = mode
+    su.DETAIL_BACKEND = backend
+    su.SURVEY_PAGES = pages
+    su.UPDATE_OUTPUT_JSON = os.path.join(workdir, "update.json")
+    su.UPDATE_JOURNAL = os.path.join(workdir, "update.jsonl")
+    su.BACKFILL_DIR = os.path.join(workdir, "backfill_shards")
+    su.RATE_CONTROLLER = AdaptiveController(
+        rate=su.RATE_INITIAL, max_rate=su.RATE_MAX, max_concurrency=su.MAX_WORKERS,
+        decision_log=os.path.join(workdir, "rate_decisions.jsonl"),
+    )
+    su.RETRY_BUDGET = RetryBudget(ratio=su.RETRY_BUDGET_RATIO)
+    su.RETRY_BREAKER = CircuitBreaker(threshold=su.BREAKER_THRESHOLD, open_s=su.BREAKER_OPEN_S)
+    try:
+        t0 = time.perf_counter()
+        su.scrape_data(resume=False)
+        elapsed = time.perf_counter() - t0
+    finally:
+        server.shutdown()
+    rows = su.load_data(su.UPDATE_OUTPUT_JSON)
+    missing = sum(1 for r in rows if r.get("detail_error"))
+    r = server.requests
+    injected = " ".join(f"{k}={v}" for k, v in server.injected.items())
+    return (
+        f"rows={len(rows)} time={elapsed:6.2f}s rows_per_sec={len(rows) / elapsed:7.1f} "
+        f"requests={r['survey'] + r['result']} no_details={missing} {injected}"
+    )
+
+
+def main() -> None:
+    """Run every mode/backend under each fault profile."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--modes", nargs="+", default=["chunked", "pipelined"],
+                        choices=["chunked", "pipelined", "backfill"])
+    parser.add_argument("--backends", nargs="+", default=["threads"],
+                        choices=["threads", "asyncio"])
+    parser.add_argument("--profiles", nargs="+", default=["clean", "faulty"],
+                        choices=["clean", "faulty"])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-details", action="store_true",
+                        help="survey pages only (compares the survey walk of each mode)")
+    parser.add_argument("--rate", type=float, default=su.RATE_INITIAL)
+    parser.add_argument("--max-rate", type=float, default=su.RATE_MAX)
+    parser.add_argument("--max-workers", type=int, default=su.MAX_WORKERS)
+    args = parser.parse_args()
+
+    # An empty database: every stand-in row is new
+    su.load_existing_ids_from_db = lambda bits: ResultIdIndex()
+    su.USE_FAILURE_LEDGER = False
+    su.USE_HTTP_CACHE = False
+    su.ARCHIVE_HTML = False
+    su.STOP_AFTER_PAGES_WITH_NO_NEW = args.pages + 1
+    su.FETCH_DETAILS = not args.no_details
+    su.RATE_INITIAL, su.RATE_MAX, su.MAX_WORKERS = args.rate, args.max_rate, args.max_workers
+
+    profiles = _profiles(args.seed)
+    for name in args.profiles:
+        for mode in args.modes:
+            for backend in args.backends:
+                result = _run(mode, backend, args.pages, args.latency_ms / 1000, profiles[name])
+                print(f"RESULT profile={name:<6} mode={mode:<9} backend={backend:<7} {result}")
+
+
+if __name__ == "__main__":
+    main()
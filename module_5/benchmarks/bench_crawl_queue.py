@@ -0,0 +1,102 @@
+"""
+Throughput of the shared crawl_tasks queue as worker processes are added.
+
+For each worker count a fresh ``crawl_tasks`` table is seeded with ``--pages``
+survey pages of the local stand-in, and that many ``run_queue_worker``
+processes drain it (every survey row becomes a result task). The clock starts
+once every worker has started and imported, so only the drain is timed.
+Tables live in a
+scratch schema (``bench_queue``, picked through ``PGOPTIONS``), with an empty
+``applicants`` table for the per-page dedup, so the real tables are never
+touched. Prints tasks/second and the speedup over one worker; with network
+latency dominating, it should grow close to linearly until the stand-in or
+Postgres saturates. Needs a reachable Postgres (``DATABASE_URL`` or ``DB_*``
+variables, as for the app).
+
+Usage (from module_5/):
+
+    python -m benchmarks.bench_crawl_queue --workers 1 2 4 8 --pages 40 --latency-ms 200
+"""
+import argparse
+import multiprocessing
+import time
+
+import src.scrape_update as su
+from src.crawl_queue import CrawlQueue
+from src.db import connect_db
+from src.rate_control import AdaptiveController
+from benchmarks.scratch_db import create_applicants, scratch_schema
+from benchmarks.standin_server import start_in_thread
+
+SCHEMA = "bench_queue"
+
+
+def _setup_schema() -> None:
+    create_applicants(SCHEMA)
+    with connect_db() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {SCHEMA}.crawl_tasks;")
+    with CrawlQueue() as q:
+        q.ensure_schema()
+
+
+def _worker(base_url: str, start) -> None:
+    """One worker process, pointed at the stand-in; drains once every worker is up."""
+    su.RATE_CONTROLLER = AdaptiveController(rate=1e6, max_rate=1e6, max_concurrency=1)
+    su.USE_HTTP_CACHE = False
+    su.ARCHIVE_HTML = False
+    su.BASE_URL = base_url
+    su.QUEUE_POLL_S = 0.05
+    start.wait()
+    su.run_queue_worker()
+
+
+def _run(workers: int, pages: int, base_url: str) -> tuple[int, float]:
+    su.BASE_URL = base_url
+    with CrawlQueue() as q:
+        q.clear()
+    su.seed_queue(pages)
+
+    ctx = multiprocessing.get_context("spawn")
+    start = ctx.Barrier(workers + 1)
+    procs = [ctx.Process(target=_worker, args=(base_url, start)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    start.wait()  # process start-up and imports are not timed
+    t0 = time.perf_counter()
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - t0
+
+    with CrawlQueue() as q:
+        done = q.counts()["done"]
+    return done, elapsed
+
+
+def main() -> None:
+    """Seed and drain the queue once per worker count."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    server = start_in_thread(latency_s=args.latency_ms / 1000)
+    base = None
+    try:
+        with scratch_schema(SCHEMA):
+            _setup_schema()
+            for n in args.workers:
+                done, elapsed = _run(n, args.pages, server.base_url + "/survey/")
+                rate = done / elapsed
+                base = base or rate
+                print(
+                    f"RESULT workers={n:<3} tasks={done} time={elapsed:6.2f}s "
+                    f"tasks_per_sec={rate:7.1f} speedup={rate / base:5.2f}x"
+                )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Startup time and memory of the scraper's de-duplication structure.
+
+Compares the old URL preload (``fetchall()`` of every stored URL, each one
+canonicalized with ``urlparse`` into a ``set`` that ``scrape_data`` then
+copied) with the integer ``ResultIdIndex`` filled from a streamed cursor,
+with and without the Bloom prefilter. The database side is simulated: rows
+are generated in memory (all at once for ``fetchall()``, in ``itersize``
+batches for the server-side cursor), so only the client cost is measured.
+Startup is timed on its own; memory is the tracemalloc peak of a second
+build. Lookups are timed over a mix of stored and new ids.
+
+Usage (from module_5/):
+
+    python -m benchmarks.bench_dedup_index --rows 30000 300000 3000000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+import src.scrape_update as su
+from src.result_index import ResultIdIndex
+
+ITERSIZE = 20_000
+
+
+def _url(rid: int) -> str:
+    return f"https://www.thegradcafe.com/result/{rid}"
+
+
+def _preload_urls(rids: range) -> set[str]:
+    rows = [(_url(rid),) for rid in rids]  # what cursor.fetchall() hands back
+    urls = set()
+    for (u,) in rows:
+        u = su._canonical_result_url(u)  # pylint: disable=protected-access
+        if u:
+            urls.add(u)
+    return set(urls)  # scrape_data's seen_urls copy
+
+
+def _streamed_ids(rids: range):
+    for start in range(0, len(rids), ITERSIZE):
+        batch = [(rid,) for rid in rids[start:start + ITERSIZE]]  # one cursor round trip
+        for (rid,) in batch:
+            yield rid
+
+
+def _measure(build):
+    """(structure, build seconds, peak traced bytes); timed without tracemalloc."""
+    t0 = time.perf_counter()
+    structure = build()
+    elapsed = time.perf_counter() - t0
+    del structure
+    tracemalloc.start()
+    structure = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return structure, elapsed, peak
+
+
+def _lookup_us(contains, probes: list) -> float:
+    t0 = time.perf_counter()
+    for p in probes:
+        contains(p)
+    return 1e6 * (time.perf_counter() - t0) / len(probes)
+
+
+def main() -> None:
+    """Build every structure for each table size and print one line each."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[30_000, 300_000, 3_000_000])
+    parser.add_argument("--bloom-bits", type=int, default=10)
+    args = parser.parse_args()
+
+    for n in args.rows:
+        rids = range(1_000_000, 1_000_000 + n)
+        rng = random.Random(n)
+        probes = [rng.randrange(rids.start, rids.stop + n) for _ in range(50_000)]
+        candidates = {
+            "url_set": lambda r=rids: _preload_urls(r),
+            "id_array": lambda r=rids: ResultIdIndex(_streamed_ids(r)),
+            "id_array+bloom": lambda r=rids: ResultIdIndex(_streamed_ids(r), args.bloom_bits),
+        }
+        for name, build in candidates.items():
+            structure, elapsed, peak = _measure(build)
+            if name == "url_set":
+                lookup = _lookup_us(structure.__contains__, [_url(p) for p in probes])
+            else:
+                lookup = _lookup_us(structure.__contains__, probes)
+            print(
+                f"rows={n:<8} {name:<15} startup={elapsed:7.2f}s "
+                f"peak_mem={peak / 2**20:8.1f}MiB lookup={lookup:.2f}us"
+            )
+            del structure
+
+
+if __name__ == "__main__":
+    main()
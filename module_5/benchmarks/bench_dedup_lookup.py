@@ -0,0 +1,90 @@
+"""
+Preloaded id index vs. per-page Postgres lookups for scraper de-duplication.
+
+For each table size an ``applicants`` table with that many stored
+``/result/<id>`` URLs is created in a scratch schema (``bench_dedup``, picked
+through ``PGOPTIONS``, so the real table is never touched). Both strategies
+then de-duplicate the same simulated crawl: ``--pages`` survey pages of 20
+rows, the first half new and the rest already stored.
+
+- preload: ``load_existing_ids_from_db`` once, then in-memory lookups
+- per-page: ``DbPageDedup``, one ``url = ANY(%s)`` query per page
+
+Startup, total time and tracemalloc peak are printed per strategy. Needs a
+reachable Postgres (``DATABASE_URL`` or ``DB_*`` variables, as for the app).
+
+Usage (from module_5/):
+
+    python -m benchmarks.bench_dedup_lookup --rows 30000 300000 3000000
+"""
+import argparse
+import time
+import tracemalloc
+
+import src.scrape_update as su
+from src.db import connect_db
+from benchmarks.scratch_db import create_applicants, scratch_schema
+
+SCHEMA = "bench_dedup"
+ROWS_PER_PAGE = 20
+
+
+def _create_table(n: int) -> None:
+    create_applicants(SCHEMA)
+    with connect_db() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"INSERT INTO {SCHEMA}.applicants (url) "
+                "SELECT 'https://www.thegradcafe.com/result/' || g FROM generate_series(1, %s) g;",
+                (n,),
+            )
+            cur.execute(f"ANALYZE {SCHEMA}.applicants;")
+
+
+def _pages(n: int, pages: int) -> list[list[dict]]:
+    """Newest ids first: the first half of the pages are new, the rest stored."""
+    top = n + pages * ROWS_PER_PAGE // 2
+    return [
+        [{"entry_url": su._result_url(top - p * ROWS_PER_PAGE - k)} for k in range(ROWS_PER_PAGE)]  # pylint: disable=protected-access
+        for p in range(pages)
+    ]
+
+
+def _run(make_seen, pages: list[list[dict]]) -> tuple[float, float, int, int]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    seen = make_seen()
+    startup = time.perf_counter() - t0
+    new = sum(len(su._collect_new_rows([dict(r) for r in page], seen)) for page in pages)  # pylint: disable=protected-access
+    total = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if isinstance(seen, su.DbPageDedup):
+        seen.close()
+    return startup, total, peak, new
+
+
+def main() -> None:
+    """Build each table size, then run both strategies over the same pages."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[30_000, 300_000, 3_000_000])
+    parser.add_argument("--pages", type=int, default=40)
+    args = parser.parse_args()
+
+    with scratch_schema(SCHEMA):
+        for n in args.rows:
+            _create_table(n)
+            pages = _pages(n, args.pages)
+            for name, make_seen in (
+                ("preload", lambda: su.load_existing_ids_from_db(0)),
+                ("per-page", su.DbPageDedup),
+            ):
+                startup, total, peak, new = _run(make_seen, pages)
+                print(
+                    f"rows={n:<8} {name:<9} startup={startup:7.3f}s total={total:7.3f}s "
+                    f"peak_mem={peak / 2**20:7.1f}MiB new={new}"
+                )
+
+
+if __name__ == "__main__":
+    main()
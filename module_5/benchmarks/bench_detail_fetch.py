@@ -0,0 +1,82 @@
+"""
+Benchmark the detail-page backends of scrape_update against a local stand-in.
+
+Runs the thread-pool backend (MAX_WORKERS threads) and the asyncio backend
+(ASYNC_MAX_IN_FLIGHT requests) over the same set of /result/<id> URLs and
+prints wall time and pages/sec for each. ``--parse-workers N`` moves HTML
+parsing into N processes; the ``[cpu]`` line after each run splits CPU time
+between the fetch and parse stages.
+
+Usage (from module_5/):
+
+    python -m benchmarks.bench_detail_fetch --pages 1000 --latency-ms 50
+"""
+import argparse
+import time
+
+import src.scrape_update as su
+from src.rate_control import AdaptiveController
+from benchmarks.standin_server import TOP_RESULT_ID, start_in_thread
+
+
+def _records_and_tasks(base_url: str, n: int) -> tuple[list[dict], list[tuple[int, str]]]:
+    records = [{"entry_url": f"{base_url}/result/{TOP_RESULT_ID - i}"} for i in range(n)]
+    return records, [(i, r["entry_url"]) for i, r in enumerate(records)]
+
+
+def _run(label: str, backend, base_url: str, n: int) -> float:
+    records, tasks = _records_and_tasks(base_url, n)
+    t0 = time.perf_counter()
+    cpu0 = time.process_time()
+    su._PARSE_STATS.update(pages=0, cpu_s=0.0, inline_cpu_s=0.0)  # pylint: disable=protected-access
+    updated, failed = backend(records, tasks)
+    elapsed = time.perf_counter() - t0
+    print(
+        f"{label:<28} pages={n} updated={updated} failed={failed} "
+        f"time={elapsed:.2f}s rate={n / elapsed:.1f} pages/s"
+    )
+    su._print_cpu_stats(time.process_time() - cpu0, elapsed)  # pylint: disable=protected-access
+    return elapsed
+
+
+def main() -> None:
+    """Start the stand-in, run both backends, print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--workers", type=int, default=su.MAX_WORKERS)
+    parser.add_argument("--in-flight", type=int, default=su.ASYNC_MAX_IN_FLIGHT)
+    parser.add_argument("--parse-workers", type=int, default=su.PARSE_WORKERS)
+    args = parser.parse_args()
+
+    su.MAX_WORKERS = args.workers
+    # Compare the backends themselves: give the thread pool a fixed, unthrottled budget
+    su.RATE_CONTROLLER = AdaptiveController(
+        rate=1e6, max_rate=1e6, concurrency=args.workers, max_concurrency=args.workers
+    )
+    su.ASYNC_MAX_IN_FLIGHT = args.in_flight
+    su.PARSE_WORKERS = args.parse_workers
+
+    server = start_in_thread(latency_s=args.latency_ms / 1000)
+    try:
+        t_threads = _run(
+            f"threads (workers={args.workers})",
+            su._fetch_details_threaded,  # pylint: disable=protected-access
+            server.base_url,
+            args.pages,
+        )
+        t_async = _run(
+            f"asyncio (in_flight={args.in_flight})",
+            su._fetch_details_async,  # pylint: disable=protected-access
+            server.base_url,
+            args.pages,
+        )
+    finally:
+        server.shutdown()
+        su._shutdown_parse_pool()  # pylint: disable=protected-access
+
+    print(f"speedup: {t_threads / t_async:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark /result/<id> field extraction as the number of fields grows.
+
+Compares the spec-driven single-pass ``Extractor`` (src.result_schema) with a
+rescan of every line per label, the way the old ``get_after`` helper worked.
+Extra synthetic ``Field`` rows are added to the spec and to each page. The
+rescan cost grows with fields x lines; the single pass only with page length.
+
+Usage (from module_5/):
+
+    python -m benchmarks.bench_extract --pages 2000
+"""
+import argparse
+import time
+
+from src import parsers
+from src.result_schema import RESULT_FIELDS, Extractor, Field, clean_text
+from benchmarks.standin_server import TOP_RESULT_ID, result_html
+
+
+def _rescan(fields: tuple[Field, ...], lines: list[str]) -> dict:
+    def get_after(label: str) -> str | None:
+        for i, ln in enumerate(lines):
+            if ln.strip() == label and i + 1 < len(lines):
+                return lines[i + 1]
+        return None
+
+    return {f.field: f.clean(get_after(f.label)) for f in fields}
+
+
+def _time(fn, pages: list[list[str]]) -> float:
+    t0 = time.perf_counter()
+    for lines in pages:
+        fn(lines)
+    return 1e6 * (time.perf_counter() - t0) / len(pages)
+
+
+def main() -> None:
+    """Time both extraction strategies for growing field counts."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    args = parser.parse_args()
+
+    base = [parsers.page_lines(result_html(TOP_RESULT_ID - i)) for i in range(args.pages)]
+    for extra in (0, 20, 80):
+        fields = RESULT_FIELDS + tuple(
+            Field(f"Extra field {k}", f"extra_{k}", clean_text) for k in range(extra)
+        )
+        padding = [x for k in range(extra) for x in (f"Extra field {k}", f"value {k}")]
+        pages = [padding + lines for lines in base]
+        extractor = Extractor(fields)
+        assert all(extractor(p) == _rescan(fields, p) for p in pages[:50])
+        print(
+            f"fields={len(fields):<3} lines/page={len(pages[0]):<4} "
+            f"single_pass={_time(extractor, pages):.1f}us "
+            f"rescan={_time(lambda p, f=fields: _rescan(f, p), pages):.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
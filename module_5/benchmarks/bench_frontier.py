@@ -0,0 +1,70 @@
+"""
+Compare request counts of the chunked survey crawl and the frontier crawl.
+
+Simulates a daily update against the local stand-in: the database already
+holds every entry up to ``TOP_RESULT_ID - new`` and the site has ``new``
+newer entries (with every ``gap_every``-th id removed). Both modes run
+end to end (``scrape_data``) with the database lookups stubbed out, and the
+stand-in's request counters are printed for each.
+
+Usage (from module_5/):
+
+    python -m benchmarks.bench_frontier --new 150 --gap-every 37
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import src.scrape_update as su
+from src.rate_control import AdaptiveController
+from src.result_index import ResultIdIndex
+from benchmarks.standin_server import ROWS_PER_PAGE, TOP_RESULT_ID, start_in_thread
+
+
+def _run(mode: str, server, known_top: int, known_pages: int) -> None:
+    su.CRAWL_MODE = mode
+    su.BASE_URL = server.base_url + "/survey/"
+    server.requests.update(survey=0, result=0)
+
+    known = range(known_top, known_top - known_pages * ROWS_PER_PAGE, -1)
+    su.load_existing_ids_from_db = lambda bits: ResultIdIndex(reversed(known))
+    su.load_max_result_id_from_db = lambda: known_top
+
+    t0 = time.perf_counter()
+    su.scrape_data()
+    elapsed = time.perf_counter() - t0
+    rows = len(su.load_data())
+    r = server.requests
+    print(
+        f"RESULT mode={mode:<9} rows={rows} survey_requests={r['survey']} "
+        f"result_requests={r['result']} total={r['survey'] + r['result']} time={elapsed:.2f}s"
+    )
+
+
+def main() -> None:
+    """Run both modes against the same simulated update."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--new", type=int, default=150, help="entries newer than the DB")
+    parser.add_argument("--gap-every", type=int, default=37)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    su.RATE_CONTROLLER = AdaptiveController(rate=1e6, max_rate=1e6, max_concurrency=su.MAX_WORKERS)
+    su.USE_HTTP_CACHE = False
+    su.USE_FAILURE_LEDGER = False
+    su.ARCHIVE_HTML = False
+    workdir = tempfile.mkdtemp(prefix="bench_frontier_")
+    su.UPDATE_OUTPUT_JSON = os.path.join(workdir, "update.json")
+    su.load_data.__defaults__ = (su.UPDATE_OUTPUT_JSON,)
+
+    server = start_in_thread(latency_s=args.latency_ms / 1000, gap_every=args.gap_every)
+    try:
+        for mode in ("chunked", "frontier"):
+            _run(mode, server, TOP_RESULT_ID - args.new, known_pages=200)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark urlopen-per-request against the keep-alive HttpPool.
+
+Fetches the same survey pages sequentially (like the survey loop) and the
+same /result/<id> pages from MAX_WORKERS threads (like the detail pool),
+first with a new urllib connection per request, then through src.http_pool.
+
+Usage (from module_5/):
+
+    python -m benchmarks.bench_http_pool --pages 200 --details 800 --latency-ms 5
+"""
+import argparse
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from src.http_pool import HttpPool
+from benchmarks.standin_server import TOP_RESULT_ID, start_in_thread
+
+
+def _urlopen(url: str) -> str:
+    req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return resp.read().decode("utf-8", errors="ignore")
+
+
+def _timed(fetch, urls: list[str], workers: int) -> float:
+    t0 = time.perf_counter()
+    if workers == 1:
+        for u in urls:
+            fetch(u)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(fetch, urls))
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    """Run both fetchers over survey and detail URLs and print timings + pool stats."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--details", type=int, default=800)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    server = start_in_thread(latency_s=args.latency_ms / 1000)
+    base = server.base_url
+    survey = [f"{base}/survey/?page={p}" for p in range(1, args.pages + 1)]
+    details = [f"{base}/result/{TOP_RESULT_ID - i}" for i in range(args.details)]
+
+    try:
+        for label, urls, workers in (
+            ("survey (serial)", survey, 1),
+            (f"details ({args.workers} threads)", details, args.workers),
+        ):
+            pool = HttpPool(max_idle_per_host=args.workers * 2)
+            t_urlopen = _timed(_urlopen, urls, workers)
+            t_pool = _timed(pool.fetch_html, urls, workers)
+            s = pool.stats()
+            pool.close()
+            print(
+                f"{label:<22} urlopen={t_urlopen:.2f}s pool={t_pool:.2f}s "
+                f"speedup={t_urlopen / t_pool:.2f}x reuse_ratio={s['reuse_ratio']:.2f} "
+                f"bytes_wire={s['bytes_wire']} bytes_saved={s['bytes_saved']} "
+                f"({s['bytes_saved'] / max(s['bytes_decoded'], 1):.0%})"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
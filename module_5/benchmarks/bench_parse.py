@@ -0,0 +1,73 @@
+"""
+Benchmark and cross-check the HTML parser backends in src.parsers.
+
+Parses the same survey and /result/<id> pages with every backend, prints the
+per-page parse time of each, and counts pages where a backend's output differs
+from bs4 (the reference). Pages come from the stand-in generator by default,
+or from an HTML archive written by scrape_update (``--archive``), which is the
+check to run before switching a real crawl to ``--parser lxml``.
+
+Usage (from module_5/):
+
+    python -m benchmarks.bench_parse --pages 500
+    python -m benchmarks.bench_parse --archive html_archive
+"""
+import argparse
+import time
+
+from src import html_archive, parsers
+from src.http_cache import url_class
+from benchmarks.standin_server import TOP_RESULT_ID, result_html, survey_html
+
+_PARSE = {"survey": parsers.survey_rows, "result": parsers.page_lines}
+
+
+def _standin_pages(n: int) -> list[tuple[str, str]]:
+    pages = [("survey", survey_html(page)) for page in range(1, n + 1)]
+    pages += [("result", result_html(TOP_RESULT_ID - i)) for i in range(n)]
+    return pages
+
+
+def _archive_pages(root: str, limit: int) -> list[tuple[str, str]]:
+    entries = list(html_archive.latest_entries(root).values())[:limit]
+    return [(url_class(e["url"]), html_archive.read_entry(root, e)) for e in entries]
+
+
+def _time_backend(backend: str, pages: list[tuple[str, str]]) -> dict[str, list]:
+    """Parse every page once; per page class, the list of (seconds, output)."""
+    out: dict[str, list] = {"survey": [], "result": []}
+    for kind, html in pages:
+        t0 = time.perf_counter()
+        parsed = _PARSE[kind](html, backend)
+        out[kind].append((time.perf_counter() - t0, parsed))
+    return out
+
+
+def main() -> None:
+    """Parse the page set with each backend and print timings and mismatches."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--pages", type=int, default=500,
+                        help="stand-in pages per class, or max archived pages")
+    parser.add_argument("--archive", help="archive directory to read pages from")
+    args = parser.parse_args()
+
+    pages = _archive_pages(args.archive, args.pages) if args.archive else _standin_pages(args.pages)
+    results = {backend: _time_backend(backend, pages) for backend in parsers.BACKENDS}
+
+    for kind in ("survey", "result"):
+        reference = results["bs4"][kind]
+        if not reference:
+            continue
+        base_ms = 1000 * sum(t for t, _ in reference) / len(reference)
+        for backend in parsers.BACKENDS:
+            timed = results[backend][kind]
+            per_page_ms = 1000 * sum(t for t, _ in timed) / len(timed)
+            mismatches = sum(out != ref for (_, out), (_, ref) in zip(timed, reference))
+            print(
+                f"{kind:<6} {backend:<5} pages={len(timed)} per_page={per_page_ms:.3f}ms "
+                f"speedup={base_ms / per_page_ms:.1f}x mismatches={mismatches}"
+            )
+
+
+if __name__ == "__main__":
+    main()
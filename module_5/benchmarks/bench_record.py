@@ -0,0 +1,109 @@
+"""
+Memory and speed of ApplicantRecord against the dicts it replaces.
+
+Builds ``--rows`` applicant rows from stand-in survey and /result/<id> pages
+(parse, then merge the detail fields), then measures:
+
+- memory per row, with tracemalloc, of a list of raw rows and of cleaned rows,
+  held as ApplicantRecords and as dicts in the JSON schemas. Both forms share
+  the same text objects, so the difference is the container plus the numeric
+  fields (floats/ints in a record, text in a dict).
+- time per row of each stage: parse the survey page, merge the detail page,
+  clean, build the insert parameters; and of the dict <-> record conversions.
+
+Usage (from module_5/):
+
+    python -m benchmarks.bench_record --rows 20000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+import src.scrape_update as su
+from src import clean_update, load_update
+from src.applicant_record import ApplicantRecord
+from benchmarks.standin_server import ROWS_PER_PAGE, TOP_RESULT_ID, result_html, survey_html
+
+
+def _bytes_per_row(build, n: int) -> float:
+    """Traced bytes held by ``build()``'s result, per row."""
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    held = build()
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del held
+    return size / n
+
+
+def _per_row_us(fn, items) -> float:
+    t0 = time.perf_counter()
+    for item in items:
+        fn(item)
+    return 1e6 * (time.perf_counter() - t0) / len(items)
+
+
+def _build_rows(n: int) -> tuple[list[ApplicantRecord], float, float]:
+    """``n`` parsed rows with detail fields merged, and the two stages' us/row."""
+    pages = -(-n // ROWS_PER_PAGE)
+    htmls = [(survey_html(p), f"{su.BASE_URL}?page={p}") for p in range(1, pages + 1)]
+    t0 = time.perf_counter()
+    rows = [
+        r for html, url in htmls
+        for r in su._parse_survey_page(html, url)  # pylint: disable=protected-access
+    ][:n]
+    parse_us = 1e6 * (time.perf_counter() - t0) / len(rows)
+
+    details = [
+        su._parse_result_html(result_html(TOP_RESULT_ID - i % 500))  # pylint: disable=protected-access
+        for i in range(len(rows))
+    ]
+    t0 = time.perf_counter()
+    for rec, extra in zip(rows, details):
+        su._apply_detail(rec, extra)  # pylint: disable=protected-access
+    return rows, parse_us, 1e6 * (time.perf_counter() - t0) / len(rows)
+
+
+def main() -> None:  # pylint: disable=too-many-locals
+    """Print memory per row and time per row and stage."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--rows", type=int, default=20_000, help="applicant rows to build")
+    args = parser.parse_args()
+
+    rows, parse_us, detail_us = _build_rows(args.rows)
+    n = len(rows)
+    raw_dicts = [dict(r) for r in rows]
+    cleaned = clean_update.clean_data(rows)
+    clean_dicts = [r.to_clean_dict() for r in cleaned]
+
+    print(f"rows={n}")
+    for label, as_dicts, as_records in (
+        ("raw", lambda: [dict(r) for r in rows],
+         lambda: [ApplicantRecord.from_dict(d) for d in raw_dicts]),
+        ("cleaned", lambda: [r.to_clean_dict() for r in cleaned],
+         lambda: [ApplicantRecord.from_dict(d) for d in clean_dicts]),
+    ):
+        dict_b, record_b = _bytes_per_row(as_dicts, n), _bytes_per_row(as_records, n)
+        print(
+            f"memory {label:<7} dict={dict_b:.0f}B/row record={record_b:.0f}B/row "
+            f"saved={1 - record_b / dict_b:.0%}"
+        )
+
+    stages = {
+        "parse": parse_us,
+        "detail": detail_us,
+        "clean": _per_row_us(clean_update.clean_record, rows),
+        "clean(dict in)": _per_row_us(clean_update.clean_record, raw_dicts),
+        "row_params": _per_row_us(load_update.row_params, cleaned),
+        "row_params(dict in)": _per_row_us(load_update.row_params, clean_dicts),
+        "from_dict": _per_row_us(ApplicantRecord.from_dict, raw_dicts),
+        "to_dict": _per_row_us(dict, rows),
+    }
+    for name, us in stages.items():
+        print(f"stage {name:<20} {us:8.2f}us/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Scratch Postgres schema for the benchmarks that need a database.
+
+``scratch_schema`` points every connection opened from then on, in this
+process and in the ones it starts, at a schema of its own (``PGOPTIONS``
+search_path) and drops that schema with everything in it on exit, so the
+real tables are never touched. ``create_applicants`` gives it an empty
+``applicants`` table holding only ``url``, enough for the scraper's dedup.
+"""
+import contextlib
+import os
+from collections.abc import Iterator
+
+from src.db import connect_db
+
+
+@contextlib.contextmanager
+def scratch_schema(schema: str) -> Iterator[None]:
+    """Route new connections to ``schema`` for the duration, then drop it."""
+    os.environ["PGOPTIONS"] = f"-c search_path={schema}"
+    try:
+        yield
+    finally:
+        with connect_db() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE;")
+
+
+def create_applicants(schema: str) -> None:
+    """Create ``schema`` if needed with a fresh, empty ``applicants`` table."""
+    with connect_db() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"CREATE SCHEMA IF NOT EXISTS {schema};")
+            cur.execute(f"DROP TABLE IF EXISTS {schema}.applicants;")
+            cur.execute(
+                f"CREATE TABLE {schema}.applicants (p_id BIGSERIAL PRIMARY KEY, url TEXT UNIQUE);"
+            )
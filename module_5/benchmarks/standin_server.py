@@ -0,0 +1,289 @@
+"""
+Local stand-in for thegradcafe.com used by the scraper benchmarks.
+
+Serves generated survey pages (``/survey/?page=N``) and detail pages
+(``/result/<id>``) shaped like the markup ``_parse_survey_page`` and
+``_parse_result_page`` expect, with a per-request latency so network wait
+dominates just as it does against the real site. Responses are keep-alive
+and gzip-compressed when the client asks for it. Ids above ``TOP_RESULT_ID``
+(and every ``gap_every``-th id, if set) are 404s, and the server counts the
+requests it answers.
+
+``Faults`` makes it misbehave like a loaded site, reproducibly for a given
+``seed``: latency drawn from a distribution (fixed, uniform, exponential or
+lognormal around ``latency_s``), a share of 503s, of 429s with
+``Retry-After``, of connections dropped without an answer, and of bodies
+trickled out slowly. With ``archive`` set, pages stored in a scraper HTML
+archive (``src.html_archive``) are served instead of generated ones where
+the archive has them, keyed by path and query.
+
+Point the scraper at it with ``scrape_update.BASE_URL = server.base_url +
+"/survey/"``; result links then stay on the stand-in's host.
+
+Usage (from module_5/):
+
+    python -m benchmarks.standin_server --port 8765 --latency-ms 50
+    python -m benchmarks.standin_server --latency lognormal --error-rate 0.02 \
+        --throttle-rate 0.01 --slow-body-rate 0.05 --seed 1
+"""
+import argparse
+import gzip
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src import html_archive
+
+ROWS_PER_PAGE = 20
+TOP_RESULT_ID = 1_000_000
+LATENCY_DISTS = ("fixed", "uniform", "exponential", "lognormal")
+SLOW_BODY_CHUNKS = 10
+
+
+@dataclass
+class Faults:  # pylint: disable=too-many-instance-attributes
+    """How the stand-in misbehaves; rates are shares of requests (0..1)."""
+
+    latency: str = "fixed"        # one of LATENCY_DISTS, around the server's latency_s
+    latency_sigma: float = 0.5    # lognormal shape (latency_s is the median)
+    error_rate: float = 0.0       # answered 503
+    throttle_rate: float = 0.0    # answered 429 with Retry-After: retry_after_s
+    retry_after_s: float = 1.0
+    reset_rate: float = 0.0       # connection closed without an answer
+    slow_body_rate: float = 0.0   # 200 body sent in SLOW_BODY_CHUNKS pieces over slow_body_s
+    slow_body_s: float = 1.0
+    seed: int | None = None
+
+
+def _exists(rid: int, gap_every: int = 0) -> bool:
+    """Ids above TOP_RESULT_ID are not posted yet; every gap_every-th id was removed."""
+    return rid <= TOP_RESULT_ID and not (gap_every and rid % gap_every == 0)
+
+
+def survey_html(page: int, rows_per_page: int = ROWS_PER_PAGE, gap_every: int = 0) -> str:
+    """Survey list page: newest ids first, one /result/<id> link per row."""
+    rows = []
+    for k in range(rows_per_page):
+        rid = TOP_RESULT_ID - (page - 1) * rows_per_page - k
+        if not _exists(rid, gap_every):
+            continue
+        rows.append(
+            "<tr>"
+            f"<td>Stand-in University {rid % 50}</td>"
+            f"<td>Program {rid % 17}</td>"
+            "<td>February 10, 2026</td>"
+            f"<td>{'Accepted' if rid % 2 else 'Rejected'} on 29 Jan</td>"
+            f"<td>Total comments Open options See More Report comment {rid}</td>"
+            f'<td><a href="/result/{rid}">See More</a></td>'
+            "</tr>"
+        )
+    return (
+        "<html><body><table>"
+        "<tr><th>School</th><th>Program</th><th>Added On</th><th>Decision</th><th></th></tr>"
+        + "".join(rows)
+        + "</table></body></html>"
+    )
+
+
+def _archived_pages(root: str) -> dict[str, str]:
+    """Latest archived page per "path?query" (e.g. "/survey/?page=2", "/result/7")."""
+    pages = {}
+    for url, entry in html_archive.latest_entries(root).items():
+        p = urlparse(url)
+        pages[p.path + (f"?{p.query}" if p.query else "")] = html_archive.read_entry(root, entry)
+    return pages
+
+
+def result_html(rid: int) -> str:
+    """Detail page as label/value lines, the way _parse_result_page reads them."""
+    fields = [
+        ("Degree Type", "PhD" if rid % 3 == 0 else "Masters"),
+        ("Degree's Country of Origin", "American" if rid % 2 else "International"),
+        ("Undergrad GPA", f"3.{rid % 100:02d}"),
+        ("GRE General:", str(300 + rid % 40)),
+        ("GRE Verbal:", str(140 + rid % 30)),
+        ("Analytical Writing:", f"{3 + rid % 3}.5"),
+        ("Notes", f"Stand-in note for result {rid}."),
+    ]
+    body = "".join(f"<dt>{label}</dt><dd>{value}</dd>" for label, value in fields)
+    return f"<html><body><h1>Result {rid}</h1><dl>{body}</dl></body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "StandinServer"
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Route /survey/ and /result/<id>; everything else is a 404."""
+        p = urlparse(self.path)
+        time.sleep(self.server.latency())
+        self.server.count(p.path)
+        rid = p.path[len("/result/"):]
+        gap_every = self.server.gap_every
+
+        fault = self.server.draw_fault()
+        if fault == "reset":
+            self.close_connection = True
+            return
+        if fault == "503":
+            self._send(503, "<html><body>Service Unavailable</body></html>")
+            return
+        if fault == "429":
+            self._send(429, "<html><body>Too Many Requests</body></html>",
+                       {"Retry-After": f"{self.server.faults.retry_after_s:g}"})
+            return
+
+        archived = self.server.archived.get(self.path)
+        if archived is not None:
+            self._send(200, archived)
+        elif p.path.rstrip("/") == "/survey":
+            page = int(parse_qs(p.query).get("page", ["1"])[0])
+            self._send(200, survey_html(page, self.server.rows_per_page, gap_every))
+        elif p.path.startswith("/result/") and rid.isdigit() and _exists(int(rid), gap_every):
+            self._send(200, result_html(int(rid)))
+        else:
+            self._send(404, "<html><body>Not Found</body></html>")
+
+    def _send(self, status: int, text: str, headers: dict[str, str] | None = None) -> None:
+        body = text.encode("utf-8")
+        self.send_response(status)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if status == 200 and self.server.draw_slow_body():
+            # Trickle the body out: the client waits on the read, not the connect
+            step = -(-len(body) // SLOW_BODY_CHUNKS)
+            for i in range(0, len(body), step):
+                time.sleep(self.server.faults.slow_body_s / SLOW_BODY_CHUNKS)
+                self.wfile.write(body[i:i + step])
+                self.wfile.flush()
+        else:
+            self.wfile.write(body)
+
+    def log_message(self, format, *_args):  # pylint: disable=redefined-builtin
+        """Keep benchmark output quiet."""
+
+
+class StandinServer(ThreadingHTTPServer):  # pylint: disable=too-many-instance-attributes
+    """Threaded HTTP server with a deep accept backlog for high-concurrency clients."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, address, latency_s: float = 0.05, rows_per_page: int = ROWS_PER_PAGE,
+        gap_every: int = 0, *, faults: Faults | None = None, archive: str | None = None,
+    ):
+        super().__init__(address, _Handler)
+        self.latency_s = latency_s
+        self.rows_per_page = rows_per_page
+        self.gap_every = gap_every
+        self.faults = faults or Faults()
+        if self.faults.latency not in LATENCY_DISTS:
+            raise ValueError(f"latency must be one of {LATENCY_DISTS}, not {self.faults.latency!r}")
+        self.archived = _archived_pages(archive) if archive else {}
+        self.requests = {"survey": 0, "result": 0}
+        self.injected = {"503": 0, "429": 0, "reset": 0, "slow_body": 0}
+        self._rng = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+
+    def count(self, path: str) -> None:
+        """Tally one request by page type."""
+        with self._lock:
+            self.requests["result" if path.startswith("/result/") else "survey"] += 1
+
+    def latency(self) -> float:
+        """Seconds to wait before answering, drawn from the configured distribution."""
+        dist, mean = self.faults.latency, self.latency_s
+        with self._lock:
+            if dist == "uniform":
+                return self._rng.uniform(0.0, 2 * mean)
+            if dist == "exponential":
+                return self._rng.expovariate(1 / mean) if mean > 0 else 0.0
+            if dist == "lognormal":
+                return mean * self._rng.lognormvariate(0.0, self.faults.latency_sigma)
+        return mean
+
+    def draw_fault(self) -> str | None:
+        """"reset", "503", "429" or None (answer normally), per the configured rates."""
+        f = self.faults
+        with self._lock:
+            u = self._rng.random()
+            for name, rate in (("reset", f.reset_rate), ("503", f.error_rate),
+                               ("429", f.throttle_rate)):
+                if u < rate:
+                    self.injected[name] += 1
+                    return name
+                u -= rate
+        return None
+
+    def draw_slow_body(self) -> bool:
+        """Whether this 200 response trickles its body out."""
+        with self._lock:
+            slow = self._rng.random() < self.faults.slow_body_rate
+            self.injected["slow_body"] += slow
+        return slow
+
+    @property
+    def base_url(self) -> str:
+        """Root URL of the running server, e.g. http://127.0.0.1:8765"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_in_thread(
+    latency_s: float = 0.05, port: int = 0, gap_every: int = 0,
+    faults: Faults | None = None, archive: str | None = None,
+) -> StandinServer:
+    """Start a server on 127.0.0.1 in a daemon thread; call .shutdown() when done."""
+    server = StandinServer(("127.0.0.1", port), latency_s=latency_s, gap_every=gap_every,
+                           faults=faults, archive=archive)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0,
+                        help="fixed latency, or the mean (median for lognormal)")
+    parser.add_argument("--latency", choices=LATENCY_DISTS, default="fixed")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share answered 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share answered 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 Retry-After seconds")
+    parser.add_argument("--reset-rate", type=float, default=0.0,
+                        help="share of connections dropped without an answer")
+    parser.add_argument("--slow-body-rate", type=float, default=0.0)
+    parser.add_argument("--slow-body-s", type=float, default=1.0)
+    parser.add_argument("--gap-every", type=int, default=0)
+    parser.add_argument("--archive", default=None,
+                        help="serve pages from this HTML archive directory where it has them")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    srv = StandinServer(
+        ("127.0.0.1", args.port), latency_s=args.latency_ms / 1000, gap_every=args.gap_every,
+        faults=Faults(
+            latency=args.latency, latency_sigma=args.latency_sigma, error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate, retry_after_s=args.retry_after,
+            reset_rate=args.reset_rate, slow_body_rate=args.slow_body_rate,
+            slow_body_s=args.slow_body_s, seed=args.seed,
+        ),
+        archive=args.archive,
+    )
+    print(f"[standin] serving on {srv.base_url} (latency={args.latency} {args.latency_ms}ms, "
+          f"{len(srv.archived)} archived pages) {srv.faults}")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
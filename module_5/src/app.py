@@ -16,16 +16,16 @@ interface remains responsive.
 """
 
 import os
-import re
-import subprocess
-import sys
 import threading
+import traceback
 from datetime import datetime
 from pathlib import Path
 
 from flask import Flask, render_template, redirect, url_for, flash, request, jsonify
 
+from src import scrape_update, update_stream
 from src.query_data import get_analysis_cards
+from src.run_metrics import load_report, prometheus_text
 
 # Cached analysis results + timestamp
 analysis_cache = []
@@ -48,25 +48,29 @@ def wants_json():
 job_lock = threading.Lock()
 job_running = False  # pylint: disable=invalid-name
 job_last_message = "No update run yet."  # pylint: disable=invalid-name
+# PipelineResult.to_dict() of the last successful run, served by /update-status
+job_last_result = None  # pylint: disable=invalid-name
 
 BASE_DIR = Path(__file__).resolve().parent  # .../module_4/src
 
 job_log_path = BASE_DIR / "update_job.log"
 
-SCRAPE_CMD = [sys.executable, "-m", "src.scrape_update"]
-CLEAN_CMD  = [sys.executable, "-m", "src.clean_update"]
-LOAD_CMD   = [sys.executable, "-m", "src.load_update"]
+# Metrics report of the last scrape (src.run_metrics), served by /scrape-metrics and /metrics
+metrics_path = BASE_DIR / "scrape_metrics.json"
 
 
 def run_update_pipeline():   # pylint: disable=global-statement
     """
-    Executes the scrape → clean → load pipeline as subprocesses.
+    Executes the scrape → clean → load pipeline in this process.
 
-    Output from each stage is written to a log file.
+    The stages run as one streaming pass (src.update_stream) on the calling
+    thread with a fresh scrape_update.RunState; their output and any traceback
+    go to the log file (not the process's stdout), and the PipelineResult is
+    kept in ``job_last_result``.
     While running, global job state is updated so the UI can prevent
     overlapping update requests.
     """
-    global job_running, job_last_message  # pylint: disable=global-statement
+    global job_running, job_last_message, job_last_result  # pylint: disable=global-statement
 
     # Prevent concurrent runs
     with job_lock:
@@ -78,31 +82,22 @@ def run_update_pipeline():   # pylint: disable=global-statement
 
     try:
         with job_log_path.open("a", encoding="utf-8") as log:
+            state = scrape_update.RunState(log=log, metrics_json=str(metrics_path))
+            try:
+                result = update_stream.run(state=state)
+            except Exception:
+                traceback.print_exc(file=log)
+                raise
+
+        job_last_result = result.to_dict()
+        job_last_message = (
+            f"✅ Update completed successfully. Inserted {result.inserted} new rows."
+        )
+        if result.failures:
+            job_last_message += f" {len(result.failures)} detail pages failed."
 
-            def run_one(cmd, label):
-                """Run a pipeline stage and log its output."""
-                print(f"\n--- {label}: {' '.join(cmd)} ---\n", file=log, flush=True)
-                subprocess.run(cmd, stdout=log, stderr=log, text=True, check=True)
-
-            run_one(SCRAPE_CMD, "SCRAPE")
-            run_one(CLEAN_CMD, "CLEAN")
-            run_one(LOAD_CMD, "LOAD")
-
-            # Parse inserted row count from log output
-            log.flush()
-            text = job_log_path.read_text(encoding="utf-8", errors="replace")
-            m = re.search(r"Inserted\s+(\d+)\s+new rows", text)
-            inserted = int(m.group(1)) if m else None
-
-        if inserted is None:
-            job_last_message = "✅ Update completed successfully."
-        else:
-            job_last_message = f"✅ Update completed successfully. Inserted {inserted} new rows."
-
-    except subprocess.CalledProcessError:
-        job_last_message = "❌ Update failed. Check update_job.log."
     except Exception as e:   # pylint: disable=broad-exception-caught
-        job_last_message = f"❌ Update crashed: {e}"
+        job_last_message = f"❌ Update failed: {e}. Check update_job.log."
     finally:
         with job_lock:
             job_running = False
@@ -189,6 +184,30 @@ def update_analysis():  # pylint: disable=global-statement
 
 
 
+@app.route("/update-status")
+def update_status():
+    """State of the update job and the PipelineResult of the last run, as JSON."""
+    return jsonify(running=job_running, message=job_last_message, result=job_last_result)
+
+
+@app.route("/scrape-metrics")
+def scrape_metrics():
+    """Metrics report of the last scrape run, as JSON."""
+    report = load_report(str(metrics_path))
+    if report is None:
+        return jsonify(error="no scrape run has written metrics yet"), 404
+    return jsonify(report)
+
+
+@app.route("/metrics")
+def metrics():
+    """The same report in Prometheus text format, for dashboards."""
+    report = load_report(str(metrics_path))
+    if report is None:
+        return "", 404
+    return prometheus_text(report), 200, {"Content-Type": "text/plain; version=0.0.4"}
+
+
 def create_app():
     """Application factory for testing."""
     return app
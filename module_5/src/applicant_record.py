@@ -0,0 +1,302 @@
+"""
+Compact record for one GradCafe applicant, shared by the update stages.
+
+``scrape_update._parse_survey_page`` creates an ``ApplicantRecord`` per
+survey row, the crawl merges detail fields into it, ``clean_update`` returns
+a cleaned one and ``load_update`` builds its insert parameters from it. The
+class has ``__slots__``, so there is no per-record ``__dict__``, and numeric
+fields are typed: ``gpa`` and ``gre_aw`` are floats; ``gre_total``,
+``gre_v`` and ``start_year`` are ints; ``is_international`` is a bool. A
+record takes less than half the memory of the 20-key dict it replaces (see
+``benchmarks/bench_record.py``).
+
+Each field has one name in both stages. The JSON files keep their current
+schemas: ``dict(rec)`` or ``to_dict()`` gives the raw scrape schema
+(``program_name_raw``, ``gpa``, ``is_international``), and ``to_clean_dict()``
+gives the cleaned schema (``program``, ``GPA``, ``US/International``).
+Typed fields are written back as the value they were read from: a GPA read
+as ``"3.5"`` is written as ``"3.5"``, a start year of ``"Fall 2026"`` (which
+is not an int, so ``start_year`` is None) stays ``"Fall 2026"``, and an
+unknown ``US/International`` label is kept. ``from_dict`` reads either schema.
+
+Records also read and write like those dicts: ``rec["GPA"] = "3.40"`` stores
+``3.4`` and ``rec["gpa"]`` is ``"3.40"``, ``get``/``in`` accept both schemas'
+key names, and keys neither schema has are kept alongside the fields. ``in``
+and ``dict(rec)`` cover the keys that were assigned, like the survey dicts,
+which had no ``detail_error`` until the detail page was tried. Code written
+against the dict schema therefore works on records unchanged. New code should
+use the typed attributes.
+"""
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
+from typing import Any, Iterator
+
+# Raw (scrape) JSON key -> field, in the scrape schema's order
+RAW_KEYS = {
+    "program_name_raw": "program",
+    "university_raw": "university",
+    "comments": "comments",
+    "date_posted": "date_posted",
+    "entry_url": "entry_url",
+    "applicant_status": "applicant_status",
+    "accepted_date": "accepted_date",
+    "rejected_date": "rejected_date",
+    "start_term": "start_term",
+    "start_year": "start_year",
+    "is_international": "is_international",
+    "gre_total": "gre_total",
+    "gre_v": "gre_v",
+    "gre_aw": "gre_aw",
+    "degree_level": "degree_level",
+    "degree": "degree",
+    "gpa": "gpa",
+    "source_url": "source_url",
+    "scraped_at": "scraped_at",
+    "detail_error": "detail_error",
+}
+
+# Cleaned JSON key -> field, in clean_update's output order
+CLEAN_KEYS = {
+    "program": "program",
+    "university": "university",
+    "comments": "comments",
+    "date_posted": "date_posted",
+    "entry_url": "entry_url",
+    "applicant_status": "applicant_status",
+    "accepted_date": "accepted_date",
+    "rejected_date": "rejected_date",
+    "start_term": "start_term",
+    "start_year": "start_year",
+    "US/International": "is_international",
+    "gre_total": "gre_total",
+    "gre_v": "gre_v",
+    "gre_aw": "gre_aw",
+    "degree_level": "degree_level",
+    "degree": "degree",
+    "GPA": "gpa",
+    "source_url": "source_url",
+    "scraped_at": "scraped_at",
+}
+
+_ALIASES = {**CLEAN_KEYS, **RAW_KEYS}
+_LABEL_KEY = "US/International"  # the one key whose text differs from the raw value
+# One bit per field in ApplicantRecord._set
+_BIT = {name: 1 << i for i, name in enumerate(RAW_KEYS.values())}
+_ALL = (1 << len(_BIT)) - 1
+
+
+def to_float(v: Any) -> float | None:
+    """Float from a number or numeric text; None when missing or not a number."""
+    if v is None or isinstance(v, bool):
+        return None
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_int(v: Any) -> int | None:
+    """Int from a number or integer text ("330", "330.0"); None otherwise."""
+    f = to_float(v)
+    return int(f) if f is not None and f.is_integer() else None
+
+
+def to_bool(v: Any) -> bool | None:
+    """is_international from a bool, "true"/"false" or an "International"/"American" label."""
+    if v is None or isinstance(v, bool):
+        return v
+    t = str(v).strip().lower()
+    if t in ("true", "international"):
+        return True
+    if t in ("false", "american"):
+        return False
+    return None
+
+
+def international_label(v: bool | None) -> str | None:
+    """The cleaned schema's "US/International" text."""
+    return None if v is None else ("International" if v else "American")
+
+
+def _float_text(v: float | None, places: int) -> str | None:
+    if v is None:
+        return None
+    text = f"{v:.{places}f}"
+    return text if float(text) == v else repr(v)
+
+
+_TO_VALUE = {
+    "start_year": to_int,
+    "is_international": to_bool,
+    "gre_total": to_int,
+    "gre_v": to_int,
+    "gre_aw": to_float,
+    "gpa": to_float,
+}
+
+# Text written for a typed value when the record holds no original text for it
+_TO_TEXT = {
+    "start_year": lambda v: None if v is None else str(v),
+    "gre_total": lambda v: None if v is None else str(v),
+    "gre_v": lambda v: None if v is None else str(v),
+    "gre_aw": lambda v: _float_text(v, 1),
+    "gpa": lambda v: _float_text(v, 2),
+}
+
+
+def _key_info(key: str) -> tuple:
+    """(field, its _set bit, to value, to text, the key its original text is kept under)."""
+    name = _ALIASES[key]
+    if key == _LABEL_KEY:
+        return name, _BIT[name], to_bool, international_label, key
+    return name, _BIT[name], _TO_VALUE.get(name), _TO_TEXT.get(name, lambda v: v), name
+
+
+# Everything dict-style access needs about a key, in one lookup
+_KEYS = {key: _key_info(key) for key in _ALIASES}
+
+
+@dataclass(slots=True)
+class ApplicantRecord:  # pylint: disable=too-many-instance-attributes
+    """One applicant row; see the module docstring."""
+
+    program: str | None = None
+    university: str | None = None
+    comments: str | None = None
+    date_posted: str | None = None
+    entry_url: str | None = None
+    applicant_status: str | None = None
+    accepted_date: str | None = None
+    rejected_date: str | None = None
+    start_term: str | None = None
+    start_year: int | None = None
+    is_international: bool | None = None
+    gre_total: int | None = None
+    gre_v: int | None = None
+    gre_aw: float | None = None
+    degree_level: str | None = None
+    degree: str | None = None
+    gpa: float | None = None
+    source_url: str | None = None
+    scraped_at: str | None = None
+    detail_error: str | None = None
+    # Values of typed fields that their text does not reproduce ("3.5", "Fall 2026"),
+    # keys neither schema has, and the fields assigned so far (for ``in``)
+    _text: dict | None = field(default=None, init=False, repr=False)
+    _extra: dict | None = field(default=None, init=False, repr=False)
+    _set: int = field(default=_ALL, init=False, repr=False)
+
+    # ----- conversion -----
+    @classmethod
+    def from_dict(cls, d: Mapping) -> "ApplicantRecord":
+        """Record from a raw or cleaned schema dict, with its keys and nothing else."""
+        rec = cls()
+        assigned = 0
+        for key, value in d.items():
+            info = _KEYS.get(key)
+            if info is None:
+                rec[key] = value
+                continue
+            # A dict with both names for a field: None does not replace the other's value
+            if value is None and assigned & info[1]:
+                continue
+            assigned |= info[1]
+            if info[2] is None:
+                setattr(rec, info[0], value)
+            else:
+                rec[key] = value
+        rec._set = assigned
+        return rec
+
+    @classmethod
+    def coerce(cls, rec: "Mapping | ApplicantRecord") -> "ApplicantRecord":
+        """``rec`` itself if it is a record, else ``from_dict(rec)``."""
+        return rec if isinstance(rec, cls) else cls.from_dict(rec)
+
+    def to_dict(self) -> dict:
+        """Every raw scrape schema key (None if never assigned), then any other keys."""
+        return {**{key: self[key] for key in RAW_KEYS}, **(self._extra or {})}
+
+    def to_clean_dict(self) -> dict:
+        """Cleaned schema (clean_update's OUTPUT_JSON)."""
+        return {key: self[key] for key in CLEAN_KEYS}
+
+    # ----- dict-schema access -----
+    def __getitem__(self, key: str) -> Any:
+        """The field as the dict schema holds it; a field never assigned reads None."""
+        info = _KEYS.get(key)
+        if info is None:
+            if self._extra is not None and key in self._extra:
+                return self._extra[key]
+            raise KeyError(key)
+        name, _, convert, to_text, text_key = info
+        value = getattr(self, name)
+        if convert is None:
+            return value
+        if self._text is not None and text_key in self._text:
+            original = self._text[text_key]
+            if convert(original) == value:  # still the value it was read as
+                return original
+        return to_text(value)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        info = _KEYS.get(key)
+        if info is None:
+            # e.g. a field added to RESULT_EXTRACTOR that the schemas do not have yet
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+            return
+        name, bit, convert, to_text, text_key = info
+        self._set |= bit
+        if convert is None:
+            setattr(self, name, value)
+            return
+        typed = convert(value)
+        setattr(self, name, typed)
+        if value is not None:
+            canonical = to_text(typed)
+            if value is not canonical and (type(value) is not type(canonical)
+                                           or value != canonical):
+                if self._text is None:
+                    self._text = {}
+                self._text[text_key] = value
+                return
+        if self._text is not None:
+            self._text.pop(text_key, None)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        info = _KEYS.get(key)
+        if info is None:
+            del self._extra[key]
+            return
+        name, bit, _, _, text_key = info
+        setattr(self, name, None)
+        self._set &= ~bit
+        if self._text is not None:
+            self._text.pop(text_key, None)
+
+    def __contains__(self, key: object) -> bool:
+        info = _KEYS.get(key)
+        if info is None:
+            return self._extra is not None and key in self._extra
+        return bool(self._set & info[1]) or getattr(self, info[0]) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def keys(self) -> list[str]:
+        """Assigned raw schema keys, then any other keys, so ``dict(rec)`` is the raw dict."""
+        return [key for key in RAW_KEYS if key in self] + list(self._extra or ())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """``rec[key]``, or ``default`` for a key the record does not have."""
+        return self[key] if key in self else default
+
+
+FIELDS = tuple(f.name for f in fields(ApplicantRecord) if f.init)
@@ -0,0 +1,421 @@
+"""
+Asyncio fetch engine for GradCafe detail pages.
+
+All requests run on a single event loop. A semaphore bounds how many are in
+flight, so hundreds of /result/<id> pages can be fetched at once without one
+thread per request. Finished connections are kept alive and reused by the
+next request to the same host (``ConnectionPool``). Each URL has its own
+deadline, and Ctrl-C cancels every pending request before the interrupt
+reaches the caller.
+
+Only plain HTTP/1.1 GET is needed here, so the client is a small reader built
+on ``asyncio.open_connection`` rather than an extra dependency.
+"""
+import asyncio
+import ssl
+import time
+from collections.abc import Callable, Iterable
+from typing import TextIO
+from urllib.parse import urljoin, urlparse
+
+from src.http_pool import DECODE_ERRORS, decode_body, detect_charset
+from src.rate_control import AdaptiveController, parse_retry_after
+from src.retry_policy import CircuitBreaker, RetryBudget, backoff_delay
+
+# -----------------------------
+# Defaults (scrape_update passes its own values)
+# -----------------------------
+USER_AGENT = "Mozilla/5.0"
+TIMEOUT_S = 30
+RETRIES = 3
+BACKOFF_S = 0.5
+BACKOFF_CAP_S = 30.0
+MISSING_STATUSES = {404, 410}  # not retried
+MAX_IN_FLIGHT = 200
+DEADLINE_S = 60
+MAX_REDIRECTS = 5
+
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+_SSL_CONTEXT: ssl.SSLContext | None = None
+
+# observe(url, seconds, status, html) after each attempt; status None: no HTTP answer
+Observer = Callable[[str, float, int | None, str | None], None]
+# on_headers(url, headers) before on_result of a fetched page (lower-case names)
+HeadersCallback = Callable[[str, dict[str, str]], None]
+
+
+class AsyncFetchError(Exception):
+    """Raised when a response is unusable (HTTP error status, bad reply, redirect loop)."""
+
+    def __init__(
+        self, url: str, message: str, status: int | None = None, retry_after: float | None = None
+    ):
+        super().__init__(f"{message} ({url})")
+        self.url = url
+        self.status = status
+        self.retry_after = retry_after
+
+
+# -----------------------------
+# Helpers: HTTP/1.1 over asyncio streams
+# -----------------------------
+def _ssl_context() -> ssl.SSLContext:
+    """Create the default TLS context once and reuse it for every connection."""
+    global _SSL_CONTEXT  # pylint: disable=global-statement
+    if _SSL_CONTEXT is None:
+        _SSL_CONTEXT = ssl.create_default_context()
+    return _SSL_CONTEXT
+
+
+def _connection_args(url: str) -> tuple[str, int, ssl.SSLContext | None, str]:
+    """Split a URL into (host, port, ssl_context, request_target)."""
+    p = urlparse(url)
+    if p.scheme not in ("http", "https") or not p.hostname:
+        raise AsyncFetchError(url, "unsupported URL")
+
+    secure = p.scheme == "https"
+    port = p.port or (443 if secure else 80)
+    target = p.path or "/"
+    if p.query:
+        target = f"{target}?{p.query}"
+    return p.hostname, port, (_ssl_context() if secure else None), target
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    """Read a ``Transfer-Encoding: chunked`` body."""
+    chunks: list[bytes] = []
+    while True:
+        size_line = await reader.readline()
+        size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+        if size == 0:
+            # Skip optional trailer headers up to the blank line
+            while (await reader.readline()).strip():
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)  # CRLF after each chunk
+
+
+async def _read_response(
+    url: str, reader: asyncio.StreamReader
+) -> tuple[int, dict[str, str], bytes]:
+    """Read status line, headers and body from an HTTP/1.x response."""
+    parts = (await reader.readline()).decode("latin-1").split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+        raise AsyncFetchError(url, "malformed status line")
+    status = int(parts[1])
+
+    headers: dict[str, str] = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = await _read_chunked(reader)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    else:
+        body = await reader.read()
+    return status, headers, body
+
+
+def _reusable(headers: dict[str, str]) -> bool:
+    """Whether the connection may carry another request after this response."""
+    framed = "content-length" in headers or (
+        headers.get("transfer-encoding", "").lower() == "chunked"
+    )
+    return framed and headers.get("connection", "").lower() != "close"
+
+
+class ConnectionPool:
+    """
+    Idle keep-alive connections of one event loop, keyed by (host, port, TLS).
+
+    A connection is borrowed for one request and given back only after its
+    response was read in full, so two requests never share a socket.
+    """
+
+    def __init__(self, max_idle_per_host: int = MAX_IN_FLIGHT):
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: dict[tuple, list[tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self.opened = 0
+        self.reused = 0
+
+    async def acquire(self, host: str, port: int, ssl_ctx: ssl.SSLContext | None):
+        """(reader, writer, reused): an idle connection that is still open, else a new one."""
+        idle = self._idle.get((host, port, ssl_ctx is not None), [])
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                self.reused += 1
+                return reader, writer, True
+            writer.close()
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_ctx)
+        self.opened += 1
+        return reader, writer, False
+
+    def release(self, host: str, port: int, ssl_ctx: ssl.SSLContext | None,
+                conn: tuple[asyncio.StreamReader, asyncio.StreamWriter]) -> None:
+        """Keep a connection whose response was read in full for the next request."""
+        idle = self._idle.setdefault((host, port, ssl_ctx is not None), [])
+        if len(idle) < self.max_idle_per_host:
+            idle.append(conn)
+        else:
+            conn[1].close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+        self._idle.clear()
+
+
+async def _get(
+    url: str, user_agent: str, pool: ConnectionPool | None = None
+) -> tuple[int, dict[str, str], bytes]:
+    """
+    Issue one GET request and return the raw response: on a connection from
+    ``pool`` (kept alive for the next request), or on a fresh one closed after.
+    """
+    host, port, ssl_ctx, target = _connection_args(url)
+    request = (
+        f"GET {target} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        f"User-Agent: {user_agent}\r\n"
+        "Accept-Encoding: gzip, deflate\r\n"
+        f"Connection: {'close' if pool is None else 'keep-alive'}\r\n\r\n"
+    ).encode("latin-1")
+    # A reused connection may have been closed by the server while idle;
+    # drop it and try the next one (eventually a fresh connection).
+    while True:
+        if pool is None:
+            reader, writer = await asyncio.open_connection(host, port, ssl=ssl_ctx)
+            reused = False
+        else:
+            reader, writer, reused = await pool.acquire(host, port, ssl_ctx)
+        try:
+            writer.write(request)
+            await writer.drain()
+            status, headers, body = await _read_response(url, reader)
+        except (OSError, EOFError, AsyncFetchError):
+            writer.close()
+            if reused:
+                continue
+            raise
+        except BaseException:  # timeout or cancellation mid-response
+            writer.close()
+            raise
+        if pool is not None and _reusable(headers):
+            pool.release(host, port, ssl_ctx, (reader, writer))
+        else:
+            writer.close()
+        return status, headers, body
+
+
+async def fetch_html(
+    url: str,
+    timeout_s: float = TIMEOUT_S,
+    user_agent: str = USER_AGENT,
+    pool: ConnectionPool | None = None,
+) -> str:
+    """
+    Fetch a page and return its body as text, following redirects. With a
+    ``pool``, connections are kept alive and reused.
+
+    Raises AsyncFetchError for HTTP error statuses and undecodable bodies,
+    plus the usual socket errors and ``TimeoutError`` when one attempt takes
+    longer than ``timeout_s``.
+    """
+    return (await fetch_page(url, timeout_s, user_agent, pool))[0]
+
+
+async def fetch_page(
+    url: str,
+    timeout_s: float = TIMEOUT_S,
+    user_agent: str = USER_AGENT,
+    pool: ConnectionPool | None = None,
+) -> tuple[str, dict[str, str]]:
+    """``fetch_html``, plus the final response's headers (lower-case names)."""
+    for _ in range(MAX_REDIRECTS + 1):
+        status, headers, body = await asyncio.wait_for(_get(url, user_agent, pool), timeout_s)
+        if status in _REDIRECT_STATUSES and headers.get("location"):
+            url = urljoin(url, headers["location"])
+            continue
+        if status >= 400:
+            raise AsyncFetchError(url, f"HTTP Error {status}", status,
+                                  parse_retry_after(headers.get("retry-after")))
+        encoding = headers.get("content-encoding")
+        try:
+            body = decode_body(body, encoding)
+        except DECODE_ERRORS as e:
+            raise AsyncFetchError(url, f"undecodable {encoding} body: {e}") from e
+        text = body.decode(detect_charset(headers.get("content-type"), body), errors="ignore")
+        return text, headers
+    raise AsyncFetchError(url, "too many redirects")
+
+
+# -----------------------------
+# Bounded-concurrency driver
+# -----------------------------
+async def _fetch_with_retries(  # pylint: disable=too-many-arguments,too-many-locals,too-many-branches
+    url: str,
+    *,
+    retries: int,
+    backoff_s: float,
+    backoff_cap_s: float,
+    timeout_s: float,
+    user_agent: str,
+    budget: RetryBudget | None,
+    breaker: CircuitBreaker | None,
+    observe: Observer | None = None,
+    pool: ConnectionPool | None = None,
+    controller: AdaptiveController | None = None,
+    log: TextIO | None = None,
+) -> tuple[str, dict[str, str]]:
+    """
+    (page, headers) of ``url``, mirroring scrape_update._fetch_page: every
+    attempt takes a ``controller`` slot (token bucket, AIMD limit, Retry-After
+    pauses) and reports back to it; full-jitter exponential backoff between
+    attempts, retries only while ``budget`` allows, every attempt held back
+    while ``breaker`` is open.
+    Raises the last error once retries are used up.
+    """
+    if budget is not None:
+        budget.on_request()
+    for attempt in range(1, retries + 1):
+        while breaker is not None and (wait := breaker.delay()) > 0:
+            await asyncio.sleep(wait)
+        if controller is not None:
+            await controller.acquire_async()
+        t0 = time.perf_counter()
+        try:
+            html, headers = await fetch_page(url, timeout_s, user_agent, pool)
+        except (AsyncFetchError, OSError, EOFError, ValueError) as e:
+            status = getattr(e, "status", None)
+            elapsed = time.perf_counter() - t0
+            if controller is not None:
+                controller.release(elapsed, status, getattr(e, "retry_after", None))
+            if observe is not None:
+                observe(url, elapsed, status, None)
+            missing = status in MISSING_STATUSES
+            if breaker is not None:
+                breaker.record(missing)
+            print(f"[fetch fail {attempt}/{retries}] {url} :: {e}", file=log)
+            if missing or attempt == retries or (budget is not None and not budget.try_spend()):
+                raise
+            await asyncio.sleep(backoff_delay(attempt, backoff_s, backoff_cap_s))
+        except BaseException:  # cancelled (deadline, Ctrl-C): give the slot back
+            if controller is not None:
+                controller.release(time.perf_counter() - t0, None)
+            raise
+        else:
+            elapsed = time.perf_counter() - t0
+            if controller is not None:
+                controller.release(elapsed, 200)
+            if observe is not None:
+                observe(url, elapsed, 200, html)
+            if breaker is not None:
+                breaker.record(True)
+            return html, headers
+    raise AsyncFetchError(url, "no attempts")
+
+
+async def _run(  # pylint: disable=too-many-arguments
+    urls: list[str],
+    on_result: Callable[[str, str | None, BaseException | None], None],
+    *,
+    max_in_flight: int,
+    deadline_s: float,
+    on_headers: HeadersCallback | None = None,
+    **retry,
+) -> None:
+    sem = asyncio.Semaphore(max_in_flight)
+    pool = ConnectionPool(max_idle_per_host=max_in_flight)
+
+    async def one(url: str) -> None:
+        # The deadline starts once a slot is acquired, so queued URLs
+        # do not time out while waiting their turn.
+        async with sem:
+            try:
+                html, headers = await asyncio.wait_for(
+                    _fetch_with_retries(url, pool=pool, **retry), deadline_s
+                )
+            except (TimeoutError, AsyncFetchError, OSError, EOFError, ValueError) as e:
+                on_result(url, None, e)
+                return
+        if on_headers is not None:
+            on_headers(url, headers)
+        on_result(url, html, None)
+
+    try:
+        await asyncio.gather(*(one(u) for u in urls))
+    finally:
+        pool.close()
+
+
+def fetch_all(  # pylint: disable=too-many-arguments
+    urls: Iterable[str],
+    on_result: Callable[[str, str | None, BaseException | None], None],
+    *,
+    max_in_flight: int = MAX_IN_FLIGHT,
+    deadline_s: float = DEADLINE_S,
+    retries: int = RETRIES,
+    backoff_s: float = BACKOFF_S,
+    backoff_cap_s: float = BACKOFF_CAP_S,
+    timeout_s: float = TIMEOUT_S,
+    user_agent: str = USER_AGENT,
+    budget: RetryBudget | None = None,
+    breaker: CircuitBreaker | None = None,
+    observe: Observer | None = None,
+    controller: AdaptiveController | None = None,
+    on_headers: HeadersCallback | None = None,
+    log: TextIO | None = None,
+) -> None:
+    """
+    Fetch every URL on one event loop and report each outcome via ``on_result``.
+
+    ``on_result(url, html, error)`` is called from the loop as each URL finishes:
+      - html is the page text, or None if the URL failed
+      - error is None on success, otherwise the last fetch error
+        (``AsyncFetchError``, a network error, or ``TimeoutError`` when the
+        per-URL deadline expired)
+
+    ``budget`` and ``breaker`` (src.retry_policy) may be shared with threaded
+    fetchers; without them every URL gets all its retries. ``observe`` is
+    told the latency and outcome of every attempt (scrape_update's run metrics).
+    With a ``controller`` (src.rate_control), shared with the threaded
+    fetchers, it paces every attempt and caps how many of the
+    ``max_in_flight`` coroutines are actually on the wire. ``on_headers`` gets
+    each fetched page's response headers (ETag, Last-Modified for a cache).
+    Failed attempts are reported to ``log`` (stdout when None).
+
+    Ctrl-C cancels all in-flight requests (closing their sockets) and then
+    re-raises KeyboardInterrupt so the caller can checkpoint.
+    """
+    try:
+        asyncio.run(
+            _run(
+                list(urls),
+                on_result,
+                max_in_flight=max_in_flight,
+                deadline_s=deadline_s,
+                retries=retries,
+                backoff_s=backoff_s,
+                backoff_cap_s=backoff_cap_s,
+                timeout_s=timeout_s,
+                user_agent=user_agent,
+                budget=budget,
+                breaker=breaker,
+                observe=observe,
+                controller=controller,
+                on_headers=on_headers,
+                log=log,
+            )
+        )
+    except KeyboardInterrupt:
+        print("[async] Ctrl-C received; pending detail requests cancelled", file=log)
+        raise
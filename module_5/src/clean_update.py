@@ -3,18 +3,39 @@ Clean and normalize newly scraped GradCafe applicant records.
 
 This module processes raw update data scraped from GradCafe, standardizes
 fields (dates, GPA/GRE values, terms, degrees), removes malformed entries,
-and writes a cleaned JSON dataset suitable for database insertion.
+and writes a cleaned JSON dataset suitable for database insertion. Cleaned
+rows are ``ApplicantRecord``s (src.applicant_record) with typed GPA/GRE
+fields; the JSON file keeps the cleaned dict schema and the cleaned text.
 
 It is part of the module_5 update pipeline and is designed to be deterministic,
 idempotent, and safe to re-run.
+
+Large inputs (a full backfill) can be cleaned across processes: clean_data
+splits the records into chunks of ``chunk_size`` and cleans them in a process
+pool, merging the chunks back in input order, so the output is the same for
+any worker count.
+
+Usage (from module_5/):
+
+    python -m src.clean_update [--workers N]
 """
 
+import argparse
 import json
+import os
 import re
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+from src.applicant_record import CLEAN_KEYS, ApplicantRecord
 
 INPUT_JSON = "applicant_data_update.json"
 OUTPUT_JSON = "cleaned_applicant_data_update.json"  # raw data is never overwritten
 
+# Batch cleaning: records per process-pool task, and the command line's default pool size
+CHUNK_SIZE = 2_000
+WORKERS = os.cpu_count() or 1
+
 
 # -------------------------------------------------------------------
 # Term normalization helpers
@@ -47,6 +68,27 @@ _MONTH_TO_TERM = {
 }
 
 
+# -------------------------------------------------------------------
+# Patterns (compiled once; every record runs through them)
+# -------------------------------------------------------------------
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+# Enrollment context that must be present before a term/year is inferred
+_CONTEXT_RE = re.compile(
+    r"(start|starting|begins?|beginning|program begins|term|"
+    r"semester|matriculat|enroll|enrollment|cohort)",
+    re.I,
+)
+_SEASON_YEAR_RE = re.compile(r"\b(spring|summer|fall|autumn|winter)\b\W*(20\d{2})\b", re.I)
+_MONTH_PAT = (
+    r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|"
+    r"jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:t)?(?:ember)?|"
+    r"oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+)
+_MONTH_YEAR_RE = re.compile(rf"\b{_MONTH_PAT}\b\W*(20\d{{2}})\b", re.I)
+
+
 # -------------------------------------------------------------------
 # Text normalization utilities
 # -------------------------------------------------------------------
@@ -60,10 +102,10 @@ def _clean_text(s: str | None) -> str | None:
         return None
 
     # Remove HTML fragments that may remain after scraping
-    s = re.sub(r"<[^>]+>", "", s)
+    s = _TAG_RE.sub("", s)
 
     # Collapse repeated whitespace into single spaces
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _SPACE_RE.sub(" ", s).strip()
 
     return s if s else None
 
@@ -134,27 +176,18 @@ def _extract_start_term_year(*texts: str | None) -> tuple[str | None, str | None
         return None, None
 
     # Only search if enrollment context is present
-    ctx_pat = (
-        r"(start|starting|begins?|beginning|program begins|term|"
-        r"semester|matriculat|enroll|enrollment|cohort)"
-    )
-    if not re.search(ctx_pat, hay, flags=re.I):
+    if not _CONTEXT_RE.search(hay):
         return None, None
 
     # Season + year pattern
-    m = re.search(r"\b(spring|summer|fall|autumn|winter)\b\W*(20\d{2})\b", hay, flags=re.I)
+    m = _SEASON_YEAR_RE.search(hay)
     if m:
         season = m.group(1).lower()
         year = m.group(2)
         return _TERM_ALIASES.get(season), year
 
     # Month + year pattern fallback
-    month_pat = (
-        r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|"
-        r"jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:t)?(?:ember)?|"
-        r"oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
-    )
-    my = re.search(rf"\b{month_pat}\b\W*(20\d{{2}})\b", hay, flags=re.I)
+    my = _MONTH_YEAR_RE.search(hay)
     if my:
         month = my.group(1).lower()
         year = my.group(2)
@@ -166,107 +199,106 @@ def _extract_start_term_year(*texts: str | None) -> tuple[str | None, str | None
 # -------------------------------------------------------------------
 # Core cleaning pipeline
 # -------------------------------------------------------------------
-def clean_data(records: list[dict]) -> list[dict]:  # pylint: disable=too-many-locals
+# Stable output schema guarantees downstream compatibility
+REQUIRED_KEYS = list(CLEAN_KEYS)
+
+
+def clean_data(
+    records: list[Mapping], workers: int = 1, chunk_size: int = CHUNK_SIZE
+) -> list[ApplicantRecord]:
     """
     Transform raw scraped records into normalized output rows.
 
     Each record is cleaned, standardized, and validated against a fixed schema.
+    Rows are ApplicantRecords; ``to_clean_dict()`` gives the JSON schema.
+
+    With ``workers`` > 1 and more than ``chunk_size`` records, chunks of
+    ``chunk_size`` records are cleaned in a pool of ``workers`` processes.
+    The rows come back in input order, the same as a single-process run.
     """
-    cleaned: list[dict] = []
-
-    # Stable output schema guarantees downstream compatibility
-    required_keys = [
-        "program", "university", "comments",
-        "date_posted", "entry_url", "applicant_status",
-        "accepted_date", "rejected_date",
-        "start_term", "start_year",
-        "US/International",
-        "gre_total", "gre_v", "gre_aw",
-        "degree_level", "degree", "GPA",
-        "source_url", "scraped_at",
-    ]
+    if workers <= 1 or len(records) <= chunk_size:
+        return _clean_chunk(records)
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        # map() returns results in submission order, whichever chunk finishes first
+        return [row for rows in ex.map(_clean_chunk, chunks) for row in rows]
+
 
+def _clean_chunk(records: list[Mapping]) -> list[ApplicantRecord]:
+    """Process-pool task: clean one chunk of records."""
+    return [clean_record(r) for r in records]
+
+
+def iter_cleaned(records: Iterable[Mapping]) -> Iterator[ApplicantRecord]:
+    """
+    Streaming form of clean_data: clean each record as it arrives.
+
+    Holds one record at a time, so it can sit between ``iter_scraped`` and
+    the batched loader without buffering the run.
+    """
     for r in records:
+        yield clean_record(r)
+
+
+def clean_record(r: Mapping) -> ApplicantRecord:
+    """
+    Clean one raw scraped record into an output row (see clean_data).
 
-        # Core identity fields
-        program = _clean_text(r.get("program_name_raw") or r.get("program"))
-        university = _clean_text(r.get("university_raw") or r.get("university"))
-        comments = _clean_text(r.get("comments"))
-
-        # Scalar normalization
-        date_posted = _normalize_none(r.get("date_posted"))
-        entry_url = _normalize_none(r.get("entry_url"))
-        applicant_status = _normalize_none(r.get("applicant_status"))
-        accepted_date = _normalize_none(r.get("accepted_date"))
-        rejected_date = _normalize_none(r.get("rejected_date"))
-
-        start_term = _normalize_none(r.get("start_term"))
-        start_year = _normalize_none(r.get("start_year"))
-
-        gre_total = _normalize_none(r.get("gre_total"))
-        gre_v = _normalize_none(r.get("gre_v"))
-        gre_aw = _normalize_none(r.get("gre_aw"))
-
-        degree_level = _normalize_none(r.get("degree_level"))
-        degree = _normalize_none(r.get("degree"))
-
-        gpa_raw = r.get("gpa") if "gpa" in r else r.get("GPA")
-        gpa = _normalize_none(gpa_raw)
-
-        source_url = _normalize_none(r.get("source_url"))
-        scraped_at = _normalize_none(r.get("scraped_at"))
-
-        # International label conversion
-        usintl = _normalize_us_international(r.get("is_international"))
-
-        # Attempt start term/year inference when missing
-        if start_term is None or start_year is None:
-            term2, year2 = _extract_start_term_year(
-                comments, applicant_status, program, university
-            )
-            if start_term is None:
-                start_term = term2
-            if start_year is None:
-                start_year = year2
-
-        out = {
-            "program": program,
-            "university": university,
-            "comments": comments,
-            "date_posted": date_posted,
-            "entry_url": entry_url,
-            "applicant_status": applicant_status,
-            "accepted_date": accepted_date,
-            "rejected_date": rejected_date,
-            "start_term": start_term,
-            "start_year": start_year,
-            "US/International": usintl,
-            "gre_total": gre_total,
-            "gre_v": gre_v,
-            "gre_aw": gre_aw,
-            "degree_level": degree_level,
-            "degree": degree,
-            "GPA": gpa,
-            "source_url": source_url,
-            "scraped_at": scraped_at,
-        }
-
-        # Guarantee all schema fields exist
-        for k in required_keys:
-            out.setdefault(k, None)
-
-        cleaned.append(out)
-
-    return cleaned
+    ``r`` is an ApplicantRecord or a dict in either JSON schema. Typed
+    fields are cleaned as the text they were read from, so the output keeps
+    it (``"3.5"`` stays ``"3.5"``, ``"Fall 2026"`` stays a start year).
+    """
+    r = ApplicantRecord.coerce(r)
+
+    # Core identity fields
+    program = _clean_text(r.program)
+    university = _clean_text(r.university)
+    comments = _clean_text(r.comments)
+    applicant_status = _normalize_none(r.applicant_status)
+
+    start_term = _normalize_none(r.start_term)
+    start_year = _normalize_none(r["start_year"])
+
+    # Attempt start term/year inference when missing
+    if start_term is None or start_year is None:
+        term2, year2 = _extract_start_term_year(
+            comments, applicant_status, program, university
+        )
+        if start_term is None:
+            start_term = term2
+        if start_year is None:
+            start_year = year2
+
+    out = ApplicantRecord(
+        program=program,
+        university=university,
+        comments=comments,
+        date_posted=_normalize_none(r.date_posted),
+        entry_url=_normalize_none(r.entry_url),
+        applicant_status=applicant_status,
+        accepted_date=_normalize_none(r.accepted_date),
+        rejected_date=_normalize_none(r.rejected_date),
+        start_term=start_term,
+        degree_level=_normalize_none(r.degree_level),
+        degree=_normalize_none(r.degree),
+        source_url=_normalize_none(r.source_url),
+        scraped_at=_normalize_none(r.scraped_at),
+    )
+    # Typed fields go through the record's dict access, which keeps their text
+    out["start_year"] = start_year
+    out["US/International"] = _normalize_us_international(r["is_international"])
+    for key in ("gre_total", "gre_v", "gre_aw", "GPA"):
+        out[key] = _normalize_none(r[key])
+    return out
 
 
 # -------------------------------------------------------------------
 # File IO helpers
 # -------------------------------------------------------------------
-def save_data(records: list[dict], out_path: str = OUTPUT_JSON) -> None:
-    """Write cleaned records to disk."""
+def save_data(records: list[ApplicantRecord], out_path: str = OUTPUT_JSON) -> None:
+    """Write cleaned records to disk (cleaned JSON schema)."""
     with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(records, f, indent=2, ensure_ascii=False)
+        json.dump(records, f, indent=2, ensure_ascii=False, default=ApplicantRecord.to_clean_dict)
         f.write("\n")
 
 
@@ -292,8 +324,18 @@ def load_data(path: str = INPUT_JSON) -> list[dict]:
 # -------------------------------------------------------------------
 # Script entry point
 # -------------------------------------------------------------------
-if __name__ == "__main__":
+def main(argv: list[str] | None = None) -> list[ApplicantRecord]:
+    """Clean INPUT_JSON into OUTPUT_JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help=f"cleaning processes (default: {WORKERS}, one per CPU)")
+    args = parser.parse_args(argv)
     raw_records = load_data(INPUT_JSON)
-    cleaned_records = clean_data(raw_records)
+    cleaned_records = clean_data(raw_records, workers=args.workers)
     save_data(cleaned_records, OUTPUT_JSON)
     print(f"Cleaned {len(cleaned_records)} records -> {OUTPUT_JSON}")
+    return cleaned_records
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Postgres-backed crawl frontier shared by any number of scraper processes.
+
+Survey-page and result-page fetches are rows of a ``crawl_tasks`` table in the
+same database as ``applicants`` (``src.db.connect_db``). A worker claims a batch
+with ``SELECT ... FOR UPDATE SKIP LOCKED``, so concurrent workers on one host or
+several never block on, or double-claim, each other's rows. A claim is a lease:
+it carries the worker's id and an expiry, and a lease that runs out (the worker
+died or hung) is claimable again. Each task keeps its attempt count and last
+error; a task that fails ``max_attempts`` times is parked as ``failed``.
+
+Task URLs are unique, so a result page listed on two survey pages, or found by
+two workers, is enqueued once. ``payload`` carries the survey row a result task
+came from; ``result`` is what the worker reported back.
+"""
+from __future__ import annotations
+
+import os
+import socket
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from psycopg.types.json import Jsonb
+
+from src.db import TableHandle, connect_db
+
+# -----------------------------
+# Defaults
+# -----------------------------
+LEASE_S = 120.0
+MAX_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_tasks (
+    task_id BIGSERIAL PRIMARY KEY,
+    kind TEXT NOT NULL CHECK (kind IN ('survey', 'result')),
+    url TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'leased', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires TIMESTAMPTZ,
+    last_error TEXT,
+    payload JSONB,
+    result JSONB,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS crawl_tasks_claimable
+    ON crawl_tasks (task_id) WHERE status IN ('pending', 'leased');
+"""
+
+# Pending tasks, and leased tasks whose lease ran out (with attempts left),
+# oldest first. SKIP LOCKED passes over rows another worker's claim is
+# updating right now.
+_CLAIM = """
+UPDATE crawl_tasks t
+SET status = 'leased',
+    attempts = t.attempts + 1,
+    lease_owner = %(owner)s,
+    lease_expires = now() + make_interval(secs => %(lease_s)s),
+    updated_at = now()
+FROM (
+    SELECT task_id FROM crawl_tasks
+    WHERE kind = ANY(%(kinds)s)
+      AND (status = 'pending' OR (
+          status = 'leased' AND lease_expires < now() AND attempts < %(max_attempts)s
+      ))
+    ORDER BY task_id
+    LIMIT %(limit)s
+    FOR UPDATE SKIP LOCKED
+) c
+WHERE t.task_id = c.task_id
+RETURNING t.task_id, t.kind, t.url, t.attempts, t.payload;
+"""
+
+
+@dataclass(frozen=True)
+class CrawlTask:
+    """One claimed task."""
+
+    task_id: int
+    kind: str
+    url: str
+    attempts: int
+    payload: dict | None = None
+
+
+def default_worker_id() -> str:
+    """host:pid, unique among live workers."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class CrawlQueue(TableHandle):
+    """
+    One worker's handle on ``crawl_tasks`` (see ``TableHandle``).
+
+    ``complete`` and ``fail`` only touch a task while this worker still holds
+    its lease, so a worker whose lease expired cannot overwrite the result of
+    the worker that reclaimed the task.
+    """
+
+    TABLE = "crawl_tasks"
+    SCHEMA = _SCHEMA
+
+    def __init__(
+        self,
+        worker_id: str | None = None,
+        lease_s: float = LEASE_S,
+        max_attempts: int = MAX_ATTEMPTS,
+        connect: Callable[[], Any] = connect_db,
+    ):
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+        super().__init__(connect)
+
+    def enqueue(self, kind: str, items: Iterable[tuple[str, dict | None]]) -> int:
+        """
+        Add (url, payload) tasks of one kind; URLs already queued are skipped.
+
+        Returns:
+          number of tasks actually inserted
+        """
+        urls, payloads = [], []
+        for url, payload in items:
+            urls.append(url)
+            payloads.append(Jsonb(payload) if payload is not None else None)
+        if not urls:
+            return 0
+        rows = self._execute(
+            "INSERT INTO crawl_tasks (kind, url, payload) "
+            "SELECT %s, u, p FROM unnest(%s::text[], %s::jsonb[]) AS x(u, p) "
+            "ON CONFLICT (url) DO NOTHING RETURNING task_id;",
+            (kind, urls, payloads),
+        )
+        return len(rows)
+
+    def claim(
+        self, limit: int = 1, kinds: tuple[str, ...] = ("survey", "result")
+    ) -> list[CrawlTask]:
+        """Lease up to ``limit`` claimable tasks for this worker."""
+        rows = self._execute(
+            _CLAIM,
+            {"owner": self.worker_id, "lease_s": self.lease_s, "kinds": list(kinds),
+             "limit": limit, "max_attempts": self.max_attempts},
+        )
+        return sorted((CrawlTask(*row) for row in rows), key=lambda t: t.task_id)
+
+    def complete(self, task: CrawlTask, result: dict | None = None) -> bool:
+        """Report a task done; False if the lease was lost to another worker."""
+        rows = self._execute(
+            "UPDATE crawl_tasks SET status = 'done', result = %s, last_error = NULL, "
+            "lease_owner = NULL, lease_expires = NULL, updated_at = now() "
+            "WHERE task_id = %s AND status = 'leased' AND lease_owner = %s "
+            "RETURNING task_id;",
+            (Jsonb(result) if result is not None else None, task.task_id, self.worker_id),
+        )
+        return bool(rows)
+
+    def fail(self, task: CrawlTask, error: str) -> bool:
+        """
+        Release a task after an error: back to ``pending`` for another attempt,
+        or ``failed`` once it has used ``max_attempts``. False if the lease was lost.
+        """
+        rows = self._execute(
+            "UPDATE crawl_tasks SET "
+            "status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'pending' END, "
+            "last_error = %s, lease_owner = NULL, lease_expires = NULL, updated_at = now() "
+            "WHERE task_id = %s AND status = 'leased' AND lease_owner = %s "
+            "RETURNING task_id;",
+            (self.max_attempts, error[:500], task.task_id, self.worker_id),
+        )
+        return bool(rows)
+
+    def reap(self) -> int:
+        """Park expired leases that already used every attempt as ``failed``."""
+        rows = self._execute(
+            "UPDATE crawl_tasks SET status = 'failed', "
+            "last_error = COALESCE(last_error, 'lease expired'), updated_at = now() "
+            "WHERE status = 'leased' AND lease_expires < now() AND attempts >= %s "
+            "RETURNING task_id;",
+            (self.max_attempts,),
+        )
+        return len(rows)
+
+    def counts(self) -> dict[str, int]:
+        """Number of tasks per status."""
+        rows = self._execute("SELECT status, count(*) FROM crawl_tasks GROUP BY status;")
+        return {"pending": 0, "leased": 0, "done": 0, "failed": 0, **dict(rows)}
+
+    def results(self) -> list[tuple[dict | None, dict | None, str | None]]:
+        """(payload, result, last_error) of every finished result task, oldest first."""
+        return self._execute(
+            "SELECT payload, result, last_error FROM crawl_tasks "
+            "WHERE kind = 'result' AND status IN ('done', 'failed') ORDER BY task_id;"
+        )
+
+    def clear(self) -> None:
+        """Delete every task (start a new crawl)."""
+        self._execute("TRUNCATE crawl_tasks;")
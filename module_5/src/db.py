@@ -1,7 +1,8 @@
 """
 db.py
 
-Single source of truth for Postgres connection configuration.
+Single source of truth for Postgres connection configuration, and the base
+class of the handles on the crawl's own tables.
 
 Priority:
 1) If DATABASE_URL is set, use it (backward compatible for existing tests/dev).
@@ -11,9 +12,11 @@ Priority:
 from __future__ import annotations
 
 import os
+from collections.abc import Callable
 from typing import Any
 
 import psycopg
+import psycopg.errors
 
 
 def connect_db() -> psycopg.Connection[Any]:
@@ -41,3 +44,54 @@ def connect_db() -> psycopg.Connection[Any]:
         kwargs["password"] = password
 
     return psycopg.connect(**kwargs)
+
+
+class TableHandle:
+    """
+    Base of the handles on tables kept next to ``applicants`` (the crawl
+    queue, the failure ledger, the refresh schedule): one autocommit
+    connection from ``connect`` (``connect_db`` unless a test passes its
+    own), closed by ``close()`` or at the end of a ``with`` block.
+
+    Subclasses set ``TABLE`` and the DDL (``SCHEMA``) that creates it.
+    """
+
+    TABLE = ""
+    SCHEMA = ""
+
+    def __init__(self, connect: Callable[[], Any] = connect_db):
+        self._conn = connect()
+        self._conn.autocommit = True  # every statement is its own short transaction
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _execute(self, sql: str, params=None) -> list[tuple]:
+        with self._conn.cursor() as cur:
+            cur.execute(sql, params)
+            return cur.fetchall() if cur.description else []
+
+    def ensure_schema(self) -> None:
+        """
+        Create the handle's table if it does not exist yet.
+
+        ``CREATE TABLE IF NOT EXISTS`` needs CREATE on the schema even when
+        the table is there, so a role without it (see the README) may use a
+        table the database owner created.
+
+        Raises:
+          psycopg.errors.InsufficientPrivilege: the table is missing and
+          this role may not create it
+        """
+        try:
+            self._execute(self.SCHEMA)
+        except psycopg.errors.InsufficientPrivilege:
+            if self._execute("SELECT to_regclass(%s) IS NULL;", (self.TABLE,))[0][0]:
+                raise
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._conn.close()
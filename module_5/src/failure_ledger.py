@@ -0,0 +1,125 @@
+"""
+Persistent ledger of /result/<id> detail pages that could not be fetched.
+
+A crawl that gives up on a detail page still stores the row, with its detail
+fields None and ``detail_error`` set. The URL goes into the ``detail_failures``
+table next to ``applicants`` (``src.db.connect_db``), with the error class,
+the number of failed attempts and when it may be tried again. Each failure
+doubles the wait (``RETRY_BASE_S``, capped at ``RETRY_CAP_S``), so a page that
+is down for a day is not hammered.
+
+``scrape_update --repair`` re-fetches the URLs that are due and patches their
+rows in ``applicants``. A URL that has failed ``dead_after`` times, or that
+answered 404/410, is dead-lettered: repair leaves it alone and normal crawls
+do not fetch it.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from src.db import TableHandle, connect_db
+
+# -----------------------------
+# Defaults
+# -----------------------------
+DEAD_AFTER = 5              # failed attempts before a URL is dead-lettered
+RETRY_BASE_S = 3600.0       # wait before the first repair attempt
+RETRY_CAP_S = 7 * 86400.0
+DEAD_ERRORS = ("HTTP 404", "HTTP 410")  # the page is gone: dead-lettered at once
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS detail_failures (
+    url TEXT PRIMARY KEY,
+    error TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    first_failed TIMESTAMPTZ NOT NULL DEFAULT now(),
+    last_failed TIMESTAMPTZ NOT NULL DEFAULT now(),
+    next_retry TIMESTAMPTZ NOT NULL,
+    dead BOOLEAN NOT NULL DEFAULT false
+);
+"""
+
+# One row per URL; a URL seen again gets one more attempt and a longer wait.
+_RECORD = """
+INSERT INTO detail_failures AS f (url, error, next_retry, dead)
+SELECT u, e, now() + make_interval(secs => %(base_s)s), d OR %(dead_after)s <= 1
+FROM unnest(%(urls)s::text[], %(errors)s::text[], %(dead)s::boolean[]) AS x(u, e, d)
+ON CONFLICT (url) DO UPDATE SET
+    error = EXCLUDED.error,
+    attempts = f.attempts + 1,
+    last_failed = now(),
+    next_retry = now() + make_interval(
+        secs => LEAST(%(cap_s)s, %(base_s)s * power(2, f.attempts))
+    ),
+    dead = f.dead OR EXCLUDED.dead OR f.attempts + 1 >= %(dead_after)s
+RETURNING dead;
+"""
+
+
+class FailureLedger(TableHandle):
+    """Handle on ``detail_failures`` (see ``TableHandle``)."""
+
+    TABLE = "detail_failures"
+    SCHEMA = _SCHEMA
+
+    def __init__(
+        self,
+        dead_after: int = DEAD_AFTER,
+        retry_base_s: float = RETRY_BASE_S,
+        retry_cap_s: float = RETRY_CAP_S,
+        connect: Callable[[], Any] = connect_db,
+    ):
+        self.dead_after = dead_after
+        self.retry_base_s = retry_base_s
+        self.retry_cap_s = retry_cap_s
+        super().__init__(connect)
+
+    def record(self, failures: Iterable[tuple[str, str]]) -> tuple[int, int]:
+        """
+        Count one more failed attempt for each (url, error class).
+
+        Returns:
+          (URLs recorded, how many of them are now dead-lettered)
+        """
+        latest = dict(failures)  # a URL may fail twice in one run; one row each
+        if not latest:
+            return 0, 0
+        rows = self._execute(
+            _RECORD,
+            {"urls": list(latest), "errors": list(latest.values()),
+             "dead": [e in DEAD_ERRORS for e in latest.values()],
+             "base_s": self.retry_base_s, "cap_s": self.retry_cap_s,
+             "dead_after": self.dead_after},
+        )
+        return len(rows), sum(1 for (dead,) in rows if dead)
+
+    def resolve(self, urls: Iterable[str]) -> int:
+        """Forget URLs whose details were fetched after all."""
+        urls = list(urls)
+        if not urls:
+            return 0
+        rows = self._execute(
+            "DELETE FROM detail_failures WHERE url = ANY(%s) RETURNING url;", (urls,)
+        )
+        return len(rows)
+
+    def due(self, limit: int | None = None) -> list[tuple[str, int]]:
+        """(url, attempts) of live failures whose retry time has come, oldest first."""
+        return self._execute(
+            "SELECT url, attempts FROM detail_failures "
+            "WHERE NOT dead AND next_retry <= now() ORDER BY next_retry LIMIT %s;",
+            (limit,),
+        )
+
+    def dead_urls(self) -> set[str]:
+        """The dead-letter list."""
+        return {url for (url,) in self._execute("SELECT url FROM detail_failures WHERE dead;")}
+
+    def counts(self) -> dict[str, int]:
+        """Live (``pending``) and dead-lettered (``dead``) URLs."""
+        rows = self._execute(
+            "SELECT CASE WHEN dead THEN 'dead' ELSE 'pending' END, count(*) "
+            "FROM detail_failures GROUP BY 1;"
+        )
+        return {"pending": 0, "dead": 0, **dict(rows)}
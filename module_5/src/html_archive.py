@@ -0,0 +1,147 @@
+"""
+Append-only compressed archive of fetched HTML pages.
+
+Every page the scraper downloads can be written here so that parser fixes can
+be replayed over history without touching the network (see the ``--reparse``
+mode of ``scrape_update``).
+
+Layout of an archive directory:
+
+- ``seg-00001.gz`` (or ``.zst``): compressed segments. Each page is its own
+  gzip member / zstd frame, so a page can be read back with one seek.
+- ``index.jsonl``: one line per stored page with url, fetch time, segment,
+  byte offset, compressed length and a SHA-1 of the body.
+
+zstd is used when the optional ``zstandard`` package is installed, gzip
+otherwise. Pages identical to the latest stored copy of the same URL are not
+stored again.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+# -----------------------------
+# Defaults
+# -----------------------------
+INDEX_NAME = "index.jsonl"
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _zstd():
+    """The optional zstandard module, or None when it is not installed."""
+    try:
+        import zstandard  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return zstandard
+
+
+def default_codec() -> str:
+    """'zstd' if zstandard is importable, else 'gzip'."""
+    return "zstd" if _zstd() is not None else "gzip"
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return _zstd().ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return _zstd().ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def read_entry(root: str, entry: dict) -> str:
+    """
+    Read one archived page given its index entry.
+
+    A plain function (not a method) so process-pool workers can call it
+    with nothing but the archive path.
+    """
+    codec = "zstd" if entry["segment"].endswith(".zst") else "gzip"
+    with open(os.path.join(root, entry["segment"]), "rb") as f:
+        f.seek(entry["offset"])
+        data = f.read(entry["length"])
+    return _decompress(data, codec).decode("utf-8")
+
+
+def iter_index(root: str):
+    """Yield every index entry in the order pages were stored."""
+    path = os.path.join(root, INDEX_NAME)
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def latest_entries(root: str) -> dict[str, dict]:
+    """Most recent index entry per URL."""
+    latest: dict[str, dict] = {}
+    for entry in iter_index(root):
+        latest[entry["url"]] = entry
+    return latest
+
+
+class HtmlArchive:  # pylint: disable=too-many-instance-attributes,too-few-public-methods
+    """Thread-safe writer for an archive directory."""
+
+    def __init__(self, root: str, codec: str | None = None,
+                 segment_max_bytes: int = SEGMENT_MAX_BYTES):
+        self.root = root
+        self.codec = codec or default_codec()
+        self.segment_max_bytes = segment_max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+        self._hashes = {e["url"]: e["sha1"] for e in iter_index(root)}
+        numbers = [
+            int(name[4:9]) for name in os.listdir(root)
+            if name.startswith("seg-") and name.endswith(_EXTENSIONS[self.codec])
+        ]
+        self._segment_no = max(numbers, default=1)
+        self.stored = 0
+        self.skipped = 0
+
+    def _segment_name(self) -> str:
+        return f"seg-{self._segment_no:05d}{_EXTENSIONS[self.codec]}"
+
+    def append(self, url: str, html: str, fetched_at: str | None = None) -> bool:
+        """Store a page; returns False if it equals the latest copy of this URL."""
+        body = html.encode("utf-8")
+        sha1 = hashlib.sha1(body).hexdigest()
+        with self._lock:
+            if self._hashes.get(url) == sha1:
+                self.skipped += 1
+                return False
+            blob = _compress(body, self.codec)
+            path = os.path.join(self.root, self._segment_name())
+            if os.path.exists(path) and os.path.getsize(path) >= self.segment_max_bytes:
+                self._segment_no += 1
+                path = os.path.join(self.root, self._segment_name())
+            with open(path, "ab") as f:
+                offset = f.tell()
+                f.write(blob)
+            entry = {
+                "url": url,
+                "fetched_at": fetched_at or datetime.now(timezone.utc).isoformat(),
+                "segment": self._segment_name(),
+                "offset": offset,
+                "length": len(blob),
+                "sha1": sha1,
+            }
+            with open(os.path.join(self.root, INDEX_NAME), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._hashes[url] = sha1
+            self.stored += 1
+        return True
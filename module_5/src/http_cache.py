@@ -0,0 +1,207 @@
+"""
+Persistent conditional HTTP cache for GradCafe pages.
+
+Responses are stored in a local SQLite file keyed by canonical URL, with
+zlib-compressed bodies and their ``ETag`` / ``Last-Modified`` validators.
+
+- Within the TTL of the URL's class (``result`` or ``survey``) a page is
+  served from disk with no request at all.
+- After the TTL it is revalidated with ``If-None-Match`` /
+  ``If-Modified-Since``; a ``304 Not Modified`` is answered from disk.
+- The total stored body size is capped, evicting least recently used pages.
+"""
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+# -----------------------------
+# Defaults
+# -----------------------------
+DEFAULT_PATH = "http_cache.sqlite3"
+MAX_BYTES = 512 * 1024 * 1024  # compressed bodies
+# /result/<id> pages almost never change once posted; survey listings gain new
+# rows all the time, so they are always revalidated (conditional request).
+TTL_S = {
+    "result": 30 * 24 * 3600,
+    "survey": 0,
+}
+COMPRESS_LEVEL = 6
+
+_RESULT_PATH_RE = re.compile(r"^/result/\d+$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access);
+"""
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL for use as a cache key (case, fragment, slash, query order)."""
+    p = urlparse(url.strip())
+    path = p.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(p.query, keep_blank_values=True)))
+    return urlunparse((p.scheme.lower(), p.netloc.lower(), path, "", query, ""))
+
+
+def url_class(url: str) -> str:
+    """'result' for /result/<id> detail pages, 'survey' for everything else."""
+    return "result" if _RESULT_PATH_RE.match(urlparse(url).path.rstrip("/")) else "survey"
+
+
+class HttpCache:  # pylint: disable=too-many-instance-attributes
+    """
+    Thread-safe on-disk page cache used in front of an HttpPool.
+
+    ``fetch_html(pool, url)`` is a drop-in replacement for ``pool.fetch_html(url)``.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_PATH,
+        max_bytes: int = MAX_BYTES,
+        ttl_s: dict[str, float] | None = None,
+        clock=time.time,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_s = {**TTL_S, **(ttl_s or {})}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        self._stats = {"fresh_hits": 0, "revalidated": 0, "misses": 0, "evictions": 0,
+                       "bytes_from_cache": 0}
+
+    # ---- lookups ----
+    def _row(self, key: str):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, body, stored_at FROM pages WHERE url = ?", (key,)
+            ).fetchone()
+            if row:
+                self._db.execute(
+                    "UPDATE pages SET last_access = ? WHERE url = ?", (self._clock(), key)
+                )
+                self._db.commit()
+        return row
+
+    def _fresh_text(self, url: str, row) -> str | None:
+        if row is None or self._clock() - row[3] >= self.ttl_s[url_class(url)]:
+            return None
+        text = zlib.decompress(row[2]).decode("utf-8")
+        self._count("fresh_hits", len(text))
+        return text
+
+    def fresh_text(self, url: str) -> str | None:
+        """Return the cached page if it is still within its class TTL, else None."""
+        return self._fresh_text(url, self._row(canonical_url(url)))
+
+    def fetch_html(self, pool, url: str, timeout: float | None = None) -> str:
+        """
+        Fresh cache hit, else a (conditional) GET through ``pool``.
+        A 304 refreshes the entry and returns the stored body.
+        """
+        key = canonical_url(url)
+        row = self._row(key)
+        fresh = self._fresh_text(url, row)
+        if fresh is not None:
+            return fresh
+        return self._get(pool, url, key, row, timeout)[0]
+
+    def revalidate(self, pool, url: str, timeout: float | None = None) -> tuple[str, bool]:
+        """
+        Conditional GET whatever the TTL (re-checking pages that may have been edited).
+
+        Returns:
+          (page, changed): changed is False when the server answered 304
+        """
+        key = canonical_url(url)
+        return self._get(pool, url, key, self._row(key), timeout)
+
+    def _get(self, pool, url: str, key: str, row, timeout: float | None) -> tuple[str, bool]:
+        headers = {}
+        if row and row[0]:
+            headers["If-None-Match"] = row[0]
+        if row and row[1]:
+            headers["If-Modified-Since"] = row[1]
+
+        resp = pool.get(url, timeout=timeout, headers=headers or None)
+        if resp.status == 304 and row:
+            with self._lock:
+                self._db.execute(
+                    "UPDATE pages SET stored_at = ?, etag = COALESCE(?, etag), "
+                    "last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                    (self._clock(), resp.headers.get("ETag"),
+                     resp.headers.get("Last-Modified"), key),
+                )
+                self._db.commit()
+            text = zlib.decompress(row[2]).decode("utf-8")
+            self._count("revalidated", len(text))
+            return text, False
+
+        text = resp.text
+        self._count("misses", 0)
+        if "no-store" not in (resp.headers.get("Cache-Control") or ""):
+            self.store(key, text, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return text, True
+
+    # ---- writes ----
+    def store(self, url: str, text: str, etag: str | None, last_modified: str | None) -> None:
+        """Insert or replace a page, then evict LRU pages beyond max_bytes."""
+        key = canonical_url(url)
+        body = zlib.compress(text.encode("utf-8"), COMPRESS_LEVEL)
+        now = self._clock()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM pages WHERE url = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, body, len(body), now, now),
+            )
+            self._total += len(body) - (old[0] if old else 0)
+            self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used pages until under max_bytes. Caller holds the lock."""
+        while self._total > self.max_bytes:
+            url, size = self._db.execute(
+                "SELECT url, size FROM pages ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self._total -= size
+            self._stats["evictions"] += 1
+
+    # ---- reporting ----
+    def _count(self, name: str, nbytes: int) -> None:
+        with self._lock:
+            self._stats[name] += 1
+            self._stats["bytes_from_cache"] += nbytes
+
+    def stats(self) -> dict:
+        """Hit/miss counters plus the number of pages and bytes on disk."""
+        with self._lock:
+            s = dict(self._stats)
+            s["pages"] = self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        s["bytes_on_disk"] = self._total
+        lookups = s["fresh_hits"] + s["revalidated"] + s["misses"]
+        hits = s["fresh_hits"] + s["revalidated"]
+        s["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        return s
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._db.close()
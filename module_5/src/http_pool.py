@@ -0,0 +1,231 @@
+"""
+Keep-alive HTTP connection pool for the GradCafe scraper.
+
+``urllib.request.urlopen`` opens a fresh TCP+TLS connection for every page and
+downloads uncompressed HTML. This module keeps idle ``http.client`` connections
+per host and reuses them across requests and threads. It asks for
+gzip/deflate transfer and decodes bodies using the response charset.
+
+Errors are raised as ``urllib.error.HTTPError`` / ``URLError`` so callers that
+were written against ``urlopen`` keep working unchanged.
+"""
+import gzip
+import http.client
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlparse
+
+USER_AGENT = "Mozilla/5.0"
+TIMEOUT_S = 30
+MAX_IDLE_PER_HOST = 16
+MAX_REDIRECTS = 5
+
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+_HEADER_CHARSET = re.compile(r"""charset=["']?([\w.:-]+)""", re.I)
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w.:-]+)""", re.I)
+
+# What decode_body raises for a corrupt or truncated gzip/deflate body
+DECODE_ERRORS = (zlib.error, EOFError, gzip.BadGzipFile)
+
+
+@dataclass
+class Response:
+    """A fully read HTTP response."""
+
+    url: str
+    status: int
+    headers: http.client.HTTPMessage
+    body: bytes
+
+    @property
+    def text(self) -> str:
+        """Body decoded with the charset from headers, a <meta> tag, or UTF-8."""
+        charset = detect_charset(self.headers.get("Content-Type"), self.body)
+        return self.body.decode(charset, errors="ignore")
+
+
+# -----------------------------
+# Helpers: content decoding
+# -----------------------------
+def decode_body(body: bytes, content_encoding: str | None) -> bytes:
+    """
+    Undo gzip/deflate transfer compression; identity bodies pass through.
+
+    Raises one of DECODE_ERRORS when the compressed body is corrupt or cut short.
+    """
+    enc = (content_encoding or "").strip().lower()
+    if enc in ("gzip", "x-gzip"):
+        return gzip.decompress(body)
+    if enc == "deflate":
+        # Servers disagree on zlib-wrapped vs raw deflate; accept both
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+def detect_charset(content_type: str | None, body: bytes) -> str:
+    """Pick the body charset: Content-Type header, then <meta charset>, else UTF-8."""
+    m = _HEADER_CHARSET.search(content_type or "")
+    if m:
+        charset = m.group(1)
+    else:
+        meta = _META_CHARSET.search(body[:2048])
+        charset = meta.group(1).decode("ascii") if meta else "utf-8"
+    try:
+        "".encode(charset)
+    except LookupError:
+        return "utf-8"
+    return charset
+
+
+# -----------------------------
+# Connection pool
+# -----------------------------
+class HttpPool:
+    """
+    Thread-safe pool of keep-alive connections keyed by (scheme, host, port).
+
+    Connections are borrowed for a single request and returned afterwards,
+    so concurrent threads never share a socket.
+    """
+
+    def __init__(
+        self,
+        user_agent: str = USER_AGENT,
+        timeout: float = TIMEOUT_S,
+        max_idle_per_host: int = MAX_IDLE_PER_HOST,
+    ):
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "connections_opened": 0,
+            "reused": 0,
+            "bytes_wire": 0,
+            "bytes_decoded": 0,
+        }
+
+    # ---- connection bookkeeping ----
+    def _acquire(self, key: tuple[str, str, int], timeout: float):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+            self._stats["connections_opened"] += 1
+
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=timeout), False
+
+    def _release(self, key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _request_once(self, url: str, timeout: float, headers: dict[str, str] | None) -> Response:
+        p = urlparse(url)
+        if p.scheme not in ("http", "https") or not p.hostname:
+            raise URLError(f"unsupported URL: {url}")
+        key = (p.scheme, p.hostname, p.port or (443 if p.scheme == "https" else 80))
+        target = (p.path or "/") + (f"?{p.query}" if p.query else "")
+        send_headers = {
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+            **(headers or {}),
+        }
+
+        # A reused connection may have been closed by the server while idle;
+        # drop it and try the next one (eventually a fresh connection).
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request("GET", target, headers=send_headers)
+                resp = conn.getresponse()
+                raw = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                conn.close()
+                if reused:
+                    continue
+                raise URLError(e) from e
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise URLError(e) from e
+            break
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+        # A body that will not decompress is a broken transfer: retryable
+        # like a dropped connection, not a crash of the caller.
+        encoding = resp.headers.get("Content-Encoding")
+        try:
+            body = decode_body(raw, encoding)
+        except DECODE_ERRORS as e:
+            raise URLError(f"undecodable {encoding} body: {e}") from e
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["reused"] += int(reused)
+            self._stats["bytes_wire"] += len(raw)
+            self._stats["bytes_decoded"] += len(body)
+        return Response(url=url, status=resp.status, headers=resp.headers, body=body)
+
+    # ---- public API ----
+    def get(
+        self, url: str, timeout: float | None = None, headers: dict[str, str] | None = None
+    ) -> Response:
+        """
+        GET a URL, following redirects.
+
+        Raises HTTPError for 4xx/5xx statuses and URLError for connection
+        problems, matching ``urllib.request.urlopen``.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        for _ in range(MAX_REDIRECTS + 1):
+            resp = self._request_once(url, timeout, headers)
+            location = resp.headers.get("Location")
+            if resp.status in _REDIRECT_STATUSES and location:
+                url = urljoin(url, location)
+                continue
+            if resp.status >= 400:
+                raise HTTPError(url, resp.status, http.client.responses.get(resp.status, ""),
+                                resp.headers, None)
+            return resp
+        raise URLError(f"too many redirects: {url}")
+
+    def fetch_html(self, url: str, timeout: float | None = None) -> str:
+        """GET a page and return its decoded text."""
+        return self.get(url, timeout=timeout).text
+
+    def stats(self) -> dict:
+        """Snapshot of pool counters plus reuse ratio and bytes saved by compression."""
+        with self._lock:
+            s = dict(self._stats)
+        s["reuse_ratio"] = round(s["reused"] / s["requests"], 4) if s["requests"] else 0.0
+        s["bytes_saved"] = s["bytes_decoded"] - s["bytes_wire"]
+        return s
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            conns = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for c in conns:
+            c.close()
@@ -6,15 +6,42 @@ while avoiding duplicates (typically by URL). It is part of the module_5 update
 pipeline used by the Flask app.
 """
 import json
+from collections.abc import Callable, Iterable
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
+from typing import Any, TextIO
 import psycopg  # pylint: disable=unused-import
+from src.applicant_record import ApplicantRecord
 from src.db import connect_db
 
 
 # Cleaned update dataset produced by clean_update.py
 CLEANED_UPDATE_PATH = Path("cleaned_applicant_data_update.json")
 
+# Rows per transaction in the streaming loader (load_batches)
+BATCH_SIZE = 200
+
+# Insert one cleaned record; duplicates (by URL) are ignored
+INSERT_SQL = """
+    INSERT INTO applicants (
+        program, university, comments, date_added, url,
+        status, term, us_or_international,
+        gpa, gre, gre_v, gre_aw,
+        degree, llm_generated_program, llm_generated_university
+    )
+    VALUES (
+        %(program)s, %(university)s, %(comments)s, %(date_added)s, %(url)s,
+        %(status)s, %(term)s, %(us_or_international)s,
+        %(gpa)s, %(gre)s, %(gre_v)s, %(gre_aw)s,
+        %(degree)s, %(llm_generated_program)s, %(llm_generated_university)s
+    )
+    ON CONFLICT (url) DO NOTHING;
+"""
+
+# INSERT_SQL returning one row per insert, so skipped duplicates are not counted
+INSERT_RETURNING_SQL = INSERT_SQL.replace("DO NOTHING;", "DO NOTHING\n    RETURNING url;")
+
 
 def parse_date(date_str):
     """
@@ -42,6 +69,90 @@ def safe_float(x):
         return None
 
 
+def term_value(entry):
+    """
+    Build the ``term`` column from start_term / start_year.
+    Returns None when neither is present.
+    """
+    term_part = entry.get("start_term")
+    year_part = entry.get("start_year")
+    if term_part and year_part:
+        return f"{term_part} {year_part}"
+    return term_part or year_part or None
+
+
+def _as_float(rec: ApplicantRecord, key: str) -> float | None:
+    """A typed int field as a float; text that is not an int ("330.5") is read like safe_float."""
+    value = getattr(rec, key)
+    return safe_float(rec[key]) if value is None else float(value)
+
+
+def row_params(entry):
+    """
+    INSERT_SQL parameters for one cleaned record (an ApplicantRecord, or a
+    dict in the cleaned JSON schema). Numerics come from its typed fields,
+    the term and US/International label from the text it was read with.
+    """
+    rec = ApplicantRecord.coerce(entry)
+    return {
+        "program": rec.program,
+        "university": rec.university,
+        "comments": rec.comments,
+        "date_added": parse_date(rec.date_posted),
+        "url": rec.entry_url,
+        "status": rec.applicant_status,
+        "term": term_value(rec),
+        "us_or_international": rec["US/International"],
+        "gpa": rec.gpa,
+        "gre": _as_float(rec, "gre_total"),
+        "gre_v": _as_float(rec, "gre_v"),
+        "gre_aw": rec.gre_aw,
+        "degree": rec.degree_level or rec.degree,
+
+        # No LLM processing for update records
+        "llm_generated_program": None,
+        "llm_generated_university": None,
+    }
+
+
+def _returned_rows(cur) -> int:
+    """Rows returned over every result set of ``executemany(..., returning=True)``."""
+    count = len(cur.fetchall())
+    while cur.nextset():
+        count += len(cur.fetchall())
+    return count
+
+
+def load_batches(
+    entries: Iterable[dict],
+    batch_size: int = BATCH_SIZE,
+    connect: Callable[[], Any] = connect_db,
+    log: TextIO | None = None,
+) -> int:
+    """
+    Streaming sink: insert cleaned records as they arrive, ``batch_size`` at a
+    time. Each batch is one pipelined ``executemany`` and one commit, so rows
+    reach the table while the crawl is still running and at most one batch
+    is held in memory. Inserts are counted from the rows each statement
+    returns (INSERT_RETURNING_SQL), not from the batch's ``rowcount``.
+    Each batch's line goes to ``log`` (stdout when None).
+
+    Returns:
+      number of rows inserted (duplicate URLs are not counted)
+    """
+    entries = iter(entries)
+    inserted = 0
+    with connect() as conn:
+        while batch := [row_params(e) for e in islice(entries, batch_size)]:
+            with conn.cursor() as cur:
+                cur.executemany(INSERT_RETURNING_SQL, batch, returning=True)
+                added = _returned_rows(cur)
+            conn.commit()
+            inserted += added
+            print(f"[load] batch of {len(batch)}: inserted {added} (total {inserted})", file=log)
+    return inserted
+
+
 def main():
     """
     Loads cleaned update records and inserts only new entries
@@ -68,60 +179,8 @@ def main():
 
             for entry in data:
 
-                # Build a valid term string only when meaningful data exists
-                term_part = entry.get("start_term")
-                year_part = entry.get("start_year")
-
-                term_value = None
-                if term_part and year_part:
-                    term_value = f"{term_part} {year_part}"
-                elif term_part:
-                    term_value = term_part
-                elif year_part:
-                    term_value = year_part
-
                 # Insert record; ignore duplicates based on URL
-                cur.execute(
-                    """
-                    INSERT INTO applicants (
-                        program, university, comments, date_added, url,
-                        status, term, us_or_international,
-                        gpa, gre, gre_v, gre_aw,
-                        degree, llm_generated_program, llm_generated_university
-                    )
-                    VALUES (
-                        %(program)s, %(university)s, %(comments)s, %(date_added)s, %(url)s,
-                        %(status)s, %(term)s, %(us_or_international)s,
-                        %(gpa)s, %(gre)s, %(gre_v)s, %(gre_aw)s,
-                        %(degree)s, %(llm_generated_program)s, %(llm_generated_university)s
-                    )
-                    ON CONFLICT (url) DO NOTHING;
-                    """,
-                    {
-                        "program": entry.get("program"),
-                        "university": entry.get("university"),
-                        "comments": entry.get("comments"),
-                        "date_added": parse_date(
-                            entry.get("date_posted")
-                        ),
-                        "url": entry.get("entry_url"),
-                        "status": entry.get("applicant_status"),
-                        "term": term_value,
-                        "us_or_international": entry.get(
-                            "US/International"
-                        ),
-                        "gpa": safe_float(entry.get("GPA")),
-                        "gre": safe_float(entry.get("gre_total")),
-                        "gre_v": safe_float(entry.get("gre_v")),
-                        "gre_aw": safe_float(entry.get("gre_aw")),
-                        "degree": entry.get("degree_level")
-                        or entry.get("degree"),
-
-                        # No LLM processing for update records
-                        "llm_generated_program": None,
-                        "llm_generated_university": None,
-                    },
-                )
+                cur.execute(INSERT_SQL, row_params(entry))
 
                 # Count only successful inserts
                 if cur.rowcount == 1:
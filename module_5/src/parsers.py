@@ -0,0 +1,130 @@
+"""
+Pluggable HTML parsing backends for the GradCafe scraper.
+
+The scraper only needs two things from a page:
+
+- survey pages: for every ``table tr`` row with at least 5 ``<td>`` cells, the
+  text of the first 5 cells and the ``href`` of every ``<a href>`` in the row
+- result pages: the page text as lines, like
+  ``soup.get_text("\\n", strip=True).splitlines()``
+
+``bs4`` (the default) builds a full ``BeautifulSoup(html, "html.parser")``
+tree. ``lxml`` uses libxml2 and XPath and copies bs4's text rules: comments,
+processing instructions and text inside ``script``/``style``/``template``/
+``rt``/``rp`` are skipped, and each text node is stripped and joined.
+
+For well-formed markup both backends return identical values. lxml hands a
+page to bs4 instead when it cannot match bs4 exactly: carriage returns (which
+libxml2 normalizes), NUL bytes, XML declarations and empty documents.
+Malformed markup (stray end tags, nested links, cells outside a table) is
+repaired differently by the two parsers, so ``benchmarks/bench_parse.py``
+counts mismatches over real archived pages before lxml is switched on.
+"""
+from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+
+BACKENDS = ("bs4", "lxml")
+
+# Strings bs4 stores as Script/Stylesheet/TemplateString/Ruby*String, which
+# get_text() leaves out
+_BS4_SKIPPED_CONTAINERS = {"script", "style", "template", "rt", "rp"}
+
+SurveyRow = tuple[list[str], list[str]]
+
+
+# -----------------------------
+# BeautifulSoup (reference)
+# -----------------------------
+def _bs4_survey_rows(html: str) -> list[SurveyRow]:
+    soup = BeautifulSoup(html, "html.parser")
+    rows: list[SurveyRow] = []
+    for row in soup.select("table tr"):
+        cols = row.find_all("td")
+        if len(cols) < 5:
+            continue
+        texts = [c.get_text(" ", strip=True) for c in cols[:5]]
+        hrefs = [a["href"] for a in row.find_all("a", href=True)]
+        rows.append((texts, hrefs))
+    return rows
+
+
+def _bs4_page_lines(html: str) -> list[str]:
+    return BeautifulSoup(html, "html.parser").get_text("\n", strip=True).splitlines()
+
+
+# -----------------------------
+# lxml
+# -----------------------------
+def _lxml_compatible(html: str) -> bool:
+    """False for inputs where libxml2 would not see the same characters as html.parser."""
+    return "\r" not in html and "\x00" not in html
+
+
+def _lxml_root(html: str):
+    """Parsed document, or None if lxml cannot take it (caller falls back to bs4)."""
+    try:
+        return lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def _lxml_strings(root):
+    """Text nodes under ``root`` in document order, following bs4's get_text rules."""
+    skip = 0
+    for event, node in etree.iterwalk(root, events=("start", "end", "comment", "pi")):
+        if event == "start":
+            if node.tag in _BS4_SKIPPED_CONTAINERS:
+                skip += 1
+            if not skip and node.text:
+                yield node.text
+        elif event == "end":
+            if node.tag in _BS4_SKIPPED_CONTAINERS:
+                skip -= 1
+            if not skip and node.tail and node is not root:
+                yield node.tail
+        elif not skip and node.tail:  # comment / pi: content skipped, tail is parent text
+            yield node.tail
+
+
+def _lxml_text(root, separator: str) -> str:
+    return separator.join(t for t in (s.strip() for s in _lxml_strings(root)) if t)
+
+
+def _lxml_survey_rows(html: str) -> list[SurveyRow]:
+    root = _lxml_root(html) if _lxml_compatible(html) else None
+    if root is None:
+        return _bs4_survey_rows(html)
+    rows: list[SurveyRow] = []
+    for row in root.xpath("//table//tr"):
+        cols = row.xpath(".//td")
+        if len(cols) < 5:
+            continue
+        texts = [_lxml_text(c, " ") for c in cols[:5]]
+        rows.append((texts, [str(h) for h in row.xpath(".//a/@href")]))
+    return rows
+
+
+def _lxml_page_lines(html: str) -> list[str]:
+    # Result pages are split into lines, so "\r" normalization cannot change them
+    root = _lxml_root(html) if "\x00" not in html else None
+    if root is None:
+        return _bs4_page_lines(html)
+    return _lxml_text(root, "\n").splitlines()
+
+
+# -----------------------------
+# Dispatch
+# -----------------------------
+_SURVEY = {"bs4": _bs4_survey_rows, "lxml": _lxml_survey_rows}
+_LINES = {"bs4": _bs4_page_lines, "lxml": _lxml_page_lines}
+
+
+def survey_rows(html: str, backend: str = "bs4") -> list[SurveyRow]:
+    """(first 5 cell texts, row hrefs) for every table row with at least 5 cells."""
+    return _SURVEY[backend](html)
+
+
+def page_lines(html: str, backend: str = "bs4") -> list[str]:
+    """Stripped, non-empty text lines of the whole page."""
+    return _LINES[backend](html)
@@ -0,0 +1,293 @@
+"""
+Adaptive request-rate controller for the GradCafe scraper.
+
+Replaces hand-tuned delays and worker counts with one shared budget:
+
+- a token bucket limits requests per second
+- an AIMD limit caps how many requests may be in flight at once
+
+While latency and error rate stay healthy, the controller adds a little rate
+and concurrency each round. On HTTP 429/5xx, network errors or rising latency
+it halves both. ``Retry-After`` pauses every caller until the server says it
+is fine to continue. A 404/410 is a healthy answer (the page does not exist).
+Every change is recorded so runs can be tuned afterwards.
+
+Threads take a slot with ``acquire``/``slot``; coroutines on an event loop
+use ``acquire_async``, which waits without blocking the loop.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# -----------------------------
+# Defaults
+# -----------------------------
+INITIAL_RATE = 20.0        # requests/second
+MIN_RATE = 0.5
+MAX_RATE = 100.0
+RATE_STEP = 1.0            # additive increase per healthy round
+INITIAL_CONCURRENCY = 8
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 32
+DECREASE_FACTOR = 0.5      # multiplicative decrease on errors
+LATENCY_FACTOR = 2.0       # "rising latency" = EWMA above baseline * factor
+LATENCY_ALPHA = 0.2        # EWMA smoothing
+ERROR_RATE_LIMIT = 0.05    # max error rate in the window to still count as healthy
+WINDOW = 50                # recent outcomes used for error rate
+WARMUP_SAMPLES = 5         # samples before latency baseline is trusted
+COOLDOWN_S = 2.0           # at most one decrease per cooldown
+MAX_RETRY_AFTER_S = 300.0
+MISSING_STATUSES = frozenset({404, 410})  # the page does not exist: not an error
+MAX_DECISIONS = 1000       # most recent decisions kept in memory (the log has all)
+ASYNC_POLL_S = 0.05        # acquire_async re-checks at least this often
+
+
+def parse_retry_after(value: str | None, now: datetime | None = None) -> float | None:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds to wait."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+class AdaptiveController:  # pylint: disable=too-many-instance-attributes
+    """
+    Thread-safe token bucket + AIMD concurrency limit shared by all fetchers.
+
+    Use ``with controller.slot() as done: ...; done(latency_s, status, retry_after)``
+    or call ``acquire()`` / ``release(...)`` directly.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        rate: float = INITIAL_RATE,
+        concurrency: int = INITIAL_CONCURRENCY,
+        min_rate: float = MIN_RATE,
+        max_rate: float = MAX_RATE,
+        min_concurrency: int = MIN_CONCURRENCY,
+        max_concurrency: int = MAX_CONCURRENCY,
+        decision_log: str | None = None,
+        clock=time.monotonic,
+    ):
+        self.rate = rate
+        self.concurrency = concurrency
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.decision_log = decision_log
+        self.decisions: deque[dict] = deque(maxlen=MAX_DECISIONS)
+        self._counts = {"increase": 0, "decrease": 0, "pause": 0}
+        self._unlogged: list[dict] = []
+        self._log_lock = threading.Lock()  # keeps log lines in order; not held with _cond
+
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._tokens = 1.0
+        self._last_refill = clock()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._outcomes: deque[bool] = deque(maxlen=WINDOW)
+        self._healthy_streak = 0
+        self._latency_ewma: float | None = None
+        self._latency_baseline: float | None = None
+        self._samples = 0
+
+    # ---- acquiring a slot ----
+    def _refill(self, now: float) -> None:
+        burst = max(1.0, self.rate)
+        self._tokens = min(burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _wait_time(self, now: float) -> float:
+        """Seconds until a request may start (0 means go now). Caller holds the lock."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= self.concurrency:
+            return 1.0  # woken early by release()
+        self._refill(now)
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) / self.rate
+
+    def _try_take(self) -> float:
+        """Take a slot and a token if both are free (0.0), else the seconds to wait."""
+        wait = self._wait_time(self._clock())
+        if wait <= 0:
+            self._tokens -= 1.0
+            self._in_flight += 1
+            return 0.0
+        return wait
+
+    def acquire(self) -> None:
+        """Block until both a concurrency slot and a rate token are available."""
+        with self._cond:
+            while (wait := self._try_take()) > 0:
+                self._cond.wait(wait)
+
+    async def acquire_async(self) -> None:
+        """
+        ``acquire`` for a coroutine: sleeps on the event loop, never blocks it.
+        Report the request with ``release`` as usual.
+        """
+        while True:
+            with self._cond:
+                wait = self._try_take()
+            if wait <= 0:
+                return
+            await asyncio.sleep(min(wait, ASYNC_POLL_S))
+
+    def release(
+        self, latency_s: float, status: int | None, retry_after: float | None = None
+    ) -> None:
+        """
+        Report how a request went and adjust the budget.
+
+        ``status`` is the HTTP status, or None for network errors/timeouts.
+        """
+        with self._cond:
+            self._in_flight -= 1
+            now = self._clock()
+            throttled = status == 429 or (status is not None and status >= 500)
+            ok = status is not None and (status < 400 or status in MISSING_STATUSES)
+
+            if retry_after is not None and (throttled or status == 503):
+                pause = min(retry_after, MAX_RETRY_AFTER_S)
+                self._paused_until = max(self._paused_until, now + pause)
+                self._record("pause", f"Retry-After {pause:.1f}s (HTTP {status})")
+
+            self._outcomes.append(ok)
+            if ok:
+                self._observe_latency(latency_s)
+
+            if throttled or status is None:
+                self._decrease(now, f"HTTP {status}" if status else "network error/timeout")
+            elif self._latency_rising():
+                self._decrease(
+                    now,
+                    f"latency {self._latency_ewma:.3f}s > "
+                    f"{LATENCY_FACTOR}x baseline {self._latency_baseline:.3f}s",
+                )
+            elif ok:
+                self._healthy_streak += 1
+                # One "round" = as many healthy responses as requests allowed in flight
+                healthy = self.error_rate() <= ERROR_RATE_LIMIT
+                if self._healthy_streak >= self.concurrency and healthy:
+                    self._increase()
+            self._cond.notify_all()
+        self._write_log()
+
+    @contextmanager
+    def slot(self):
+        """
+        Context manager around one request; call the yielded function with
+        (latency_s, status, retry_after). A slot released without a report
+        counts as a network error.
+        """
+        self.acquire()
+        reported = []
+
+        def done(latency_s: float, status: int | None, retry_after: float | None = None):
+            reported.append(True)
+            self.release(latency_s, status, retry_after)
+
+        try:
+            yield done
+        finally:
+            if not reported:
+                self.release(0.0, None)
+
+    # ---- AIMD ----
+    def _observe_latency(self, latency_s: float) -> None:
+        self._samples += 1
+        if self._latency_ewma is None:
+            self._latency_ewma = latency_s
+        else:
+            self._latency_ewma += LATENCY_ALPHA * (latency_s - self._latency_ewma)
+        if self._samples >= WARMUP_SAMPLES and (
+            self._latency_baseline is None or self._latency_ewma < self._latency_baseline
+        ):
+            self._latency_baseline = self._latency_ewma
+
+    def _latency_rising(self) -> bool:
+        return (
+            self._latency_baseline is not None
+            and self._latency_ewma is not None
+            and self._latency_ewma > self._latency_baseline * LATENCY_FACTOR
+        )
+
+    def _increase(self) -> None:
+        self._healthy_streak = 0
+        new_rate = min(self.max_rate, self.rate + RATE_STEP)
+        new_conc = min(self.max_concurrency, self.concurrency + 1)
+        if (new_rate, new_conc) != (self.rate, self.concurrency):
+            self.rate, self.concurrency = new_rate, new_conc
+            self._record("increase", "healthy round")
+
+    def _decrease(self, now: float, reason: str) -> None:
+        self._healthy_streak = 0
+        if now - self._last_decrease < COOLDOWN_S:
+            return
+        self._last_decrease = now
+        self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+        self.concurrency = max(self.min_concurrency, int(self.concurrency * DECREASE_FACTOR))
+        if self._latency_rising():
+            # The new, lower load level defines what "normal" latency is
+            self._latency_baseline = self._latency_ewma
+        self._record("decrease", reason)
+
+    # ---- reporting ----
+    def error_rate(self) -> float:
+        """Share of failed requests among the most recent WINDOW outcomes."""
+        if not self._outcomes:
+            return 0.0
+        return 1.0 - sum(self._outcomes) / len(self._outcomes)
+
+    def _record(self, action: str, reason: str) -> None:
+        decision = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "action": action,
+            "reason": reason,
+            "rate": round(self.rate, 3),
+            "concurrency": self.concurrency,
+            "latency_ewma_s": None if self._latency_ewma is None else round(self._latency_ewma, 4),
+            "error_rate": round(self.error_rate(), 4),
+        }
+        self.decisions.append(decision)
+        self._counts[action] += 1
+        if self.decision_log:
+            self._unlogged.append(decision)  # written by _write_log, after the lock
+
+    def _write_log(self) -> None:
+        """Append the decisions recorded since the last call to ``decision_log``."""
+        if not self.decision_log:
+            return
+        with self._log_lock:
+            with self._cond:
+                pending, self._unlogged = self._unlogged, []
+            if pending:
+                with open(self.decision_log, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(d) + "\n" for d in pending)
+
+    def summary(self) -> str:
+        """One-line state summary for run logs."""
+        counts = self._counts
+        return (
+            f"rate={self.rate:.1f}/s concurrency={self.concurrency} "
+            f"increases={counts['increase']} decreases={counts['decrease']} "
+            f"pauses={counts['pause']} error_rate={self.error_rate():.3f}"
+        )
@@ -0,0 +1,212 @@
+"""
+Append-only NDJSON journal of scraped records.
+
+Instead of rewriting the whole output JSON at every checkpoint, the scraper
+appends one line per change and folds the journal into the final JSON once,
+at the end of the run (``compact``):
+
+- ``{"op": "add", "i": <index>, "rec": {...}}``: a newly found record
+- ``{"op": "detail", "i": <index>, "fields": {...}}``: fields merged into
+  record ``i`` after its /result/<id> page was parsed
+- ``{"op": "state", "state": {...}}``: the writer's crawl position (page
+  cursor, pending work); only the last one counts
+
+Each record and each detail enrichment is written exactly once, so
+checkpoint I/O grows linearly with the run. ``commit()`` (called at chunk
+boundaries) flushes and, by default, fsyncs. With ``compress=True`` the
+journal is a gzip stream; every commit is a zlib sync point, so everything
+committed can be read back even if the process dies before the gzip member is
+closed. A torn last line from a crash is dropped when the journal is replayed
+and cut off before the journal is appended to again.
+"""
+import gzip
+import json
+import os
+import threading
+import zlib
+
+GZIP_LEVEL = 6
+_READ_BLOCK = 4096
+
+
+def _inflate_member(data: bytes) -> tuple[bytes, bool, bytes]:
+    """
+    Decompress one gzip member from the start of ``data``.
+
+    Returns:
+      (output, complete, bytes after the member); a corrupt member yields
+      everything up to the damaged byte
+    """
+    d = zlib.decompressobj(wbits=31)
+    out = []
+    for start in range(0, len(data), _READ_BLOCK):
+        block = data[start:start + _READ_BLOCK]
+        saved = d.copy()
+        try:
+            out.append(d.decompress(block))
+        except zlib.error:
+            # Redo this block byte by byte to keep the output before the damage
+            d = saved
+            for k in range(len(block)):
+                try:
+                    out.append(d.decompress(block[k:k + 1]))
+                except zlib.error:
+                    break
+            return b"".join(out), False, b""
+        if d.eof:
+            return b"".join(out), True, d.unused_data + data[start + _READ_BLOCK:]
+    return b"".join(out), False, b""
+
+
+def _read_text(path: str) -> tuple[str, bool]:
+    """
+    Decoded journal text, stopping at the first damaged or unfinished gzip member.
+
+    Returns:
+      (text, intact) where ``intact`` is False when gzip data was left unread
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if not path.endswith(".gz"):
+        return data.decode("utf-8", errors="replace"), True
+    out = []
+    complete = True
+    while data and complete:
+        # A member still open (writer died) gives back what was sync-flushed
+        text, complete, data = _inflate_member(data)
+        out.append(text)
+    return b"".join(out).decode("utf-8", errors="replace"), complete
+
+
+def read_ops(path: str) -> tuple[list[dict], bool]:
+    """
+    Parse a journal into its operations.
+
+    Returns:
+      (ops, clean) where ``clean`` is False when a damaged tail was dropped
+    """
+    if not os.path.exists(path):
+        return [], True
+    text, intact = _read_text(path)
+    ops: list[dict] = []
+    lines = text.split("\n")
+    # A complete journal ends with "\n", so the last piece is empty
+    clean = intact and lines[-1] == ""
+    for line in lines[:-1]:
+        try:
+            ops.append(json.loads(line))
+        except json.JSONDecodeError:
+            clean = False
+            break
+    return ops, clean
+
+
+def replay(path: str) -> tuple[list[dict], set[int], dict | None]:
+    """
+    Rebuild the records a journal describes.
+
+    Returns:
+      (records, indices of records that received a detail enrichment,
+       last journaled state or None)
+    """
+    records: list[dict] = []
+    enriched: set[int] = set()
+    state = None
+    for op in read_ops(path)[0]:
+        if op["op"] == "add" and op["i"] == len(records):
+            records.append(op["rec"])
+        elif op["op"] == "detail" and op["i"] < len(records):
+            records[op["i"]].update(op["fields"])
+            enriched.add(op["i"])
+        elif op["op"] == "state":
+            state = op["state"]
+    return records, enriched, state
+
+
+def write_json_atomic(records: list[dict] | dict, out_path: str) -> None:
+    """Write ``records`` as JSON through a temp file, so a crash never leaves half a file."""
+    tmp = f"{out_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, out_path)
+
+
+class RecordJournal:
+    """Thread-safe appender for one journal file (see the module docstring)."""
+
+    def __init__(self, path: str, compress: bool = False, fsync: bool = True):
+        self.path = path if path.endswith(".gz") or not compress else f"{path}.gz"
+        self.fsync = fsync
+        self.lines = 0
+        self._lock = threading.Lock()
+        self._repair()
+        self._f = open(self.path, "ab")  # pylint: disable=consider-using-with
+        self._z = zlib.compressobj(GZIP_LEVEL, wbits=31) if self.path.endswith(".gz") else None
+
+    def _repair(self) -> None:
+        # Drop a torn tail so new lines are not appended after garbage
+        ops, clean = read_ops(self.path)
+        if clean:
+            return
+        body = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops).encode("utf-8")
+        if self.path.endswith(".gz"):
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, self.path)
+
+    def _write(self, op: dict) -> None:
+        data = (json.dumps(op, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self._f.write(self._z.compress(data) if self._z is not None else data)
+            self.lines += 1
+
+    def add(self, i: int, rec: dict) -> None:
+        """Journal a newly found record stored at index ``i``."""
+        self._write({"op": "add", "i": i, "rec": rec})
+
+    def detail(self, i: int, fields: dict) -> None:
+        """Journal the detail fields merged into record ``i``."""
+        self._write({"op": "detail", "i": i, "fields": fields})
+
+    def state(self, fields: dict) -> None:
+        """Journal the writer's current crawl position (replaces earlier states on replay)."""
+        self._write({"op": "state", "state": fields})
+
+    def commit(self) -> None:
+        """Make everything written so far durable (chunk boundary)."""
+        with self._lock:
+            if self._z is not None:
+                self._f.write(self._z.flush(zlib.Z_SYNC_FLUSH))
+            self._f.flush()
+            if self.fsync:
+                os.fsync(self._f.fileno())
+
+    def close(self) -> None:
+        """Commit and close the file (ends the gzip member)."""
+        self.commit()
+        with self._lock:
+            if self._z is not None:
+                self._f.write(self._z.flush())
+                self._z = None
+            self._f.close()
+
+
+def compact(path: str, out_path: str, required_keys=(), keep: bool = False) -> list[dict]:
+    """
+    Fold a journal into the final JSON file and delete the journal.
+
+    Keys in ``required_keys`` are added (as None) to records missing them.
+    ``keep`` leaves the journal in place (an interrupted run that can resume).
+    """
+    records = replay(path)[0]
+    for r in records:
+        for k in required_keys:
+            r.setdefault(k, None)
+    write_json_atomic(records, out_path)
+    if not keep:
+        os.remove(path)
+    return records
@@ -0,0 +1,109 @@
+"""
+Which stored entries to re-check for edits, and when.
+
+``applicants`` rows are only ever inserted, so an entry edited after it was
+scraped stays stale. ``scrape_update --refresh`` re-fetches the detail pages
+of stored entries and updates the rows whose parsed fields changed. This
+module keeps the schedule in a ``refresh_checks`` table (url, last check),
+next to ``applicants`` (``src.db.connect_db``).
+
+How often an entry is due depends on its age (``date_added``), per
+``TIERS``: fresh posts are still being edited, year-old ones rarely are.
+Due entries are handed out newest first, so a run cut short by its budget
+spends it on the entries most likely to have changed.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from src.db import TableHandle, connect_db
+
+# -----------------------------
+# Defaults
+# -----------------------------
+# (entries posted within this many days, re-check every this many days);
+# the last tier (None) covers older entries and rows without a date
+TIERS: tuple[tuple[int | None, int], ...] = ((30, 1), (180, 7), (None, 60))
+
+# applicants columns a refresh may update
+COLUMNS = ("comments", "term", "us_or_international", "gpa", "gre", "gre_v", "gre_aw", "degree")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS refresh_checks (
+    url TEXT PRIMARY KEY,
+    checked_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+"""
+
+
+def _interval_days_sql(tiers: tuple[tuple[int | None, int], ...]) -> str:
+    """CASE expression: re-check interval (days) of an applicants row ``a``."""
+    whens = " ".join(
+        f"WHEN a.date_added >= current_date - {int(age)} THEN {int(every)}"
+        for age, every in tiers if age is not None
+    )
+    return f"CASE {whens} ELSE {int(tiers[-1][1])} END"
+
+
+class RefreshSchedule(TableHandle):
+    """Handle on ``refresh_checks`` and the refreshable ``applicants`` columns."""
+
+    TABLE = "refresh_checks"
+    SCHEMA = _SCHEMA
+
+    def __init__(
+        self,
+        tiers: tuple[tuple[int | None, int], ...] = TIERS,
+        connect: Callable[[], Any] = connect_db,
+    ):
+        self.tiers = tiers
+        super().__init__(connect)
+
+    def due(self, limit: int) -> list[dict]:
+        """
+        Up to ``limit`` stored entries whose re-check is due, newest first.
+
+        Returns:
+          one dict per entry: ``url`` plus the current value of each of COLUMNS
+        """
+        rows = self._execute(
+            f"SELECT a.url, {', '.join('a.' + c for c in COLUMNS)} "
+            "FROM applicants a LEFT JOIN refresh_checks c ON c.url = a.url "
+            "WHERE a.url IS NOT NULL AND (c.checked_at IS NULL OR c.checked_at < "
+            f"now() - make_interval(days => {_interval_days_sql(self.tiers)})) "
+            "ORDER BY a.date_added DESC NULLS LAST, a.p_id DESC LIMIT %s;",
+            (limit,),
+        )
+        return [dict(zip(("url", *COLUMNS), row)) for row in rows]
+
+    def mark_checked(self, urls: Iterable[str]) -> None:
+        """Record a check of ``urls`` now (changed or not)."""
+        urls = list(urls)
+        if urls:
+            self._execute(
+                "INSERT INTO refresh_checks (url) SELECT unnest(%s::text[]) "
+                "ON CONFLICT (url) DO UPDATE SET checked_at = now();",
+                (urls,),
+            )
+
+    def apply(self, changes: list[dict]) -> int:
+        """
+        Update changed entries in one transaction. Each dict holds ``url`` and
+        only the columns that changed.
+
+        Returns:
+          number of rows updated
+        """
+        updated = 0
+        with self._conn.transaction():
+            with self._conn.cursor() as cur:
+                for change in changes:
+                    cols = [c for c in COLUMNS if c in change]
+                    cur.execute(
+                        f"UPDATE applicants SET {', '.join(f'{c} = %({c})s' for c in cols)} "
+                        "WHERE url = %(url)s;",
+                        change,
+                    )
+                    updated += cur.rowcount
+        return updated
@@ -0,0 +1,110 @@
+"""
+Compact de-duplication index of GradCafe ``/result/<id>`` numbers.
+
+The scraper only needs to answer "is this entry already stored?", and every
+entry URL ends in an integer id. Holding those ids in a sorted ``array('q')``
+costs 8 bytes per stored row, against well over 100 bytes for a canonicalized
+URL string in a ``set``, and it can be filled straight from a server-side
+cursor without materializing the result set first.
+
+Lookups are a binary search. An optional Bloom filter in front of the array
+answers most lookups for ids that are *not* stored (the common case while
+crawling new entries) with a few bit tests. Ids added during a run go to a
+small ``set`` so the array never has to be re-sorted.
+"""
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+from math import log
+
+_MASK64 = (1 << 64) - 1
+
+
+def _probe(rid: int, m: int) -> tuple[int, int]:
+    """Start bit and stride of ``rid`` in an m-bit filter (double hashing)."""
+    h1 = (rid * 0x9E3779B97F4A7C15) & _MASK64
+    h2 = (((rid ^ (rid >> 31)) * 0xBF58476D1CE4E5B9) & _MASK64) | 1
+    return h1 % m, h2 % m or 1
+
+
+class BloomFilter:
+    """Bit-array Bloom filter over integers (no false negatives)."""
+
+    def __init__(self, expected: int, bits_per_id: int = 10):
+        self.m = max(64, expected * bits_per_id)
+        self.k = max(1, round(bits_per_id * log(2)))
+        self.bits = bytearray((self.m + 7) // 8)
+
+    def add(self, rid: int) -> None:
+        """Set the bits of ``rid``."""
+        b, step = _probe(rid, self.m)
+        bits = self.bits
+        for _ in range(self.k):
+            bits[b >> 3] |= 1 << (b & 7)
+            b = (b + step) % self.m
+
+    def __contains__(self, rid: int) -> bool:
+        b, step = _probe(rid, self.m)
+        bits = self.bits
+        for _ in range(self.k):
+            if not bits[b >> 3] & (1 << (b & 7)):
+                return False
+            b = (b + step) % self.m
+        return True
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the bit array."""
+        return len(self.bits)
+
+
+class ResultIdIndex:
+    """
+    Set-like membership test over result ids: ``rid in index`` / ``index.add(rid)``.
+
+    ``ids`` may arrive in any order and may repeat; they are streamed into the
+    array and only sorted when they were not already ascending (the database
+    loader asks Postgres for them in order).
+    """
+
+    def __init__(self, ids: Iterable[int] = (), bloom_bits_per_id: int = 0):
+        stored = array("q")
+        ascending = True
+        last = None
+        for rid in ids:
+            if rid == last:
+                continue
+            if last is not None and rid < last:
+                ascending = False
+            stored.append(rid)
+            last = rid
+        if not ascending:
+            stored = array("q", sorted(set(stored)))
+        self._stored = stored
+        self._added: set[int] = set()
+        self._bloom = None
+        if bloom_bits_per_id > 0:
+            self._bloom = BloomFilter(len(stored), bloom_bits_per_id)
+            for rid in stored:
+                self._bloom.add(rid)
+
+    def __contains__(self, rid: int) -> bool:
+        if rid in self._added:
+            return True
+        if self._bloom is not None and rid not in self._bloom:
+            return False
+        i = bisect_left(self._stored, rid)
+        return i < len(self._stored) and self._stored[i] == rid
+
+    def add(self, rid: int) -> None:
+        """Remember an id seen during this run."""
+        self._added.add(rid)
+
+    def __len__(self) -> int:
+        return len(self._stored) + len(self._added)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the sorted array and the Bloom filter (run-time adds excluded)."""
+        arr = self._stored.itemsize * self._stored.buffer_info()[1]
+        return arr + (self._bloom.nbytes if self._bloom is not None else 0)
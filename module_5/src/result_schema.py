@@ -0,0 +1,152 @@
+"""
+Declarative field spec for GradCafe ``/result/<id>`` detail pages.
+
+Result pages are label/value sequences in the page text: a line such as
+``Undergrad GPA`` is followed by a line holding the value. Each field is one
+``Field(label, field, clean, type)`` row in ``RESULT_FIELDS``:
+
+- ``label``: the text line that precedes the value
+- ``field``: the key it is stored under in the detail dict
+- ``clean``: raw value line (or None) -> cleaned value (or None)
+- ``type``: type non-None cleaned values are converted to
+
+``Extractor`` indexes the wanted labels in one pass over the lines, so the
+cost per page stays flat as fields are added. The first occurrence of a
+label wins. This module is shared by module_5 ``scrape_update`` and
+module_2 ``scrape.py``.
+"""
+import re
+from typing import Callable, NamedTuple
+
+# Labels (and other page chrome) that show up where a value was expected
+LABEL_GARBAGE = {
+    "GRE General:", "GRE Verbal:", "Analytical Writing:", "Notes",
+    "Undergrad GPA", "Degree Type", "Degree's Country of Origin",
+    "Timeline", "Admissions", "Results", "Logo"
+}
+
+
+# -----------------------------
+# Value cleaners
+# -----------------------------
+def clean_text(v: str | None) -> str | None:
+    """Stripped text, or None when empty."""
+    if v is None:
+        return None
+    t = v.strip()
+    return t if t else None
+
+
+def clean_label_value(v: str | None) -> str | None:
+    """Drop obvious label-as-value artifacts ("Notes", "GRE Verbal:", ...)."""
+    t = clean_text(v)
+    if t is None or t in LABEL_GARBAGE or (t.endswith(":") and len(t) <= 25):
+        return None
+    return t
+
+
+def extract_float(s: str | None) -> str | None:
+    """Extract a float-like number from a string (e.g., GPA 3.41, AW 4.0)."""
+    if not s:
+        return None
+    m = re.search(r"(\d+(?:\.\d+)?)", s)
+    return m.group(1) if m else None
+
+
+def extract_int(s: str | None) -> str | None:
+    """Extract the first integer from a string."""
+    if not s:
+        return None
+    m = re.search(r"(\d+)", s)
+    return m.group(1) if m else None
+
+
+def _metric(v: str | None) -> str | None:
+    t = clean_text(v)
+    if t in {"0", "0.0", "0.00"}:  # GradCafe placeholder for "not given"
+        return None
+    return clean_label_value(t)
+
+
+def clean_float(v: str | None) -> str | None:
+    """First float-like number (GPA, AW), ignoring 0 placeholders and labels."""
+    return extract_float(_metric(v))
+
+
+def clean_int(v: str | None) -> str | None:
+    """First integer (GRE scores), ignoring 0 placeholders and labels."""
+    return extract_int(_metric(v))
+
+
+def clean_notes(v: str | None) -> str | None:
+    """Notes text, or None when the next line is another label."""
+    t = clean_text(v)
+    return None if t in LABEL_GARBAGE else t
+
+
+def is_international(v: str | None) -> bool | None:
+    """Degree's country of origin -> False for "American", True otherwise."""
+    t = clean_text(v)
+    return None if t is None else t.lower() != "american"
+
+
+# -----------------------------
+# Spec
+# -----------------------------
+class Field(NamedTuple):
+    """One extracted field: value on the line after ``label``."""
+
+    label: str
+    field: str
+    clean: Callable[[str | None], object]
+    type: type = str
+
+
+RESULT_FIELDS: tuple[Field, ...] = (
+    Field("Degree Type", "degree", clean_text),
+    Field("Degree's Country of Origin", "is_international", is_international, bool),
+    Field("Undergrad GPA", "gpa", clean_float),
+    Field("GRE General:", "gre_total", clean_int),
+    Field("GRE Verbal:", "gre_v", clean_int),
+    Field("Analytical Writing:", "gre_aw", clean_float),
+    Field("Notes", "detail_comments", clean_notes),
+    Field("Term", "start_term", clean_text),
+    Field("Year", "start_year", clean_text),
+)
+
+
+def label_index(lines: list[str], labels: frozenset[str]) -> dict[str, str]:
+    """Map each label in ``labels`` to the line after its first occurrence."""
+    found: dict[str, str] = {}
+    wanted = len(labels)
+    for i in range(len(lines) - 1):
+        key = lines[i].strip()
+        if key in labels and key not in found:
+            found[key] = lines[i + 1]
+            if len(found) == wanted:
+                break
+    return found
+
+
+class Extractor:
+    """Single-pass extractor compiled from a tuple of ``Field`` rows."""
+
+    def __init__(self, fields: tuple[Field, ...]):
+        self.spec = fields
+        self.fields = tuple(f.field for f in fields)
+        self.labels = frozenset(f.label for f in fields)
+
+    def __call__(self, lines: list[str]) -> dict:
+        found = label_index(lines, self.labels)
+        out = {}
+        for f in self.spec:
+            value = f.clean(found.get(f.label))
+            out[f.field] = None if value is None else f.type(value)
+        return out
+
+    def empty(self) -> dict:
+        """Every field set to None (page missing or not fetched)."""
+        return dict.fromkeys(self.fields)
+
+
+RESULT_EXTRACTOR = Extractor(RESULT_FIELDS)
@@ -0,0 +1,175 @@
+"""
+Retry policy for the GradCafe scraper: how long to wait before a retry, how
+many retries are allowed, and when to stop fetching altogether.
+
+- ``backoff_delay``: exponential backoff with full jitter. The wait is uniform
+  in ``[0, min(cap, base * 2**attempt)]``, so workers that failed together do
+  not all retry at the same moment.
+- ``RetryBudget``: retries may add at most ``ratio`` extra requests per first
+  attempt, plus a reserve of at most ``reserve`` unspent retries. During an
+  outage the budget runs dry and URLs fail fast instead of every worker
+  retrying every URL.
+- ``CircuitBreaker``: when the error rate of the last ``window`` requests
+  passes ``threshold``, every fetch pauses for ``open_s``. Then a single probe
+  request is let through. Success closes the breaker; failure opens it again
+  for twice as long (up to ``max_open_s``).
+"""
+import random
+import threading
+import time
+from collections import deque
+from typing import TextIO
+
+# -----------------------------
+# Defaults
+# -----------------------------
+BACKOFF_BASE_S = 0.5
+BACKOFF_CAP_S = 30.0
+BUDGET_RATIO = 0.2       # retries per first attempt
+BUDGET_RESERVE = 10      # unspent retries that may be saved up
+BREAKER_WINDOW = 50
+BREAKER_MIN_CALLS = 20
+BREAKER_THRESHOLD = 0.5  # error rate that opens the breaker
+BREAKER_OPEN_S = 15.0
+BREAKER_MAX_OPEN_S = 240.0
+PROBE_POLL_S = 0.5       # how often callers re-check while a probe is in flight
+
+
+def backoff_delay(
+    attempt: int,
+    base_s: float = BACKOFF_BASE_S,
+    cap_s: float = BACKOFF_CAP_S,
+    rng: random.Random | None = None,
+) -> float:
+    """Seconds to sleep after failed attempt ``attempt`` (1-based), full jitter."""
+    ceiling = min(cap_s, base_s * 2 ** attempt)
+    return (rng or random).uniform(0.0, ceiling)
+
+
+class RetryBudget:
+    """Thread-safe token bucket: each first attempt earns ``ratio`` retry tokens."""
+
+    def __init__(self, ratio: float = BUDGET_RATIO, reserve: int = BUDGET_RESERVE):
+        self.ratio = ratio
+        self.reserve = reserve
+        self.tokens = float(reserve)
+        self.retries = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def on_request(self) -> None:
+        """Count a first attempt (earns retry tokens)."""
+        with self._lock:
+            self.tokens = min(float(self.reserve), self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one retry token; False when the budget is exhausted."""
+        with self._lock:
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                self.retries += 1
+                return True
+            self.denied += 1
+            return False
+
+    def summary(self) -> str:
+        """One-line state for run logs."""
+        return f"retries={self.retries} denied={self.denied} tokens={self.tokens:.1f}"
+
+
+class CircuitBreaker:  # pylint: disable=too-many-instance-attributes
+    """
+    Thread-safe breaker shared by every fetcher (states: closed, open, half-open).
+
+    Threads call ``wait()`` before a request and ``record(ok)`` after it.
+    Event loops, which must not block, call ``delay()`` and sleep themselves.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        window: int = BREAKER_WINDOW,
+        min_calls: int = BREAKER_MIN_CALLS,
+        threshold: float = BREAKER_THRESHOLD,
+        open_s: float = BREAKER_OPEN_S,
+        max_open_s: float = BREAKER_MAX_OPEN_S,
+        clock=time.monotonic,
+        log: TextIO | None = None,
+    ):
+        self.min_calls = min_calls
+        self.threshold = threshold
+        self.open_s = open_s
+        self.max_open_s = max_open_s
+        self.state = "closed"
+        self.trips = 0
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._open_until = 0.0
+        self._next_open_s = open_s
+        self._probing = False
+        self._log = log  # where trips are reported (stdout when None)
+
+    def delay(self) -> float:
+        """Seconds to wait before a request may start (0: go now)."""
+        with self._cond:
+            if self.state == "open":
+                remaining = self._open_until - self._clock()
+                if remaining > 0:
+                    return remaining
+                self.state = "half-open"
+            if self.state == "half-open":
+                if self._probing:
+                    return PROBE_POLL_S
+                self._probing = True  # this caller is the probe
+            return 0.0
+
+    def wait(self) -> None:
+        """Block while the breaker is open (or another caller's probe is out)."""
+        while True:
+            d = self.delay()
+            if d <= 0:
+                return
+            with self._cond:
+                self._cond.wait(d)
+
+    def record(self, ok: bool) -> None:
+        """Report a request outcome; may open or close the breaker."""
+        with self._cond:
+            if self.state == "half-open" and self._probing:
+                self._probing = False
+                if ok:
+                    self.state = "closed"
+                    self._outcomes.clear()
+                    self._next_open_s = self.open_s
+                else:
+                    self._trip()
+                self._cond.notify_all()
+                return
+            if self.state != "closed":
+                return  # a request that started before the breaker opened
+            self._outcomes.append(ok)
+            if len(self._outcomes) >= self.min_calls and self.error_rate() > self.threshold:
+                self._trip()
+
+    def _trip(self) -> None:
+        # Caller holds the lock
+        self.state = "open"
+        self.trips += 1
+        self._open_until = self._clock() + self._next_open_s
+        print(
+            f"[breaker] open: fetching paused for {self._next_open_s:.0f}s (trip {self.trips})",
+            file=self._log,
+        )
+        self._next_open_s = min(self.max_open_s, self._next_open_s * 2)
+        self._outcomes.clear()
+
+    def error_rate(self) -> float:
+        """Share of failed requests in the current window."""
+        if not self._outcomes:
+            return 0.0
+        return 1.0 - sum(self._outcomes) / len(self._outcomes)
+
+    def summary(self) -> str:
+        """One-line state for run logs."""
+        return f"state={self.state} trips={self.trips}"
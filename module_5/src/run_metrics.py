@@ -0,0 +1,235 @@
+"""
+Per-run instrumentation of the GradCafe scraper.
+
+The crawl records what it spends time on as it goes: fetch latency and page
+size per URL class (survey/result), parse time per page, dedup lookups,
+detail outcomes and checkpoint duration. Durations and sizes go into
+fixed-bucket histograms, everything else into counters, each with labels.
+
+At the end of a run ``RunMetrics.report()`` is written as JSON
+(``REPORT_PATH``), and optionally as Prometheus text exposition format
+(``prometheus_text``), so the Flask app and dashboards can read the last run
+without parsing log lines. Histograms carry cumulative bucket counts, as in
+Prometheus, plus quantiles estimated from the buckets.
+"""
+import bisect
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from src.record_journal import write_json_atomic
+
+# -----------------------------
+# Defaults
+# -----------------------------
+REPORT_PATH = "scrape_metrics.json"
+PROM_PREFIX = "gradcafe_scrape"
+QUANTILES = (0.5, 0.9, 0.99)
+
+# Bucket upper bounds; a last +Inf bucket is implied
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PARSE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+BYTES_BUCKETS = tuple(1024 * 2 ** k for k in range(11))  # 1 KiB .. 1 MiB
+
+# Histogram name -> buckets; names not listed use SECONDS_BUCKETS
+BUCKETS = {
+    "fetch_seconds": SECONDS_BUCKETS,
+    "fetch_bytes": BYTES_BUCKETS,
+    "parse_seconds": PARSE_BUCKETS,
+    "checkpoint_seconds": SECONDS_BUCKETS,
+}
+
+
+class Histogram:
+    """Counts of observed values per bucket, with their sum, min and max."""
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last: above every bound
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        """Add one value."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the ``q`` quantile by linear interpolation inside its bucket
+        (like Prometheus' ``histogram_quantile``), clamped to the observed range.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count  # 0 < q <= 1, so some non-empty bucket reaches it
+        seen, i = 0, 0
+        while seen + self.counts[i] < rank:
+            seen += self.counts[i]
+            i += 1
+        lower = self.bounds[i - 1] if i else 0.0
+        upper = self.bounds[i] if i < len(self.bounds) else self.max
+        value = lower + (upper - lower) * (rank - seen) / self.counts[i]
+        return min(max(value, self.min), self.max)
+
+    def to_dict(self) -> dict:
+        """Cumulative bucket counts keyed by upper bound, plus summary values."""
+        cumulative, total = {}, 0
+        for bound, n in zip((*self.bounds, "+Inf"), self.counts):
+            total += n
+            cumulative[str(bound)] = total
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "mean": self.sum / self.count if self.count else None,
+            **{f"p{round(q * 100)}": self.quantile(q) for q in QUANTILES},
+            "buckets": cumulative,
+        }
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class RunMetrics:
+    """Thread-safe labelled counters and histograms for one run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything recorded so far (start of a run)."""
+        with self._lock:
+            self.started = datetime.now(timezone.utc)
+            self._counters: dict[tuple, float] = {}
+            self._histograms: dict[tuple, Histogram] = {}
+
+    def count(self, name: str, n: float = 1, **labels) -> None:
+        """Add ``n`` to counter ``name{labels}``."""
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Add ``value`` to histogram ``name{labels}`` (buckets from BUCKETS)."""
+        key = _key(name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram(BUCKETS.get(name, SECONDS_BUCKETS))
+            hist.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the wall time of the ``with`` block into histogram ``name``."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0, **labels)
+
+    def counter(self, name: str, **labels) -> float:
+        """Current value of one counter; with no labels, the sum over all of them."""
+        with self._lock:
+            if labels:
+                return self._counters.get(_key(name, labels), 0)
+            return sum(v for (n, _), v in self._counters.items() if n == name)
+
+    def report(self, **run) -> dict:
+        """
+        Everything recorded, as a JSON-ready dict.
+
+        ``run`` (mode, rows, elapsed, ...) is stored under ``"run"`` as given.
+        Counters and histograms are lists of ``{"name", "labels", ...}``.
+        """
+        with self._lock:
+            counters = [
+                {"name": n, "labels": dict(lbl), "value": v}
+                for (n, lbl), v in sorted(self._counters.items())
+            ]
+            histograms = [
+                {"name": n, "labels": dict(lbl), **h.to_dict()}
+                for (n, lbl), h in sorted(self._histograms.items())
+            ]
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "finished": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "run": run,
+            "counters": counters,
+            "histograms": histograms,
+        }
+
+
+def _labels_text(labels: dict, **extra) -> str:
+    pairs = {**labels, **extra}
+    if not pairs:
+        return ""
+    escaped = (
+        (k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs.items()
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def prometheus_text(report: dict, prefix: str = PROM_PREFIX) -> str:
+    """
+    Render a ``report()`` dict in Prometheus text exposition format.
+
+    Counters become ``<prefix>_<name>_total``, histograms the usual
+    ``_bucket``/``_sum``/``_count`` series, and numeric ``run`` values gauges
+    named ``<prefix>_run_<key>``.
+    """
+    lines: list[str] = []
+    typed: set[str] = set()
+
+    def declare(metric: str, kind: str) -> None:
+        if metric not in typed:
+            typed.add(metric)
+            lines.append(f"# TYPE {metric} {kind}")
+
+    for key, value in report.get("run", {}).items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            metric = f"{prefix}_run_{key}"
+            declare(metric, "gauge")
+            lines.append(f"{metric} {value}")
+    for c in report.get("counters", []):
+        metric = f"{prefix}_{c['name']}_total"
+        declare(metric, "counter")
+        lines.append(f"{metric}{_labels_text(c['labels'])} {c['value']}")
+    for h in report.get("histograms", []):
+        metric = f"{prefix}_{h['name']}"
+        declare(metric, "histogram")
+        for bound, n in h["buckets"].items():
+            lines.append(f"{metric}_bucket{_labels_text(h['labels'], le=bound)} {n}")
+        lines.append(f"{metric}_sum{_labels_text(h['labels'])} {h['sum']}")
+        lines.append(f"{metric}_count{_labels_text(h['labels'])} {h['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_report(report: dict, path: str = REPORT_PATH, prom_path: str | None = None) -> None:
+    """Write ``report`` as JSON to ``path`` and, if given, as Prometheus text to ``prom_path``."""
+    write_json_atomic(report, path)
+    if prom_path:
+        tmp = f"{prom_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(prometheus_text(report))
+        os.replace(tmp, prom_path)
+
+
+def load_report(path: str = REPORT_PATH) -> dict | None:
+    """The last run's report, or None if no run has written one yet."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
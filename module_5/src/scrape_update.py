@@ -5,47 +5,180 @@ This module fetches new GradCafe entries, retrieves detailed applicant data,
 and writes cleaned updates for ingestion into the PostgreSQL database.
 It is designed to be resilient to partial failures and supports incremental updates.
 """
+# pylint: disable=too-many-lines
+import argparse
+import contextlib
 import json
+import os
+import queue
 import re
+import threading
 import time
 import socket
+import uuid
+from collections.abc import Callable, Iterator
+from typing import TextIO
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-import urllib.request as urllib_request
 from urllib.error import HTTPError, URLError
 from urllib.parse import urljoin, urlparse
-from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
-
-from bs4 import BeautifulSoup
-
+from concurrent.futures import (
+    Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed,
+    TimeoutError as FuturesTimeoutError,
+)
+
+from psycopg.errors import InsufficientPrivilege
+
+from src import (
+    async_fetch, clean_update, html_archive, load_update, parsers, record_journal, run_metrics,
+    survey_backfill,
+)
+from src.applicant_record import ApplicantRecord
+from src.crawl_queue import CrawlQueue, CrawlTask
 from src.db import connect_db
+from src.failure_ledger import FailureLedger
+from src.refresh_schedule import COLUMNS as REFRESH_COLUMNS, RefreshSchedule
+from src.html_archive import HtmlArchive
+from src.http_cache import HttpCache, url_class
+from src.http_pool import HttpPool
+from src.record_journal import RecordJournal
+from src.rate_control import AdaptiveController, parse_retry_after
+from src.result_index import ResultIdIndex
+from src.result_schema import RESULT_EXTRACTOR, clean_label_value
+from src.retry_policy import CircuitBreaker, RetryBudget, backoff_delay
+from src.run_metrics import RunMetrics
 
 # -----------------------------
 # Output settings
 # -----------------------------
 UPDATE_OUTPUT_JSON = "applicant_data_update.json"
 
+# Checkpoints go to an append-only NDJSON journal (src.record_journal) that is
+# compacted into UPDATE_OUTPUT_JSON at the end of the run. JOURNAL_GZIP writes
+# UPDATE_JOURNAL + ".gz"; JOURNAL_FSYNC fsyncs at every chunk boundary.
+UPDATE_JOURNAL = "applicant_data_update.jsonl"
+JOURNAL_GZIP = False
+JOURNAL_FSYNC = True
+
 # Stop scraping once we hit N consecutive survey pages that contain zero new entries
 STOP_AFTER_PAGES_WITH_NO_NEW = 2
 
+# De-duplication index (src.result_index): stored ids are streamed this many rows
+# per round trip; DEDUP_BLOOM_BITS > 0 puts a Bloom filter of that many bits per
+# stored id in front of the sorted array.
+DEDUP_ITERSIZE = 20_000
+DEDUP_BLOOM_BITS = 0
+
+# "preload": load every stored id before crawling (load_existing_ids_from_db);
+# "per-page": ask Postgres about each survey page's ids instead (DbPageDedup)
+DEDUP_MODE = "preload"
 
-def load_existing_urls_from_db() -> set[str]:
+
+def load_existing_ids_from_db(bloom_bits_per_id: int = 0) -> ResultIdIndex:
     """
-    Load all previously stored GradCafe entry URLs from Postgres.
+    Load the /result/<id> number of every stored GradCafe entry from Postgres.
 
     This is the core de-duplication mechanism:
     - survey rows are parsed
-    - each /result/<id> URL is canonicalized
-    - if it already exists in the database, it is skipped
+    - each entry URL is reduced to its integer result id
+    - if that id already exists in the database, the row is skipped
+
+    Ids are streamed in ascending order from a server-side cursor
+    (DEDUP_ITERSIZE rows per round trip) into a ResultIdIndex, so neither the
+    full result set nor any URL strings are held in memory.
+    """
+    with connect_db() as conn:
+        with conn.cursor(name="dedup_result_ids") as cur:
+            cur.itersize = DEDUP_ITERSIZE
+            cur.execute(
+                "SELECT substring(url from '/result/([0-9]+)')::bigint AS rid "
+                "FROM applicants WHERE url ~ '/result/[0-9]+' ORDER BY rid;"
+            )
+            return ResultIdIndex((rid for (rid,) in cur), bloom_bits_per_id)
+
+
+# Host/scheme spellings a stored entry URL may have; each one is sent to the
+# unique url index, since the stored text is not canonicalized by Postgres.
+_URL_SPELLINGS = (
+    "https://www.thegradcafe.com/result/{}",
+    "https://thegradcafe.com/result/{}",
+    "http://www.thegradcafe.com/result/{}",
+    "http://thegradcafe.com/result/{}",
+)
+
+
+class DbPageDedup:
+    """
+    Duplicate tracking that asks Postgres one page at a time (DEDUP_MODE "per-page").
+
+    ``lookup(ids)`` sends a survey page's candidate ids to the database in one
+    ``url = ANY(%s)`` query, served by the unique index on ``applicants.url``.
+    Only ids seen during this run and the stored ids of the current page are
+    held in memory, so startup is one connection and memory does not grow
+    with the table.
     """
-    urls = set()
+
+    def __init__(self):
+        self._conn = None
+        self._run: set[int] = set()
+        self._stored: set[int] = set()
+        self.queries = 0
+        self.query_s = 0.0
+
+    def lookup(self, rids: list[int]) -> None:
+        """Fetch which of one page's ids are already stored (replaces the last page's)."""
+        ask = sorted({rid for rid in rids if rid not in self._run})
+        self._stored = set()
+        if not ask:
+            return
+        if self._conn is None:
+            self._conn = connect_db()
+            self._conn.autocommit = True  # no transaction left open between pages
+        t0 = time.perf_counter()
+        with self._conn.cursor() as cur:
+            cur.execute(
+                "SELECT url FROM applicants WHERE url = ANY(%s);",
+                ([s.format(rid) for rid in ask for s in _URL_SPELLINGS],),
+            )
+            self._stored = {_result_id(u) for (u,) in cur.fetchall()}
+        self.queries += 1
+        self.query_s += time.perf_counter() - t0
+
+    def __contains__(self, rid: int) -> bool:
+        return rid in self._run or rid in self._stored
+
+    def add(self, rid: int) -> None:
+        """Remember an id seen during this run."""
+        self._run.add(rid)
+
+    def __len__(self) -> int:
+        return len(self._run)
+
+    def close(self) -> None:
+        """Close the lookup connection (if one was opened)."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def summary(self) -> str:
+        """One-line lookup statistics for the end-of-run report."""
+        avg_ms = 1000 * self.query_s / self.queries if self.queries else 0.0
+        return f"queries={self.queries} total={self.query_s:.2f}s avg_ms={avg_ms:.2f}"
+
+
+# Anything _collect_new_rows can de-duplicate against
+SeenIds = set[int] | ResultIdIndex | DbPageDedup
+
+
+def load_max_result_id_from_db() -> int:
+    """Highest /result/<id> number stored in Postgres (0 when there is none)."""
     with connect_db() as conn:
         with conn.cursor() as cur:
-            cur.execute("SELECT url FROM applicants WHERE url IS NOT NULL;")
-            for (u,) in cur.fetchall():
-                u = _canonical_result_url(u)  # normalize DB URLs to match scraped URLs
-                if u:
-                    urls.add(u)
-    return urls
+            cur.execute(
+                "SELECT MAX(substring(url from '/result/([0-9]+)')::bigint) FROM applicants;"
+            )
+            (top,) = cur.fetchone()
+    return int(top or 0)
 
 
 # -----------------------------
@@ -57,48 +190,345 @@ TIMEOUT_S = 30
 
 # The GradCafe survey supports pagination; this is the max page we attempt
 SURVEY_PAGES = 1550
-DELAY_BETWEEN_SURVEY_PAGES_S = 0.25
 
 # /result/<id> detail scraping (parallel)
 FETCH_DETAILS = True
-MAX_WORKERS = 8
+MAX_WORKERS = 8  # thread ceiling; RATE_CONTROLLER decides how many fetch at once
 RETRIES = 3
-BACKOFF_S = 1.5
+MISSING_STATUSES = {404, 410}  # page does not exist: not retried
+
+# Adaptive rate control: one token bucket + AIMD concurrency limit shared by the
+# survey loop and the detail workers (replaces fixed page delays and backoff).
+# It starts at the old fixed pace (0.25 s between survey pages) and stays near
+# it; faster crawls are an explicit override.
+RATE_INITIAL = 4.0
+RATE_MAX = 10.0
+RATE_DECISION_LOG: str | None = None  # JSONL of every rate decision (--rate-log)
+
+
+def new_rate_controller() -> AdaptiveController:
+    """A rate controller at the configured starting rate, with no decisions yet."""
+    return AdaptiveController(
+        rate=RATE_INITIAL,
+        max_rate=RATE_MAX,
+        max_concurrency=MAX_WORKERS,
+        decision_log=RATE_DECISION_LOG,
+    )
+
+
+RATE_CONTROLLER = new_rate_controller()
+
+# Detail backend: "threads" (ThreadPoolExecutor, MAX_WORKERS) or
+# "asyncio" (single event loop, up to ASYNC_MAX_IN_FLIGHT coroutines). Both take
+# their slots from RATE_CONTROLLER and share the retry policy below.
+DETAIL_BACKEND = "threads"
+ASYNC_MAX_IN_FLIGHT = 200
+
+# Retries (src.retry_policy): full-jitter exponential backoff starting at
+# BACKOFF_S and capped at BACKOFF_CAP_S, a global budget of RETRY_BUDGET_RATIO
+# retries per first attempt, and a circuit breaker that pauses every fetch
+# while the recent error rate is above BREAKER_THRESHOLD.
+BACKOFF_S = 0.5
+BACKOFF_CAP_S = 30.0
+RETRY_BUDGET_RATIO = 0.2
+BREAKER_THRESHOLD = 0.5
+BREAKER_OPEN_S = 15.0
+RETRY_BUDGET = RetryBudget(ratio=RETRY_BUDGET_RATIO)
+RETRY_BREAKER = CircuitBreaker(threshold=BREAKER_THRESHOLD, open_s=BREAKER_OPEN_S)
+
+# Failure ledger (src.failure_ledger): each run records the detail pages it gave
+# up on and skips dead-lettered URLs (DEAD_AFTER failures, or 404/410). Their
+# rows keep detail_error = DEAD_LETTER. --repair re-fetches failures that are due.
+USE_FAILURE_LEDGER = True
+DEAD_AFTER = 5
+DEAD_LETTER = "dead letter"
+DEAD_LETTERS: set[str] = set()
+
+# Streaming (iter_scraped): finished rows wait in a queue of at most
+# STREAM_QUEUE_SIZE for the consumer. STREAM_KEEP_JSON also writes
+# UPDATE_OUTPUT_JSON at the end, for debugging (it holds every row at once).
+STREAM_QUEUE_SIZE = 500
+STREAM_KEEP_JSON = False
 
 # Chunking: scrape a block of survey pages, then fetch details for that block
 CHUNK_SURVEY_PAGES = 25
 DETAIL_FUTURE_TIMEOUT_S = 60
 
+# Crawl scheduling: "chunked" (details fetched at each chunk boundary),
+# "pipelined" (detail threads drain a bounded queue while survey pages are fetched),
+# "frontier" (pipelined, down to the newest stored id only, see _scrape_frontier)
+# or "backfill" (full rebuild: chunked, but survey pages are read by concurrent shards)
+CRAWL_MODE = "chunked"
+PIPELINE_QUEUE_SIZE = 500
+
+# Backfill mode: SURVEY_PAGES is split into BACKFILL_SHARDS page ranges read
+# concurrently under the shared RATE_CONTROLLER; each shard checkpoints its
+# parsed pages under BACKFILL_DIR so a failed shard is retried alone
+# (src.survey_backfill). Every page is read: no early stop.
+BACKFILL_SHARDS = survey_backfill.SHARDS
+BACKFILL_DIR = survey_backfill.CHECKPOINT_DIR
+
+# HTML parser backend (src.parsers): "bs4" (reference) or "lxml" (faster, same output)
+PARSER_BACKEND = "bs4"
+
+# Parse stage: 0 parses in the fetching thread; N > 0 hands raw HTML to N worker
+# processes so parsing is not capped at one core by the GIL.
+PARSE_WORKERS = 0
+
+# Run metrics (src.run_metrics): fetch/parse/checkpoint histograms and dedup and
+# detail counters, written as JSON to METRICS_JSON at the end of a crawl (and as
+# Prometheus text to METRICS_PROM when set).
+RUN_METRICS = RunMetrics()
+METRICS_JSON = run_metrics.REPORT_PATH
+METRICS_PROM: str | None = None
+
+# Progress lines go to _LOG (stdout when None); see _log and run_state
+_LOG: TextIO | None = None
+
+
+def _log(*args) -> None:
+    """print() to the current run's log."""
+    print(*args, file=_LOG, flush=_LOG is not None)
+
 
 # -----------------------------
 # Helpers: HTTP fetching
 # -----------------------------
+# Shared keep-alive pool: survey and detail fetches reuse connections per host
+# and download gzip/deflate-compressed HTML.
+HTTP_POOL = HttpPool(user_agent=USER_AGENT, timeout=TIMEOUT_S, max_idle_per_host=MAX_WORKERS * 2)
+
+# On-disk conditional cache (src.http_cache), off unless --cache: /result pages
+# are served from disk within their TTL, survey pages are revalidated with
+# ETag/Last-Modified. It grows to HTTP_CACHE_MAX_BYTES, so it is opt-in.
+USE_HTTP_CACHE = False
+HTTP_CACHE_PATH = os.path.join(".cache", "http_cache.sqlite3")
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024
+_HTTP_CACHE: HttpCache | None = None
+
+
+def _http_cache() -> HttpCache | None:
+    """Open the page cache on first use (so importing this module creates no files)."""
+    global _HTTP_CACHE  # pylint: disable=global-statement
+    if USE_HTTP_CACHE and _HTTP_CACHE is None:
+        os.makedirs(os.path.dirname(HTTP_CACHE_PATH) or ".", exist_ok=True)
+        _HTTP_CACHE = HttpCache(HTTP_CACHE_PATH, max_bytes=HTTP_CACHE_MAX_BYTES)
+    return _HTTP_CACHE if USE_HTTP_CACHE else None
+
+
+@dataclass
+class RunState:  # pylint: disable=too-many-instance-attributes
+    """
+    What one crawl changes as it goes: the rate controller (and its decision
+    history), the retry budget and circuit breaker, the run metrics and the
+    open page cache. The defaults are all fresh, so a run started with a new
+    RunState shares none of it with earlier runs in the same process.
+
+    ``log`` receives the run's progress lines (stdout when None), and the
+    metrics report goes to ``metrics_json`` (METRICS_JSON when None).
+    """
+
+    log: TextIO | None = None
+    metrics_json: str | None = None
+    controller: AdaptiveController = field(default_factory=new_rate_controller)
+    budget: RetryBudget = field(default_factory=lambda: RetryBudget(ratio=RETRY_BUDGET_RATIO))
+    breaker: CircuitBreaker | None = None
+    metrics: RunMetrics = field(default_factory=RunMetrics)
+    cache: "HttpCache | None" = None
+
+    def __post_init__(self):
+        if self.breaker is None:
+            self.breaker = CircuitBreaker(
+                threshold=BREAKER_THRESHOLD, open_s=BREAKER_OPEN_S, log=self.log
+            )
+
+
+@contextlib.contextmanager
+def run_state(state: RunState) -> Iterator[RunState]:
+    """
+    Make ``state`` the module's run state (controller, retry policy, metrics,
+    page cache, log) until the block ends, then put the previous one back and
+    close a cache opened during the block. Runs in one process must not
+    overlap (the Flask app allows one Pull Data at a time).
+    """
+    global RATE_CONTROLLER, RETRY_BUDGET, RETRY_BREAKER  # pylint: disable=global-statement
+    global RUN_METRICS, METRICS_JSON, _HTTP_CACHE, _LOG  # pylint: disable=global-statement
+    saved = (RATE_CONTROLLER, RETRY_BUDGET, RETRY_BREAKER, RUN_METRICS, METRICS_JSON,
+             _HTTP_CACHE, _LOG)
+    RATE_CONTROLLER, RETRY_BUDGET, RETRY_BREAKER, RUN_METRICS = (
+        state.controller, state.budget, state.breaker, state.metrics
+    )
+    METRICS_JSON = state.metrics_json or METRICS_JSON
+    _HTTP_CACHE, _LOG = state.cache, state.log
+    try:
+        yield state
+    finally:
+        if _HTTP_CACHE is not None and _HTTP_CACHE is not state.cache:
+            _HTTP_CACHE.close()
+        (RATE_CONTROLLER, RETRY_BUDGET, RETRY_BREAKER, RUN_METRICS, METRICS_JSON,
+         _HTTP_CACHE, _LOG) = saved
+
+
+# Append-only raw HTML archive (src.html_archive), off unless --archive: every
+# downloaded page is kept so `--reparse` can rebuild the output after parser
+# fixes without the network. Nothing is ever evicted, so it is opt-in.
+ARCHIVE_HTML = False
+ARCHIVE_DIR = "html_archive"
+_ARCHIVE: HtmlArchive | None = None
+
+
+def _html_archive() -> HtmlArchive | None:
+    """Open the archive on first use (so importing this module creates no files)."""
+    global _ARCHIVE  # pylint: disable=global-statement
+    if ARCHIVE_HTML and _ARCHIVE is None:
+        _ARCHIVE = HtmlArchive(ARCHIVE_DIR)
+    return _ARCHIVE if ARCHIVE_HTML else None
+
+
+def _archive_page(url: str, html: str) -> None:
+    archive = _html_archive()
+    if archive is not None:
+        archive.append(url, html)
+
+
 def _fetch_html(url: str, timeout: int = TIMEOUT_S) -> str:
-    req = urllib_request.Request(url, headers={"User-Agent": USER_AGENT})
-    with urllib_request.urlopen(req, timeout=timeout) as resp:
-        return resp.read().decode("utf-8", errors="ignore")
+    cache = _http_cache()
+    if cache is not None:
+        return cache.fetch_html(HTTP_POOL, url, timeout=timeout)
+    return HTTP_POOL.fetch_html(url, timeout=timeout)
+
+
+def _observe_fetch(url: str, seconds: float, status: int | None, html: str | None) -> None:
+    """Record one network attempt in RUN_METRICS (latency, outcome, page size)."""
+    kind = url_class(url)
+    RUN_METRICS.observe("fetch_seconds", seconds, url_class=kind)
+    RUN_METRICS.count("fetch_responses", url_class=kind, status=status or "error")
+    if html is not None:
+        RUN_METRICS.observe("fetch_bytes", len(html.encode("utf-8")), url_class=kind)
+
+
+def _print_http_stats() -> None:
+    s = HTTP_POOL.stats()
+    _log(
+        f"[http] requests={s['requests']} connections={s['connections_opened']} "
+        f"reuse_ratio={s['reuse_ratio']:.2f} bytes_wire={s['bytes_wire']} "
+        f"bytes_saved={s['bytes_saved']}"
+    )
+    _log(f"[retry] {RETRY_BUDGET.summary()} breaker {RETRY_BREAKER.summary()}")
+    cache = _http_cache()
+    if cache is not None:
+        c = cache.stats()
+        _log(
+            f"[cache] fresh_hits={c['fresh_hits']} revalidated_304={c['revalidated']} "
+            f"misses={c['misses']} hit_ratio={c['hit_ratio']:.2f} pages={c['pages']} "
+            f"bytes_on_disk={c['bytes_on_disk']} evictions={c['evictions']}"
+        )
 
 
-def _safe_fetch_html(url: str) -> str | None:
+class FetchError(Exception):
+    """A page could not be fetched: HTTP error status, network error or timeout."""
+
+    def __init__(self, url: str, reason: str, status: int | None = None):
+        super().__init__(f"{reason} ({url})")
+        self.url = url
+        self.reason = reason  # short error class, e.g. "HTTP 503" or "timeout"
+        self.status = status
+
+    @property
+    def missing(self) -> bool:
+        """The page does not exist (404/410); retrying will not help."""
+        return self.status in MISSING_STATUSES
+
+
+def _fetch_page(url: str) -> str:
+    """
+    Fetch through RETRY_BREAKER and RATE_CONTROLLER, raising FetchError once
+    retries are used up. Every attempt reports its latency and status, so the
+    controller paces retries (halved rate, Retry-After pauses). Between
+    attempts the fetcher sleeps a full-jitter exponential backoff, but only
+    while RETRY_BUDGET has retries left. Pages still fresh in the HTTP cache
+    skip all of this.
+    """
+    cache = _http_cache()
+    cached = cache.fresh_text(url) if cache is not None else None
+    if cached is not None:
+        return cached
+    return _fetch_with_retries(url, _fetch_html)
+
+
+def _refetch_page(url: str) -> str | None:
+    """
+    ``_fetch_page`` for a page fetched before: a conditional request whatever
+    the cache TTL. Returns None when the server answers 304 (unchanged).
+    """
+    cache = _http_cache()
+    if cache is None:
+        return _fetch_with_retries(url, _fetch_html)
+
+    def revalidate(u: str) -> str | None:
+        text, changed = cache.revalidate(HTTP_POOL, u, timeout=TIMEOUT_S)
+        return text if changed else None
+
+    return _fetch_with_retries(url, revalidate)
+
+
+def _fetch_with_retries(url: str, fetch: Callable[[str], str | None]) -> str | None:
+    """The attempt loop of _fetch_page around ``fetch(url)``."""
+    RETRY_BUDGET.on_request()
     for attempt in range(1, RETRIES + 1):
-        try:
-            return _fetch_html(url)
-        except (HTTPError, URLError, socket.timeout, TimeoutError) as e:
-            print(f"[fetch fail {attempt}/{RETRIES}] {url} :: {e}")
-            time.sleep(BACKOFF_S * attempt)
-    return None
+        RETRY_BREAKER.wait()
+        with RATE_CONTROLLER.slot() as done:
+            t0 = time.perf_counter()
+            try:
+                html = fetch(url)
+            except HTTPError as e:
+                elapsed = time.perf_counter() - t0
+                retry_after = parse_retry_after(e.headers.get("Retry-After") if e.headers else None)
+                done(elapsed, e.code, retry_after)
+                _observe_fetch(url, elapsed, e.code, None)
+                error = FetchError(url, f"HTTP {e.code}", e.code)
+                # A missing page is a healthy answer as far as the breaker is concerned
+                RETRY_BREAKER.record(error.missing)
+                if error.missing:
+                    _log(f"[fetch missing] {url} :: {e}")
+                    raise error from e
+            except (URLError, socket.timeout, TimeoutError) as e:
+                elapsed = time.perf_counter() - t0
+                done(elapsed, None)
+                _observe_fetch(url, elapsed, None, None)
+                RETRY_BREAKER.record(False)
+                is_timeout = isinstance(e, (socket.timeout, TimeoutError))
+                error = FetchError(url, "timeout" if is_timeout else "network error")
+            else:
+                elapsed = time.perf_counter() - t0
+                done(elapsed, 200)
+                # A refresh's conditional fetch returns None for 304 Not Modified
+                _observe_fetch(url, elapsed, 304 if html is None else 200, html)
+                RETRY_BREAKER.record(True)
+                if html is not None:
+                    _archive_page(url, html)
+                return html
+        _log(f"[fetch fail {attempt}/{RETRIES}] {url} :: {error.reason}")
+        if attempt == RETRIES:
+            break
+        if not RETRY_BUDGET.try_spend():
+            _log(f"[retry budget] exhausted; giving up on {url}")
+            break
+        time.sleep(backoff_delay(attempt, BACKOFF_S, BACKOFF_CAP_S))
+    raise error
+
+
+def _safe_fetch_html(url: str) -> str | None:
+    """``_fetch_page``, with None instead of FetchError (survey pages)."""
+    try:
+        return _fetch_page(url)
+    except FetchError:
+        return None
 
 
 # -----------------------------
 # Helpers: normalization
 # -----------------------------
-LABEL_GARBAGE = {
-    "GRE General:", "GRE Verbal:", "Analytical Writing:", "Notes",
-    "Undergrad GPA", "Degree Type", "Degree's Country of Origin",
-    "Timeline", "Admissions", "Results", "Logo"
-}
-
-
 def _normalize_none(s: str | None) -> str | None:
     if s is None:
         return None
@@ -106,12 +536,20 @@ def _normalize_none(s: str | None) -> str | None:
     return t if t else None
 
 
+def _standin_host() -> str | None:
+    """Host of BASE_URL when it points somewhere other than GradCafe (a local stand-in)."""
+    netloc = urlparse(BASE_URL).netloc
+    return None if netloc.endswith("thegradcafe.com") else netloc
+
+
 def _canonical_result_url(url: str | None) -> str | None:
     if not url:
         return None
     try:
         p = urlparse(url)
         clean = p._replace(fragment="", query="")
+        if clean.netloc and clean.netloc == _standin_host():
+            return clean.geturl()  # keep the stand-in's http://host:port
         scheme = "https"
         netloc = clean.netloc or "www.thegradcafe.com"
         if netloc == "thegradcafe.com":
@@ -127,39 +565,18 @@ def _valid_result_url(url: str | None) -> bool:
         return False
     try:
         p = urlparse(url)
-        return p.netloc.endswith("thegradcafe.com") and p.path.startswith("/result/")
+        host_ok = p.netloc.endswith("thegradcafe.com") or p.netloc == _standin_host()
+        return host_ok and p.path.startswith("/result/")
     except (ValueError, AttributeError):
         return False
 
 
-def _clean_bad_label_values(v: str | None) -> str | None:
-    if v is None:
-        return None
-    t = v.strip()
-    if not t or t in LABEL_GARBAGE or (t.endswith(":") and len(t) <= 25):
-        return None
-    return t
-
-
-def _extract_float(s: str | None) -> str | None:
-    if not s:
-        return None
-    m = re.search(r"(\d+(?:\.\d+)?)", s)
-    return m.group(1) if m else None
-
+_RESULT_ID_RE = re.compile(r"/result/(\d+)")
 
-def _extract_int(s: str | None) -> str | None:
-    if not s:
-        return None
-    m = re.search(r"(\d+)", s)
-    return m.group(1) if m else None
 
-
-def _zero_to_none(s: str | None) -> str | None:
-    if s is None:
-        return None
-    t = s.strip()
-    return None if t in {"0", "0.0", "0.00"} else t
+def _result_id(url: str | None) -> int | None:
+    m = _RESULT_ID_RE.search(url or "")
+    return int(m.group(1)) if m else None
 
 
 def _degree_level(degree_type: str | None) -> str | None:
@@ -188,10 +605,10 @@ def _clean_listpage_comments(txt: str | None) -> str | None:
     return t if t else None
 
 
-def _extract_entry_url(row_soup, source_url: str) -> str | None:
-    """Find the first /result/<id> link inside a survey row."""
-    for a in row_soup.find_all("a", href=True):
-        href = a["href"].strip()
+def _extract_entry_url(hrefs: list[str], source_url: str) -> str | None:
+    """Find the first /result/<id> link among a survey row's hrefs."""
+    for href in hrefs:
+        href = href.strip()
         if href.startswith("/result/") or "/result/" in href:
             full = urljoin(source_url, href)
             return _canonical_result_url(full)
@@ -235,68 +652,135 @@ def _parse_decision(decision_text: str | None) -> tuple[str | None, str | None,
     return _normalize_none(status), accepted_date, rejected_date
 
 
-def _parse_survey_page(html: str, source_url: str) -> list[dict]:  # pylint: disable=too-many-locals
+def _parse_survey_page(html: str, source_url: str) -> list[ApplicantRecord]:
     """
     Parse a survey list page and return a list of raw records.
     Note: detail fields (GPA/GRE/etc.) are filled later from /result/<id>.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    rows = soup.select("table tr")
-
-    records: list[dict] = []
+    records: list[ApplicantRecord] = []
     scraped_at_iso = datetime.now(timezone.utc).isoformat()
 
-    for row in rows:
-        cols = row.find_all("td")
-        if len(cols) < 5:
-            continue
-
-        university = _normalize_none(cols[0].get_text(" ", strip=True))
-        program = _normalize_none(cols[1].get_text(" ", strip=True))
-        date_posted = _normalize_none(cols[2].get_text(" ", strip=True))
-        decision_text = _normalize_none(cols[3].get_text(" ", strip=True))
-        comments_text = _clean_listpage_comments(cols[4].get_text(" ", strip=True))
+    for cols, hrefs in parsers.survey_rows(html, PARSER_BACKEND):
+        university = _normalize_none(cols[0])
+        program = _normalize_none(cols[1])
+        date_posted = _normalize_none(cols[2])
+        decision_text = _normalize_none(cols[3])
+        comments_text = _clean_listpage_comments(cols[4])
 
         status, accepted_date, rejected_date = _parse_decision(decision_text)
-        entry_url = _extract_entry_url(row, source_url)
+        entry_url = _extract_entry_url(hrefs, source_url)
 
+        # Detail fields (term, GRE, GPA, ...) stay None until the /result/<id> page
         records.append(
-            {
-                "program_name_raw": program,
-                "university_raw": university,
-                "comments": comments_text,
-                "date_posted": date_posted,
-                "entry_url": entry_url,
-                "applicant_status": status,
-                "accepted_date": accepted_date,
-                "rejected_date": rejected_date,
-
-                # Filled from detail pages later
-                "start_term": None,
-                "start_year": None,
-
-                # Stored as a raw boolean; cleaned later into "American"/"International"
-                "is_international": None,
-
-                "gre_total": None,
-                "gre_v": None,
-                "gre_aw": None,
-                "degree": None,
-                "degree_level": None,
-                "gpa": None,
-
-                "source_url": source_url,
-                "scraped_at": scraped_at_iso,
-            }
+            ApplicantRecord(
+                program=program,
+                university=university,
+                comments=comments_text,
+                date_posted=date_posted,
+                entry_url=entry_url,
+                applicant_status=status,
+                accepted_date=accepted_date,
+                rejected_date=rejected_date,
+                source_url=source_url,
+                scraped_at=scraped_at_iso,
+            )
         )
 
     return records
 
 
+# -----------------------------
+# Parse stage (optional process pool)
+# -----------------------------
+_PARSE_POOL: ProcessPoolExecutor | None = None
+_PARSE_LOCK = threading.Lock()
+_PARSE_STATS = {"pages": 0, "cpu_s": 0.0, "inline_cpu_s": 0.0}
+
+
+def _init_parse_worker(backend: str) -> None:
+    """Process-pool initializer: worker processes parse with the parent's backend."""
+    global PARSER_BACKEND  # pylint: disable=global-statement
+    PARSER_BACKEND = backend
+
+
+def _timed_parse(fn, *args):
+    """Run a parser and return (result, CPU seconds spent in this thread)."""
+    t0 = time.thread_time()
+    out = fn(*args)
+    return out, time.thread_time() - t0
+
+
+def _parse_pool() -> ProcessPoolExecutor | None:
+    """Shared parser processes, started on first use; None when PARSE_WORKERS is 0."""
+    global _PARSE_POOL  # pylint: disable=global-statement
+    if PARSE_WORKERS <= 0:
+        return None
+    with _PARSE_LOCK:
+        if _PARSE_POOL is None:
+            _PARSE_POOL = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                initializer=_init_parse_worker,
+                initargs=(PARSER_BACKEND,),
+            )
+    return _PARSE_POOL
+
+
+def _count_parse(cpu_s: float, inline: bool, page: str = "result") -> None:
+    RUN_METRICS.observe("parse_seconds", cpu_s, page=page)
+    with _PARSE_LOCK:
+        _PARSE_STATS["pages"] += 1
+        _PARSE_STATS["cpu_s"] += cpu_s
+        if inline:
+            _PARSE_STATS["inline_cpu_s"] += cpu_s
+
+
+def _parse(fn, *args):
+    """
+    Run ``fn(*args)`` in the parse stage and wait for it.
+
+    The calling fetch thread blocks without holding the GIL while a worker
+    process parses, so other fetch threads keep running.
+    """
+    pool = _parse_pool()
+    if pool is None:
+        out, cpu_s = _timed_parse(fn, *args)
+    else:
+        out, cpu_s = pool.submit(_timed_parse, fn, *args).result()
+    page = "survey" if fn is _parse_survey_page else "result"
+    _count_parse(cpu_s, inline=pool is None, page=page)
+    return out
+
+
+def _shutdown_parse_pool() -> None:
+    global _PARSE_POOL  # pylint: disable=global-statement
+    with _PARSE_LOCK:
+        pool, _PARSE_POOL = _PARSE_POOL, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def _print_cpu_stats(process_cpu_s: float, wall_s: float) -> None:
+    """Per-stage CPU: fetch/crawl threads in this process vs. HTML parsing."""
+    with _PARSE_LOCK:
+        s = dict(_PARSE_STATS)
+    fetch_cpu = max(0.0, process_cpu_s - s["inline_cpu_s"])
+    per_page_ms = 1000 * s["cpu_s"] / s["pages"] if s["pages"] else 0.0
+    _log(
+        f"[cpu] fetch_stage={fetch_cpu:.1f}s parse_stage={s['cpu_s']:.1f}s "
+        f"parse_pages={s['pages']} parse_ms_per_page={per_page_ms:.2f} "
+        f"parse_workers={PARSE_WORKERS or 'inline'} wall={wall_s:.1f}s"
+    )
+
+
 # -----------------------------
 # Detail page parsing (/result/<id>)
 # -----------------------------
-def _parse_result_page(entry_url: str) -> dict:  # pylint: disable=too-many-locals
+def _empty_detail() -> dict:
+    """All detail fields set to None."""
+    return {**RESULT_EXTRACTOR.empty(), "degree_level": None}
+
+
+def _parse_result_page(entry_url: str) -> dict:
     """
     Fetch and parse a single /result/<id> page and return detail fields.
 
@@ -306,83 +790,28 @@ def _parse_result_page(entry_url: str) -> dict:  # pylint: disable=too-many-loca
       - gpa, gre_total, gre_v, gre_aw
       - detail_comments (to optionally replace list-page comments)
       - start_term / start_year (if present)
-    """
-    html = _safe_fetch_html(entry_url)
-    if not html:
-        return {
-            "degree": None,
-            "degree_level": None,
-            "is_international": None,
-            "gpa": None,
-            "gre_total": None,
-            "gre_v": None,
-            "gre_aw": None,
-            "detail_comments": None,
-            "start_term": None,
-            "start_year": None,
-        }
-
-    soup = BeautifulSoup(html, "html.parser")
-    lines = soup.get_text("\n", strip=True).splitlines()
-
-    # Helper: GradCafe result pages are label/value sequences in the full text,
-    # so we search for a label and read the next line as the value.
-    def get_after(label: str) -> str | None:
-        for i, ln in enumerate(lines):
-            if ln.strip() == label and i + 1 < len(lines):
-                return _normalize_none(lines[i + 1])
-        return None
-
-    degree = _normalize_none(get_after("Degree Type"))
-    origin = _normalize_none(get_after("Degree's Country of Origin"))
-
-    notes = _normalize_none(get_after("Notes"))
-    if notes and notes.strip() in LABEL_GARBAGE:
-        notes = None
-
-    # These may be missing on many entries; keep None if absent
-    start_term = _normalize_none(get_after("Term"))
-    start_year = _normalize_none(get_after("Year"))
 
-    # Metric extraction: strip placeholders, drop label artifacts, then parse numbers
-    gpa_raw = _clean_bad_label_values(_zero_to_none(get_after("Undergrad GPA")))
-    gre_total_raw = _clean_bad_label_values(_zero_to_none(get_after("GRE General:")))
-    gre_v_raw = _clean_bad_label_values(_zero_to_none(get_after("GRE Verbal:")))
-    gre_aw_raw = _clean_bad_label_values(_zero_to_none(get_after("Analytical Writing:")))
-
-    gpa = _extract_float(gpa_raw)
-    gre_total = _extract_int(gre_total_raw)
-    gre_v = _extract_int(gre_v_raw)
-    gre_aw = _extract_float(gre_aw_raw)
+    Raises FetchError when the page cannot be fetched, so a failed fetch is
+    never mistaken for a page without data (see _mark_detail_failed).
+    """
+    return _parse(_parse_result_html, _fetch_page(entry_url))
 
-    # Convert origin into a strict boolean:
-    # - "American" -> False
-    # - anything else (non-empty) -> True
-    is_international = None
-    if origin:
-        is_international = origin.strip().lower() != "american"
 
-    return {
-        "degree": degree,
-        "degree_level": _degree_level(degree),
-        "is_international": is_international,
-        "gpa": gpa,
-        "gre_total": gre_total,
-        "gre_v": gre_v,
-        "gre_aw": gre_aw,
-        "detail_comments": notes,
-        "start_term": start_term,
-        "start_year": start_year,
-    }
+def _parse_result_html(html: str) -> dict:
+    """Parse the HTML of a /result/<id> page into detail fields (no network)."""
+    # Fields are declared in src.result_schema.RESULT_FIELDS and read in one
+    # pass over the page's text lines.
+    detail = RESULT_EXTRACTOR(parsers.page_lines(html, PARSER_BACKEND))
+    detail["degree_level"] = _degree_level(detail["degree"])
+    return detail
 
 
 # -----------------------------
 # JSON I/O
 # -----------------------------
 def save_data(records: list[dict], out_path: str = UPDATE_OUTPUT_JSON) -> None:
-    """Write raw update records to disk as JSON."""
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(records, f, indent=2, ensure_ascii=False)
+    """Write raw update records to disk as JSON (via a temp file, never half-written)."""
+    record_journal.write_json_atomic([dict(r) for r in records], out_path)
 
 
 def load_data(path: str = UPDATE_OUTPUT_JSON) -> list[dict]:
@@ -391,26 +820,181 @@ def load_data(path: str = UPDATE_OUTPUT_JSON) -> list[dict]:
         return json.load(f)
 
 
+# Journal of the current crawl (set by scrape_data; None outside a run)
+_JOURNAL: RecordJournal | None = None
+
+
+def _journal_path() -> str:
+    return f"{UPDATE_JOURNAL}.gz" if JOURNAL_GZIP else UPDATE_JOURNAL
+
+
+def _add_record(records: list[dict], rec: dict) -> int:
+    """Append a newly found row and journal it (raw JSON schema); returns its index."""
+    records.append(rec)
+    i = len(records) - 1
+    if _JOURNAL is not None:
+        _JOURNAL.add(i, dict(rec))
+    return i
+
+
+def _count_detail(rec: dict) -> None:
+    """Count the outcome of one row's detail page in RUN_METRICS."""
+    if rec.get("detail_error") is None:
+        RUN_METRICS.count("details", outcome="ok")
+    else:
+        RUN_METRICS.count("details", outcome="failed", error=rec["detail_error"])
+
+
+def _journal_detail(records: list[dict], i: int, stream: "_RowStream | None" = None) -> None:
+    """
+    Journal (and count) the fields _apply_detail merged into records[i].
+    The row is final now, so a streaming run hands it on to its ``stream``
+    (_emit). Callers holding a lock leave ``stream`` out and call _emit after
+    releasing it, since handing the row on blocks while the consumer is behind.
+    """
+    _count_detail(records[i])
+    if _JOURNAL is not None:
+        r = records[i]
+        _JOURNAL.detail(i, {k: r.get(k) for k in _DETAIL_KEYS})
+    _emit(records, i, stream)
+
+
+class _RowStream:
+    """
+    Bounded hand-off of finished rows from the crawl threads to iter_scraped.
+
+    ``put`` blocks while the queue is full, so a slow consumer (cleaning,
+    loading) holds the crawl back instead of letting rows pile up. The
+    failed rows' (url, error) pairs are kept for the failure ledger, since
+    a streaming run has no output JSON to read them back from.
+    """
+
+    def __init__(self, size: int):
+        self.queue: queue.Queue = queue.Queue(maxsize=size)
+        self.rows = 0
+        self.failed: list[dict] = []
+        self.closed = False
+
+    def put(self, rec: dict) -> None:
+        """Hand one finished row to the consumer (dropped once it has gone away)."""
+        if self.closed:
+            return
+        self.rows += 1
+        if rec.get("detail_error"):
+            self.failed.append({"entry_url": rec.get("entry_url"),
+                                "detail_error": rec["detail_error"]})
+        self.queue.put(rec)
+
+    def close(self) -> None:
+        """The consumer stopped early: drop queued rows and unblock the crawl."""
+        self.closed = True
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
+
+
+class _StreamClosed(KeyboardInterrupt):
+    """
+    The iter_scraped consumer went away. Raised on the crawl thread, it takes
+    the Ctrl-C path of every crawl mode, so the journal is kept for a resume.
+    """
+
+
+def _stop_if_closed(stream: _RowStream | None) -> None:
+    """Raise _StreamClosed once nobody reads ``stream`` any more."""
+    if stream is not None and stream.closed:
+        raise _StreamClosed
+
+
+def _interrupt_cause(e: KeyboardInterrupt) -> str:
+    """What stopped the crawl, for the [interrupt] log line."""
+    return "Stream consumer stopped" if isinstance(e, _StreamClosed) else "Ctrl-C received"
+
+
+def _emit(records: list[dict], i: int, stream: _RowStream | None) -> None:
+    """
+    Stream records[i] and let go of it: the journal holds it for a resume.
+
+    Raises _StreamClosed (before letting go) when the consumer has gone away.
+    """
+    if stream is not None:
+        _stop_if_closed(stream)
+        rec, records[i] = records[i], None
+        stream.put(rec)
+
+
+def _skip_dead_letter(records: list[dict], i: int, stream: _RowStream | None = None) -> bool:
+    """Mark records[i] instead of fetching its detail page if it is dead-lettered."""
+    if records[i].get("entry_url") not in DEAD_LETTERS:
+        return False
+    _mark_detail_failed(records[i], DEAD_LETTER)
+    _journal_detail(records, i, stream)
+    return True
+
+
+def _checkpoint(records: list[dict], label: str = "[checkpoint]") -> None:
+    """Chunk boundary: make the journal durable (nothing is rewritten)."""
+    if _JOURNAL is not None:
+        with RUN_METRICS.timer("checkpoint_seconds", kind="commit"):
+            _JOURNAL.commit()
+        _log(f"{label} {len(records)} rows journaled -> {_JOURNAL.path}")
+
+
 # -----------------------------
 # Parallel detail fetch for a subset of records
 # -----------------------------
-def _fetch_details_for_indices(records: list[dict], indices: list[int]) -> tuple[int, int]:
-    """
-    Fetch /result/<id> detail pages in parallel for only the specified record indices.
+def _apply_detail(r: dict, extra: dict) -> None:
+    """Merge parsed /result/<id> fields into a raw survey record in place."""
+    r["detail_error"] = None
+    # Prefer the detail "Notes" over list-page comments when available
+    if extra.get("detail_comments"):
+        r["comments"] = extra["detail_comments"]
 
-    Returns:
-      (updated_count, failed_count)
+    # Overwrite the detail fields in the raw record (is_international stays a raw boolean)
+    for k in (*RESULT_EXTRACTOR.fields, "degree_level"):
+        if k != "detail_comments":
+            r[k] = extra.get(k)
+
+    # Final safety cleanup for numeric-ish fields
+    for k in ["gpa", "gre_total", "gre_v", "gre_aw"]:
+        r[k] = clean_label_value(r.get(k))
+
+
+def _mark_detail_failed(r: dict, reason: str) -> None:
     """
-    tasks: list[tuple[int, str]] = []
-    for i in indices:
-        u = _canonical_result_url(records[i].get("entry_url"))
-        if _valid_result_url(u):
-            records[i]["entry_url"] = u
-            tasks.append((i, u))
+    Record that the /result/<id> page of ``r`` could not be fetched: detail
+    fields stay None and ``detail_error`` says why (e.g. "HTTP 503",
+    "timeout"). A fetched page sets ``detail_error`` to None.
+    """
+    _apply_detail(r, _empty_detail())
+    r["detail_error"] = reason
+
+
+def _detail_error_reason(e: BaseException) -> str:
+    """Short error class for ``detail_error``."""
+    if isinstance(e, FetchError):
+        return e.reason
+    if isinstance(e, (TimeoutError, FuturesTimeoutError)):
+        return "timeout"
+    status = getattr(e, "status", None)
+    return f"HTTP {status}" if status else type(e).__name__
+
+
+# Record keys _apply_detail may change (what a journal "detail" line holds)
+_DETAIL_KEYS = (
+    "comments",
+    *(k for k in RESULT_EXTRACTOR.fields if k != "detail_comments"),
+    "degree_level",
+    "detail_error",
+)
 
-    if not tasks:
-        return 0, 0
 
+def _fetch_details_threaded(
+    records: list[dict], tasks: list[tuple[int, str]], stream: _RowStream | None = None
+) -> tuple[int, int]:
+    """Thread-pool backend: one blocking fetch per worker thread."""
     updated = 0
     failed = 0
 
@@ -418,190 +1002,1409 @@ def _fetch_details_for_indices(records: list[dict], indices: list[int]) -> tuple
         # Map each future back to its record index and URL
         future_map = {ex.submit(_parse_result_page, url): (i, url) for (i, url) in tasks}
 
-        for fut in as_completed(future_map):
-            i, url = future_map[fut]
-            try:
-                extra = fut.result(timeout=DETAIL_FUTURE_TIMEOUT_S)
-            except FuturesTimeoutError as e:
-                failed += 1
-                print(f"[details worker timeout] {url} :: {e}")
-                continue
-            except Exception as e:  # pylint: disable=broad-exception-caught
-                failed += 1
-                print(f"[details worker error] {url} :: {e}")
-                continue
+        try:
+            for fut in as_completed(future_map):
+                i, url = future_map[fut]
+                try:
+                    extra = fut.result(timeout=DETAIL_FUTURE_TIMEOUT_S)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    failed += 1
+                    _log(f"[details worker error] {url} :: {e!r}")
+                    _mark_detail_failed(records[i], _detail_error_reason(e))
+                    _journal_detail(records, i, stream)
+                    continue
 
-            r = records[i]
-
-            # Prefer the detail "Notes" over list-page comments when available
-            if extra.get("detail_comments"):
-                r["comments"] = extra["detail_comments"]
-
-            # Overwrite the detail fields in the raw record
-            for k in [
-                "degree",
-                "degree_level",
-                "gpa",
-                "gre_total",
-                "gre_v",
-                "gre_aw",
-                "start_term",
-                "start_year",
-            ]:
-                r[k] = extra.get(k)
-            # Store international status as raw boolean
-            r["is_international"] = extra.get("is_international")
-
-            # Final safety cleanup for numeric-ish fields
-            for k in ["gpa", "gre_total", "gre_v", "gre_aw"]:
-                r[k] = _clean_bad_label_values(r.get(k))
-
-            updated += 1
+                _apply_detail(records[i], extra)
+                _journal_detail(records, i, stream)
+                updated += 1
+        except KeyboardInterrupt:
+            # Only the fetches already running hold up the executor's exit
+            for fut in future_map:
+                fut.cancel()
+            raise
 
     return updated, failed
 
 
-# -----------------------------
-# Main scrape pipeline (pull NEW rows only)
-# -----------------------------
-def scrape_data(resume: bool = True) -> None:  # pylint: disable=too-many-locals,too-many-branches,too-many-statements,unused-argument
+def _fetch_details_async(  # pylint: disable=too-many-locals
+    records: list[dict], tasks: list[tuple[int, str]], stream: _RowStream | None = None
+) -> tuple[int, int]:
     """
-    Scrape survey pages from newest to older, collecting only entries that are
-    not already present in Postgres. Optionally fetch detail pages in chunks.
+    Asyncio backend: all requests share one event loop (see src.async_fetch).
+
+    DETAIL_FUTURE_TIMEOUT_S becomes a per-URL deadline covering every retry,
+    matching the per-future timeout of the thread-pool backend.
     """
-    existing_urls = load_existing_urls_from_db()
-    print(f"[db] loaded {len(existing_urls)} existing urls from postgres")
+    # Several rows may point at the same URL; every one of them gets the detail
+    by_url: dict[str, list[int]] = {}
+    for i, url in tasks:
+        by_url.setdefault(url, []).append(i)
+
+    counts = {"updated": 0, "failed": 0}
+    # With a parse pool the event loop only submits pages; they are merged
+    # after the fetch, in submission order
+    pool = _parse_pool()
+    parsing: list[tuple[str, list[int], Future]] = []
+
+    def fail(url: str, idxs: list[int], error: BaseException) -> None:
+        counts["failed"] += len(idxs)
+        _log(f"[details worker error] {url} :: {error!r}")
+        for i in idxs:
+            _mark_detail_failed(records[i], _detail_error_reason(error))
+            _journal_detail(records, i, stream)
+
+    def merge(url: str, idxs: list[int], parse) -> None:
+        try:
+            extra = parse()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            fail(url, idxs, e)
+            return
+        for i in idxs:
+            _apply_detail(records[i], extra)
+            _journal_detail(records, i, stream)
+        counts["updated"] += len(idxs)
+
+    def on_result(url: str, html: str | None, error: BaseException | None) -> None:
+        idxs = by_url[url]
+        if error is not None:
+            fail(url, idxs, error)
+        elif pool is not None:
+            parsing.append((url, idxs, pool.submit(_timed_parse, _parse_result_html, html)))
+        else:
+            merge(url, idxs, lambda: _parse(_parse_result_html, html))
+
+    # Detail pages still fresh in the HTTP cache never reach the event loop
+    cache = _http_cache()
+    if cache is not None:
+        for url in list(by_url):
+            html = cache.fresh_text(url)
+            if html is not None:
+                on_result(url, html, None)
+                del by_url[url]
+
+    # ETag/Last-Modified of each fetched page, handed over just before its result
+    validators: dict[str, tuple[str | None, str | None]] = {}
+
+    def on_headers(url: str, headers: dict[str, str]) -> None:
+        validators[url] = (headers.get("etag"), headers.get("last-modified"))
+
+    def on_fetched(url: str, html: str | None, error: BaseException | None) -> None:
+        etag, last_modified = validators.pop(url, (None, None))
+        if cache is not None and html:
+            cache.store(url, html, etag, last_modified)
+        if html:
+            _archive_page(url, html)
+        on_result(url, html, error)
+
+    async_fetch.fetch_all(
+        by_url,
+        on_fetched,
+        max_in_flight=ASYNC_MAX_IN_FLIGHT,
+        deadline_s=DETAIL_FUTURE_TIMEOUT_S,
+        retries=RETRIES,
+        backoff_s=BACKOFF_S,
+        backoff_cap_s=BACKOFF_CAP_S,
+        timeout_s=TIMEOUT_S,
+        user_agent=USER_AGENT,
+        budget=RETRY_BUDGET,
+        breaker=RETRY_BREAKER,
+        observe=_observe_fetch,
+        controller=RATE_CONTROLLER,
+        on_headers=on_headers,
+        log=_LOG,
+    )
 
-    # New records found during this run
-    records: list[dict] = []
+    def pooled_result(fut: Future) -> dict:
+        extra, cpu_s = fut.result()
+        _count_parse(cpu_s, inline=False)
+        return extra
 
-    # In-memory duplicate tracking begins with database URLs
-    seen_urls: set[str] = set(existing_urls)
+    for url, idxs, fut in parsing:
+        merge(url, idxs, lambda f=fut: pooled_result(f))
+    return counts["updated"], counts["failed"]
 
-    # Track which newly-added records still need detail fetching
-    chunk_new_indices: list[int] = []
-    total_failed_details = 0
 
-    # Early stop tracking
-    pages_with_no_new = 0
+def _fetch_details_for_indices(
+    records: list[dict], indices: list[int], stream: _RowStream | None = None
+) -> tuple[int, int]:
+    """
+    Fetch /result/<id> detail pages in parallel for only the specified record indices.
 
-    try:
-        for page in range(1, SURVEY_PAGES + 1):
-            url = f"{BASE_URL}?page={page}"
-            print(f"[survey] page {page}: {url}")
+    The backend is chosen by DETAIL_BACKEND ("threads" or "asyncio").
+    Dead-lettered URLs are not fetched (see _skip_dead_letter).
 
-            html = _safe_fetch_html(url)
-            if not html:
-                print("  -> skipped (fetch failed)")
-                continue
+    Returns:
+      (updated_count, failed_count)
+    """
+    tasks: list[tuple[int, str]] = []
+    for i in indices:
+        u = _canonical_result_url(records[i].get("entry_url"))
+        if _valid_result_url(u):
+            records[i]["entry_url"] = u
+            if not _skip_dead_letter(records, i, stream):
+                tasks.append((i, u))
+
+    if not tasks:
+        return 0, 0
 
-            page_records = _parse_survey_page(html, url)
+    if DETAIL_BACKEND == "asyncio":
+        return _fetch_details_async(records, tasks, stream)
+    return _fetch_details_threaded(records, tasks, stream)
 
-            added = 0
-            for rec in page_records:
-                u = _canonical_result_url(rec.get("entry_url"))
-                rec["entry_url"] = u
 
-                if not _valid_result_url(u):
-                    continue
+# -----------------------------
+# Main scrape pipeline (pull NEW rows only)
+# -----------------------------
+REQUIRED_KEYS = [
+    "program_name_raw", "university_raw", "comments", "date_posted", "entry_url",
+    "applicant_status", "accepted_date", "rejected_date",
+    "start_term", "start_year", "is_international",
+    "gre_total", "gre_v", "gre_aw", "degree_level", "degree", "gpa",
+    "source_url", "scraped_at", "detail_error",
+]
+
+
+def _collect_new_rows(
+    page_records: list[dict],
+    seen_ids: SeenIds,
+) -> list[dict]:
+    """Return the rows of one survey page that are not in the DB or seen earlier this run."""
+    candidates: list[tuple[dict, int]] = []
+    for rec in page_records:
+        u = _canonical_result_url(rec.get("entry_url"))
+        rec["entry_url"] = u
+
+        rid = _result_id(u) if _valid_result_url(u) else None
+        if rid is not None:
+            candidates.append((rec, rid))
+
+    if isinstance(seen_ids, DbPageDedup):
+        seen_ids.lookup([rid for _, rid in candidates])
+
+    new_rows: list[dict] = []
+    for rec, rid in candidates:
+        # Skip rows already in DB (or already seen during this run)
+        if rid in seen_ids:
+            continue
 
-                # Skip rows already in DB (or already seen during this run)
-                if u in seen_urls:
-                    continue
+        seen_ids.add(rid)
+        new_rows.append(rec)
+    RUN_METRICS.count("dedup_lookups", len(candidates))
+    RUN_METRICS.count("dedup_hits", len(candidates) - len(new_rows))
+    return new_rows
 
-                seen_urls.add(u)
-                records.append(rec)
-                chunk_new_indices.append(len(records) - 1)
-                added += 1
 
-            print(
+@dataclass
+class CrawlState:
+    """
+    Resumable position of a chunked or pipelined crawl.
+
+    Journaled after every survey page (``save``), so an interrupted run can
+    continue after the last handled page with the same early-stop counter and
+    the same rows still waiting for their detail pages.
+    """
+
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    page: int = 0  # last survey page handled
+    pages_with_no_new: int = 0  # early-stop counter
+    pending: list[int] = field(default_factory=list)  # record indices waiting for details
+    done: bool = False  # survey loop finished (early stop or last page)
+    interrupted: bool = False  # Ctrl-C: not journaled; keeps the journal for a resume
+
+    def save(self) -> None:
+        """Append this state to the run's journal."""
+        if _JOURNAL is not None:
+            _JOURNAL.state({
+                "run_id": self.run_id,
+                "page": self.page,
+                "pages_with_no_new": self.pages_with_no_new,
+                "pending": list(self.pending),
+                "done": self.done,
+            })
+
+    def pages(self) -> range:
+        """Survey pages still to fetch."""
+        return range(0) if self.done else range(self.page + 1, SURVEY_PAGES + 1)
+
+
+def _survey_rows(page: int) -> list[dict] | None:
+    """Parsed rows of one survey page, or None if it could not be fetched."""
+    url = f"{BASE_URL}?page={page}"
+    html = _safe_fetch_html(url)
+    return _parse(_parse_survey_page, html, url) if html else None
+
+
+def _survey_pages(state: CrawlState) -> Iterator[tuple[int, list[dict] | None]]:
+    """
+    ``(page, rows)`` for the survey pages ``state`` has left, in page order:
+    one after another, or from BACKFILL_SHARDS concurrent shards in backfill
+    mode.
+    """
+    if CRAWL_MODE == "backfill":
+        _log(f"[backfill] {BACKFILL_SHARDS} shards, checkpoints in {BACKFILL_DIR}")
+        pages = survey_backfill.backfill(
+            state.pages(), _survey_rows, BACKFILL_SHARDS, BACKFILL_DIR, log=_LOG
+        )
+        for page, rows in pages:
+            # Pages read back from a checkpoint hold JSON dicts
+            yield page, rows and [ApplicantRecord.coerce(r) for r in rows]
+        return
+    for page in state.pages():
+        yield page, _survey_rows(page)
+
+
+def _scrape_chunked(  # pylint: disable=too-many-branches,too-many-statements
+    seen_ids: SeenIds,
+    records: list[dict] | None = None,
+    state: CrawlState | None = None,
+    stream: _RowStream | None = None,
+) -> tuple[list[dict], int]:
+    """
+    Survey pages are handled in page order (fetched one after another, or by
+    concurrent shards in backfill mode); every CHUNK_SURVEY_PAGES pages
+    the loop pauses to fetch details for that chunk's new rows, then checkpoints.
+
+    A resumed run passes the ``records`` replayed from the journal and the
+    journaled ``state``: the loop continues after ``state.page`` and
+    ``state.pending`` rows get their details with the current chunk.
+
+    Returns:
+      (records, total_failed_details)
+    """
+    # New records found during this run
+    records = [] if records is None else records
+    state = CrawlState() if state is None else state
+    total_failed_details = 0
+
+    try:
+        for page, page_records in _survey_pages(state):
+            _stop_if_closed(stream)
+            _log(f"[survey] page {page}: {BASE_URL}?page={page}")
+            if page_records is None:
+                _log("  -> skipped (fetch failed)")
+                state.page = page
+                state.save()
+                continue
+
+            # state.pending tracks which newly-added records still need detail fetching
+            new_rows = _collect_new_rows(page_records, seen_ids)
+            for rec in new_rows:
+                i = _add_record(records, rec)
+                if FETCH_DETAILS:
+                    state.pending.append(i)
+                else:
+                    _emit(records, i, stream)  # final as listed
+            added = len(new_rows)
+
+            _log(
                 f"  parsed={len(page_records)} added={added} total={len(records)} "
-                f"chunk_pending={len(chunk_new_indices)}"
+                f"chunk_pending={len(state.pending)}"
             )
 
             # If we hit consecutive pages with no new rows, stop scanning older pages
-            if added == 0:
-                pages_with_no_new += 1
-            else:
-                pages_with_no_new = 0
+            state.pages_with_no_new = 0 if added else state.pages_with_no_new + 1
+            state.page = page
+            state.done = (
+                CRAWL_MODE != "backfill"
+                and state.pages_with_no_new >= STOP_AFTER_PAGES_WITH_NO_NEW
+            )
+            state.save()
 
-            if pages_with_no_new >= STOP_AFTER_PAGES_WITH_NO_NEW:
-                print(
+            if state.done:
+                _log(
                     "[early stop] "
                     f"{STOP_AFTER_PAGES_WITH_NO_NEW} consecutive pages with no new rows. "
                     "Stopping."
                 )
-
-                # Before stopping, fetch details for any remaining new rows in this chunk
-                if FETCH_DETAILS and chunk_new_indices:
-                    print(f"[details] early-stop final fetch for {len(chunk_new_indices)} rows ...")
-                    updated, failed = _fetch_details_for_indices(records, chunk_new_indices)
-                    total_failed_details += failed
-                    print(f"[details] early-stop done: updated={updated}, failed={failed}")
-                    chunk_new_indices = []
-
-                    save_data(records, UPDATE_OUTPUT_JSON)
-                    print(f"[checkpoint] saved {len(records)} rows -> {UPDATE_OUTPUT_JSON}")
-
                 break
 
             # Chunk boundary: fetch details for accumulated new rows
-            if FETCH_DETAILS and (page % CHUNK_SURVEY_PAGES == 0) and chunk_new_indices:
-                print(
-                    f"[details] fetching details for last {len(chunk_new_indices)} new rows "
-                    f"(workers={MAX_WORKERS}) ..."
+            if FETCH_DETAILS and (page % CHUNK_SURVEY_PAGES == 0) and state.pending:
+                _log(
+                    f"[details] fetching details for last {len(state.pending)} new rows "
+                    f"(backend={DETAIL_BACKEND}) ..."
                 )
-                updated, failed = _fetch_details_for_indices(records, chunk_new_indices)
+                updated, failed = _fetch_details_for_indices(records, state.pending, stream)
                 total_failed_details += failed
-                print(
+                _log(
                     f"[details] chunk done: updated={updated}, failed={failed}, "
                     f"total_failed_details={total_failed_details}"
                 )
-                chunk_new_indices = []
-
-                save_data(records, UPDATE_OUTPUT_JSON)
-                print(f"[checkpoint] saved {len(records)} rows -> {UPDATE_OUTPUT_JSON}")
-
-            # If detail fetching is disabled, still checkpoint on the same schedule
-            if page % CHUNK_SURVEY_PAGES == 0 and not FETCH_DETAILS:
-                save_data(records, UPDATE_OUTPUT_JSON)
-                print(f"[checkpoint] saved {len(records)} rows -> {UPDATE_OUTPUT_JSON}")
-
-            time.sleep(DELAY_BETWEEN_SURVEY_PAGES_S)
-
-    except KeyboardInterrupt:
-        # Save partial results on Ctrl-C so progress isn't lost
-        print("\n[interrupt] Ctrl-C received. Saving update data...")
-        save_data(records, UPDATE_OUTPUT_JSON)
-        print(f"[interrupt] saved {len(records)} rows -> {UPDATE_OUTPUT_JSON}")
-
-    # Final detail fetch for any records still pending detail extraction
-    if FETCH_DETAILS and chunk_new_indices:
-        print(f"[details] final fetch for remaining {len(chunk_new_indices)} rows ...")
-        updated, failed = _fetch_details_for_indices(records, chunk_new_indices)
-        total_failed_details += failed
-        print(
-            f"[details] final done: updated={updated}, failed={failed}, "
-            f"total_failed_details={total_failed_details}"
-        )
+                state.pending = []
+                state.save()
+
+            # Checkpoint on the chunk schedule whether or not details are fetched
+            if page % CHUNK_SURVEY_PAGES == 0:
+                _checkpoint(records)
+        else:
+            state.done = True
+
+        # Final detail fetch for any records still pending detail extraction
+        if FETCH_DETAILS and state.pending:
+            _log(f"[details] final fetch for remaining {len(state.pending)} rows ...")
+            updated, failed = _fetch_details_for_indices(records, state.pending, stream)
+            total_failed_details += failed
+            _log(
+                f"[details] final done: updated={updated}, failed={failed}, "
+                f"total_failed_details={total_failed_details}"
+            )
+            state.pending = []
+
+    except KeyboardInterrupt as e:
+        # Keep the journal (page cursor + pending details) so the run can resume
+        _log(f"\n[interrupt] {_interrupt_cause(e)}. Saving update data...")
+        state.interrupted = True
+        state.save()
+        _checkpoint(records, "[interrupt]")
+        return records, total_failed_details
+
+    state.save()
+
+    return records, total_failed_details
+
+
+class _DetailPipeline:  # pylint: disable=too-many-instance-attributes
+    """
+    Detail workers that drain a bounded queue of (index, url, chunk) items
+    while the survey loop keeps producing.
+
+    A chunk checkpoint is written once the survey loop has passed the chunk's
+    last page and every detail fetch of that chunk (and all earlier chunks) has
+    finished, so a checkpoint still means "these chunks are complete".
+    """
+
+    def __init__(
+        self,
+        records: list[dict],
+        workers: int,
+        queue_size: int,
+        stream: _RowStream | None = None,
+    ):
+        self.records = records
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.updated = 0
+        self.failed = 0
+        self._q: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._outstanding: dict[int, int] = {}
+        self._queued: set[int] = set()  # record indices whose detail fetch is not done
+        self._closed_through = 0  # chunks below this number will get no more rows
+        self._saved_through = 0
+        self._dirty = False
+        self._threads = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def add(self, rec: dict, chunk: int) -> None:
+        """Append a new row and queue its detail fetch (blocks when the queue is full)."""
+        with self.lock:
+            i = _add_record(self.records, rec)
+        self.queue_existing(i, chunk)
+
+    def queue_existing(self, i: int, chunk: int) -> None:
+        """Queue the detail fetch of a row already in ``records`` (e.g. replayed)."""
+        with self.lock:
+            dead = _skip_dead_letter(self.records, i)
+            if not dead:
+                self._outstanding[chunk] = self._outstanding.get(chunk, 0) + 1
+                self._queued.add(i)
+        if dead:
+            _emit(self.records, i, self.stream)
+            return
+        try:
+            self._q.put((i, self.records[i]["entry_url"], chunk))
+        except KeyboardInterrupt:
+            # Never queued: do not leave the chunk waiting on it forever
+            with self.lock:
+                self._outstanding[chunk] -= 1
+                self._queued.discard(i)
+            raise
+
+    def pending(self) -> list[int]:
+        """Indices queued or in flight (journaled with the crawl state)."""
+        with self.lock:
+            return sorted(self._queued)
+
+    def close_chunks(self, through: int) -> None:
+        """The survey loop has moved past every chunk below ``through``."""
+        with self.lock:
+            self._closed_through = max(self._closed_through, through)
+            self._maybe_checkpoint()
+
+    def finish(self) -> None:
+        """Let the workers drain the queue, then stop them."""
+        for _ in self._threads:
+            self._q.put(None)
+        for t in self._threads:
+            t.join()
+
+    def cancel(self) -> int:
+        """
+        Drop the queued fetches no worker has started, let the ones in flight
+        finish, then stop the workers. Dropped rows stay in ``pending()`` (and
+        their chunks incomplete), so a resumed run fetches them.
+
+        Returns:
+          number of dropped fetches
+        """
+        dropped = 0
+        while True:
+            try:
+                self._q.get_nowait()
+            except queue.Empty:
+                break
+            dropped += 1
+        self.finish()
+        return dropped
+
+    def _work(self) -> None:
+        while True:
+            item = self._q.get()
+            if item is None:
+                return
+            i, url, chunk = item
+            if self.stream is not None and self.stream.closed:
+                continue  # nobody reads the rows: leave it pending for a resume
+            extra = error = None
+            try:
+                extra = _parse_result_page(url)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                _log(f"[details worker error] {url} :: {e!r}")
+                error = e
+
+            with self.lock:
+                if error is not None:
+                    _mark_detail_failed(self.records[i], _detail_error_reason(error))
+                    self.failed += 1
+                else:
+                    _apply_detail(self.records[i], extra)
+                    self.updated += 1
+                _journal_detail(self.records, i)
+                self._outstanding[chunk] -= 1
+                self._queued.discard(i)
+                self._dirty = True
+                self._maybe_checkpoint()
+            # Outside the lock: a full stream must not stall the other workers.
+            # A closed stream is the survey loop's to act on.
+            with contextlib.suppress(_StreamClosed):
+                _emit(self.records, i, self.stream)
+
+    def _maybe_checkpoint(self) -> None:
+        # Caller holds self.lock
+        advanced = False
+        while (
+            self._saved_through < self._closed_through
+            and not self._outstanding.get(self._saved_through)
+        ):
+            self._saved_through += 1
+            advanced = True
+        if advanced and self._dirty:
+            self._dirty = False
+            _checkpoint(
+                self.records,
+                f"[checkpoint] chunks 1-{self._saved_through} complete (updated={self.updated}, "
+                f"failed={self.failed}, queued={self._q.qsize()}):",
+            )
+
 
-    # Defensive schema: guarantee keys exist even if some pages were missing fields
-    required_keys = [
-        "program_name_raw", "university_raw", "comments", "date_posted", "entry_url",
-        "applicant_status", "accepted_date", "rejected_date",
-        "start_term", "start_year", "is_international",
-        "gre_total", "gre_v", "gre_aw", "degree_level", "degree", "gpa",
-        "source_url", "scraped_at",
+def _scrape_pipelined(  # pylint: disable=too-many-locals
+    seen_ids: SeenIds,
+    records: list[dict] | None = None,
+    state: CrawlState | None = None,
+    stream: _RowStream | None = None,
+) -> tuple[list[dict], int]:
+    """
+    Producer/consumer crawl: the survey loop feeds new entry URLs into a
+    bounded queue (PIPELINE_QUEUE_SIZE) and MAX_WORKERS detail threads drain
+    it continuously. A full queue blocks the survey loop (backpressure).
+
+    Early stop and chunk checkpoints keep the chunked-mode meaning. A resumed
+    run continues after ``state.page``; replayed ``records`` listed in
+    ``state.pending`` join the chunk of that page. Ctrl-C drops the queued
+    detail fetches, which stay in ``state.pending``.
+
+    Returns:
+      (records, total_failed_details)
+    """
+    records = [] if records is None else records
+    state = CrawlState() if state is None else state
+    pipe = _DetailPipeline(records, MAX_WORKERS, PIPELINE_QUEUE_SIZE, stream)
+    last_chunk = state.page // CHUNK_SURVEY_PAGES
+    # Chunks before the resume page were checkpointed by the interrupted run
+    pipe.close_chunks(last_chunk)
+
+    try:
+        for i in state.pending:
+            pipe.queue_existing(i, last_chunk)
+        for page in state.pages():
+            _stop_if_closed(stream)
+            url = f"{BASE_URL}?page={page}"
+            chunk = (page - 1) // CHUNK_SURVEY_PAGES
+            last_chunk = chunk
+            _log(f"[survey] page {page}: {url}")
+
+            html = _safe_fetch_html(url)
+            if html:
+                page_records = _parse(_parse_survey_page, html, url)
+                new_rows = _collect_new_rows(page_records, seen_ids)
+                for rec in new_rows:
+                    pipe.add(rec, chunk)
+
+                _log(
+                    f"  parsed={len(page_records)} added={len(new_rows)} total={len(records)} "
+                    f"detail_done={pipe.updated + pipe.failed}"
+                )
+                state.pages_with_no_new = 0 if new_rows else state.pages_with_no_new + 1
+            else:
+                _log("  -> skipped (fetch failed)")
+
+            state.page = page
+            state.pending = pipe.pending()
+            state.done = state.pages_with_no_new >= STOP_AFTER_PAGES_WITH_NO_NEW
+            state.save()
+            if state.done:
+                _log(
+                    "[early stop] "
+                    f"{STOP_AFTER_PAGES_WITH_NO_NEW} consecutive pages with no new rows. "
+                    "Stopping."
+                )
+                break
+
+            if page % CHUNK_SURVEY_PAGES == 0:
+                pipe.close_chunks(chunk + 1)
+        else:
+            state.done = True
+
+    except KeyboardInterrupt as e:
+        _log(f"\n[interrupt] {_interrupt_cause(e)}. Saving update data...")
+        state.interrupted = True
+        with pipe.lock:
+            _checkpoint(records, "[interrupt]")
+        dropped = pipe.cancel()
+        _log(f"[details] cancelled {dropped} queued detail fetches (left for the resume)")
+    else:
+        # Same as the chunked final fetch: pending rows still get their details
+        _log("[details] waiting for queued detail fetches ...")
+        pipe.finish()
+    pipe.close_chunks(last_chunk + 1)
+    state.pending = pipe.pending()
+    state.save()
+    _log(f"[details] pipeline done: updated={pipe.updated}, failed={pipe.failed}")
+    return records, pipe.failed
+
+
+# -----------------------------
+# Frontier crawl (/result/<id> above the newest stored id)
+# -----------------------------
+def _result_url(rid: int) -> str:
+    return _canonical_result_url(urljoin(BASE_URL, f"/result/{rid}"))
+
+
+def _scrape_frontier(top: int, stream: _RowStream | None = None) -> tuple[list[dict], int]:
+    """
+    Incremental crawl bounded by the newest stored id instead of by empty pages.
+
+    Survey pages are read from page 1, and every row with an id above ``top``
+    (the newest id in Postgres) goes straight to the detail threads of a
+    _DetailPipeline, so detail pages are fetched while the walk goes on. The
+    walk stops at the first page that lists an id at or below ``top``; rows
+    without a /result/<id> link are skipped and do not stop it. Unlike
+    the chunked crawl it reads no trailing pages without new rows, and only
+    listed ids are fetched, so deleted or moderated ids cost no request.
+    Without FETCH_DETAILS the rows are kept as listed and no detail page is
+    fetched.
+
+    Returns:
+      (records, total_failed_details)
+    """
+    records: list[dict] = []
+    seen: set[int] = set()
+    pipe = _DetailPipeline(records, MAX_WORKERS, PIPELINE_QUEUE_SIZE, stream)
+    page = 0
+    try:
+        for page in range(1, SURVEY_PAGES + 1):
+            _stop_if_closed(stream)
+            url = f"{BASE_URL}?page={page}"
+            html = _safe_fetch_html(url)
+            if not html:
+                _log(f"[survey] page {page}: skipped (fetch failed)")
+                continue
+            rows = _parse(_parse_survey_page, html, url)
+            ids = [_result_id(r.get("entry_url")) for r in rows]
+            newer = [r for r, rid in zip(rows, ids) if rid is not None and rid > top]
+            for rec in _collect_new_rows(newer, seen):
+                if FETCH_DETAILS:
+                    pipe.add(rec, 0)
+                else:
+                    _emit(records, _add_record(records, rec), stream)  # final as listed
+            _log(f"[survey] page {page}: rows={len(rows)} above_frontier={len(newer)}")
+            if not rows or len(newer) < len(ids) - ids.count(None):
+                break  # reached entries that are already stored
+    except KeyboardInterrupt as e:
+        _log(f"\n[interrupt] {_interrupt_cause(e)}. Stopping the survey walk.")
+        dropped = pipe.cancel()
+        _log(f"[details] cancelled {dropped} queued detail fetches")
+    else:
+        pipe.finish()
+
+    _log(
+        f"[frontier] top_id={top} survey_pages={page} rows={len(records)} "
+        f"updated={pipe.updated} failed={pipe.failed} "
+        f"requests~{page + pipe.updated + pipe.failed}"
+    )
+    return records, pipe.failed
+
+
+# -----------------------------
+# Distributed crawl (shared crawl_tasks queue, src.crawl_queue)
+# -----------------------------
+# Each worker process claims QUEUE_CLAIM_BATCH tasks per round trip on a
+# QUEUE_LEASE_S lease, and polls every QUEUE_POLL_S while other workers still
+# hold leases that may fail back into the queue.
+QUEUE_CLAIM_BATCH = 8
+QUEUE_LEASE_S = 120.0
+QUEUE_POLL_S = 1.0
+
+
+def seed_queue(pages: int = SURVEY_PAGES, fresh: bool = False) -> int:
+    """Enqueue survey pages 1..pages (``fresh`` drops every earlier task first)."""
+    with CrawlQueue(lease_s=QUEUE_LEASE_S) as q:
+        q.ensure_schema()
+        if fresh:
+            q.clear()
+        added = q.enqueue("survey", ((f"{BASE_URL}?page={p}", None) for p in range(1, pages + 1)))
+    _log(f"[queue] seeded {added} of {pages} survey pages")
+    return added
+
+
+def _run_queue_task(q: CrawlQueue, task: CrawlTask, seen_ids: DbPageDedup) -> bool:
+    """
+    Fetch one claimed task and report it back. A survey page enqueues its new
+    rows as result tasks (payload = survey row); a result page completes with
+    the merged record. Fetch failures go back to the queue for another attempt.
+    """
+    try:
+        html = _fetch_page(task.url)
+    except FetchError as e:
+        q.fail(task, e.reason)
+        return False
+    if task.kind == "survey":
+        rows = _collect_new_rows(_parse(_parse_survey_page, html, task.url), seen_ids)
+        queued = q.enqueue("result", ((r.entry_url, dict(r)) for r in rows))
+        return q.complete(task, {"new_rows": len(rows), "queued": queued})
+    rec = dict(task.payload or {"entry_url": task.url})
+    _apply_detail(rec, _parse(_parse_result_html, html))
+    return q.complete(task, rec)
+
+
+def run_queue_worker(q: CrawlQueue | None = None, max_tasks: int | None = None) -> dict[str, int]:
+    """
+    Claim and run tasks until the queue has nothing pending or leased.
+
+    Any number of these can run at once, on one host or several; dedup against
+    stored rows is per survey page (DbPageDedup), and across workers by the
+    unique task URL.
+
+    Returns:
+      tasks handled per outcome: {"survey": n, "result": n, "failed": n}
+    """
+    own = q is None
+    q = CrawlQueue(lease_s=QUEUE_LEASE_S) if q is None else q
+    seen_ids = DbPageDedup()
+    stats = {"survey": 0, "result": 0, "failed": 0}
+    t0 = time.perf_counter()
+    try:
+        while max_tasks is None or sum(stats.values()) < max_tasks:
+            tasks = q.claim(QUEUE_CLAIM_BATCH)
+            if not tasks:
+                counts = q.counts()
+                if not counts["pending"] and not counts["leased"]:
+                    break
+                q.reap()
+                time.sleep(QUEUE_POLL_S)
+                continue
+            for task in tasks:
+                ok = _run_queue_task(q, task, seen_ids)
+                stats[task.kind if ok else "failed"] += 1
+    finally:
+        _shutdown_parse_pool()
+        seen_ids.close()
+        if own:
+            q.close()
+    elapsed = time.perf_counter() - t0
+    _log(
+        f"[queue] worker {q.worker_id} done: survey={stats['survey']} "
+        f"result={stats['result']} failed={stats['failed']} elapsed={elapsed:.1f}s"
+    )
+    return stats
+
+
+def export_queue(out_path: str = UPDATE_OUTPUT_JSON) -> list[dict]:
+    """
+    Write the records of every finished result task to ``out_path``. Rows whose
+    detail page failed every attempt keep their survey fields, with the
+    task's last error in ``detail_error`` (as in the other crawl modes).
+    """
+    with CrawlQueue(lease_s=QUEUE_LEASE_S) as q:
+        counts = q.counts()
+        finished = q.results()
+    records = []
+    for payload, result, last_error in finished:
+        rec = result
+        if rec is None:
+            rec = dict(payload or {})
+            _mark_detail_failed(rec, last_error or "fetch failed")
+        for k in REQUIRED_KEYS:
+            rec.setdefault(k, None)
+        records.append(rec)
+    record_journal.write_json_atomic(records, out_path)
+    _log(f"[queue] {counts} -> exported {len(records)} records to {out_path}")
+    if USE_FAILURE_LEDGER:
+        _update_failure_ledger(records)
+    return records
+
+
+# -----------------------------
+# Failure ledger and detail repair (src.failure_ledger)
+# -----------------------------
+# applicants columns a repaired detail page may fill; stored values are kept
+# where the page has nothing
+_REPAIR_UPDATE = """
+UPDATE applicants SET
+    comments = COALESCE(%(comments)s, comments),
+    term = COALESCE(%(term)s, term),
+    us_or_international = COALESCE(%(us_or_international)s, us_or_international),
+    gpa = COALESCE(%(gpa)s, gpa),
+    gre = COALESCE(%(gre)s, gre),
+    gre_v = COALESCE(%(gre_v)s, gre_v),
+    gre_aw = COALESCE(%(gre_aw)s, gre_aw),
+    degree = COALESCE(%(degree)s, degree)
+WHERE url = %(url)s;
+"""
+
+
+def _ledger_denied(err: InsufficientPrivilege) -> None:
+    # A least-privilege role without the ledger grants (README) still crawls
+    _log(
+        f"[ledger] skipped: {str(err).splitlines()[0]} "
+        "(grant access to detail_failures, or run with --no-ledger)"
+    )
+
+
+def _load_dead_letters() -> set[str]:
+    """The dead-letter list; empty when this role may not use the ledger."""
+    try:
+        with FailureLedger(dead_after=DEAD_AFTER) as ledger:
+            ledger.ensure_schema()
+            return ledger.dead_urls()
+    except InsufficientPrivilege as e:
+        _ledger_denied(e)
+        return set()
+
+
+def _update_failure_ledger(records: list[dict]) -> None:
+    """Record this run's failed detail pages (dead-lettered rows were not fetched)."""
+    failures = [
+        (r["entry_url"], r["detail_error"]) for r in records
+        if r.get("entry_url") and r.get("detail_error") not in (None, DEAD_LETTER)
     ]
+    skipped = sum(1 for r in records if r.get("detail_error") == DEAD_LETTER)
+    try:
+        with FailureLedger(dead_after=DEAD_AFTER) as ledger:
+            ledger.ensure_schema()
+            recorded, dead = ledger.record(failures)
+            counts = ledger.counts()
+    except InsufficientPrivilege as e:
+        _ledger_denied(e)
+        return
+    _log(
+        f"[ledger] failed={recorded} dead_lettered={dead} skipped_dead={skipped} "
+        f"-> pending={counts['pending']} dead={counts['dead']} (retry with --repair)"
+    )
+
+
+def _detail_columns(rec: dict) -> dict:
+    """applicants columns (plus ``url``) of a record whose detail page was re-fetched."""
+    row = clean_update.clean_data([rec])[0]
+    return {
+        "url": rec["entry_url"],
+        "comments": row["comments"],
+        "term": load_update.term_value(row),
+        "us_or_international": row["US/International"],
+        "gpa": load_update.safe_float(row["GPA"]),
+        "gre": load_update.safe_float(row["gre_total"]),
+        "gre_v": load_update.safe_float(row["gre_v"]),
+        "gre_aw": load_update.safe_float(row["gre_aw"]),
+        "degree": row["degree_level"] or row["degree"],
+    }
+
+
+def _patch_applicants(rows: list[dict]) -> list[str]:
+    """Apply repaired detail fields; returns the URLs that matched a stored row."""
+    patched = []
+    with connect_db() as conn:
+        with conn.cursor() as cur:
+            for row in rows:
+                cur.execute(_REPAIR_UPDATE, row)
+                if cur.rowcount:
+                    patched.append(row["url"])
+        conn.commit()
+    return patched
+
+
+def repair_details(limit: int | None = None, ledger: FailureLedger | None = None) -> dict[str, int]:
+    """
+    Re-fetch the detail pages the failure ledger has due (at most ``limit``),
+    in parallel through the usual detail backend, and patch their rows in
+    ``applicants``. Fixed URLs leave the ledger; URLs that fail again get a
+    longer wait, or are dead-lettered after DEAD_AFTER failures. A fixed URL
+    whose row is not in ``applicants`` yet stays in the ledger for a later repair.
+
+    Returns:
+      {"due": n, "patched": n, "not_stored": n, "failed": n, "dead_lettered": n}
+    """
+    own = ledger is None
+    ledger = FailureLedger(dead_after=DEAD_AFTER) if ledger is None else ledger
+    try:
+        ledger.ensure_schema()
+        records = [{"entry_url": url} for url, _ in ledger.due(limit)]
+        _fetch_details_for_indices(records, list(range(len(records))))
+        fixed = [r for r in records if "detail_error" in r and r["detail_error"] is None]
+        patched = _patch_applicants([_detail_columns(r) for r in fixed]) if fixed else []
+        ledger.resolve(patched)
+        failed, dead = ledger.record(
+            (r["entry_url"], r["detail_error"]) for r in records if r.get("detail_error")
+        )
+        counts = ledger.counts()
+    finally:
+        _shutdown_parse_pool()
+        if own:
+            ledger.close()
+    stats = {"due": len(records), "patched": len(patched), "not_stored": len(fixed) - len(patched),
+             "failed": failed, "dead_lettered": dead}
+    _log(
+        f"[repair] due={stats['due']} patched={stats['patched']} "
+        f"not_stored={stats['not_stored']} failed={failed} dead_lettered={dead} "
+        f"-> pending={counts['pending']} dead={counts['dead']}"
+    )
+    return stats
+
+
+# -----------------------------
+# Refresh of stored entries (src.refresh_schedule)
+# -----------------------------
+# A refresh run re-checks at most REFRESH_MAX_REQUESTS detail pages with
+# REFRESH_WORKERS threads and starts no new batch after REFRESH_MAX_S seconds,
+# so it stays small next to new-entry ingestion. Changed rows are written one
+# REFRESH_BATCH at a time.
+REFRESH_MAX_REQUESTS = 500
+REFRESH_MAX_S = 300.0
+REFRESH_WORKERS = 4
+REFRESH_BATCH = 50
+
+# Not (reliably) on the detail page: comments fall back to the survey row and
+# term may be inferred, so a missing value there does not clear the stored one
+_REFRESH_KEEP_IF_NONE = ("comments", "term")
+
+
+def _refresh_one(url: str) -> dict | None:
+    """Re-fetched detail columns of a stored entry; None if the page is unchanged (304)."""
+    html = _refetch_page(url)
+    if html is None:
+        return None
+    rec = {"entry_url": url}
+    _apply_detail(rec, _parse(_parse_result_html, html))
+    return _detail_columns(rec)
+
+
+def _refresh_change(current: dict, fresh: dict) -> dict | None:
+    """``url`` plus the columns whose re-fetched value differs, or None if none does."""
+    change = {
+        c: fresh[c] for c in REFRESH_COLUMNS
+        if fresh[c] != current[c] and not (fresh[c] is None and c in _REFRESH_KEEP_IF_NONE)
+    }
+    return {"url": current["url"], **change} if change else None
+
+
+def refresh_entries(  # pylint: disable=too-many-locals
+    max_requests: int | None = None,
+    max_s: float | None = None,
+    schedule: RefreshSchedule | None = None,
+) -> dict[str, int]:
+    """
+    Re-check stored entries that are due (recent ones more often, see
+    src.refresh_schedule) with conditional requests, and update the rows
+    whose parsed fields changed, one batch per transaction. A 304 skips the
+    parse. Stops at ``max_requests`` pages or, between batches, after
+    ``max_s`` seconds; whatever is left stays due for the next run.
+
+    Returns:
+      {"due": n, "checked": n, "not_modified": n, "changed": n, "updated": n, "failed": n}
+    """
+    max_requests = REFRESH_MAX_REQUESTS if max_requests is None else max_requests
+    deadline = time.monotonic() + (REFRESH_MAX_S if max_s is None else max_s)
+    own = schedule is None
+    schedule = RefreshSchedule() if schedule is None else schedule
+    stats = dict.fromkeys(("due", "checked", "not_modified", "changed", "updated", "failed"), 0)
+    try:
+        schedule.ensure_schema()
+        due = schedule.due(max_requests)
+        stats["due"] = len(due)
+        with ThreadPoolExecutor(max_workers=REFRESH_WORKERS) as ex:
+            for start in range(0, len(due), REFRESH_BATCH):
+                if time.monotonic() >= deadline:
+                    _log(f"[refresh] time budget used; {len(due) - start} entries stay due")
+                    break
+                batch = due[start:start + REFRESH_BATCH]
+                futures = [ex.submit(_refresh_one, row["url"]) for row in batch]
+                checked, changes = [], []
+                for current, fut in zip(batch, futures):
+                    try:
+                        fresh = fut.result(timeout=DETAIL_FUTURE_TIMEOUT_S)
+                    except Exception as e:  # pylint: disable=broad-exception-caught
+                        _log(f"[refresh] {current['url']} :: {_detail_error_reason(e)}")
+                        stats["failed"] += 1
+                        continue
+                    checked.append(current["url"])
+                    change = None if fresh is None else _refresh_change(current, fresh)
+                    stats["not_modified"] += fresh is None
+                    if change:
+                        changes.append(change)
+                if changes:
+                    stats["updated"] += schedule.apply(changes)
+                schedule.mark_checked(checked)
+                stats["checked"] += len(checked)
+                stats["changed"] += len(changes)
+    finally:
+        _shutdown_parse_pool()
+        if own:
+            schedule.close()
+    _log("[refresh] " + " ".join(f"{k}={v}" for k, v in stats.items()))
+    return stats
+
+
+# -----------------------------
+# Offline re-parse from the HTML archive
+# -----------------------------
+REPARSE_WORKERS = os.cpu_count() or 1
+
+
+def _survey_page_no(url: str) -> int:
+    m = re.search(r"[?&]page=(\d+)", url)
+    return int(m.group(1)) if m else 0
+
+
+def _reparse_survey(job: tuple[str, dict]) -> list[ApplicantRecord]:
+    """Process-pool task: parse one archived survey page (scraped_at = fetch time)."""
+    root, entry = job
+    rows = _parse_survey_page(html_archive.read_entry(root, entry), entry["url"])
+    for r in rows:
+        r["scraped_at"] = entry["fetched_at"]
+    return rows
+
+
+def _reparse_detail(job: tuple[str, dict]) -> dict:
+    """Process-pool task: parse one archived /result/<id> page."""
+    root, entry = job
+    return _parse_result_html(html_archive.read_entry(root, entry))
+
+
+def _map_jobs(fn, jobs: list, workers: int) -> list:
+    """Ordered map over jobs, in-process for one worker, else across processes."""
+    if workers <= 1 or len(jobs) <= 1:
+        return [fn(j) for j in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(fn, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def reparse_archive(
+    archive_dir: str = ARCHIVE_DIR,
+    out_path: str = UPDATE_OUTPUT_JSON,
+    workers: int = REPARSE_WORKERS,
+) -> list[ApplicantRecord]:
+    """
+    Rebuild the update JSON from archived HTML only (no network, no database).
+
+    Uses the latest archived copy of every survey page (newest page first, so
+    duplicates keep their newest row) and of every /result/<id> page. Rows whose
+    detail page was never archived keep list-page fields only.
+    """
+    t0 = time.perf_counter()
+    latest = html_archive.latest_entries(archive_dir)
+    surveys = sorted(
+        (e for u, e in latest.items() if url_class(u) == "survey" and _survey_page_no(u)),
+        key=lambda e: _survey_page_no(e["url"]),
+    )
+    _log(f"[reparse] {len(surveys)} survey pages, {len(latest) - len(surveys)} other pages "
+          f"in {archive_dir} (workers={workers})")
+
+    records: list[ApplicantRecord] = []
+    seen: set[int] = set()
+    for rows in _map_jobs(_reparse_survey, [(archive_dir, e) for e in surveys], workers):
+        records.extend(_collect_new_rows(rows, seen))
+
+    with_detail = [i for i, r in enumerate(records) if r["entry_url"] in latest]
+    jobs = [(archive_dir, latest[records[i]["entry_url"]]) for i in with_detail]
+    for i, extra in zip(with_detail, _map_jobs(_reparse_detail, jobs, workers)):
+        _apply_detail(records[i], extra)
+
+    save_data(records, out_path)
+    _log(
+        f"[reparse] saved {len(records)} records ({len(with_detail)} with details) -> "
+        f"{out_path} in {time.perf_counter() - t0:.1f}s"
+    )
+    return records
+
+
+def _replay_journal(seen_ids: SeenIds) -> tuple[list[dict], CrawlState | None]:
+    """
+    Rows and crawl state journaled by an interrupted run; their ids join
+    ``seen_ids``. Pending rows whose details were journaled after the last
+    state are dropped from the state. A journal without a state (the run died
+    before its first survey page was done) restarts at page 1 with every row
+    that has no details pending.
+    """
+    path = _journal_path()
+    if not os.path.exists(path):
+        return [], None
+    records, enriched, saved = record_journal.replay(path)
+    records = [ApplicantRecord.from_dict(r) for r in records]
     for r in records:
-        for k in required_keys:
-            r.setdefault(k, None)
+        rid = _result_id(r.get("entry_url"))
+        if rid is not None:
+            seen_ids.add(rid)
+    if saved is None:
+        state = CrawlState(pending=list(range(len(records))))
+    else:
+        state = CrawlState(**saved)
+    state.pending = [i for i in state.pending if i not in enriched]
+    _log(
+        f"[resume] run {state.run_id}: replayed {len(records)} rows from {path}, "
+        f"continuing after survey page {state.page} ({len(state.pending)} detail fetches pending)"
+    )
+    return records, state
+
+
+def _write_run_report(rows: int, elapsed: float, process_cpu_s: float) -> dict:
+    """Write this run's RUN_METRICS to METRICS_JSON (and METRICS_PROM); returns the report."""
+    lookups = RUN_METRICS.counter("dedup_lookups")
+    report = RUN_METRICS.report(
+        mode=CRAWL_MODE,
+        rows=rows,
+        elapsed_s=round(elapsed, 3),
+        rows_per_sec=round(rows / elapsed, 3) if elapsed else 0.0,
+        cpu_s=round(process_cpu_s, 3),
+        dedup_hit_rate=round(RUN_METRICS.counter("dedup_hits") / lookups, 4) if lookups else 0.0,
+        http=HTTP_POOL.stats(),
+    )
+    run_metrics.write_report(report, METRICS_JSON, METRICS_PROM)
+    fetch = " ".join(
+        f"{h['labels']['url_class']}_p50={1000 * h['p50']:.0f}ms "
+        f"{h['labels']['url_class']}_p90={1000 * h['p90']:.0f}ms"
+        for h in report["histograms"] if h["name"] == "fetch_seconds"
+    )
+    _log(
+        f"[metrics] {fetch} dedup_hit_rate={report['run']['dedup_hit_rate']:.2f} "
+        f"details_ok={RUN_METRICS.counter('details', outcome='ok'):.0f} "
+        f"-> {METRICS_JSON}" + (f" + {METRICS_PROM}" if METRICS_PROM else "")
+    )
+    return report
+
 
-    save_data(records, UPDATE_OUTPUT_JSON)
-    print(f"[final] saved {len(records)} records -> {UPDATE_OUTPUT_JSON}")
-    print(f"[final] total_failed_details={total_failed_details}")
+def scrape_data(  # pylint: disable=too-many-branches,too-many-statements,too-many-locals
+    resume: bool = True, stream: _RowStream | None = None
+) -> None:
+    """
+    Scrape survey pages from newest to older, collecting only entries that are
+    not already present in Postgres. Optionally fetch detail pages.
+
+    CRAWL_MODE selects how detail fetching is scheduled:
+      - "chunked": pause every CHUNK_SURVEY_PAGES pages to fetch that chunk's details
+      - "pipelined": detail workers run alongside the survey loop (needs FETCH_DETAILS)
+      - "frontier": read survey pages only down to the newest stored id, fetching
+        details alongside (chunked crawl if the table is empty, or to finish the
+        journal of an interrupted run first)
+      - "backfill": chunked, but every survey page is read, by BACKFILL_SHARDS
+        concurrent shards with their own checkpoints (a fresh run discards them)
+
+    DEDUP_MODE "preload" loads every stored id before crawling; "per-page"
+    looks up each survey page's ids in Postgres instead (DbPageDedup).
+
+    Checkpoints append to the UPDATE_JOURNAL journal, which is compacted into
+    UPDATE_OUTPUT_JSON at the end. With ``resume`` a journal left by an
+    interrupted chunked/pipelined run is replayed first (CrawlState: the crawl
+    continues after the last journaled survey page and detail page, with the same
+    run id); otherwise it is discarded. After Ctrl-C the JSON is still written but
+    the journal is kept for the next run.
+
+    With USE_FAILURE_LEDGER, dead-lettered detail pages are skipped and the
+    run's failed detail pages are added to the failure ledger.
+
+    With a ``stream`` (iter_scraped), each row is handed to it once final.
+
+    Fetch, parse, dedup, detail and checkpoint metrics (RUN_METRICS) are
+    written to METRICS_JSON at the end of the run.
+    """
+    global _JOURNAL, DEAD_LETTERS  # pylint: disable=global-statement
+    RUN_METRICS.reset()
+    if USE_FAILURE_LEDGER:
+        DEAD_LETTERS = _load_dead_letters()
+        _log(f"[ledger] {len(DEAD_LETTERS)} dead-lettered detail pages will be skipped")
+    seen_ids: SeenIds = set()
+    top = 0
+    if CRAWL_MODE == "frontier" and resume and os.path.exists(_journal_path()):
+        # Frontier runs keep no journal; this one was left by an interrupted
+        # chunked/pipelined run, so finish that run before moving the frontier
+        _log("[frontier] finishing the interrupted run in the journal first")
+    elif CRAWL_MODE == "frontier":
+        top = load_max_result_id_from_db()
+        _log(f"[db] newest stored result id: {top}")
+    if not top and DEDUP_MODE == "per-page":
+        # Nothing is loaded up front; each survey page asks Postgres about its ids
+        seen_ids = DbPageDedup()
+        _log("[db] per-page dedup: stored ids are looked up one survey page at a time")
+    elif not top:
+        t_load = time.perf_counter()
+        # In-memory duplicate tracking begins with the database's result ids
+        seen_ids = load_existing_ids_from_db(DEDUP_BLOOM_BITS)
+        _log(
+            f"[db] loaded {len(seen_ids)} existing result ids from postgres "
+            f"({seen_ids.nbytes / 1024:.0f} KiB in {time.perf_counter() - t_load:.2f}s)"
+        )
+
+    records: list[dict] = []
+    state = None
+    if resume and not top:
+        records, state = _replay_journal(seen_ids)
+        if state is not None and stream is not None:
+            # Rows finished before the interruption may not have reached the
+            # consumer; loading is idempotent, so send them again
+            for i in sorted(set(range(len(records))) - set(state.pending)):
+                _emit(records, i, stream)
+    elif not resume:
+        if os.path.exists(_journal_path()):
+            os.remove(_journal_path())
+        survey_backfill.discard(BACKFILL_DIR)
+    _JOURNAL = RecordJournal(UPDATE_JOURNAL, compress=JOURNAL_GZIP, fsync=JOURNAL_FSYNC)
+    journal = _JOURNAL
+    if not top:
+        state = state or CrawlState()
+        _log(f"[run] id={state.run_id}")
+
+    t0 = time.perf_counter()
+    cpu0 = time.process_time()
+    try:
+        if top:
+            records, total_failed_details = _scrape_frontier(top, stream)
+        elif CRAWL_MODE == "pipelined" and FETCH_DETAILS:
+            records, total_failed_details = _scrape_pipelined(seen_ids, records, state, stream)
+        else:
+            records, total_failed_details = _scrape_chunked(seen_ids, records, state, stream)
+    finally:
+        _shutdown_parse_pool()
+        if isinstance(seen_ids, DbPageDedup):
+            seen_ids.close()
+        journal.close()
+        _JOURNAL = None
+    elapsed = time.perf_counter() - t0
+    process_cpu = time.process_time() - cpu0
+
+    interrupted = state is not None and state.interrupted
+    if stream is not None and not stream.closed and not STREAM_KEEP_JSON:
+        # Every row went to the stream; the journal only matters for a resume.
+        # The failed rows are all the failure ledger needs.
+        if not interrupted:
+            os.remove(journal.path)
+        rows, records = stream.rows, stream.failed
+        _log(f"[final] streamed {rows} records ({journal.lines} journal lines)")
+    else:
+        # Fold the journal into the output JSON; missing keys are filled with None
+        with RUN_METRICS.timer("checkpoint_seconds", kind="compact"):
+            records = record_journal.compact(
+                journal.path, UPDATE_OUTPUT_JSON, REQUIRED_KEYS, keep=interrupted
+            )
+        rows = len(records)
+        _log(
+            f"[final] compacted {journal.lines} journal lines into {rows} records "
+            f"-> {UPDATE_OUTPUT_JSON}"
+        )
+    if interrupted:
+        _log(
+            f"[resume] journal kept at {journal.path}; run again to continue "
+            f"run {state.run_id} after survey page {state.page} (--fresh to discard)"
+        )
+    _log(f"[final] total_failed_details={total_failed_details}")
+    if USE_FAILURE_LEDGER and not interrupted:
+        # An interrupted run's failures are recorded by the run that finishes it
+        _update_failure_ledger(records)
+    _log(
+        f"[final] mode={CRAWL_MODE} rows={rows} elapsed={elapsed:.1f}s "
+        f"rows_per_sec={rows / elapsed if elapsed else 0.0:.2f}"
+    )
+    _print_http_stats()
+    _print_cpu_stats(process_cpu, elapsed)
+    _log(f"[rate] {RATE_CONTROLLER.summary()}"
+         + (f" decisions -> {RATE_DECISION_LOG}" if RATE_DECISION_LOG else ""))
+    if isinstance(seen_ids, DbPageDedup):
+        _log(f"[dedup] per-page {seen_ids.summary()}")
+    _write_run_report(rows, elapsed, process_cpu)
+
+
+def iter_scraped(resume: bool = False) -> Iterator[dict]:
+    """
+    Run ``scrape_data`` in a background thread and yield each new row as soon
+    as its detail fields are final, while the crawl goes on.
+
+    At most STREAM_QUEUE_SIZE finished rows wait for the consumer; past that
+    the crawl blocks, so memory stays bounded however long the run. The crawl
+    lets go of each row once it is handed over (the journal still has it for
+    a resume). No UPDATE_OUTPUT_JSON is written unless STREAM_KEEP_JSON is
+    set. With ``resume``, the rows an interrupted run had finished are yielded
+    again first.
+
+    Stopping the iteration early (close(), or an exception in the consumer)
+    stops the crawl as Ctrl-C would, keeping the journal for a resume, and
+    waits for the crawl thread: nothing of the run is left running once the
+    generator is closed.
+    """
+    stream = _RowStream(STREAM_QUEUE_SIZE)
+    done = object()
+    errors: list[BaseException] = []
+
+    def crawl() -> None:
+        try:
+            scrape_data(resume=resume, stream=stream)
+        except BaseException as e:  # pylint: disable=broad-exception-caught
+            errors.append(e)
+        finally:
+            stream.queue.put(done)
+
+    thread = threading.Thread(target=crawl, name="scrape-stream", daemon=True)
+    thread.start()
+    try:
+        while (rec := stream.queue.get()) is not done:
+            yield rec
+    finally:
+        stream.close()
+        # A put already past its closed check can still refill the queue
+        while thread.is_alive():
+            thread.join(timeout=0.1)
+            stream.close()
+    if errors:
+        raise errors[0]
 
 
 if __name__ == "__main__":
-    # Pulls only NEW GradCafe entries (de-duped against Postgres URLs)
-    scrape_data()
+    parser = argparse.ArgumentParser(
+        description="Pull only NEW GradCafe entries (de-duped against Postgres result ids)."
+    )
+    parser.add_argument("--mode", choices=["chunked", "pipelined", "frontier", "backfill"],
+                        default=CRAWL_MODE)
+    parser.add_argument("--shards", type=int, default=BACKFILL_SHARDS,
+                        help="backfill mode: survey page ranges fetched concurrently")
+    parser.add_argument("--dedup", choices=["preload", "per-page"], default=DEDUP_MODE,
+                        help="load every stored id up front, or look ids up per survey page")
+    parser.add_argument("--bloom-bits", type=int, default=DEDUP_BLOOM_BITS,
+                        help="Bloom filter bits per stored id for the dedup index (0 = off)")
+    parser.add_argument("--detail-backend", choices=["threads", "asyncio"], default=DETAIL_BACKEND)
+    parser.add_argument(
+        "--cache", nargs="?", const=HTTP_CACHE_PATH, default=None, metavar="PATH",
+        help=f"keep fetched pages in an on-disk HTTP cache (default path: {HTTP_CACHE_PATH}, "
+             f"at most {HTTP_CACHE_MAX_BYTES // 2**20} MiB)",
+    )
+    parser.add_argument("--gzip-journal", action="store_true",
+                        help=f"gzip the checkpoint journal ({UPDATE_JOURNAL}.gz)")
+    parser.add_argument("--no-fsync", action="store_true",
+                        help="do not fsync the journal at chunk boundaries")
+    parser.add_argument("--fresh", action="store_true",
+                        help="discard the journal of an interrupted run instead of replaying "
+                             "it (--queue seed: delete every queued task first)")
+    parser.add_argument(
+        "--archive", nargs="?", const=ARCHIVE_DIR, default=None, metavar="DIR",
+        help=f"append every downloaded page to an HTML archive for --reparse "
+             f"(default dir: {ARCHIVE_DIR})",
+    )
+    parser.add_argument(
+        "--reparse", action="store_true",
+        help=f"rebuild {UPDATE_OUTPUT_JSON} from the HTML archive (no network)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help=f"HTML parser processes (crawl default: {PARSE_WORKERS} = parse in the "
+             f"fetch threads; --reparse default: {REPARSE_WORKERS})",
+    )
+    parser.add_argument("--parser", choices=parsers.BACKENDS, default=PARSER_BACKEND,
+                        help="HTML parser backend")
+    parser.add_argument(
+        "--queue", choices=["seed", "work", "export"], default=None,
+        help="distributed crawl over the crawl_tasks table: seed survey pages, "
+             "run one worker, or export finished records",
+    )
+    parser.add_argument("--pages", type=int, default=SURVEY_PAGES,
+                        help="--queue seed: survey pages to enqueue")
+    parser.add_argument("--repair", action="store_true",
+                        help="re-fetch failed detail pages from the failure ledger and "
+                             "patch their rows in applicants")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="--repair: at most this many URLs")
+    parser.add_argument("--dead-after", type=int, default=DEAD_AFTER,
+                        help="failed attempts before a detail page is dead-lettered")
+    parser.add_argument("--no-ledger", action="store_true",
+                        help="do not read or update the failure ledger")
+    parser.add_argument("--refresh", action="store_true",
+                        help="re-check stored entries that are due and update changed rows")
+    parser.add_argument("--max-requests", type=int, default=REFRESH_MAX_REQUESTS,
+                        help="--refresh: detail pages to re-check at most")
+    parser.add_argument("--max-seconds", type=float, default=REFRESH_MAX_S,
+                        help="--refresh: start no new batch after this many seconds")
+    parser.add_argument("--metrics-json", default=METRICS_JSON,
+                        help="where to write the run's metrics report")
+    parser.add_argument("--metrics-prom", default=None,
+                        help="also write the metrics in Prometheus text format to this file")
+    parser.add_argument("--rate", type=float, default=RATE_INITIAL,
+                        help="starting request rate (requests/second)")
+    parser.add_argument("--max-rate", type=float, default=RATE_MAX,
+                        help="ceiling of the adaptive request rate")
+    parser.add_argument("--max-workers", type=int, default=MAX_WORKERS,
+                        help="ceiling of concurrent fetches (detail threads)")
+    parser.add_argument("--rate-log", default=None,
+                        help="append every rate controller decision to this JSONL file")
+    cli = parser.parse_args()
+    PARSER_BACKEND = cli.parser
+    # A refresh needs the stored validators for its conditional requests
+    USE_HTTP_CACHE = cli.cache is not None or cli.refresh
+    HTTP_CACHE_PATH = cli.cache or HTTP_CACHE_PATH
+    ARCHIVE_HTML = cli.archive is not None
+    ARCHIVE_DIR = cli.archive or ARCHIVE_DIR
+    JOURNAL_GZIP = cli.gzip_journal
+    JOURNAL_FSYNC = not cli.no_fsync
+    CRAWL_MODE = cli.mode
+    BACKFILL_SHARDS = cli.shards
+    DEDUP_MODE = cli.dedup
+    DEDUP_BLOOM_BITS = cli.bloom_bits
+    DETAIL_BACKEND = cli.detail_backend
+    DEAD_AFTER = cli.dead_after
+    USE_FAILURE_LEDGER = not cli.no_ledger
+    METRICS_JSON = cli.metrics_json
+    METRICS_PROM = cli.metrics_prom
+    RATE_INITIAL, RATE_MAX, MAX_WORKERS = cli.rate, cli.max_rate, cli.max_workers
+    RATE_DECISION_LOG = cli.rate_log
+    RATE_CONTROLLER = new_rate_controller()
+    if cli.reparse:
+        reparse_archive(
+            ARCHIVE_DIR, workers=REPARSE_WORKERS if cli.workers is None else cli.workers
+        )
+    elif cli.queue == "seed":
+        seed_queue(cli.pages, fresh=cli.fresh)
+    elif cli.queue == "work":
+        PARSE_WORKERS = PARSE_WORKERS if cli.workers is None else cli.workers
+        run_queue_worker()
+    elif cli.queue == "export":
+        export_queue()
+    elif cli.repair:
+        repair_details(cli.limit)
+    elif cli.refresh:
+        refresh_entries(cli.max_requests, cli.max_seconds)
+    else:
+        PARSE_WORKERS = PARSE_WORKERS if cli.workers is None else cli.workers
+        scrape_data(resume=not cli.fresh)
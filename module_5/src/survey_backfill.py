@@ -0,0 +1,173 @@
+"""
+Sharded survey-page backfill for full rebuilds.
+
+A full rebuild reads every survey page, and one page after another that is
+mostly waiting on the network. ``backfill`` splits the page range into
+contiguous shards and walks them concurrently, one thread per shard. All
+shards share one rate limit: the caller's fetch function (module_5 paces
+every request through its rate controller), and ``min_interval_s`` between
+the starts of any two page fetches (module_2 passes its page delay).
+
+Each shard appends every page it reads to its own checkpoint file,
+``<dir>/shard-<first>-<last>.jsonl``, one ``{"page": n, "rows": [...]}``
+line per page. A rerun reads every checkpoint file in the directory first
+and fetches only the pages none of them has, so a shard that failed is
+retried without redoing the others. Pages whose fetch failed are not
+checkpointed. Once a run has every page, the directory is removed.
+
+Pages are yielded in page order, whatever order the shards finish in, so
+the caller de-duplicates exactly as a sequential walk would. A row that
+moved to the next page while the shards ran appears on both pages, and the
+later copy is dropped.
+"""
+import glob
+import json
+import os
+import shutil
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import TextIO
+
+SHARDS = 8
+CHECKPOINT_DIR = "backfill_shards"
+
+FetchRows = Callable[[int], list[dict] | None]  # page -> parsed rows, None if the fetch failed
+
+
+def shard_ranges(pages: range, shards: int) -> list[range]:
+    """Split ``pages`` into at most ``shards`` contiguous, nearly equal ranges."""
+    shards = max(1, min(shards, len(pages)))
+    size, extra = divmod(len(pages), shards)
+    out = []
+    start = pages.start
+    for k in range(shards):
+        stop = start + size + (k < extra)
+        out.append(range(start, stop))
+        start = stop
+    return [r for r in out if r]
+
+
+def load_checkpoints(checkpoint_dir: str) -> dict[int, list[dict]]:
+    """Rows of every page already checkpointed in ``checkpoint_dir``, by page."""
+    done: dict[int, list[dict]] = {}
+    for path in sorted(glob.glob(os.path.join(checkpoint_dir, "shard-*.jsonl"))):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line of a shard that died mid-write
+                done[entry["page"]] = entry["rows"]
+    return done
+
+
+def discard(checkpoint_dir: str = CHECKPOINT_DIR) -> None:
+    """Delete the shard checkpoints of an earlier backfill."""
+    shutil.rmtree(checkpoint_dir, ignore_errors=True)
+
+
+class _Pacer:  # pylint: disable=too-few-public-methods
+    """At least ``interval_s`` between the starts of any two fetches, across threads."""
+
+    def __init__(self, interval_s: float):
+        self.interval_s = interval_s
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        """Block until this thread may start its fetch."""
+        if self.interval_s <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval_s
+        time.sleep(start - now)
+
+
+def backfill(  # pylint: disable=too-many-arguments,too-many-locals,too-many-statements
+    pages: range,
+    fetch_rows: FetchRows,
+    shards: int = SHARDS,
+    checkpoint_dir: str = CHECKPOINT_DIR,
+    *,
+    min_interval_s: float = 0.0,
+    log: TextIO | None = None,
+) -> Iterator[tuple[int, list[dict] | None]]:
+    """
+    Fetch ``pages`` in ``shards`` concurrent contiguous shards and yield
+    ``(page, rows)`` in page order; ``rows`` is None for a page whose fetch
+    failed. Stopping the iteration early stops the shards after their
+    current fetch; what they checkpointed is kept for the next run.
+    Shard summaries go to ``log`` (stdout when None).
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    done = load_checkpoints(checkpoint_dir)
+    ranges = shard_ranges(pages, shards)
+    pacer = _Pacer(min_interval_s)
+    cond = threading.Condition()
+    ready: dict[int, list[dict] | None] = {}
+    errors: dict[int, BaseException] = {}  # shard index -> what killed it
+    stop = threading.Event()
+
+    def run_shard(k: int, shard: range) -> None:
+        path = os.path.join(checkpoint_dir, f"shard-{shard.start}-{shard[-1]}.jsonl")
+        fetched = reused = failed = 0
+        try:
+            with open(path, "a", encoding="utf-8") as ckpt:
+                for page in shard:
+                    rows = done.get(page)
+                    reused += rows is not None
+                    if rows is None and not stop.is_set():
+                        pacer.wait()
+                        rows = fetch_rows(page)
+                        fetched += 1
+                        if rows is None:
+                            failed += 1
+                        else:
+                            # default=dict: rows may be mappings (module_5's ApplicantRecord)
+                            entry = json.dumps({"page": page, "rows": rows}, default=dict)
+                            ckpt.write(entry + "\n")
+                            ckpt.flush()
+                    with cond:
+                        ready[page] = rows
+                        cond.notify_all()
+        except BaseException as e:  # pylint: disable=broad-exception-caught
+            with cond:
+                errors[k] = e
+                cond.notify_all()
+            return
+        print(
+            f"[backfill] shard {shard.start}-{shard[-1]}: fetched={fetched} "
+            f"from_checkpoint={reused} failed={failed}",
+            file=log,
+        )
+
+    shard_of = {page: k for k, shard in enumerate(ranges) for page in shard}
+    failed_pages = 0
+    pool = ThreadPoolExecutor(max_workers=len(ranges) or 1, thread_name_prefix="backfill")
+    try:
+        for k, shard in enumerate(ranges):
+            pool.submit(run_shard, k, shard)
+        for page in pages:
+            with cond:
+                cond.wait_for(lambda p=page: p in ready or shard_of[p] in errors)
+                if page not in ready:
+                    raise errors[shard_of[page]]
+                rows = ready.pop(page)
+            failed_pages += rows is None
+            yield page, rows
+    finally:
+        stop.set()
+        pool.shutdown(wait=True)
+
+    if failed_pages:
+        print(
+            f"[backfill] {failed_pages} pages failed; their shards' checkpoints are "
+            f"kept in {checkpoint_dir} and the next run fetches only those pages",
+            file=log,
+        )
+    else:
+        discard(checkpoint_dir)
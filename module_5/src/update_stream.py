@@ -0,0 +1,168 @@
+"""
+Streaming update: scrape -> clean -> load without the intermediate JSON files.
+
+The file-based pipeline runs ``scrape_update``, ``clean_update`` and
+``load_update`` one after another, each reading the previous stage's whole
+JSON file. Here the three stages are chained iterators instead:
+
+- ``scrape_update.iter_scraped`` yields each new row once its detail page is
+  parsed, from a crawl running in a background thread (bounded queue)
+- ``clean_update.iter_cleaned`` cleans it
+- ``load_update.load_batches`` inserts the cleaned rows ``batch_size`` at a
+  time, one commit per batch
+
+Rows reach Postgres while the crawl is still running, and memory holds at
+most the crawl's queue plus one batch. The file-based stages stay available
+for debugging; ``--keep-json`` also writes the raw update JSON at the end.
+
+``run`` returns a PipelineResult (time and row counts per stage, inserted
+rows, failed detail pages); the Flask app calls it in-process for Pull Data,
+with its own log file and a fresh ``scrape_update.RunState`` per run.
+
+Usage (from module_5/):
+
+    python -m src.update_stream [--batch-size 200] [--queue-size 500] [--resume]
+"""
+import argparse
+import contextlib
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from typing import TextIO
+
+from src import clean_update, load_update, scrape_update
+
+STAGES = ("scrape", "clean", "load")
+
+
+@dataclass
+class StageResult:
+    """
+    Time and row counts of one stage.
+
+    ``seconds`` is the stage's own share of the run: the stages overlap, so
+    each one's time waiting on the stage before it is not counted (scrape is
+    the time the pipeline waited on the crawl). The three add up to the run.
+    """
+
+    name: str
+    seconds: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of one scrape -> clean -> load run."""
+
+    stages: dict[str, StageResult] = field(
+        default_factory=lambda: {name: StageResult(name) for name in STAGES}
+    )
+    inserted: int = 0
+    failures: list[dict] = field(default_factory=list)  # {"entry_url", "detail_error"}
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        """JSON-ready form (served by the Flask app's /update-status)."""
+        return asdict(self)
+
+    def summary(self) -> str:
+        """One log line: per-stage time and rows in -> out."""
+        stages = " | ".join(
+            f"{s.name} {s.seconds:.2f}s {s.rows_in}->{s.rows_out}" for s in self.stages.values()
+        )
+        return (
+            f"[pipeline] {stages} | inserted={self.inserted} "
+            f"failed_details={len(self.failures)} wall={self.seconds:.2f}s"
+        )
+
+
+def _timed(rows: Iterable[dict], stage: StageResult) -> Iterator[dict]:
+    """Pass rows through, adding the time spent producing each one to ``stage``."""
+    it = iter(rows)
+    done = object()
+    while True:
+        t0 = time.perf_counter()
+        row = next(it, done)
+        stage.seconds += time.perf_counter() - t0
+        if row is done:
+            return
+        stage.rows_out += 1
+        yield row
+
+
+def run(
+    batch_size: int = load_update.BATCH_SIZE,
+    resume: bool = False,
+    log: TextIO | None = None,
+    state: scrape_update.RunState | None = None,
+) -> PipelineResult:
+    """
+    Crawl, clean and load in one pass.
+
+    The crawl runs with ``state``, by default a fresh scrape_update.RunState
+    whose progress lines go to ``log`` (stdout when None), so its rate
+    controller, retry policy, page cache and metrics start over every run.
+    A given ``state`` brings its own log.
+
+    Returns:
+      PipelineResult of the run; exceptions from any stage propagate
+    """
+    state = scrape_update.RunState(log=log) if state is None else state
+    with scrape_update.run_state(state):
+        result = _run(batch_size, resume, state)
+    print(result.summary(), file=state.log)
+    # Same summary line as load_update
+    print(f"✅ Inserted {result.inserted} new rows into applicants.", file=state.log)
+    return result
+
+
+def _run(batch_size: int, resume: bool, state: scrape_update.RunState) -> PipelineResult:
+    result = PipelineResult()
+    scrape, clean, load = (result.stages[name] for name in STAGES)
+    t0 = time.perf_counter()
+
+    rows = scrape_update.iter_scraped(resume=resume)
+
+    def scraped() -> Iterator[dict]:
+        for row in _timed(rows, scrape):
+            if row.get("detail_error"):
+                result.failures.append(
+                    {"entry_url": row.get("entry_url"), "detail_error": row["detail_error"]}
+                )
+            yield row
+
+    # A failed load stops the crawl and waits for it before run_state ends
+    with contextlib.closing(rows):
+        cleaned = _timed(clean_update.iter_cleaned(scraped()), clean)
+        result.inserted = load_update.load_batches(cleaned, batch_size, log=state.log)
+    result.seconds = time.perf_counter() - t0
+
+    # Each clock so far includes the stages upstream of it
+    load.seconds = result.seconds - clean.seconds
+    clean.seconds -= scrape.seconds
+    scrape.rows_in = state.metrics.counter("dedup_lookups")
+    clean.rows_in = scrape.rows_out
+    load.rows_in, load.rows_out = clean.rows_out, result.inserted
+    return result
+
+
+def main(argv: list[str] | None = None) -> PipelineResult:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--batch-size", type=int, default=load_update.BATCH_SIZE,
+                        help="rows per insert transaction")
+    parser.add_argument("--queue-size", type=int, default=scrape_update.STREAM_QUEUE_SIZE,
+                        help="finished rows that may wait for the loader before the crawl blocks")
+    parser.add_argument("--keep-json", action="store_true",
+                        help=f"also write {scrape_update.UPDATE_OUTPUT_JSON} (debugging)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted streaming run from its journal")
+    args = parser.parse_args(argv)
+    scrape_update.STREAM_QUEUE_SIZE = args.queue_size
+    scrape_update.STREAM_KEEP_JSON = args.keep_json
+    return run(args.batch_size, resume=args.resume)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
 import os
+import socketserver
+import threading
 import pytest
 import psycopg
 from src.app import create_app
+import src.scrape_update as scrape_update
+from src.retry_policy import CircuitBreaker, RetryBudget
+
+# Captured at import time, before any test can replace it
+_REAL_THREAD = threading.Thread
 
 def _pg_env(name: str, fallback: str | None = None) -> str | None:
     # Prefer standard libpq env vars, then POSTGRES_* from actions services
@@ -67,4 +74,97 @@ def ensure_schema():
 def client():
     app = create_app()
     app.config.update(TESTING=True)
-    return app.test_client()
\ No newline at end of file
+    return app.test_client()
+
+
+@pytest.fixture(autouse=True)
+def _real_threading_thread(monkeypatch):
+    """
+    Some tests patch threading.Thread with a never-undone MonkeyPatch().
+    Reset it per test so thread pools and local HTTP servers keep working.
+    """
+    monkeypatch.setattr(threading, "Thread", _REAL_THREAD)
+
+
+@pytest.fixture(autouse=True)
+def _scraper_files_in_tmp(monkeypatch, tmp_path):
+    """Keep the scraper's cache, HTML archive, journal, metrics and rate log out of the working tree."""
+    monkeypatch.setattr(scrape_update, "UPDATE_JOURNAL", str(tmp_path / "update.jsonl"))
+    monkeypatch.setattr(scrape_update, "BACKFILL_DIR", str(tmp_path / "backfill_shards"))
+    monkeypatch.setattr(scrape_update, "METRICS_JSON", str(tmp_path / "scrape_metrics.json"))
+    monkeypatch.setattr(scrape_update, "RATE_DECISION_LOG", str(tmp_path / "rate_decisions.jsonl"))
+    monkeypatch.setattr(scrape_update, "HTTP_CACHE_PATH", str(tmp_path / "http_cache.sqlite3"))
+    monkeypatch.setattr(scrape_update, "_HTTP_CACHE", None)
+    monkeypatch.setattr(scrape_update, "ARCHIVE_DIR", str(tmp_path / "html_archive"))
+    monkeypatch.setattr(scrape_update, "_ARCHIVE", None)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_retry_policy(monkeypatch):
+    """A breaker tripped by one test must not pause the next; retries do not sleep."""
+    monkeypatch.setattr(scrape_update, "RETRY_BUDGET", RetryBudget())
+    monkeypatch.setattr(scrape_update, "RETRY_BREAKER", CircuitBreaker())
+    monkeypatch.setattr(scrape_update, "BACKOFF_S", 0)
+
+
+@pytest.fixture(autouse=True)
+def _no_failure_ledger(monkeypatch):
+    """Crawl tests do not touch the detail_failures table unless they ask to."""
+    monkeypatch.setattr(scrape_update, "USE_FAILURE_LEDGER", False)
+    monkeypatch.setattr(scrape_update, "DEAD_LETTERS", set())
+
+
+class _RawHandler(socketserver.StreamRequestHandler):
+    """Reply to each request line with canned raw bytes keyed by path."""
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line.strip():
+                return
+            path = line.split()[1].decode()
+            headers = {}
+            while True:
+                h = self.rfile.readline().strip()
+                if not h:
+                    break
+                name, _, value = h.decode().partition(":")
+                headers[name.strip().lower()] = value.strip()
+            reply = self.server.responses[path]
+            if callable(reply):
+                reply = reply(headers)
+            if reply is None:  # drop the connection without answering
+                return
+            self.wfile.write(reply)
+            self.wfile.flush()
+            if path in self.server.close_after:
+                return
+
+
+class _RawServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+@pytest.fixture()
+def raw_http_server():
+    """
+    Start a local HTTP server that answers with canned raw responses.
+
+    Usage: base = raw_http_server({"/path": b"HTTP/1.1 200 OK..."}, close_after={"/path"})
+    A response may also be a callable taking the request headers.
+    """
+    servers = []
+
+    def start(responses, close_after=()):
+        server = _RawServer(("127.0.0.1", 0), _RawHandler)
+        server.responses = responses
+        server.close_after = set(close_after)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
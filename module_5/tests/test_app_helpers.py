@@ -11,4 +11,22 @@ def test_get_analysis_results_calls_query_function(monkeypatch):
 
     result = appmod.get_analysis_results()
 
-    assert result == fake_cards
\ No newline at end of file
+    assert result == fake_cards
+
+@pytest.mark.web
+def test_scrape_metrics_routes(monkeypatch, tmp_path):
+    import src.app as appmod
+    from src.run_metrics import RunMetrics, write_report
+
+    monkeypatch.setattr(appmod, "metrics_path", tmp_path / "scrape_metrics.json")
+    client = appmod.app.test_client()
+    assert client.get("/scrape-metrics").status_code == 404
+    assert client.get("/metrics").status_code == 404
+
+    m = RunMetrics()
+    m.count("details", outcome="ok")
+    write_report(m.report(rows=3), str(tmp_path / "scrape_metrics.json"))
+    assert client.get("/scrape-metrics").get_json()["run"] == {"rows": 3}
+    resp = client.get("/metrics")
+    assert resp.mimetype == "text/plain"
+    assert 'gradcafe_scrape_details_total{outcome="ok"} 1' in resp.get_data(as_text=True)
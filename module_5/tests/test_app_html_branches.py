@@ -28,15 +28,14 @@ def test_update_analysis_busy_html_redirects(client):
 @pytest.mark.buttons
 def test_run_update_pipeline_returns_immediately_if_already_running(monkeypatch):
     import src.app as appmod
-    import subprocess
 
     # force "already running" before calling
     appmod.job_running = True
     before = appmod.job_last_message
 
-    # if it tried to run subprocess we'd know
+    # if it tried to run the pipeline we'd know
     called = {"ran": False}
-    monkeypatch.setattr(subprocess, "run", lambda *a, **k: called.__setitem__("ran", True))
+    monkeypatch.setattr(appmod.update_stream, "run", lambda *a, **k: called.__setitem__("ran", True))
 
     appmod.run_update_pipeline()
 
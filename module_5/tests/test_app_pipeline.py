@@ -1,46 +1,63 @@
 import pytest
-import subprocess
 
+from src.update_stream import PipelineResult
 
-@pytest.mark.buttons
-def test_run_update_pipeline_success_sets_message(monkeypatch):
+
+@pytest.fixture()
+def appmod(monkeypatch, tmp_path):
     import src.app as appmod
-    from pathlib import Path
 
+    monkeypatch.setattr(appmod, "job_log_path", tmp_path / "update_job.log")
+    monkeypatch.setattr(appmod, "job_last_result", None)
     appmod.job_running = False
     appmod.job_last_message = "No update run yet."
+    return appmod
 
-    # fake subprocess success
-    monkeypatch.setattr(
-        "subprocess.run",
-        lambda *args, **kwargs: None
-    )
 
-    # fake log contents (patch class method)
-    monkeypatch.setattr(
-        Path,
-        "read_text",
-        lambda *args, **kwargs: "Inserted 5 new rows"
-    )
+@pytest.mark.buttons
+def test_run_update_pipeline_success_sets_message(appmod, monkeypatch):
+    seen = {}
+
+    def fake_run(state):
+        seen["state"] = state
+        print("stage output", file=state.log)
+        result = PipelineResult(inserted=5, seconds=1.5)
+        result.stages["scrape"].rows_out = 6
+        result.failures.append({"entry_url": "u", "detail_error": "timeout"})
+        return result
+
+    monkeypatch.setattr(appmod.update_stream, "run", fake_run)
 
     appmod.run_update_pipeline()
 
     assert appmod.job_running is False
-    assert "Update completed successfully" in appmod.job_last_message
+    assert appmod.job_last_message == (
+        "✅ Update completed successfully. Inserted 5 new rows. 1 detail pages failed."
+    )
+    assert appmod.job_last_result["inserted"] == 5
+    assert appmod.job_last_result["stages"]["scrape"]["rows_out"] == 6
+    # the run gets its own state; the module defaults are left alone
+    assert seen["state"].metrics_json == str(appmod.metrics_path)
+    assert appmod.scrape_update.METRICS_JSON != str(appmod.metrics_path)
+    assert "stage output" in appmod.job_log_path.read_text(encoding="utf-8")
 
-@pytest.mark.buttons
-def test_run_update_pipeline_failure_sets_failed_message(monkeypatch):
-    import src.app as appmod
+    # JSON clients read the structured result instead of the log
+    resp = appmod.app.test_client().get("/update-status")
+    body = resp.get_json()
+    assert body["running"] is False and body["result"]["failures"][0]["entry_url"] == "u"
 
-    appmod.job_running = False
-    appmod.job_last_message = "No update run yet."
 
-    def boom(*args, **kwargs):
-        raise subprocess.CalledProcessError(returncode=1, cmd="x")
+@pytest.mark.buttons
+def test_run_update_pipeline_failure_sets_failed_message(appmod, monkeypatch):
+    def boom(state):
+        raise RuntimeError("db down")
 
-    monkeypatch.setattr(subprocess, "run", boom)
+    monkeypatch.setattr(appmod.update_stream, "run", boom)
 
     appmod.run_update_pipeline()
 
     assert appmod.job_running is False
-    assert "Update failed" in appmod.job_last_message
\ No newline at end of file
+    assert appmod.job_last_message == "❌ Update failed: db down. Check update_job.log."
+    assert appmod.job_last_result is None
+    log = appmod.job_log_path.read_text(encoding="utf-8")
+    assert "Traceback" in log and "RuntimeError: db down" in log
@@ -0,0 +1,149 @@
+import json
+import pickle
+
+import pytest
+
+import src.clean_update as cu
+import src.load_update as lu
+import src.scrape_update as su
+from src.applicant_record import (
+    CLEAN_KEYS, FIELDS, RAW_KEYS, ApplicantRecord, to_bool, to_float, to_int,
+)
+
+RAW = {
+    "program_name_raw": "Computer Science",
+    "university_raw": "MIT",
+    "comments": "note",
+    "date_posted": "2026-02-10",
+    "entry_url": "https://www.thegradcafe.com/result/7",
+    "applicant_status": "Accepted",
+    "accepted_date": "29 Jan",
+    "rejected_date": None,
+    "start_term": "Fall",
+    "start_year": "2026",
+    "is_international": True,
+    "gre_total": "330",
+    "gre_v": "165",
+    "gre_aw": "4.5",
+    "degree_level": "Masters",
+    "degree": "MS",
+    "gpa": "3.90",
+    "source_url": "https://www.thegradcafe.com/survey/?page=1",
+    "scraped_at": "t0",
+    "detail_error": None,
+}
+
+
+@pytest.mark.analysis
+def test_record_round_trips_the_raw_schema_with_typed_numerics():
+    rec = ApplicantRecord.from_dict(RAW)
+    assert (rec.gpa, rec.gre_total, rec.gre_v, rec.gre_aw) == (3.9, 330, 165, 4.5)
+    assert (rec.start_year, rec.is_international, rec.program) == (2026, True, "Computer Science")
+    assert dict(rec) == rec.to_dict() == RAW
+    assert list(rec) == list(RAW_KEYS) and len(rec) == len(RAW)
+    assert not hasattr(rec, "__dict__")
+    assert pickle.loads(pickle.dumps(rec)) == rec  # crosses the parse process pool
+    assert ApplicantRecord.coerce(rec) is rec
+
+
+@pytest.mark.analysis
+def test_record_reads_and_writes_both_schemas():
+    rec = ApplicantRecord.from_dict(RAW)
+    clean = rec.to_clean_dict()
+    assert list(clean) == list(CLEAN_KEYS) == cu.REQUIRED_KEYS
+    assert clean["program"] == "Computer Science" and clean["US/International"] == "International"
+    assert clean["GPA"] == "3.90" and clean["start_year"] == "2026"
+    assert ApplicantRecord.from_dict(clean).to_clean_dict() == clean
+
+    rec["GPA"] = "3.456"
+    assert rec.gpa == 3.456 and rec["gpa"] == "3.456"  # more places than two are kept
+    rec["US/International"] = "American"
+    assert rec.is_international is False and rec["US/International"] == "American"
+    rec["gre_total"] = None
+    assert rec["gre_total"] is None and rec.get("GPA") == "3.456"
+    assert "GPA" in rec and "program_name_raw" in rec and "nope" not in rec
+    assert rec.get("nope", 0) == 0
+    with pytest.raises(KeyError):
+        rec["nope"]
+    assert set(FIELDS) == set(RAW_KEYS.values())
+
+
+@pytest.mark.analysis
+def test_record_writes_back_the_text_it_read():
+    raw = {**RAW, "gpa": "3.5", "gre_aw": "4", "start_year": "Fall 2026",
+           "gre_total": 330, "is_international": "true"}
+    rec = ApplicantRecord.from_dict(raw)
+    assert (rec.gpa, rec.gre_aw, rec.start_year, rec.is_international) == (3.5, 4.0, None, True)
+    assert dict(rec) == raw and pickle.loads(pickle.dumps(rec)) == rec
+    assert rec["US/International"] == "International"
+
+    rec.gpa = 3.7  # an attribute set directly no longer matches the kept text
+    assert rec["GPA"] == "3.70"
+    rec["start_year"] = "2027"
+    assert rec.start_year == 2027 and rec["start_year"] == "2027"
+    del rec["GPA"]
+    assert "gpa" not in rec and rec.gpa is None and rec["GPA"] is None
+
+    clean = ApplicantRecord.from_dict({"US/International": "Other", "GPA": "3.5"})
+    assert clean.is_international is None and clean["US/International"] == "Other"
+    assert lu.row_params(clean)["us_or_international"] == "Other"
+    assert lu.row_params({"gre_total": "330.5"})["gre"] == 330.5
+
+
+@pytest.mark.analysis
+def test_record_has_the_keys_it_was_given():
+    rec = ApplicantRecord.from_dict({"program_name_raw": "CS", "program": None, "gpa": None})
+    assert rec.program == "CS"  # the other name's None does not replace it
+    assert list(rec) == ["program_name_raw", "gpa"] and "detail_error" not in rec
+    assert rec.get("detail_error", "unset") == "unset" and rec["detail_error"] is None
+    assert rec.to_dict()["detail_error"] is None  # the full schema is still written
+
+    rec["detail_error"] = None
+    assert "detail_error" in rec
+    del rec["detail_error"]
+    assert "detail_error" not in rec
+    with pytest.raises(KeyError):
+        del rec["detail_error"]
+
+    # Keys neither schema has (e.g. a new detail field) are kept, not refused
+    rec["other"] = 1
+    assert rec["other"] == 1 and "other" in rec and list(rec)[-1] == "other"
+    assert rec.to_dict()["other"] == 1 and "other" not in rec.to_clean_dict()
+    assert ApplicantRecord.from_dict(dict(rec)) == rec
+    del rec["other"]
+    assert "other" not in rec
+
+
+@pytest.mark.analysis
+def test_converters_reject_what_is_not_a_number():
+    assert to_float("3.5") == 3.5 and to_float("n/a") is None and to_float(True) is None
+    assert to_float(None) is None and to_float([]) is None
+    assert to_int("330.0") == 330 and to_int("3.5") is None and to_int(None) is None
+    assert to_bool("International") is True and to_bool("false") is False
+    assert to_bool(None) is None and to_bool("maybe") is None
+
+
+@pytest.mark.integration
+def test_records_flow_from_parse_through_clean_to_the_loader(tmp_path):
+    html = (
+        '<table><tr><td>MIT</td><td>CS</td><td>2026-02-10</td><td>Accepted on 29 Jan</td>'
+        '<td>Starting Fall 2026</td><td><a href="/result/7">x</a></td></tr></table>'
+    )
+    [rec] = su._parse_survey_page(html, "https://www.thegradcafe.com/survey/?page=1")
+    assert isinstance(rec, ApplicantRecord) and rec.university == "MIT"
+    su._apply_detail(rec, {"gpa": "3.9", "gre_total": "330", "gre_aw": "4.0",
+                           "is_international": False})
+    assert (rec.gpa, rec.gre_total, rec.gre_aw, rec.is_international) == (3.9, 330, 4.0, False)
+
+    [row] = cu.clean_data([rec])
+    assert isinstance(row, ApplicantRecord)
+    assert (row.start_term, row.start_year, row["US/International"]) == ("Fall", 2026, "American")
+
+    params = lu.row_params(row)
+    assert params["gpa"] == 3.9 and params["gre"] == 330.0 and params["gre_aw"] == 4.0
+    assert params["term"] == "Fall 2026" and params["us_or_international"] == "American"
+    assert lu.row_params(row.to_clean_dict()) == params
+
+    out = tmp_path / "cleaned.json"
+    cu.save_data([row], str(out))
+    assert json.loads(out.read_text(encoding="utf-8")) == [row.to_clean_dict()]
@@ -0,0 +1,240 @@
+import asyncio
+import time
+
+import pytest
+
+import src.async_fetch as af
+import src.scrape_update as su
+from src.rate_control import AdaptiveController
+from src.retry_policy import CircuitBreaker, RetryBudget
+
+
+RESULT_PAGE = (
+    "<html><body><dl>"
+    "<dt>Degree Type</dt><dd>Masters</dd>"
+    "<dt>Degree's Country of Origin</dt><dd>International</dd>"
+    "<dt>Undergrad GPA</dt><dd>3.75</dd>"
+    "<dt>GRE General:</dt><dd>325</dd>"
+    "<dt>Notes</dt><dd>Detail note</dd>"
+    "</dl></body></html>"
+)
+
+
+def _ok(body: str) -> bytes:
+    data = body.encode("utf-8")
+    return (
+        b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+        + f"Content-Length: {len(data)}\r\n\r\n".encode()
+        + data
+    )
+
+
+# Canned raw responses keyed by request path
+RESPONSES = {
+    "/ok": _ok("hello"),
+    "/result/1": _ok(RESULT_PAGE),
+    "/chunked": (
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+        b"5;ext=1\r\nhello\r\n6\r\n world\r\n0\r\nX-Trailer: y\r\n\r\n"
+    ),
+    "/eof": b"HTTP/1.0 200 OK\r\n\r\nuntil-close",
+    "/redirect": b"HTTP/1.1 302 Found\r\nLocation: /ok\r\nContent-Length: 0\r\n\r\n",
+    "/loop": b"HTTP/1.1 301 Moved\r\nLocation: /loop\r\nContent-Length: 0\r\n\r\n",
+    "/missing": b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n",
+    "/garbage": b"NOT-HTTP\r\n\r\n",
+}
+
+
+def _slow(headers):
+    time.sleep(1.0)
+    return _ok("late")
+
+
+@pytest.fixture()
+def base_url(raw_http_server):
+    # Every canned response is one-shot: the connection closes after it
+    return raw_http_server({**RESPONSES, "/slow": _slow}, close_after=set(RESPONSES) | {"/slow"})
+
+
+def _collect(urls, **kwargs):
+    out = {}
+    kwargs.setdefault("backoff_s", 0)
+    af.fetch_all(urls, lambda u, html, err: out.__setitem__(u, (html, err)), **kwargs)
+    return out
+
+
+@pytest.mark.web
+def test_fetch_all_reads_length_chunked_eof_and_redirect_bodies(base_url):
+    paths = ["/ok", "/chunked", "/eof", "/redirect"]
+    out = _collect([base_url + p for p in paths], max_in_flight=2)
+
+    assert out[base_url + "/ok"] == ("hello", None)
+    assert out[base_url + "/chunked"] == ("hello world", None)
+    assert out[base_url + "/eof"] == ("until-close", None)
+    assert out[base_url + "/redirect"] == ("hello", None)
+
+
+@pytest.mark.web
+def test_fetch_all_reports_last_error_after_retries(base_url, capsys):
+    urls = [base_url + p for p in ("/missing", "/loop", "/garbage")]
+    out = _collect(urls, retries=2)
+
+    assert all(html is None for html, _ in out.values())
+    assert out[base_url + "/missing"][1].status == 404
+    assert isinstance(out[base_url + "/loop"][1], af.AsyncFetchError)
+    text = capsys.readouterr().out
+    assert "[fetch fail 2/2]" in text
+    assert "[fetch fail 2/2] " + base_url + "/missing" not in text  # 404 is not retried
+    assert "HTTP Error 404" in text
+    assert "too many redirects" in text
+    assert "malformed status line" in text
+
+
+@pytest.mark.web
+def test_fetch_all_shares_retry_budget_and_breaker(base_url, capsys):
+    budget = RetryBudget(ratio=0.0, reserve=1)
+    breaker = CircuitBreaker(min_calls=2, threshold=0.4, open_s=0.05)
+    out = _collect([base_url + "/loop", base_url + "/garbage"], retries=3, max_in_flight=1,
+                   budget=budget, breaker=breaker)
+
+    assert all(err is not None for _, err in out.values())
+    assert budget.retries == 1 and budget.denied == 2
+    assert breaker.trips >= 1
+    assert "[breaker] open" in capsys.readouterr().out
+    assert "no attempts" in str(_collect([base_url + "/ok"], retries=0)[base_url + "/ok"][1])
+
+
+@pytest.mark.web
+def test_fetch_all_reports_deadline_as_timeout(base_url):
+    out = _collect([base_url + "/slow"], deadline_s=0.2, timeout_s=5)
+    html, err = out[base_url + "/slow"]
+    assert html is None
+    assert isinstance(err, TimeoutError)
+
+
+@pytest.mark.web
+def test_fetch_all_reraises_keyboard_interrupt(base_url, capsys):
+    def on_result(url, html, err):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        af.fetch_all([base_url + "/ok"], on_result)
+    assert "Ctrl-C received" in capsys.readouterr().out
+
+
+@pytest.mark.web
+def test_connection_args_handles_https_and_rejects_other_schemes():
+    host, port, ctx, target = af._connection_args("https://www.thegradcafe.com/survey/?page=2")
+    assert (host, port, target) == ("www.thegradcafe.com", 443, "/survey/?page=2")
+    assert ctx is af._ssl_context()
+
+    with pytest.raises(af.AsyncFetchError):
+        af._connection_args("ftp://example.com/x")
+
+
+@pytest.mark.web
+def test_scrape_update_async_backend_merges_details(base_url, monkeypatch):
+    monkeypatch.setattr(su, "BACKOFF_S", 0)
+    monkeypatch.setattr(su, "USE_HTTP_CACHE", False)
+    monkeypatch.setattr(su, "RETRIES", 1)
+    good = base_url + "/result/1"
+    bad = base_url + "/missing"
+    records = [
+        {"entry_url": good, "comments": "list comment"},
+        {"entry_url": good, "comments": "list comment"},
+        {"entry_url": bad, "comments": "kept"},
+    ]
+
+    updated, failed = su._fetch_details_async(records, [(0, good), (1, good), (2, bad)])
+
+    assert (updated, failed) == (2, 1)
+    assert records[0]["degree_level"] == "Masters"
+    assert records[0]["is_international"] is True
+    assert records[0]["gpa"] == "3.75"
+    assert records[0]["comments"] == "Detail note"
+    assert records[1] == records[0]
+    assert records[2]["gpa"] is None and records[2]["comments"] == "kept"
+    assert records[0]["detail_error"] is None and records[2]["detail_error"] == "HTTP 404"
+
+
+KEEP_ALIVE = {
+    "/a": _ok("a"),
+    "/b": _ok("b"),
+    "/last": _ok("last"),
+    "/closing": b"HTTP/1.1 200 OK\r\nContent-Length: 3\r\nConnection: close\r\n\r\nbye",
+    "/drop": None,
+    "/bad-gzip": b"HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\nContent-Length: 4\r\n\r\nnope",
+}
+
+
+@pytest.fixture()
+def keep_alive_url(raw_http_server):
+    # Connections stay open except after /last (the server hangs up silently)
+    return raw_http_server(KEEP_ALIVE, close_after={"/last"})
+
+
+@pytest.mark.web
+def test_connection_pool_reuses_and_replaces_connections(keep_alive_url):
+    async def scenario():
+        pool = af.ConnectionPool()
+        texts = [await af.fetch_html(keep_alive_url + p, pool=pool) for p in ("/a", "/b", "/a")]
+        assert texts == ["a", "b", "a"] and (pool.opened, pool.reused) == (1, 2)
+
+        await af.fetch_html(keep_alive_url + "/last", pool=pool)
+        await asyncio.sleep(0.1)  # the hang-up reaches the idle connection
+        assert await af.fetch_html(keep_alive_url + "/a", pool=pool) == "a"
+        assert pool.opened == 2
+
+        # Dropped without an answer: the reused connection is replaced once
+        with pytest.raises(af.AsyncFetchError, match="malformed status line"):
+            await af.fetch_html(keep_alive_url + "/drop", pool=pool)
+        assert pool.opened == 3
+
+        await af.fetch_html(keep_alive_url + "/closing", pool=pool)  # never pooled
+        await af.fetch_html(keep_alive_url + "/a", pool=pool)
+        assert pool.opened == 5
+        pool.close()
+
+        full = af.ConnectionPool(max_idle_per_host=0)
+        await af.fetch_html(keep_alive_url + "/a", pool=full)
+        await af.fetch_html(keep_alive_url + "/a", pool=full)
+        assert (full.opened, full.reused) == (2, 0)
+
+    asyncio.run(scenario())
+    assert asyncio.run(af.fetch_html(keep_alive_url + "/a")) == "a"  # no pool: one-shot
+
+
+@pytest.mark.web
+def test_fetch_all_retries_an_undecodable_body(keep_alive_url, capsys):
+    out = _collect([keep_alive_url + "/bad-gzip", keep_alive_url + "/a"], retries=2)
+    html, err = out[keep_alive_url + "/bad-gzip"]
+    assert html is None and isinstance(err, af.AsyncFetchError)
+    assert "undecodable gzip body" in str(err)
+    assert "[fetch fail 2/2]" in capsys.readouterr().out
+    assert out[keep_alive_url + "/a"] == ("a", None)
+
+
+@pytest.mark.web
+def test_fetch_all_paces_every_attempt_through_the_controller(raw_http_server):
+    calls = {"n": 0}
+
+    def throttled_once(_headers):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return b"HTTP/1.1 429 Too Many Requests\r\nRetry-After: 0\r\nContent-Length: 0\r\n\r\n"
+        return _ok("fine")
+
+    base = raw_http_server({"/t": throttled_once, "/missing": RESPONSES["/missing"]})
+    ctl = AdaptiveController(rate=1000.0, concurrency=1, max_concurrency=1)
+    out = _collect([base + "/t", base + "/missing"], retries=2, max_in_flight=50,
+                   controller=ctl)
+
+    assert out[base + "/t"] == ("fine", None) and out[base + "/missing"][1].status == 404
+    assert [d["action"] for d in ctl.decisions] == ["pause", "decrease"]
+    assert list(ctl._outcomes) == [False, True, True]  # 429, then 200 and a healthy 404
+    assert ctl._in_flight == 0
+
+    # A deadline that cancels an attempt gives its slot back
+    slow = raw_http_server({"/slow": _slow})
+    _collect([slow + "/slow"], deadline_s=0.2, controller=ctl)
+    assert ctl._in_flight == 0
@@ -1,5 +1,3 @@
-import subprocess
-
 import psycopg
 import pytest
 
@@ -151,11 +149,11 @@ def test_pull_data_failure_sets_message_and_does_not_write_db(client, monkeypatc
 
     monkeypatch.setattr(appmod.threading, "Thread", CaptureThread)
 
-    # Force subprocess.run to fail (simulating a pipeline failure)
+    # Force the in-process pipeline to fail
     def boom(*args, **kwargs):
-        raise subprocess.CalledProcessError(returncode=1, cmd="SCRAPE")
+        raise RuntimeError("scrape failed")
 
-    monkeypatch.setattr(appmod.subprocess, "run", boom)
+    monkeypatch.setattr(appmod.update_stream, "run", boom)
 
     # 1) Endpoint returns immediately
     resp = client.post("/pull-data", headers={"Accept": "application/json"})
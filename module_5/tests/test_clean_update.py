@@ -166,6 +166,7 @@ def test_module_main_writes_cleaned_output_file(tmp_path, monkeypatch):
 
     # Ensure runpy doesn't warn about module already imported
     sys.modules.pop("src.clean_update", None)
+    monkeypatch.setattr(sys, "argv", ["clean_update", "--workers", "1"])
 
      # Executes src.clean_update as a script (hits __main__ block)
     runpy.run_module("src.clean_update", run_name="__main__")
@@ -197,4 +198,25 @@ def test_clean_update_covers_remaining_branches():
     assert cu._extract_start_term_year("   ", None, "") == (None, None)
 
     # line 159: context present but no parseable term/year
-    assert cu._extract_start_term_year("Program begins soon, TBD") == (None, None)
\ No newline at end of file
+    assert cu._extract_start_term_year("Program begins soon, TBD") == (None, None)
+
+
+@pytest.mark.analysis
+def test_batched_clean_matches_a_single_process_byte_for_byte(tmp_path):
+    import src.clean_update as cu
+
+    records = [
+        {
+            "program_name_raw": f" <b>P{i}</b> ",
+            "comments": "Starting Fall 2026" if i % 2 else "Program begins Aug 2027",
+            "is_international": ("true", False, None)[i % 3],
+            "gpa": f"3.{i % 10}",
+            "entry_url": f"https://www.thegradcafe.com/result/{i}",
+        }
+        for i in range(25)
+    ]
+    serial, batched = tmp_path / "serial.json", tmp_path / "batched.json"
+    cu.save_data(cu.clean_data(records), str(serial))
+    cu.save_data(cu.clean_data(records, workers=2, chunk_size=4), str(batched))
+    assert batched.read_bytes() == serial.read_bytes()
+    assert [r.start_year for r in cu.clean_data(records[:2], workers=2)] == [2027, 2026]
@@ -0,0 +1,205 @@
+import json
+
+import pytest
+
+import src.crawl_queue as cq
+import src.scrape_update as su
+
+
+class _FakeConn:
+    """Records each statement and answers with the next queued result set."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.queries = []
+        self.autocommit = False
+        self.closed = False
+
+    def cursor(self):
+        conn = self
+
+        class _Cur:
+            description = None
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params=None):
+                conn.queries.append((sql, params))
+                if "RETURNING" in sql or sql.lstrip().startswith("SELECT"):
+                    self.description = [("col",)]
+
+            def fetchall(self):
+                return conn.results.pop(0)
+
+        return _Cur()
+
+    def close(self):
+        self.closed = True
+
+
+def _queue(*results, **kw):
+    conn = _FakeConn(*results)
+    return cq.CrawlQueue(worker_id="w1", connect=lambda: conn, **kw), conn
+
+
+@pytest.mark.db
+def test_claim_leases_with_skip_locked():
+    q, conn = _queue([(7, "result", "u7", 2, {"entry_url": "u7"}), (5, "survey", "u5", 1, None)],
+                     lease_s=30, max_attempts=4)
+    assert conn.autocommit
+    tasks = q.claim(10, kinds=("result",))
+    assert [t.task_id for t in tasks] == [5, 7]
+    assert tasks[1] == cq.CrawlTask(7, "result", "u7", 2, {"entry_url": "u7"})
+
+    sql, params = conn.queries[0]
+    assert "FOR UPDATE SKIP LOCKED" in sql and "lease_expires < now()" in sql
+    assert params == {"owner": "w1", "lease_s": 30, "kinds": ["result"], "limit": 10,
+                      "max_attempts": 4}
+
+
+@pytest.mark.db
+def test_enqueue_complete_fail_and_bookkeeping():
+    q, conn = _queue([(1,), (2,)], [(1,)], [], [(1,)], [(3,)],
+                     [("done", 4), ("pending", 1)], [({"a": 1}, None, "HTTP 500")], max_attempts=2)
+    q.ensure_schema()
+    assert "CREATE TABLE IF NOT EXISTS crawl_tasks" in conn.queries[0][0]
+
+    assert q.enqueue("survey", []) == 0
+    assert q.enqueue("result", [("u1", {"entry_url": "u1"}), ("u2", None)]) == 2
+    sql, (kind, urls, payloads) = conn.queries[-1]
+    assert "ON CONFLICT (url) DO NOTHING" in sql and kind == "result" and urls == ["u1", "u2"]
+    assert payloads[0].obj == {"entry_url": "u1"} and payloads[1] is None
+
+    task = cq.CrawlTask(1, "result", "u1", 1)
+    assert q.complete(task, {"gpa": "3.9"})
+    assert conn.queries[-1][1][0].obj == {"gpa": "3.9"} and conn.queries[-1][1][1:] == (1, "w1")
+    assert not q.complete(task)  # lease lost: no row updated
+    assert q.fail(task, "x" * 600)
+    assert conn.queries[-1][1][0] == 2 and len(conn.queries[-1][1][1]) == 500
+
+    assert q.reap() == 1
+    assert q.counts() == {"pending": 1, "leased": 0, "done": 4, "failed": 0}
+    assert q.results() == [({"a": 1}, None, "HTTP 500")]
+    q.clear()
+    assert conn.queries[-1][0] == "TRUNCATE crawl_tasks;"
+    with q as handle:
+        assert handle is q and not conn.closed
+    assert conn.closed
+    assert cq.default_worker_id().endswith(f":{__import__('os').getpid()}")
+
+
+class _MemQueue:
+    """In-memory stand-in for CrawlQueue with the same task life cycle."""
+
+    def __init__(self, max_attempts=2):
+        self.worker_id = "mem"
+        self.max_attempts = max_attempts
+        self.tasks = {}
+
+    def enqueue(self, kind, items):
+        added = 0
+        for url, payload in items:
+            if url not in {t["url"] for t in self.tasks.values()}:
+                tid = len(self.tasks) + 1
+                self.tasks[tid] = {"kind": kind, "url": url, "payload": payload,
+                                   "status": "pending", "attempts": 0, "result": None}
+                added += 1
+        return added
+
+    def claim(self, limit=1):
+        out = []
+        for tid, t in self.tasks.items():
+            if t["status"] == "pending" and len(out) < limit:
+                t["status"] = "leased"
+                t["attempts"] += 1
+                out.append(cq.CrawlTask(tid, t["kind"], t["url"], t["attempts"], t["payload"]))
+        return out
+
+    def complete(self, task, result=None):
+        self.tasks[task.task_id].update(status="done", result=result)
+        return True
+
+    def fail(self, task, error):
+        t = self.tasks[task.task_id]
+        t["status"] = "failed" if t["attempts"] >= self.max_attempts else "pending"
+        t["error"] = error
+        return True
+
+    def reap(self):
+        return 0
+
+    def counts(self):
+        out = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        for t in self.tasks.values():
+            out[t["status"]] += 1
+        return out
+
+    def results(self):
+        return [(t["payload"], t["result"], t.get("error")) for t in self.tasks.values()
+                if t["kind"] == "result" and t["status"] in ("done", "failed")]
+
+    def ensure_schema(self):
+        pass
+
+    def clear(self):
+        self.tasks.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def close(self):
+        pass
+
+
+def _survey_html(page):
+    rows = "".join(
+        f'<tr><td>U</td><td>P</td><td>d</td><td>Accepted on 1 Jan</td><td>c</td>'
+        f'<td><a href="/result/{rid}">x</a></td></tr>'
+        for rid in (page * 10 + 1, page * 10 + 2, 11)  # 11 is listed on every page
+    )
+    return f"<table>{rows}</table>"
+
+
+@pytest.mark.integration
+def test_queue_worker_crawls_seeded_pages_and_exports(monkeypatch, tmp_path):
+    q = _MemQueue()
+    monkeypatch.setattr(su, "CrawlQueue", lambda lease_s: q)
+    # Result 12 is already stored in applicants
+    monkeypatch.setattr(
+        su.DbPageDedup, "lookup", lambda self, rids: setattr(self, "_stored", {12} & set(rids))
+    )
+    fetches = []
+
+    def fetch(url):
+        fetches.append(url)
+        if url.endswith("/result/22"):
+            raise su.FetchError(url, "HTTP 503", 503)  # detail page down for good
+        if "page=" in url:
+            return _survey_html(int(url.rsplit("=", 1)[1]))
+        return "<dl><dt>Undergrad GPA</dt><dd>3.70</dd></dl>"
+
+    monkeypatch.setattr(su, "_fetch_page", fetch)
+    monkeypatch.setattr(su, "QUEUE_POLL_S", 0)
+
+    assert su.seed_queue(2) == 2
+    assert su.seed_queue(2, fresh=True) == 2
+    stats = su.run_queue_worker(q)
+    assert stats == {"survey": 2, "result": 2, "failed": 2}
+    assert fetches.count("https://www.thegradcafe.com/result/22") == 2
+    assert fetches.count("https://www.thegradcafe.com/result/11") == 1
+
+    out = tmp_path / "update.json"
+    rows = su.export_queue(str(out))
+    assert rows == json.loads(out.read_text(encoding="utf-8"))
+    assert [(su._result_id(r["entry_url"]), r["gpa"]) for r in rows] == [
+        (11, "3.70"), (21, "3.70"), (22, None)
+    ]
+    assert all(k in rows[0] for k in su.REQUIRED_KEYS)
+    assert [r["detail_error"] for r in rows] == [None, None, "HTTP 503"]
@@ -0,0 +1,256 @@
+import json
+
+import pytest
+from psycopg.errors import InsufficientPrivilege
+
+import src.failure_ledger as fl
+import src.scrape_update as su
+
+
+class _FakeConn:
+    """Records each statement and answers with the next queued result set."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.queries = []
+        self.autocommit = False
+        self.closed = False
+
+    def cursor(self):
+        conn = self
+
+        class _Cur:
+            description = None
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params=None):
+                conn.queries.append((sql, params))
+                if "RETURNING" in sql or sql.lstrip().startswith("SELECT"):
+                    self.description = [("col",)]
+
+            def fetchall(self):
+                return conn.results.pop(0)
+
+        return _Cur()
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.db
+def test_ledger_records_backs_off_and_dead_letters():
+    conn = _FakeConn([(False,), (True,)], [("u1",)], [("u2", 3)], [("u9",)],
+                     [("pending", 2), ("dead", 1)])
+    ledger = fl.FailureLedger(dead_after=3, retry_base_s=60, connect=lambda: conn)
+    assert conn.autocommit
+    ledger.ensure_schema()
+    assert "CREATE TABLE IF NOT EXISTS detail_failures" in conn.queries[0][0]
+
+    assert ledger.record([]) == (0, 0)
+    assert ledger.record([("u1", "timeout"), ("u2", "HTTP 503"), ("u1", "HTTP 404")]) == (2, 1)
+    sql, params = conn.queries[-1]
+    assert "ON CONFLICT (url) DO UPDATE" in sql and "power(2, f.attempts)" in sql
+    assert params["urls"] == ["u1", "u2"] and params["errors"] == ["HTTP 404", "HTTP 503"]
+    assert params["dead"] == [True, False]  # a missing page is dead at once
+    assert (params["base_s"], params["cap_s"], params["dead_after"]) == (60, fl.RETRY_CAP_S, 3)
+
+    assert ledger.resolve([]) == 0
+    assert ledger.resolve(["u1"]) == 1
+    assert conn.queries[-1][1] == (["u1"],)
+    assert ledger.due(10) == [("u2", 3)]
+    assert "NOT dead AND next_retry <= now()" in conn.queries[-1][0]
+    assert ledger.dead_urls() == {"u9"}
+    assert ledger.counts() == {"pending": 2, "dead": 1}
+    ledger.close()
+    assert conn.closed
+
+
+class _MemLedger:
+    """In-memory stand-in for FailureLedger (no retry times: everything is due)."""
+
+    def __init__(self, dead_after=2, **failures):
+        self.dead_after = dead_after
+        self.rows = {url: {"error": "timeout", "attempts": n, "dead": False}
+                     for url, n in failures.items()}
+
+    def ensure_schema(self):
+        pass
+
+    def record(self, failures):
+        failures, dead = dict(failures), 0
+        for url, error in failures.items():
+            row = self.rows.setdefault(url, {"attempts": 0, "dead": False})
+            row["attempts"] += 1
+            row["error"] = error
+            row["dead"] = row["dead"] or error in fl.DEAD_ERRORS or row["attempts"] >= self.dead_after
+            dead += row["dead"]
+        return len(failures), dead
+
+    def resolve(self, urls):
+        for url in urls:
+            del self.rows[url]
+
+    def due(self, limit=None):
+        return [(u, r["attempts"]) for u, r in self.rows.items() if not r["dead"]][:limit]
+
+    def dead_urls(self):
+        return {u for u, r in self.rows.items() if r["dead"]}
+
+    def counts(self):
+        dead = len(self.dead_urls())
+        return {"pending": len(self.rows) - dead, "dead": dead}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def close(self):
+        pass
+
+
+class _PatchConn:
+    """applicants stand-in for the repair UPDATE: only ``stored`` URLs match."""
+
+    def __init__(self, stored):
+        self.stored = stored
+        self.updates = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        conn = self
+
+        class _Cur:
+            rowcount = 0
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params):
+                conn.updates.append(params)
+                self.rowcount = int(params["url"] in conn.stored)
+
+        return _Cur()
+
+    def commit(self):
+        pass
+
+
+def _url(rid):
+    return f"https://www.thegradcafe.com/result/{rid}"
+
+
+@pytest.mark.integration
+def test_repair_patches_fixed_rows_and_dead_letters_the_rest(monkeypatch, capsys):
+    ledger = _MemLedger(**{_url(1): 1, _url(2): 1, _url(3): 1, _url(4): 1})
+    conn = _PatchConn({_url(1)})
+    monkeypatch.setattr(su, "connect_db", lambda: conn)
+
+    def fetch(url):
+        if url == _url(3):
+            raise su.FetchError(url, "HTTP 503", 503)
+        if url == _url(4):
+            raise su.FetchError(url, "HTTP 410", 410)
+        return ("<dl><dt>Undergrad GPA</dt><dd>3.70</dd><dt>Degree Type</dt><dd>PhD</dd>"
+                "<dt>Degree's Country of Origin</dt><dd>International</dd></dl>")
+
+    monkeypatch.setattr(su, "_fetch_page", fetch)
+    stats = su.repair_details(ledger=ledger)
+    assert stats == {"due": 4, "patched": 1, "not_stored": 1, "failed": 2, "dead_lettered": 2}
+    row = conn.updates[0]
+    assert row["url"] == _url(1) and row["gpa"] == 3.7 and row["degree"] == "PhD"
+    assert row["us_or_international"] == "International" and row["gre"] is None
+
+    # Result 2 is not loaded yet: it stays in the ledger; 3 hit dead_after, 4 is gone
+    assert ledger.due() == [(_url(2), 1)]
+    assert ledger.dead_urls() == {_url(3), _url(4)}
+    assert "[repair] due=4 patched=1 not_stored=1 failed=2 dead_lettered=2" in capsys.readouterr().out
+
+
+def _survey_html(*rids):
+    rows = "".join(
+        f'<tr><td>U</td><td>P</td><td>d</td><td>Accepted on 1 Jan</td><td>c</td>'
+        f'<td><a href="/result/{rid}">x</a></td></tr>'
+        for rid in rids
+    )
+    return f"<table>{rows}</table>"
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("mode", ["chunked", "pipelined"])
+def test_crawl_skips_dead_letters_and_records_failures(monkeypatch, tmp_path, mode):
+    ledger = _MemLedger(dead_after=5)
+    ledger.record([(_url(52), "HTTP 404")])
+    monkeypatch.setattr(su, "FailureLedger", lambda dead_after: ledger)
+    monkeypatch.setattr(su, "USE_FAILURE_LEDGER", True)
+    monkeypatch.setattr(su, "load_existing_ids_from_db", lambda bits: su.ResultIdIndex([]))
+    monkeypatch.setattr(su, "CRAWL_MODE", mode)
+    monkeypatch.setattr(su, "SURVEY_PAGES", 1)
+    monkeypatch.setattr(su, "UPDATE_OUTPUT_JSON", str(tmp_path / "update.json"))
+    fetches = []
+
+    def fetch(url):
+        fetches.append(url)
+        if "page=" in url:
+            return _survey_html(51, 52, 53)
+        if url == _url(53):
+            raise su.FetchError(url, "timeout")
+        return "<dl><dt>Undergrad GPA</dt><dd>3.10</dd></dl>"
+
+    monkeypatch.setattr(su, "_fetch_page", fetch)
+    su.scrape_data(resume=False)
+
+    rows = json.loads((tmp_path / "update.json").read_text(encoding="utf-8"))
+    assert [r["detail_error"] for r in rows] == [None, su.DEAD_LETTER, "timeout"]
+    assert _url(52) not in fetches
+    assert ledger.rows[_url(53)] == {"attempts": 1, "error": "timeout", "dead": False}
+    assert ledger.rows[_url(52)]["attempts"] == 1  # skipped, not counted again
+
+
+@pytest.mark.db
+def test_crawl_without_ledger_grants_skips_the_ledger(monkeypatch, capsys):
+    def denied(dead_after):
+        raise InsufficientPrivilege("permission denied for schema public\nLINE 1: ...")
+
+    monkeypatch.setattr(su, "FailureLedger", denied)
+    assert su._load_dead_letters() == set()
+    su._update_failure_ledger([{"entry_url": _url(1), "detail_error": "timeout"}])
+    out = capsys.readouterr().out
+    assert out.count("[ledger] skipped: permission denied for schema public (grant") == 2
+
+
+@pytest.mark.db
+def test_schema_already_created_by_the_owner_needs_no_create_privilege():
+    class _DeniedConn(_FakeConn):
+        def cursor(self):
+            cur = super().cursor()
+            execute = cur.execute
+
+            def guarded(sql, params=None):
+                execute(sql, params)
+                if sql.lstrip().startswith("CREATE"):
+                    raise InsufficientPrivilege("permission denied for schema public")
+
+            cur.execute = guarded
+            return cur
+
+    conn = _DeniedConn([(False,)], [(True,)])
+    ledger = fl.FailureLedger(connect=lambda: conn)
+    ledger.ensure_schema()  # the table exists
+    assert conn.queries[-1] == ("SELECT to_regclass(%s) IS NULL;", ("detail_failures",))
+    with pytest.raises(InsufficientPrivilege):
+        ledger.ensure_schema()  # it does not
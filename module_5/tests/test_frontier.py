@@ -0,0 +1,177 @@
+import json
+import os
+
+import psycopg
+import pytest
+
+import src.scrape_update as su
+from src import record_journal
+from src.result_index import ResultIdIndex
+
+TOP = 130  # newest id on the fake site
+GAPS = {125, 127}  # deleted / moderated ids: never listed, never fetched
+ROWS_PER_PAGE = 5
+
+
+def _listed_ids() -> list[int]:
+    return [rid for rid in range(TOP, 0, -1) if rid not in GAPS]
+
+
+def _survey_html(page: int) -> str:
+    ids = _listed_ids()[(page - 1) * ROWS_PER_PAGE: page * ROWS_PER_PAGE]
+    rows = "".join(
+        f"<tr><td>Uni {rid}</td><td>Program</td><td>2026-02-10</td>"
+        f'<td>Accepted on 29 Jan</td><td>note</td><td><a href="/result/{rid}">x</a></td></tr>'
+        for rid in ids
+    )
+    return f"<table>{rows}</table>"
+
+
+@pytest.fixture()
+def site(monkeypatch, tmp_path):
+    requests = []
+    broken = {128}  # its detail page cannot be fetched
+
+    def fetch(url):
+        requests.append(url)
+        if "?page=" in url:
+            return _survey_html(int(url.rsplit("=", 1)[1]))
+        rid = int(url.rsplit("/", 1)[1])
+        if rid in broken:
+            raise su.FetchError(url, "network error")
+        if rid > TOP or rid in GAPS:
+            raise su.FetchError(url, "HTTP 404", 404)
+        return f"<dl><dt>Undergrad GPA</dt><dd>3.{rid % 10}</dd></dl>"
+
+    monkeypatch.setattr(su, "_fetch_page", fetch)
+    monkeypatch.setattr(su, "PIPELINE_QUEUE_SIZE", 4)
+    monkeypatch.setattr(su, "UPDATE_OUTPUT_JSON", str(tmp_path / "update.json"))
+    return requests
+
+
+@pytest.mark.integration
+def test_frontier_reads_survey_pages_down_to_the_newest_stored_id(site, capsys):
+    records, failed = su._scrape_frontier(110)
+
+    ids = sorted((su._result_id(r["entry_url"]) for r in records), reverse=True)
+    assert ids == [130, 129, 128, 126, *range(124, 110, -1)]
+    assert failed == 1
+    by_id = {su._result_id(r["entry_url"]): r for r in records}
+    assert by_id[130]["university_raw"] == "Uni 130" and by_id[130]["gpa"] == "3.0"
+    assert by_id[128]["detail_error"] == "network error" and by_id[128]["gpa"] is None
+
+    # Page 4 lists 110, so the walk stops there; gaps and stored ids cost nothing
+    assert sum("?page=" in u for u in site) == 4
+    details = sorted(su._result_id(u) for u in site if "/result/" in u)
+    assert details == sorted(ids)
+    out = capsys.readouterr().out
+    assert "[frontier] top_id=110 survey_pages=4 rows=18 updated=17 failed=1 requests~22" in out
+
+
+@pytest.mark.integration
+def test_frontier_interrupt_stops_the_walk(site, monkeypatch, capsys):
+    fetch = su._fetch_page
+
+    def interrupted(url):
+        if url.endswith("?page=2"):
+            raise KeyboardInterrupt
+        return fetch(url)
+
+    monkeypatch.setattr(su, "_fetch_page", interrupted)
+    records, _ = su._scrape_frontier(110)
+    assert len(records) == 5 and not any("?page=3" in u for u in site)
+    assert "[interrupt] Ctrl-C received. Stopping the survey walk." in capsys.readouterr().out
+
+
+@pytest.mark.integration
+def test_frontier_walks_past_rows_without_an_id(site, monkeypatch):
+    fetch = su._fetch_page
+    promo = "<tr><td>Sponsored</td><td>-</td><td>-</td><td>-</td><td>-</td><td>ad</td></tr>"
+    monkeypatch.setattr(
+        su, "_fetch_page", lambda url: fetch(url).replace("<table>", "<table>" + promo)
+    )
+    records, _ = su._scrape_frontier(110)
+    assert len(records) == 18 and all(r["entry_url"] for r in records)
+    assert sum("?page=" in u for u in site) == 4
+
+
+@pytest.mark.integration
+def test_frontier_without_details_keeps_the_rows_as_listed(site, monkeypatch, capsys):
+    monkeypatch.setattr(su, "FETCH_DETAILS", False)
+    records, failed = su._scrape_frontier(110)
+    assert len(records) == 18 and failed == 0 and not any(r["gpa"] for r in records)
+    assert not any("/result/" in u for u in site)
+    assert "rows=18 updated=0 failed=0 requests~4" in capsys.readouterr().out
+
+
+@pytest.mark.integration
+def test_scrape_data_frontier_mode(site, monkeypatch, capsys, tmp_path):
+    monkeypatch.setattr(su, "CRAWL_MODE", "frontier")
+    monkeypatch.setattr(su, "load_max_result_id_from_db", lambda: 120)
+    monkeypatch.setattr(su, "load_existing_ids_from_db", lambda bits: pytest.fail("full id load"))
+    su.scrape_data()
+    rows = json.loads((tmp_path / "update.json").read_text(encoding="utf-8"))
+    assert len(rows) == 8 and all(set(su.REQUIRED_KEYS) <= set(r) for r in rows)
+    assert "mode=frontier rows=8" in capsys.readouterr().out
+
+    # Empty table: no frontier to start from, so the survey crawl runs instead
+    monkeypatch.setattr(su, "load_max_result_id_from_db", lambda: 0)
+    monkeypatch.setattr(su, "load_existing_ids_from_db", lambda bits: ResultIdIndex())
+    monkeypatch.setattr(su, "SURVEY_PAGES", 2)
+    su.scrape_data()
+    assert "[survey] page 2:" in capsys.readouterr().out
+
+
+@pytest.mark.integration
+def test_frontier_resume_finishes_an_interrupted_journal_first(site, monkeypatch, capsys):
+    monkeypatch.setattr(su, "CRAWL_MODE", "frontier")
+    monkeypatch.setattr(su, "load_max_result_id_from_db", lambda: pytest.fail("frontier run"))
+    monkeypatch.setattr(su, "load_existing_ids_from_db", lambda bits: ResultIdIndex(range(1, 121)))
+    monkeypatch.setattr(su, "SURVEY_PAGES", 3)
+    journal = record_journal.RecordJournal(su.UPDATE_JOURNAL)
+    journal.add(0, {"entry_url": "https://www.thegradcafe.com/result/130"})
+    journal.close()
+
+    su.scrape_data()
+    out = capsys.readouterr().out
+    assert "finishing the interrupted run in the journal first" in out
+    assert "[resume] run " in out and "replayed 1 rows" in out
+    rows = json.loads(open(su.UPDATE_OUTPUT_JSON, encoding="utf-8").read())
+    assert len(rows) == 8
+
+
+@pytest.mark.db
+def test_load_max_result_id_from_db():
+    url = "https://www.thegradcafe.com/result/987654321"
+    conn = psycopg.connect(
+        dbname=os.getenv("PGDATABASE", "gradcafe"),
+        user=os.getenv("PGUSER", "ziran"),
+        password=os.getenv("PGPASSWORD", "ziran"),
+        host=os.getenv("PGHOST", "localhost"),
+        port=int(os.getenv("PGPORT", "5432")),
+    )
+    try:
+        with conn.cursor() as cur:
+            cur.execute("INSERT INTO applicants (url) VALUES (%s) ON CONFLICT DO NOTHING;", (url,))
+        conn.commit()
+        assert su.load_max_result_id_from_db() == 987654321
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM applicants WHERE url = %s;", (url,))
+        conn.commit()
+        conn.close()
+
+
+@pytest.mark.web
+def test_missing_pages_are_not_retried(raw_http_server, monkeypatch, capsys):
+    hits = []
+
+    def gone(headers):
+        hits.append(1)
+        return b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n"
+
+    base = raw_http_server({"/result/5": gone})
+    monkeypatch.setattr(su, "USE_HTTP_CACHE", False)
+    assert su._safe_fetch_html(base + "/result/5") is None
+    assert len(hits) == 1
+    assert "[fetch missing]" in capsys.readouterr().out
@@ -0,0 +1,132 @@
+import json
+import sys
+import types
+import zlib
+
+import pytest
+
+import src.html_archive as ha
+import src.scrape_update as su
+
+
+@pytest.mark.analysis
+def test_archive_round_trip_and_dedup(tmp_path):
+    root = str(tmp_path / "arch")
+    arch = ha.HtmlArchive(root, codec="gzip")
+
+    assert arch.append("https://x/result/1", "<p>v1 café</p>", fetched_at="2026-01-01T00:00:00+00:00")
+    assert not arch.append("https://x/result/1", "<p>v1 café</p>")  # unchanged body
+    assert arch.append("https://x/result/1", "<p>v2</p>")
+    assert arch.append("https://x/survey/?page=1", "<table></table>")
+    assert (arch.stored, arch.skipped) == (3, 1)
+
+    entries = list(ha.iter_index(root))
+    assert [e["url"] for e in entries] == ["https://x/result/1"] * 2 + ["https://x/survey/?page=1"]
+    assert entries[0]["fetched_at"] == "2026-01-01T00:00:00+00:00"
+    assert ha.read_entry(root, entries[0]) == "<p>v1 café</p>"
+
+    latest = ha.latest_entries(root)
+    assert ha.read_entry(root, latest["https://x/result/1"]) == "<p>v2</p>"
+
+    # A reopened archive still knows the latest bodies
+    again = ha.HtmlArchive(root, codec="gzip")
+    assert not again.append("https://x/survey/?page=1", "<table></table>")
+
+
+@pytest.mark.analysis
+def test_archive_rotates_segments(tmp_path):
+    root = str(tmp_path / "arch")
+    arch = ha.HtmlArchive(root, codec="gzip", segment_max_bytes=1)
+    for rid in range(3):
+        arch.append(f"https://x/result/{rid}", f"page {rid}")
+    segments = [e["segment"] for e in ha.iter_index(root)]
+    assert segments == ["seg-00001.gz", "seg-00002.gz", "seg-00003.gz"]
+
+    reopened = ha.HtmlArchive(root, codec="gzip", segment_max_bytes=1)
+    reopened.append("https://x/result/9", "page 9")
+    assert list(ha.iter_index(root))[-1]["segment"] == "seg-00004.gz"
+    assert ha.latest_entries(str(tmp_path / "missing")) == {}
+
+
+@pytest.mark.analysis
+def test_archive_uses_zstd_when_installed(tmp_path, monkeypatch):
+    assert ha.default_codec() == ("zstd" if ha._zstd() else "gzip")
+
+    fake = types.ModuleType("zstandard")
+    fake.ZstdCompressor = lambda level: types.SimpleNamespace(compress=zlib.compress)
+    fake.ZstdDecompressor = lambda: types.SimpleNamespace(decompress=zlib.decompress)
+    monkeypatch.setitem(sys.modules, "zstandard", fake)
+    assert ha.default_codec() == "zstd"
+
+    root = str(tmp_path / "arch")
+    arch = ha.HtmlArchive(root)
+    arch.append("https://x/result/5", "zstd page")
+    entry = ha.latest_entries(root)["https://x/result/5"]
+    assert entry["segment"] == "seg-00001.zst"
+    assert ha.read_entry(root, entry) == "zstd page"
+
+    monkeypatch.setitem(sys.modules, "zstandard", None)  # import now fails
+    assert ha.default_codec() == "gzip"
+
+
+def _survey_html(page: int) -> str:
+    rows = "".join(
+        "<tr>"
+        f"<td>Uni {page}-{k}</td><td>Program {k}</td><td>2026-02-10</td>"
+        "<td>Accepted on 29 Jan</td><td>note</td>"
+        f'<td><a href="/result/{100 + page + k}">x</a></td>'
+        "</tr>"
+        for k in range(2)
+    )
+    return f"<table>{rows}</table>"
+
+
+def _result_html(gpa: str) -> str:
+    return f"<dl><dt>Degree Type</dt><dd>Masters</dd><dt>Undergrad GPA</dt><dd>{gpa}</dd></dl>"
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reparse_rebuilds_update_json_offline(tmp_path, monkeypatch, workers):
+    root = str(tmp_path / "arch")
+    arch = ha.HtmlArchive(root, codec="gzip")
+    base = "https://www.thegradcafe.com"
+    # Page 2 overlaps page 1 (row /result/102); page 1 is the newer copy
+    for page in (2, 1):
+        arch.append(f"{base}/survey/?page={page}", _survey_html(page), fetched_at=f"t{page}")
+    arch.append(f"{base}/result/101", _result_html("3.10"))
+    arch.append(f"{base}/result/101", _result_html("3.90"))  # re-fetched later
+    arch.append(f"{base}/result/9999", _result_html("2.00"))  # not on any survey page
+
+    def no_network(url):
+        raise AssertionError(f"network used for {url}")
+
+    monkeypatch.setattr(su, "_fetch_page", no_network)
+    out = tmp_path / "update.json"
+    records = su.reparse_archive(root, str(out), workers=workers)
+
+    assert [r["entry_url"] for r in records] == [
+        f"{base}/result/101", f"{base}/result/102", f"{base}/result/103",
+    ]
+    assert records[0]["gpa"] == "3.90" and records[0]["degree_level"] == "Masters"
+    assert records[1]["university_raw"] == "Uni 1-1" and records[1]["scraped_at"] == "t1"
+    assert records[2]["gpa"] is None  # detail page never archived
+    assert json.loads(out.read_text(encoding="utf-8")) == [dict(r) for r in records]
+
+
+@pytest.mark.web
+def test_safe_fetch_html_archives_downloads(raw_http_server, monkeypatch):
+    body = b"<p>archived</p>"
+    base = raw_http_server(
+        {"/result/7": b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)}
+    )
+    monkeypatch.setattr(su, "ARCHIVE_HTML", True)
+    assert su._safe_fetch_html(base + "/result/7") == "<p>archived</p>"
+    assert su._safe_fetch_html(base + "/result/7") == "<p>archived</p>"
+
+    entries = list(ha.iter_index(su.ARCHIVE_DIR))
+    assert [e["url"] for e in entries] == [base + "/result/7"]
+    assert su._html_archive().skipped == 1
+
+    monkeypatch.setattr(su, "ARCHIVE_HTML", False)
+    assert su._html_archive() is None
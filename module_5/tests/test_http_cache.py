@@ -0,0 +1,158 @@
+import pytest
+
+import src.http_cache as hc
+import src.http_pool as hp
+import src.scrape_update as su
+
+
+def _resp(body: bytes, *headers: str, status: str = "200 OK") -> bytes:
+    head = [f"HTTP/1.1 {status}", f"Content-Length: {len(body)}", *headers]
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def site(raw_http_server):
+    """Survey page with an ETag, result page with Last-Modified; both honor validators."""
+    seen = []
+
+    def survey(headers):
+        seen.append(("survey", headers.get("if-none-match")))
+        if headers.get("if-none-match") == '"v1"':
+            return _resp(b"", 'ETag: "v1"', status="304 Not Modified")
+        return _resp(b"<p>survey</p>", 'ETag: "v1"')
+
+    def result(headers):
+        seen.append(("result", headers.get("if-modified-since")))
+        if headers.get("if-modified-since"):
+            return _resp(b"", status="304 Not Modified")
+        return _resp(b"<p>result</p>", "Last-Modified: Mon, 02 Feb 2026 10:00:00 GMT")
+
+    base = raw_http_server({
+        "/survey/?page=1": survey,
+        "/result/42": result,
+        "/private": _resp(b"secret", "Cache-Control: no-store"),
+    })
+    return base, seen
+
+
+@pytest.mark.web
+def test_cache_serves_fresh_results_and_revalidates_surveys(site, tmp_path):
+    base, seen = site
+    clock = FakeClock()
+    cache = hc.HttpCache(str(tmp_path / "c.sqlite3"), clock=clock)
+    pool = hp.HttpPool(timeout=5)
+
+    assert cache.fetch_html(pool, base + "/survey/?page=1") == "<p>survey</p>"
+    assert cache.fetch_html(pool, base + "/survey/?page=1") == "<p>survey</p>"
+    assert seen == [("survey", None), ("survey", '"v1"')]  # TTL 0: always conditional
+
+    assert cache.fetch_html(pool, base + "/result/42") == "<p>result</p>"
+    assert cache.fetch_html(pool, base + "/result/42/") == "<p>result</p>"  # same key, fresh
+    assert len(seen) == 3
+
+    clock.now += hc.TTL_S["result"]
+    assert cache.fresh_text(base + "/result/42") is None
+    assert cache.fetch_html(pool, base + "/result/42") == "<p>result</p>"
+    assert seen[-1] == ("result", "Mon, 02 Feb 2026 10:00:00 GMT")
+    assert cache.fresh_text(base + "/result/42") == "<p>result</p>"  # 304 restarted the TTL
+
+    s = cache.stats()
+    assert (s["fresh_hits"], s["revalidated"], s["misses"]) == (2, 2, 2)
+    assert s["pages"] == 2 and s["hit_ratio"] == pytest.approx(4 / 6, abs=1e-4)
+    cache.close()
+
+    # Entries survive a restart
+    reopened = hc.HttpCache(str(tmp_path / "c.sqlite3"), clock=clock)
+    assert reopened.fresh_text(base + "/result/42") == "<p>result</p>"
+    assert reopened.stats()["bytes_on_disk"] > 0
+
+
+@pytest.mark.web
+def test_revalidate_ignores_the_ttl(site, tmp_path):
+    base, seen = site
+    cache = hc.HttpCache(str(tmp_path / "c.sqlite3"), clock=FakeClock())
+    pool = hp.HttpPool(timeout=5)
+
+    assert cache.revalidate(pool, base + "/result/42") == ("<p>result</p>", True)
+    # Still fresh, but re-checked anyway: a 304 means the page did not change
+    assert cache.revalidate(pool, base + "/result/42") == ("<p>result</p>", False)
+    assert seen == [("result", None), ("result", "Mon, 02 Feb 2026 10:00:00 GMT")]
+
+
+@pytest.mark.web
+def test_cache_skips_no_store_responses(site, tmp_path):
+    base, _ = site
+    cache = hc.HttpCache(str(tmp_path / "c.sqlite3"))
+    assert cache.fetch_html(hp.HttpPool(timeout=5), base + "/private") == "secret"
+    assert cache.stats()["pages"] == 0
+    assert hc.HttpCache(str(tmp_path / "empty.sqlite3")).stats()["hit_ratio"] == 0.0
+
+
+@pytest.mark.analysis
+def test_cache_evicts_least_recently_used(tmp_path):
+    clock = FakeClock()
+    cache = hc.HttpCache(str(tmp_path / "c.sqlite3"), max_bytes=50, clock=clock)
+    for rid in (1, 2, 3):
+        clock.now += 1
+        cache.store(f"https://x/result/{rid}", f"page {rid}", None, None)
+    clock.now += 1
+    cache.fresh_text("https://x/result/1")  # touch: 2 becomes least recently used
+
+    clock.now += 1
+    cache.store("https://x/result/4", "page 4", None, None)
+    kept = [rid for rid in (1, 2, 3, 4) if cache.fresh_text(f"https://x/result/{rid}")]
+    assert kept == [1, 3, 4]
+    assert cache.stats()["evictions"] == 1
+
+    cache.store("https://x/result/4", "page 4 again", None, None)  # replace, not add
+    assert cache.stats()["bytes_on_disk"] == 3 * 14 - 14 + 20
+
+
+@pytest.mark.analysis
+def test_canonical_url_and_url_class():
+    assert hc.canonical_url("HTTPS://WWW.Example.com/result/7/#top") == "https://www.example.com/result/7"
+    assert hc.canonical_url("https://x/survey/?b=2&a=1") == "https://x/survey?a=1&b=2"
+    assert hc.canonical_url("https://x") == "https://x/"
+    assert hc.url_class("https://x/result/7/") == "result"
+    assert hc.url_class("https://x/survey/?page=3") == "survey"
+
+
+@pytest.mark.web
+def test_scrape_update_fetches_through_cache(site, tmp_path, monkeypatch, capsys):
+    base, seen = site
+    monkeypatch.setattr(su, "USE_HTTP_CACHE", True)
+    monkeypatch.setattr(su, "HTTP_CACHE_PATH", str(tmp_path / "cache" / "su.sqlite3"))
+    monkeypatch.setattr(su, "_HTTP_CACHE", None)
+
+    assert su._safe_fetch_html(base + "/result/42") == "<p>result</p>"
+    assert su._safe_fetch_html(base + "/result/42") == "<p>result</p>"
+    assert len(seen) == 1
+    su._print_http_stats()
+    assert "[cache] fresh_hits=1 revalidated_304=0 misses=1" in capsys.readouterr().out
+
+    monkeypatch.setattr(su, "USE_HTTP_CACHE", False)
+    assert su._http_cache() is None
+    assert su._fetch_html(base + "/result/42") == "<p>result</p>"
+    assert len(seen) == 2
+
+
+@pytest.mark.web
+def test_async_backend_stores_validators(site, tmp_path, monkeypatch):
+    base, seen = site
+    monkeypatch.setattr(su, "USE_HTTP_CACHE", True)
+    monkeypatch.setattr(su, "HTTP_CACHE_PATH", str(tmp_path / "su.sqlite3"))
+    monkeypatch.setattr(su, "_HTTP_CACHE", None)
+    url = base + "/result/42"
+
+    assert su._fetch_details_async([{"entry_url": url}], [(0, url)]) == (1, 0)
+    # The Last-Modified of the asyncio response makes the next check conditional
+    assert su._http_cache().revalidate(hp.HttpPool(timeout=5), url) == ("<p>result</p>", False)
+    assert seen == [("result", None), ("result", "Mon, 02 Feb 2026 10:00:00 GMT")]
@@ -0,0 +1,133 @@
+import gzip
+import zlib
+from urllib.error import HTTPError, URLError
+
+import pytest
+
+import src.http_pool as hp
+
+
+def _resp(body: bytes, *headers: str, status: str = "200 OK") -> bytes:
+    head = [f"HTTP/1.1 {status}", f"Content-Length: {len(body)}", *headers]
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+PAGE = "<html><body>café</body></html>"
+
+
+def _raw_deflate(data: bytes) -> bytes:
+    c = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return c.compress(data) + c.flush()
+
+
+def _gzip_if_asked(headers):
+    assert "gzip" in headers["accept-encoding"]
+    return _resp(
+        gzip.compress(PAGE.encode("utf-8") * 20),
+        "Content-Encoding: gzip",
+        "Content-Type: text/html; charset=utf-8",
+    )
+
+
+RESPONSES = {
+    "/gzip": _gzip_if_asked,
+    "/deflate": _resp(zlib.compress(b"zlib body"), "Content-Encoding: deflate"),
+    "/raw-deflate": _resp(_raw_deflate(b"raw body"), "Content-Encoding: deflate"),
+    "/latin1": _resp(PAGE.encode("latin-1"), "Content-Type: text/html; charset=ISO-8859-1"),
+    "/redirect": _resp(b"", "Location: /latin1", status="302 Found"),
+    "/loop": _resp(b"", "Location: /loop", status="301 Moved"),
+    "/missing": _resp(b"nope", status="404 Not Found"),
+    "/closing": _resp(b"bye", "Connection: close"),
+    "/stale": _resp(b"first"),
+    "/bad-gzip": _resp(b"not gzip", "Content-Encoding: gzip"),
+    "/cut-gzip": _resp(gzip.compress(b"x" * 500)[:12], "Content-Encoding: gzip"),
+    "/bad-deflate": _resp(b"\xff\xfe not deflate", "Content-Encoding: deflate"),
+    "/drop": None,
+}
+
+
+@pytest.fixture()
+def base_url(raw_http_server):
+    return raw_http_server(RESPONSES, close_after={"/stale"})
+
+
+@pytest.mark.web
+def test_pool_reuses_connections_and_decodes_gzip(base_url):
+    pool = hp.HttpPool(user_agent="test-agent", timeout=5)
+
+    texts = [pool.fetch_html(base_url + "/gzip") for _ in range(3)]
+
+    assert texts == [PAGE * 20] * 3
+    s = pool.stats()
+    assert s["requests"] == 3
+    assert s["connections_opened"] == 1
+    assert s["reused"] == 2
+    assert s["reuse_ratio"] == pytest.approx(2 / 3, abs=1e-4)
+    assert s["bytes_saved"] == s["bytes_decoded"] - s["bytes_wire"] > 0
+    pool.close()
+
+
+@pytest.mark.web
+def test_pool_handles_deflate_charset_and_redirects(base_url):
+    pool = hp.HttpPool(timeout=5)
+
+    assert pool.fetch_html(base_url + "/deflate") == "zlib body"
+    assert pool.fetch_html(base_url + "/raw-deflate") == "raw body"
+    assert pool.fetch_html(base_url + "/latin1") == PAGE
+    resp = pool.get(base_url + "/redirect")
+    assert resp.url.endswith("/latin1") and resp.text == PAGE
+
+
+@pytest.mark.web
+def test_pool_raises_urllib_compatible_errors(base_url):
+    pool = hp.HttpPool(timeout=5)
+
+    with pytest.raises(HTTPError) as exc:
+        pool.get(base_url + "/missing")
+    assert exc.value.code == 404
+
+    with pytest.raises(URLError, match="too many redirects"):
+        pool.get(base_url + "/loop")
+    with pytest.raises(URLError, match="unsupported URL"):
+        pool.get("ftp://example.com/file")
+    with pytest.raises(URLError):
+        pool.get(base_url + "/drop")  # closed without a response
+    with pytest.raises(URLError):
+        pool.get("http://127.0.0.1:1/")  # connection refused
+    for path in ("/bad-gzip", "/cut-gzip", "/bad-deflate"):
+        with pytest.raises(URLError, match="undecodable"):
+            pool.get(base_url + path)  # retryable like a dropped connection
+
+
+@pytest.mark.web
+def test_pool_replaces_stale_and_closing_connections(base_url):
+    pool = hp.HttpPool(timeout=5)
+
+    # Server silently closes after /stale; the next request must reconnect
+    assert pool.fetch_html(base_url + "/stale") == "first"
+    assert pool.fetch_html(base_url + "/deflate") == "zlib body"
+    assert pool.stats()["connections_opened"] == 2
+
+    # "Connection: close" responses are never returned to the pool
+    pool.fetch_html(base_url + "/closing")
+    assert pool.stats()["connections_opened"] == 2
+    pool.fetch_html(base_url + "/closing")
+    assert pool.stats()["connections_opened"] == 3
+
+
+@pytest.mark.web
+def test_pool_closes_connections_beyond_idle_limit(base_url):
+    pool = hp.HttpPool(timeout=5, max_idle_per_host=0)
+    pool.fetch_html(base_url + "/deflate")
+    pool.fetch_html(base_url + "/deflate")
+    assert pool.stats()["reused"] == 0
+    assert hp.HttpPool().stats()["reuse_ratio"] == 0.0
+
+
+@pytest.mark.analysis
+def test_detect_charset_sources():
+    assert hp.detect_charset("text/html; charset=ISO-8859-1", b"") == "ISO-8859-1"
+    assert hp.detect_charset(None, b'<meta charset="windows-1252">') == "windows-1252"
+    assert hp.detect_charset("text/html", b"<p>plain</p>") == "utf-8"
+    assert hp.detect_charset("text/html; charset=bogus-xyz", b"") == "utf-8"
+    assert hp.decode_body(b"same", None) == b"same"
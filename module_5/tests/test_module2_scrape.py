@@ -0,0 +1,39 @@
+import gzip
+import importlib
+import os
+from urllib.error import URLError
+
+import pytest
+
+# module_2/scrape.py, the original scraper, runs from its own directory
+MODULE_2 = os.path.join(os.path.dirname(__file__), "..", "..", "module_2")
+
+
+def _resp(body: bytes, *headers: str) -> bytes:
+    head = "".join(f"{h}\r\n" for h in headers)
+    return (f"HTTP/1.1 200 OK\r\nContent-Length: {len(body)}\r\n{head}\r\n").encode() + body
+
+
+@pytest.fixture()
+def scrape2(monkeypatch):
+    monkeypatch.syspath_prepend(MODULE_2)
+    scrape = importlib.import_module("scrape")
+    monkeypatch.setattr(scrape, "RETRIES", 2)
+    monkeypatch.setattr(scrape, "BACKOFF_S", 0)
+    return scrape
+
+
+@pytest.mark.web
+def test_module2_survives_an_undecodable_gzip_body(scrape2, raw_http_server, capsys):
+    base = raw_http_server({
+        "/bad-gzip": _resp(b"not gzip", "Content-Encoding: gzip"),
+        "/cut-gzip": _resp(gzip.compress(b"x" * 500)[:12], "Content-Encoding: gzip"),
+    })
+    with pytest.raises(URLError, match="undecodable gzip body"):
+        scrape2.HTTP_POOL.get(base + "/bad-gzip")
+
+    # A broken transfer is retried like a dropped connection, then the page is skipped
+    assert scrape2._safe_fetch_html(base + "/cut-gzip") is None
+    with pytest.raises(scrape2.FetchError, match="network error"):
+        scrape2._fetch_page(base + "/bad-gzip")
+    assert "[fetch fail 2/2]" in capsys.readouterr().out
@@ -0,0 +1,118 @@
+import json
+import os
+
+import psycopg
+import pytest
+
+import src.scrape_update as su
+
+
+class _FakeConn:
+    """Answers `url = ANY(%s)` from an in-memory set of stored URLs."""
+
+    def __init__(self, stored):
+        self.stored = set(stored)
+        self.queries = []
+        self.autocommit = False
+        self.closed = False
+
+    def cursor(self):
+        conn = self
+
+        class _Cur:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params):
+                conn.queries.append((sql, params[0]))
+                self.rows = [(u,) for u in params[0] if u in conn.stored]
+
+            def fetchall(self):
+                return self.rows
+
+        return _Cur()
+
+    def close(self):
+        self.closed = True
+
+
+def _page(*rids):
+    return [{"entry_url": f"https://www.thegradcafe.com/result/{rid}"} for rid in rids]
+
+
+@pytest.mark.integration
+def test_page_lookup_is_one_query_per_page(monkeypatch):
+    conn = _FakeConn({"https://www.thegradcafe.com/result/2", "http://thegradcafe.com/result/3"})
+    monkeypatch.setattr(su, "connect_db", lambda: conn)
+    dedup = su.DbPageDedup()
+
+    new = su._collect_new_rows(_page(1, 2, 3, 4, 4), dedup)
+    assert [su._result_id(r["entry_url"]) for r in new] == [1, 4]
+    assert len(conn.queries) == 1 and conn.autocommit
+    sql, urls = conn.queries[0]
+    assert "url = ANY(%s)" in sql and len(urls) == 4 * len(su._URL_SPELLINGS)
+
+    # Ids already taken this run are not asked about again
+    assert su._collect_new_rows(_page(4, 5), dedup)[0]["entry_url"].endswith("/5")
+    assert conn.queries[1][1] == [s.format(5) for s in su._URL_SPELLINGS]
+    assert su._collect_new_rows(_page(1, 4), dedup) == []
+    assert len(conn.queries) == 2 and len(dedup) == 3
+    assert dedup.summary().startswith("queries=2 ")
+
+    dedup.close()
+    dedup.close()
+    assert conn.closed
+
+
+@pytest.mark.integration
+def test_scrape_data_per_page_mode(monkeypatch, tmp_path, capsys):
+    survey = _page(100, 101, 102)
+    html = "<table>" + "".join(
+        f'<tr><td>U</td><td>P</td><td>d</td><td>Accepted on 1 Jan</td><td>c</td>'
+        f'<td><a href="{r["entry_url"]}">x</a></td></tr>'
+        for r in survey
+    ) + "</table>"
+    conn = _FakeConn({"https://www.thegradcafe.com/result/101"})
+    monkeypatch.setattr(su, "connect_db", lambda: conn)
+    monkeypatch.setattr(su, "load_existing_ids_from_db", lambda bits: pytest.fail("preload"))
+    monkeypatch.setattr(su, "_fetch_page", lambda url: html)
+    monkeypatch.setattr(su, "FETCH_DETAILS", False)
+    monkeypatch.setattr(su, "SURVEY_PAGES", 5)
+    monkeypatch.setattr(su, "DEDUP_MODE", "per-page")
+    monkeypatch.setattr(su, "UPDATE_OUTPUT_JSON", str(tmp_path / "update.json"))
+
+    su.scrape_data()
+    rows = json.loads((tmp_path / "update.json").read_text(encoding="utf-8"))
+    assert [su._result_id(r["entry_url"]) for r in rows] == [100, 102]
+    # Pages 2-3 repeat page 1: only the stored id is asked about again
+    assert [len(urls) for _, urls in conn.queries] == [12, 4, 4]
+    assert conn.closed
+    assert "[dedup] per-page queries=3 " in capsys.readouterr().out
+
+
+@pytest.mark.db
+def test_page_lookup_against_postgres():
+    url = "http://thegradcafe.com/result/987655001"
+    conn = psycopg.connect(
+        dbname=os.getenv("PGDATABASE", "gradcafe"),
+        user=os.getenv("PGUSER", "ziran"),
+        password=os.getenv("PGPASSWORD", "ziran"),
+        host=os.getenv("PGHOST", "localhost"),
+        port=int(os.getenv("PGPORT", "5432")),
+    )
+    try:
+        with conn.cursor() as cur:
+            cur.execute("INSERT INTO applicants (url) VALUES (%s) ON CONFLICT DO NOTHING;", (url,))
+        conn.commit()
+        dedup = su.DbPageDedup()
+        new = su._collect_new_rows(_page(987655001, 987655002), dedup)
+        dedup.close()
+        assert [r["entry_url"] for r in new] == ["https://www.thegradcafe.com/result/987655002"]
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM applicants WHERE url = %s;", (url,))
+        conn.commit()
+        conn.close()
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+import src.async_fetch as af
+import src.scrape_update as su
+from src.result_index import ResultIdIndex
+
+
+def _survey_html(page: int) -> str:
+    rows = "".join(
+        "<tr>"
+        f"<td>Uni {page}-{k}</td><td>Program {k}</td><td>2026-02-10</td>"
+        "<td>Accepted on 29 Jan</td><td>note</td>"
+        f'<td><a href="/result/{page * 10 + k}">x</a></td>'
+        "</tr>"
+        for k in range(3)
+    )
+    return f"<table>{rows}</table>"
+
+
+def _result_html(rid: int) -> str:
+    return (
+        f"<dl><dt>Degree Type</dt><dd>{'PhD' if rid % 2 else 'Masters'}</dd>"
+        f"<dt>Undergrad GPA</dt><dd>3.{rid % 10}</dd></dl>"
+    )
+
+
+def _fake_fetch(url: str) -> str:
+    if "/result/" in url:
+        rid = int(url.rsplit("/", 1)[1])
+        if rid == 21:
+            raise su.FetchError(url, "HTTP 500", 500)
+        return _result_html(rid)
+    page = int(url.rsplit("=", 1)[1])
+    return _survey_html(page) if page <= 3 else _survey_html(3)
+
+
+@pytest.fixture()
+def parse_stage(monkeypatch, tmp_path):
+    monkeypatch.setattr(su, "_PARSE_STATS", {"pages": 0, "cpu_s": 0.0, "inline_cpu_s": 0.0})
+    monkeypatch.setattr(su, "_fetch_page", _fake_fetch)
+    monkeypatch.setattr(su, "load_existing_ids_from_db", lambda bits: ResultIdIndex())
+    monkeypatch.setattr(su, "UPDATE_OUTPUT_JSON", str(tmp_path / "update.json"))
+    monkeypatch.setattr(su, "SURVEY_PAGES", 10)
+    monkeypatch.setattr(su, "CHUNK_SURVEY_PAGES", 2)
+    yield tmp_path / "update.json"
+    su._shutdown_parse_pool()
+
+
+def _crawl(out, monkeypatch, workers, mode="chunked"):
+    monkeypatch.setattr(su, "PARSE_WORKERS", workers)
+    monkeypatch.setattr(su, "CRAWL_MODE", mode)
+    su.scrape_data()
+    rows = json.loads(out.read_text(encoding="utf-8"))
+    for r in rows:
+        r.pop("scraped_at")
+    return rows
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("mode", ["chunked", "pipelined"])
+def test_process_pool_parse_matches_inline_parse(parse_stage, monkeypatch, capsys, mode):
+    inline = _crawl(parse_stage, monkeypatch, 0, mode)
+    assert "parse_workers=inline" in capsys.readouterr().out
+
+    pooled = _crawl(parse_stage, monkeypatch, 2, mode)
+    text = capsys.readouterr().out
+    assert pooled == inline
+    assert len(pooled) == 9 and pooled[0]["degree_level"] == "Masters"
+    assert pooled[4]["gpa"] is None  # /result/21 could not be fetched
+    assert "[cpu] fetch_stage=" in text and "parse_workers=2" in text
+    assert su._PARSE_POOL is None  # shut down at the end of the run
+
+
+@pytest.mark.integration
+def test_parse_stage_counts_pages_and_cpu(parse_stage, monkeypatch):
+    monkeypatch.setattr(su, "PARSE_WORKERS", 2)
+    monkeypatch.setattr(su, "PARSER_BACKEND", "lxml")
+    rows = su._parse(su._parse_survey_page, _survey_html(1), "https://x/survey/?page=1")
+    assert rows[0]["entry_url"] == "https://x/result/10"
+    assert su._parse(su._parse_result_html, _result_html(3))["degree"] == "PhD"
+    assert su._PARSE_STATS["pages"] == 2 and su._PARSE_STATS["inline_cpu_s"] == 0.0
+
+    monkeypatch.setattr(su, "PARSE_WORKERS", 0)
+    assert su._parse_pool() is None
+    su._parse(su._parse_result_html, _result_html(3))
+    assert su._PARSE_STATS["cpu_s"] >= su._PARSE_STATS["inline_cpu_s"] > 0.0
+    assert su._PARSE_STATS["pages"] == 3
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("workers", [0, 2])
+def test_async_backend_merges_pooled_parses_in_order(parse_stage, monkeypatch, workers):
+    monkeypatch.setattr(su, "PARSE_WORKERS", workers)
+    monkeypatch.setattr(su, "USE_HTTP_CACHE", False)
+
+    def fake_fetch_all(by_url, on_result, **_):
+        for url in by_url:
+            rid = int(url.rsplit("/", 1)[1])
+            if rid == 1:
+                on_result(url, None, TimeoutError("deadline"))
+            elif rid == 2:
+                on_result(url, None, af.AsyncFetchError(url, "HTTP Error 503", 503))
+            else:
+                on_result(url, _result_html(rid), None)
+
+    monkeypatch.setattr(af, "fetch_all", fake_fetch_all)
+    urls = [f"https://www.thegradcafe.com/result/{rid}" for rid in (5, 1, 2, 8, 5)]
+    records = [{"entry_url": u} for u in urls]
+
+    updated, failed = su._fetch_details_async(records, list(enumerate(urls)))
+    assert (updated, failed) == (3, 2)
+    assert [r.get("gpa") for r in records] == ["3.5", None, None, "3.8", "3.5"]
+    assert [r["detail_error"] for r in records] == [None, "timeout", "HTTP 503", None, None]
+    assert records[3]["degree_level"] == "Masters"
+    assert su._PARSE_STATS["pages"] == 2
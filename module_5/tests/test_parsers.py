@@ -0,0 +1,96 @@
+import pytest
+
+import src.parsers as parsers
+import src.scrape_update as su
+
+SURVEY_HTML = """<!DOCTYPE html>
+<html><head><title>Survey</title><script>var t = "<td>no</td>";</script>
+<style>td { color: red }</style></head><body>
+<table>
+  <tr><th>University</th><th>Program</th></tr>
+  <tr>
+    <td>Test <b>University</b></td>
+    <td>Computer Science<!-- hidden --> <span>PhD</span></td>
+    <td>2026-02-10</td>
+    <td>Accepted on 29 Jan</td>
+    <td>Total comments <a>See More</a> My&nbsp;comment &amp; more</td>
+    <td><a href="/result/12345">link</a> <a href=" /result/12346 ">dup</a></td>
+  </tr>
+  <tr><td>short</td><td>row</td></tr>
+  <tr>
+    <td>Other University</td><td>Biology</td><td>2026-02-10</td>
+    <td>Rejected on 28 Jan</td><td></td><td><a>no href</a></td>
+  </tr>
+</table>
+</body></html>
+"""
+
+RESULT_HTML = """<html><body>
+<h1>Result <?php echo 1 ?></h1>
+<dl>
+  <dt>Degree Type</dt><dd>Masters</dd>
+  <dt>Degree's Country of Origin</dt><dd>International</dd>
+  <dt>Undergrad GPA</dt><dd>3.80</dd>
+  <dt>Notes</dt><dd><p>Line one</p>
+    <p>Line <em>two</em> tail</p></dd>
+</dl>
+<template><p>Template text</p></template>
+<ruby>GRE<rt>skip</rt><rp>(</rp></ruby>
+</body></html>
+"""
+
+
+@pytest.mark.web
+@pytest.mark.parametrize("html", [SURVEY_HTML, RESULT_HTML, "<p>x</p>", "plain text"])
+def test_backends_agree_on_well_formed_pages(html):
+    assert parsers.survey_rows(html, "lxml") == parsers.survey_rows(html, "bs4")
+    assert parsers.page_lines(html, "lxml") == parsers.page_lines(html, "bs4")
+
+
+@pytest.mark.web
+def test_survey_rows_texts_and_hrefs():
+    rows = parsers.survey_rows(SURVEY_HTML)
+    assert len(rows) == 2
+    texts, hrefs = rows[0]
+    assert texts == [
+        "Test University", "Computer Science PhD", "2026-02-10", "Accepted on 29 Jan",
+        "Total comments See More My\xa0comment & more",
+    ]
+    assert hrefs == ["/result/12345", " /result/12346 "]
+    assert rows[1][1] == []
+
+
+@pytest.mark.web
+def test_page_lines_skip_non_text_nodes():
+    lines = parsers.page_lines(RESULT_HTML, "lxml")
+    assert lines[:3] == ["Result", "Degree Type", "Masters"]
+    assert "Line two tail" not in lines and "two" in lines
+    assert not {"Template text", "skip", "("} & set(lines)
+    assert lines[-1] == "GRE"
+
+
+@pytest.mark.web
+@pytest.mark.filterwarnings("ignore::bs4.XMLParsedAsHTMLWarning")
+@pytest.mark.parametrize("html", [
+    "<table><tr>" + "<td>a\r\nb</td>" * 5 + "</tr></table>",  # \r normalized by libxml2
+    "<table><tr>" + "<td>a\x00b</td>" * 5 + "</tr></table>",  # NUL becomes U+FFFD
+    "",
+    "<?xml version='1.0' encoding='utf-8'?><p>x</p>",
+])
+def test_lxml_falls_back_to_bs4(html):
+    assert parsers.survey_rows(html, "lxml") == parsers.survey_rows(html, "bs4")
+    assert parsers.page_lines(html, "lxml") == parsers.page_lines(html, "bs4")
+
+
+@pytest.mark.web
+@pytest.mark.parametrize("backend", parsers.BACKENDS)
+def test_scrape_update_parses_with_either_backend(monkeypatch, backend):
+    monkeypatch.setattr(su, "PARSER_BACKEND", backend)
+    records = su._parse_survey_page(SURVEY_HTML, "https://www.thegradcafe.com/survey/?page=1")
+    assert [r["entry_url"] for r in records] == ["https://www.thegradcafe.com/result/12345", None]
+    assert records[0]["comments"] == "My comment & more"
+    assert records[1]["comments"] is None
+
+    detail = su._parse_result_html(RESULT_HTML)
+    assert detail["degree"] == "Masters" and detail["is_international"] is True
+    assert detail["gpa"] == "3.80" and detail["detail_comments"] == "Line one"
@@ -0,0 +1,242 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+import src.rate_control as rc
+import src.scrape_update as su
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _controller(**kw):
+    clock = FakeClock()
+    return rc.AdaptiveController(clock=clock, **kw), clock
+
+
+def _req(ctl, clock, status, latency=0.1):
+    clock.now += 1.0 / ctl.rate  # exactly one token refilled
+    ctl.acquire()
+    ctl.release(latency, status)
+
+
+def _healthy(ctl, clock, n, latency=0.1):
+    for _ in range(n):
+        _req(ctl, clock, 200, latency)
+
+
+@pytest.mark.analysis
+def test_parse_retry_after_seconds_and_dates():
+    now = datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert rc.parse_retry_after("120") == 120.0
+    assert rc.parse_retry_after("Thu, 01 Jan 2026 12:00:30 GMT", now=now) == 30.0
+    assert rc.parse_retry_after("Thu, 01 Jan 2026 11:00:00 GMT", now=now) == 0.0
+    assert rc.parse_retry_after("Thu, 01 Jan 2026 11:00:00 GMT") == 0.0
+    assert rc.parse_retry_after("soon") is None
+    assert rc.parse_retry_after(None) is None
+
+
+@pytest.mark.analysis
+def test_healthy_rounds_increase_rate_and_concurrency(tmp_path):
+    log = tmp_path / "decisions.jsonl"
+    ctl, clock = _controller(rate=5.0, concurrency=2, max_rate=6.0, max_concurrency=3,
+                             decision_log=str(log))
+    _healthy(ctl, clock, 10)
+
+    assert (ctl.rate, ctl.concurrency) == (6.0, 3)  # capped; no decision once at the ceiling
+    lines = [json.loads(x) for x in log.read_text(encoding="utf-8").splitlines()]
+    assert [d["action"] for d in lines] == ["increase"]
+    assert lines[0]["reason"] == "healthy round" and lines[0]["error_rate"] == 0.0
+    assert "increases=1 decreases=0 pauses=0" in ctl.summary()
+
+
+@pytest.mark.analysis
+def test_errors_halve_budget_once_per_cooldown():
+    ctl, clock = _controller(rate=8.0, concurrency=8)
+    _req(ctl, clock, 503)
+    _req(ctl, clock, None)  # within cooldown: no second cut
+    assert (ctl.rate, ctl.concurrency) == (4.0, 4)
+
+    clock.now += rc.COOLDOWN_S
+    _req(ctl, clock, None)
+    assert (ctl.rate, ctl.concurrency) == (2.0, 2)
+    assert [d["reason"] for d in ctl.decisions] == ["HTTP 503", "network error/timeout"]
+    assert ctl.error_rate() == 1.0
+
+    # 4xx other than 429 counts as an error but does not shrink the budget
+    clock.now += rc.COOLDOWN_S
+    _req(ctl, clock, 404)
+    assert (ctl.rate, ctl.concurrency) == (2.0, 2)
+
+
+@pytest.mark.analysis
+def test_min_limits_hold():
+    ctl, clock = _controller(rate=0.6, concurrency=1)
+    _req(ctl, clock, 429)
+    assert (ctl.rate, ctl.concurrency) == (rc.MIN_RATE, rc.MIN_CONCURRENCY)
+    assert rc.AdaptiveController().error_rate() == 0.0
+
+
+@pytest.mark.analysis
+def test_rising_latency_triggers_decrease_and_rebaselines():
+    ctl, clock = _controller(rate=50.0, concurrency=50)
+    _healthy(ctl, clock, rc.WARMUP_SAMPLES, latency=0.1)
+    for _ in range(20):
+        _healthy(ctl, clock, 1, latency=1.0)
+        if ctl.decisions:
+            break
+    assert ctl.decisions[-1]["action"] == "decrease"
+    assert ctl.decisions[-1]["reason"].startswith("latency ")
+    assert (ctl.rate, ctl.concurrency) == (25.0, 25)
+    # The slower level becomes the new baseline, so the next sample is healthy
+    clock.now += rc.COOLDOWN_S
+    before = len(ctl.decisions)
+    _healthy(ctl, clock, 1, latency=1.0)
+    assert len(ctl.decisions) == before
+
+
+@pytest.mark.analysis
+def test_retry_after_pauses_all_callers():
+    ctl = rc.AdaptiveController(rate=1000.0, concurrency=4)
+    ctl.acquire()
+    ctl.release(0.01, 429, retry_after=0.2)
+    assert ctl.decisions[0]["action"] == "pause"
+    assert "Retry-After 0.2s (HTTP 429)" in ctl.decisions[0]["reason"]
+
+    t0 = time.monotonic()
+    ctl.acquire()
+    assert time.monotonic() - t0 >= 0.15
+    ctl.release(0.01, 200)
+
+    # Retry-After on a healthy response is ignored
+    ctl.acquire()
+    ctl.release(0.01, 200, retry_after=60)
+    assert ctl.summary().count("pauses=1") == 1
+
+
+@pytest.mark.analysis
+def test_token_bucket_paces_requests():
+    ctl = rc.AdaptiveController(rate=20.0, concurrency=10)
+    t0 = time.monotonic()
+    for _ in range(4):  # 1 token to start, then one every 50 ms
+        ctl.acquire()
+        ctl.release(0.001, 200)
+    assert time.monotonic() - t0 >= 0.12
+
+
+@pytest.mark.analysis
+def test_concurrency_limit_blocks_until_release():
+    ctl = rc.AdaptiveController(rate=1000.0, concurrency=1)
+    ctl.acquire()
+    got = threading.Event()
+
+    def second():
+        ctl.acquire()
+        got.set()
+
+    t = threading.Thread(target=second)
+    t.start()
+    assert not got.wait(0.1)
+    ctl.release(0.01, 200)
+    assert got.wait(2)
+    t.join()
+
+
+@pytest.mark.analysis
+def test_slot_reports_and_defaults_to_error():
+    ctl, clock = _controller(rate=10.0, concurrency=4)
+    with ctl.slot() as done:
+        done(0.05, 200)
+    assert list(ctl._outcomes) == [True]
+
+    clock.now += 1.0
+    with pytest.raises(RuntimeError):
+        with ctl.slot():
+            raise RuntimeError("fetch crashed")
+    assert list(ctl._outcomes) == [True, False]
+    assert ctl._in_flight == 0
+
+
+@pytest.mark.web
+def test_safe_fetch_html_feeds_controller(raw_http_server, monkeypatch):
+    body = b"<p>ok</p>"
+    ok = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+    throttled = b"HTTP/1.1 429 Too Many Requests\r\nRetry-After: 0\r\nContent-Length: 0\r\n\r\n"
+    calls = {"n": 0}
+
+    def flaky(_headers):
+        calls["n"] += 1
+        return throttled if calls["n"] == 1 else ok
+
+    base = raw_http_server({"/page": flaky})
+    ctl = rc.AdaptiveController(rate=100.0, concurrency=4)
+    monkeypatch.setattr(su, "RATE_CONTROLLER", ctl)
+    monkeypatch.setattr(su, "USE_HTTP_CACHE", False)
+
+    assert su._safe_fetch_html(base + "/page") == "<p>ok</p>"
+    assert [d["action"] for d in ctl.decisions] == ["pause", "decrease"]
+    assert ctl.decisions[1]["reason"] == "HTTP 429"
+
+    monkeypatch.setattr(su, "RETRIES", 1)
+    assert su._safe_fetch_html("http://127.0.0.1:1/") is None
+    assert list(ctl._outcomes) == [False, True, False]
+
+
+@pytest.mark.analysis
+def test_missing_pages_are_healthy_answers():
+    ctl, clock = _controller(rate=5.0, concurrency=2)
+    for status in (404, 410, 200):
+        _req(ctl, clock, status)
+    assert list(ctl._outcomes) == [True, True, True] and ctl.error_rate() == 0.0
+    assert [d["action"] for d in ctl.decisions] == ["increase"]
+
+
+@pytest.mark.analysis
+def test_decisions_are_bounded_and_logged_outside_the_lock(tmp_path, monkeypatch):
+    monkeypatch.setattr(rc, "MAX_DECISIONS", 3)
+    monkeypatch.setattr(rc, "COOLDOWN_S", 0)
+    log = tmp_path / "decisions.jsonl"
+    ctl, clock = _controller(rate=50.0, decision_log=str(log))
+    writes = []
+    real_open = open
+
+    def open_checked(*args, **kwargs):
+        writes.append(ctl._cond._is_owned())
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", open_checked)
+    for _ in range(5):
+        _req(ctl, clock, 503)
+
+    assert len(ctl.decisions) == 3 and writes == [False] * 5
+    assert len(log.read_text(encoding="utf-8").splitlines()) == 5
+    assert "decreases=5" in ctl.summary()
+
+
+@pytest.mark.analysis
+def test_acquire_async_waits_on_the_event_loop():
+    ctl = rc.AdaptiveController(rate=1000.0, concurrency=1)
+    order = []
+
+    async def request(name, hold_s):
+        await ctl.acquire_async()
+        order.append(name)
+        await asyncio.sleep(hold_s)
+        ctl.release(hold_s, 200)
+
+    async def main():
+        t0 = time.monotonic()
+        await asyncio.gather(request("a", 0.1), request("b", 0))
+        return time.monotonic() - t0
+
+    assert asyncio.run(main()) >= 0.1  # b waited for a's slot without blocking the loop
+    assert order == ["a", "b"] and ctl._in_flight == 0
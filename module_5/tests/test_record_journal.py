@@ -0,0 +1,172 @@
+import json
+import shutil
+
+import pytest
+
+import src.record_journal as rj
+import src.scrape_update as su
+
+
+@pytest.mark.analysis
+@pytest.mark.parametrize("compress", [False, True])
+def test_journal_round_trip_and_compaction(tmp_path, compress):
+    journal = rj.RecordJournal(str(tmp_path / "j.jsonl"), compress=compress)
+    assert journal.path.endswith(".gz") == compress
+    journal.add(0, {"entry_url": "u0", "gpa": None})
+    journal.add(1, {"entry_url": "u1", "gpa": None})
+    journal.commit()
+    journal.detail(1, {"gpa": "3.9", "comments": "café"})
+    journal.close()
+    assert journal.lines == 3
+
+    # A reopened journal appends (a second gzip member when compressed)
+    again = rj.RecordJournal(journal.path)
+    again.add(2, {"entry_url": "u2"})
+    again.state({"page": 1})
+    again.state({"page": 2})
+    again.close()
+
+    records, enriched, state = rj.replay(journal.path)
+    assert [r["entry_url"] for r in records] == ["u0", "u1", "u2"]
+    assert records[1] == {"entry_url": "u1", "gpa": "3.9", "comments": "café"}
+    assert enriched == {1}
+    assert state == {"page": 2}
+
+    out = tmp_path / "out.json"
+    rj.compact(journal.path, str(out), required_keys=("gpa",))
+    assert json.loads(out.read_text(encoding="utf-8"))[2] == {"entry_url": "u2", "gpa": None}
+    assert not (tmp_path / journal.path).exists()
+
+
+@pytest.mark.analysis
+def test_torn_tail_is_dropped_and_cut_before_appending(tmp_path):
+    path = tmp_path / "j.jsonl"
+    journal = rj.RecordJournal(str(path))
+    journal.add(0, {"entry_url": "u0"})
+    journal.close()
+    with open(path, "ab") as f:
+        f.write(b'{"op": "add", "i": 1, "rec": {"entry_')  # crash mid-write
+
+    assert rj.read_ops(str(path)) == ([{"op": "add", "i": 0, "rec": {"entry_url": "u0"}}], False)
+    journal = rj.RecordJournal(str(path))
+    journal.add(1, {"entry_url": "u1"})
+    journal.close()
+    assert [r["entry_url"] for r in rj.replay(str(path))[0]] == ["u0", "u1"]
+    assert rj.read_ops(str(path))[1]
+
+    # A damaged line ends the replay even when more lines follow
+    with open(path, "ab") as f:
+        f.write(b'{"op": "add", "i"\n{"op": "add", "i": 2, "rec": {}}\n')
+    assert len(rj.read_ops(str(path))[0]) == 2
+
+
+@pytest.mark.analysis
+def test_unfinished_gzip_member_keeps_committed_lines(tmp_path):
+    journal = rj.RecordJournal(str(tmp_path / "j.jsonl"), compress=True)
+    journal.add(0, {"entry_url": "u0"})
+    journal.commit()
+    journal.add(1, {"entry_url": "never committed"})
+    crashed = tmp_path / "crashed.jsonl.gz"
+    shutil.copy(journal.path, crashed)  # what is on disk if the process dies now
+    journal.close()
+
+    ops, clean = rj.read_ops(str(crashed))
+    assert [op["i"] for op in ops] == [0] and not clean
+    with open(crashed, "ab") as f:
+        f.write(b"\x00garbage")
+    assert [op["i"] for op in rj.read_ops(str(crashed))[0]] == [0]
+
+    reopened = rj.RecordJournal(str(crashed))
+    reopened.add(1, {"entry_url": "u1"})
+    reopened.close()
+    assert [r["entry_url"] for r in rj.replay(str(crashed))[0]] == ["u0", "u1"]
+    assert rj.read_ops(str(tmp_path / "missing.jsonl")) == ([], True)
+
+
+def _survey_html(page: int) -> str:
+    rows = "".join(
+        f'<tr><td>U</td><td>P</td><td>d</td><td>Accepted on 1 Jan</td><td>c</td>'
+        f'<td><a href="/result/{rid}">x</a></td></tr>'
+        for rid in (page * 10 + 1, page * 10 + 2)
+    ) if page <= 2 else ""
+    return f"<table>{rows}</table>"
+
+
+@pytest.mark.integration
+def test_scrape_data_replays_journal_of_interrupted_run(monkeypatch, tmp_path, capsys):
+    fetched = []
+    monkeypatch.setattr(su, "load_existing_ids_from_db", lambda bits: su.ResultIdIndex())
+    monkeypatch.setattr(su, "_fetch_page", lambda url: _survey_html(int(url.rsplit("=", 1)[1])))
+    monkeypatch.setattr(
+        su, "_parse_result_page",
+        lambda url: fetched.append(url) or {**su._empty_detail(), "gpa": "3.5"},
+    )
+    monkeypatch.setattr(su, "UPDATE_OUTPUT_JSON", str(tmp_path / "update.json"))
+    monkeypatch.setattr(su, "SURVEY_PAGES", 4)
+
+    # An earlier run journaled page 1's rows; only row 11 got its details
+    journal = rj.RecordJournal(su.UPDATE_JOURNAL)
+    for i, rid in enumerate((11, 12)):
+        journal.add(i, {"entry_url": f"https://www.thegradcafe.com/result/{rid}", "gpa": None})
+    journal.detail(0, {"gpa": "3.0"})
+    journal.close()
+
+    su.scrape_data()
+    rows = json.loads((tmp_path / "update.json").read_text(encoding="utf-8"))
+    assert [su._result_id(r["entry_url"]) for r in rows] == [11, 12, 21, 22]
+    assert [r["gpa"] for r in rows] == ["3.0", "3.5", "3.5", "3.5"]
+    assert sorted(su._result_id(u) for u in fetched) == [12, 21, 22]
+    out = capsys.readouterr().out
+    assert "[resume] run " in out and "continuing after survey page 0 (1 detail" in out
+    assert "[final] compacted 10 journal lines into 4 records" in out
+
+    # The journal is gone after compaction; --fresh discards a stale one
+    rj.RecordJournal(su.UPDATE_JOURNAL).add(0, {"entry_url": "stale"})
+    fetched.clear()
+    su.scrape_data(resume=False)
+    rows = json.loads((tmp_path / "update.json").read_text(encoding="utf-8"))
+    assert len(rows) == 4 and "stale" not in [r["entry_url"] for r in rows]
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("mode", ["chunked", "pipelined"])
+def test_interrupted_crawl_resumes_after_last_page(monkeypatch, tmp_path, capsys, mode):
+    fetched_pages, fetched_details = [], []
+
+    def fetch(url):
+        page = int(url.rsplit("=", 1)[1])
+        if page == 2 and not fetched_pages.count(2):
+            raise KeyboardInterrupt  # Ctrl-C while page 2 is being fetched
+        fetched_pages.append(page)
+        return _survey_html(page)
+
+    monkeypatch.setattr(su, "load_existing_ids_from_db", lambda bits: su.ResultIdIndex())
+    monkeypatch.setattr(su, "_fetch_page", fetch)
+    monkeypatch.setattr(
+        su, "_parse_result_page",
+        lambda url: fetched_details.append(su._result_id(url)) or su._empty_detail(),
+    )
+    monkeypatch.setattr(su, "UPDATE_OUTPUT_JSON", str(tmp_path / "update.json"))
+    monkeypatch.setattr(su, "SURVEY_PAGES", 4)
+    monkeypatch.setattr(su, "CHUNK_SURVEY_PAGES", 2)
+    monkeypatch.setattr(su, "CRAWL_MODE", mode)
+
+    su.scrape_data()
+    out = capsys.readouterr().out
+    rows = json.loads((tmp_path / "update.json").read_text(encoding="utf-8"))
+    assert [su._result_id(r["entry_url"]) for r in rows] == [11, 12]
+    assert "[resume] journal kept at" in out
+    _, _, state = rj.replay(su.UPDATE_JOURNAL)
+    assert state["page"] == 1
+    # Pipelined: details queued at Ctrl-C are dropped and left pending
+    assert state["pending"] == [0, 1] if mode == "chunked" else set(state["pending"]) <= {0, 1}
+    fetched_pages.append(2)  # the next run is not interrupted
+
+    su.scrape_data()
+    out = capsys.readouterr().out
+    assert f"run {state['run_id']}" in out and "continuing after survey page 1" in out
+    assert fetched_pages == [1, 2, 2, 3, 4]
+    assert sorted(fetched_details) == [11, 12, 21, 22]
+    rows = json.loads((tmp_path / "update.json").read_text(encoding="utf-8"))
+    assert [su._result_id(r["entry_url"]) for r in rows] == [11, 12, 21, 22]
+    assert not (tmp_path / su.UPDATE_JOURNAL).exists()
@@ -0,0 +1,174 @@
+import pytest
+
+import src.refresh_schedule as rs
+import src.scrape_update as su
+
+
+class _FakeConn:
+    """Records each statement and answers with the next queued result set."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.queries = []
+        self.autocommit = False
+        self.closed = False
+        self.transactions = 0
+
+    def transaction(self):
+        conn = self
+
+        class _Tx:
+            def __enter__(self):
+                conn.transactions += 1
+
+            def __exit__(self, *exc):
+                return False
+
+        return _Tx()
+
+    def cursor(self):
+        conn = self
+
+        class _Cur:
+            description = None
+            rowcount = 1
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params=None):
+                conn.queries.append((sql, params))
+                if sql.lstrip().startswith("SELECT"):
+                    self.description = [("col",)]
+
+            def fetchall(self):
+                return conn.results.pop(0)
+
+        return _Cur()
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.db
+def test_schedule_hands_out_due_rows_newest_first():
+    row = ("u1", "c", "Fall 2026", "American", 3.5, None, None, None, "PhD")
+    conn = _FakeConn([row])
+    schedule = rs.RefreshSchedule(tiers=((7, 1), (None, 30)), connect=lambda: conn)
+    assert conn.autocommit
+    schedule.ensure_schema()
+    assert "CREATE TABLE IF NOT EXISTS refresh_checks" in conn.queries[0][0]
+
+    assert schedule.due(5) == [{"url": "u1", "comments": "c", "term": "Fall 2026",
+                                "us_or_international": "American", "gpa": 3.5, "gre": None,
+                                "gre_v": None, "gre_aw": None, "degree": "PhD"}]
+    sql, params = conn.queries[-1]
+    assert "CASE WHEN a.date_added >= current_date - 7 THEN 1 ELSE 30 END" in sql
+    assert "ORDER BY a.date_added DESC" in sql and params == (5,)
+
+    schedule.mark_checked([])
+    assert len(conn.queries) == 2
+    schedule.mark_checked(["u1"])
+    assert "ON CONFLICT (url) DO UPDATE SET checked_at = now()" in conn.queries[-1][0]
+
+    assert schedule.apply([{"url": "u1", "gpa": 3.9}, {"url": "u2", "gre": 160.0, "degree": None}]) == 2
+    assert conn.transactions == 1
+    assert conn.queries[-2][0] == "UPDATE applicants SET gpa = %(gpa)s WHERE url = %(url)s;"
+    assert "SET gre = %(gre)s, degree = %(degree)s WHERE" in conn.queries[-1][0]
+    schedule.close()
+    assert conn.closed
+
+
+class _MemSchedule:
+    """In-memory RefreshSchedule: every stored row is due on each run."""
+
+    def __init__(self, rows):
+        self.rows = {r["url"]: r for r in rows}
+        self.checked = []
+        self.batches = []
+
+    def ensure_schema(self):
+        pass
+
+    def due(self, limit):
+        return [dict(r) for r in self.rows.values()][:limit]
+
+    def mark_checked(self, urls):
+        self.checked.extend(urls)
+
+    def apply(self, changes):
+        self.batches.append(changes)
+        for change in changes:
+            self.rows[change["url"]].update(change)
+        return len(changes)
+
+    def close(self):
+        pass
+
+
+def _resp(body, *headers, status="200 OK"):
+    head = [f"HTTP/1.1 {status}", f"Content-Length: {len(body)}", *headers]
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+def _page(gpa):
+    body = f"<dl><dt>Undergrad GPA</dt><dd>{gpa}</dd><dt>Notes</dt><dd>edited</dd></dl>"
+
+    def reply(headers):
+        if headers.get("if-none-match") == f'"{gpa}"':
+            return _resp(b"", status="304 Not Modified")
+        return _resp(body.encode(), f'ETag: "{gpa}"')
+
+    return reply
+
+
+def _stored(url, gpa, comments="from survey"):
+    return {"url": url, "comments": comments, "term": "Fall 2026", "us_or_international": None,
+            "gpa": gpa, "gre": None, "gre_v": None, "gre_aw": None, "degree": None}
+
+
+@pytest.mark.integration
+def test_refresh_updates_only_changed_rows_with_conditional_fetches(
+    raw_http_server, monkeypatch, capsys
+):
+    monkeypatch.setattr(su, "USE_HTTP_CACHE", True)  # as --refresh sets it
+    base = raw_http_server({
+        "/result/1": _page("3.90"),
+        "/result/2": _page("3.50"),
+        "/result/3": _resp(b"", status="404 Not Found"),
+    })
+    schedule = _MemSchedule([
+        _stored(base + "/result/1", 3.5),
+        _stored(base + "/result/2", 3.5, comments="edited"),
+        _stored(base + "/result/3", 3.0),
+    ])
+
+    stats = su.refresh_entries(schedule=schedule)
+    assert stats == {"due": 3, "checked": 2, "not_modified": 0, "changed": 1, "updated": 1,
+                     "failed": 1}
+    # Only the columns that changed are written; the term the page lacks is kept
+    assert schedule.batches == [[{"url": base + "/result/1", "comments": "edited", "gpa": 3.9}]]
+    assert schedule.rows[base + "/result/1"]["term"] == "Fall 2026"
+    assert schedule.checked == [base + "/result/1", base + "/result/2"]
+
+    # Second run: both pages answer 304 and nothing is parsed or written
+    stats = su.refresh_entries(max_requests=2, schedule=schedule)
+    assert (stats["due"], stats["not_modified"], stats["changed"]) == (2, 2, 0)
+    assert len(schedule.batches) == 1
+    assert "[refresh] due=2 checked=2 not_modified=2" in capsys.readouterr().out
+
+
+@pytest.mark.integration
+def test_refresh_stops_at_the_time_budget(monkeypatch, capsys):
+    schedule = _MemSchedule([_stored(f"https://x/result/{i}", 3.5) for i in range(5)])
+    monkeypatch.setattr(su, "REFRESH_BATCH", 2)
+    monkeypatch.setattr(su, "_refetch_page", lambda url: None)
+    clock = iter([0.0, 0.0, 0.5, 2.0])
+    monkeypatch.setattr(su.time, "monotonic", lambda: next(clock))
+
+    stats = su.refresh_entries(max_s=1.0, schedule=schedule)
+    assert (stats["checked"], stats["not_modified"]) == (4, 4)
+    assert "[refresh] time budget used; 1 entries stay due" in capsys.readouterr().out
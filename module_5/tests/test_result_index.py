@@ -0,0 +1,85 @@
+import os
+import random
+
+import psycopg
+import pytest
+
+import src.scrape_update as su
+from src.result_index import BloomFilter, ResultIdIndex
+
+
+@pytest.mark.analysis
+def test_index_membership_and_run_time_adds():
+    index = ResultIdIndex([3, 5, 5, 9])
+    assert len(index) == 3 and index.nbytes == 3 * 8
+    assert 5 in index and 9 in index
+    assert 4 not in index and 10 not in index and 0 not in index
+
+    index.add(4)
+    assert 4 in index and len(index) == 4
+
+
+@pytest.mark.analysis
+def test_index_sorts_unordered_input():
+    ids = random.Random(7).sample(range(1, 10_000), 500)
+    index = ResultIdIndex(ids + ids[:10])
+    assert all(rid in index for rid in ids)
+    assert sum(rid in index for rid in range(10_000)) == 500
+
+
+@pytest.mark.analysis
+def test_bloom_prefilter_has_no_false_negatives():
+    ids = list(range(1, 20_000, 3))
+    index = ResultIdIndex(ids, bloom_bits_per_id=10)
+    assert all(rid in index for rid in ids)
+    assert not any(rid in index for rid in range(2, 20_000, 3))
+    assert index.nbytes == len(ids) * 8 + (len(ids) * 10 + 7) // 8
+
+    bloom = BloomFilter(len(ids), bits_per_id=10)
+    for rid in ids:
+        bloom.add(rid)
+    false_pos = sum(rid in bloom for rid in range(100_000, 120_000))
+    assert false_pos < 20_000 * 0.03  # ~1% expected at 10 bits per id
+
+
+@pytest.mark.integration
+def test_collect_new_rows_dedups_by_result_id():
+    index = ResultIdIndex([100])
+    rows = [
+        {"entry_url": "https://thegradcafe.com/result/100"},  # stored, other host spelling
+        {"entry_url": "https://www.thegradcafe.com/result/101#top"},
+        {"entry_url": "https://www.thegradcafe.com/result/101"},  # repeat within the run
+        {"entry_url": "https://www.thegradcafe.com/result/abc"},
+        {"entry_url": None},
+    ]
+    new = su._collect_new_rows(rows, index)
+    assert [r["entry_url"] for r in new] == ["https://www.thegradcafe.com/result/101"]
+    assert 101 in index
+
+
+@pytest.mark.db
+def test_load_existing_ids_from_db():
+    urls = [
+        "https://www.thegradcafe.com/result/987654001",
+        "http://thegradcafe.com/result/987654002?x=1",
+    ]
+    conn = psycopg.connect(
+        dbname=os.getenv("PGDATABASE", "gradcafe"),
+        user=os.getenv("PGUSER", "ziran"),
+        password=os.getenv("PGPASSWORD", "ziran"),
+        host=os.getenv("PGHOST", "localhost"),
+        port=int(os.getenv("PGPORT", "5432")),
+    )
+    try:
+        with conn.cursor() as cur:
+            for url in urls:
+                cur.execute("INSERT INTO applicants (url) VALUES (%s) ON CONFLICT DO NOTHING;", (url,))
+        conn.commit()
+        index = su.load_existing_ids_from_db(bloom_bits_per_id=8)
+        assert 987654001 in index and 987654002 in index
+        assert 987654003 not in index
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM applicants WHERE url = ANY(%s);", (urls,))
+        conn.commit()
+        conn.close()
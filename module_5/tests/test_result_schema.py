@@ -0,0 +1,72 @@
+import pytest
+
+import src.result_schema as rs
+import src.scrape_update as su
+from src.applicant_record import ApplicantRecord
+
+
+@pytest.mark.analysis
+def test_result_extractor_reads_every_field():
+    lines = [
+        "Result", "Degree Type", " Masters ", "Degree's Country of Origin", "International",
+        "Undergrad GPA", "GPA 3.41", "GRE General:", "0", "GRE Verbal:", "Analytical Writing:",
+        "4.0", "Notes", "Timeline", "Term", "Fall",
+        "Degree Type", "PhD",  # later repeats of a label are ignored
+    ]
+    assert rs.RESULT_EXTRACTOR(lines) == {
+        "degree": "Masters",
+        "is_international": True,
+        "gpa": "3.41",
+        "gre_total": None,  # 0 placeholder
+        "gre_v": None,  # next line is a label
+        "gre_aw": "4.0",
+        "detail_comments": None,
+        "start_term": "Fall",
+        "start_year": None,  # label missing
+    }
+
+
+@pytest.mark.analysis
+def test_value_cleaners():
+    assert rs.clean_text("  ") is None and rs.clean_text(None) is None
+    assert rs.clean_label_value("Some label:") is None
+    assert rs.clean_label_value("3.9 / 4.0") == "3.9 / 4.0"
+    assert rs.clean_float("n/a") is None and rs.clean_int("165 (96%)") == "165"
+    assert rs.clean_notes("Logo") is None and rs.clean_notes("Great") == "Great"
+    assert rs.is_international("american") is False and rs.is_international("") is None
+
+
+@pytest.mark.analysis
+def test_label_index_is_single_pass_and_stops_early():
+    seen = []
+
+    class Lines(list):
+        def __getitem__(self, i):
+            seen.append(i)
+            return list.__getitem__(self, i)
+
+    lines = Lines(["A", "1", "B", "2", "C", "3", "D", "4"])
+    assert rs.label_index(lines, frozenset({"A", "B"})) == {"A": "1", "B": "2"}
+    assert max(seen) == 3  # stopped once both labels were found
+    assert rs.label_index(["A"], frozenset({"A"})) == {}  # label on the last line has no value
+
+
+@pytest.mark.analysis
+def test_adding_a_field_is_one_spec_row(monkeypatch):
+    extractor = rs.Extractor(
+        rs.RESULT_FIELDS + (rs.Field("Year", "start_year_int", rs.clean_text, int),)
+    )
+    detail = extractor(["Year", "2026"])
+    assert detail["start_year"] == "2026" and detail["start_year_int"] == 2026
+    assert extractor.empty()["start_year_int"] is None
+
+    monkeypatch.setattr(su, "RESULT_EXTRACTOR", extractor)
+    record = {"comments": "list page"}
+    su._apply_detail(record, {**detail, "degree_level": None, "detail_comments": "Notes"})
+    assert record["start_year_int"] == 2026 and record["comments"] == "Notes"
+    assert "detail_comments" not in record
+
+    # A parsed row takes the new field too, although the record has no slot for it
+    row = ApplicantRecord(comments="list page")
+    su._apply_detail(row, {**detail, "degree_level": None, "detail_comments": "Notes"})
+    assert row["start_year_int"] == 2026 and dict(row)["start_year_int"] == 2026
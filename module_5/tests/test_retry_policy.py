@@ -0,0 +1,114 @@
+import random
+import threading
+from urllib.error import HTTPError, URLError
+
+import pytest
+
+import src.retry_policy as rp
+import src.scrape_update as su
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.analysis
+def test_backoff_is_full_jitter_under_an_exponential_cap():
+    rng = random.Random(7)
+    delays = [rp.backoff_delay(a, base_s=1.0, cap_s=5.0, rng=rng) for a in (1, 2, 3, 4) * 50]
+    assert all(0.0 <= d <= 5.0 for d in delays)
+    assert max(delays[0::4]) <= 2.0 and max(delays[3::4]) > 4.0
+    assert 0.0 <= rp.backoff_delay(1) <= 2 * rp.BACKOFF_BASE_S
+
+
+@pytest.mark.analysis
+def test_retry_budget_allows_a_share_of_first_attempts():
+    budget = rp.RetryBudget(ratio=0.5, reserve=2)
+    assert budget.try_spend() and budget.try_spend() and not budget.try_spend()
+    for _ in range(4):
+        budget.on_request()
+    assert budget.tokens == 2.0  # never more than the reserve saved up
+    assert budget.try_spend()
+    assert budget.summary() == "retries=3 denied=1 tokens=1.0"
+
+
+@pytest.mark.analysis
+def test_breaker_opens_probes_and_backs_off(capsys):
+    clock = _Clock()
+    breaker = rp.CircuitBreaker(window=4, min_calls=4, threshold=0.5, open_s=10,
+                                max_open_s=15, clock=clock)
+    for ok in (True, False, True, False):
+        breaker.record(ok)
+    assert breaker.state == "closed" and breaker.delay() == 0.0
+    breaker.record(False)  # window is now 3 failures out of 4
+    assert breaker.state == "open" and breaker.delay() == 10
+    breaker.record(False)  # a request that started before the trip is ignored
+    assert "[breaker] open" in capsys.readouterr().out
+
+    clock.now = 10
+    assert breaker.delay() == 0.0 and breaker.state == "half-open"  # the probe
+    assert breaker.delay() == rp.PROBE_POLL_S  # everyone else waits for it
+    breaker.record(False)
+    assert breaker.state == "open" and breaker.delay() == 15  # twice as long, capped
+    clock.now = 25
+    assert breaker.delay() == 0.0
+    breaker.record(True)
+    assert breaker.state == "closed" and breaker.error_rate() == 0.0
+    assert breaker.summary() == "state=closed trips=2"
+    assert breaker._next_open_s == 10  # reset after a good probe
+
+
+@pytest.mark.analysis
+def test_breaker_wait_blocks_until_the_probe_reports():
+    breaker = rp.CircuitBreaker(min_calls=1, threshold=0.0, open_s=0.01)
+    breaker.record(False)
+    breaker.wait()  # sleeps out the open period and becomes the probe
+    assert breaker.state == "half-open"
+
+    waited = threading.Event()
+    t = threading.Thread(target=lambda: (breaker.wait(), waited.set()))
+    t.start()
+    assert not waited.wait(0.05)
+    breaker.record(True)
+    t.join(2)
+    assert waited.is_set() and breaker.state == "closed"
+
+
+def _http_error(code):
+    return HTTPError("u", code, "err", {}, None)
+
+
+@pytest.mark.integration
+def test_fetch_page_spends_budget_and_marks_failed_details(monkeypatch, capsys):
+    calls = []
+
+    def fake_fetch(url):
+        calls.append(url)
+        if url.endswith("/404"):
+            raise _http_error(404)
+        if url.endswith("/down"):
+            raise URLError("refused")
+        return "<dl><dt>Undergrad GPA</dt><dd>3.10</dd></dl>"
+
+    monkeypatch.setattr(su, "_fetch_html", fake_fetch)
+    monkeypatch.setattr(su, "USE_HTTP_CACHE", False)
+    monkeypatch.setattr(su, "RETRY_BUDGET", rp.RetryBudget(ratio=0.0, reserve=2))
+
+    with pytest.raises(su.FetchError) as missing:
+        su._fetch_page("https://x/404")
+    assert missing.value.missing and calls == ["https://x/404"]  # never retried
+
+    records = [{"entry_url": u, "comments": "c"} for u in ("https://x/ok", "https://x/down")]
+    assert su._fetch_details_threaded(records, [(0, "https://x/ok"), (1, "https://x/down")]) == (1, 1)
+    assert records[0]["gpa"] == "3.10" and records[0]["detail_error"] is None
+    assert records[1]["gpa"] is None and records[1]["detail_error"] == "network error"
+    assert calls.count("https://x/down") == 3  # two retries: the whole budget
+    assert su.RETRY_BUDGET.retries == 2
+
+    assert su._safe_fetch_html("https://x/down") is None
+    assert calls.count("https://x/down") == 4  # budget spent: no more retries
+    assert "[retry budget] exhausted" in capsys.readouterr().out
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+import src.run_metrics as rm
+import src.scrape_update as su
+
+
+@pytest.mark.analysis
+def test_histogram_buckets_and_quantiles():
+    h = rm.Histogram((1.0, 2.0, 4.0))
+    for v in (0.5, 1.0, 1.5, 3.0, 9.0):
+        h.observe(v)
+    d = h.to_dict()
+    assert d["buckets"] == {"1.0": 2, "2.0": 3, "4.0": 4, "+Inf": 5}  # cumulative, le
+    assert (d["count"], d["sum"], d["min"], d["max"]) == (5, 15.0, 0.5, 9.0)
+    assert h.quantile(0.5) == pytest.approx(1.5)  # rank 2.5: halfway through (1, 2]
+    assert h.quantile(0.99) <= 9.0 and h.quantile(0.9) > 4.0  # +Inf bucket ends at max
+    empty = rm.Histogram((1.0,)).to_dict()
+    assert empty["p50"] == 0.0 and empty["min"] is None and empty["mean"] is None
+
+
+@pytest.mark.analysis
+def test_report_and_prometheus_text(tmp_path):
+    m = rm.RunMetrics()
+    m.count("details", outcome="ok")
+    m.count("details", 2, outcome="failed", error='HTTP "503"')
+    m.observe("fetch_bytes", 3000, url_class="result")
+    with m.timer("checkpoint_seconds"):
+        pass
+    assert m.counter("details") == 3 and m.counter("details", outcome="ok") == 1
+
+    report = m.report(mode="chunked", rows=7, ok=True)
+    assert report["run"] == {"mode": "chunked", "rows": 7, "ok": True}
+    fetch = next(h for h in report["histograms"] if h["name"] == "fetch_bytes")
+    assert fetch["labels"] == {"url_class": "result"} and fetch["buckets"]["4096"] == 1
+
+    text = rm.prometheus_text(report)
+    assert "# TYPE gradcafe_scrape_run_rows gauge\ngradcafe_scrape_run_rows 7\n" in text
+    assert "mode" not in text and "_run_ok" not in text  # only numbers become gauges
+    assert text.count("# TYPE gradcafe_scrape_details_total counter") == 1
+    assert 'gradcafe_scrape_details_total{error="HTTP \\"503\\"",outcome="failed"} 2' in text
+    assert 'gradcafe_scrape_fetch_bytes_bucket{url_class="result",le="+Inf"} 1' in text
+    assert "gradcafe_scrape_checkpoint_seconds_count 1" in text
+
+    rm.write_report(report, str(tmp_path / "m.json"), str(tmp_path / "m.prom"))
+    assert rm.load_report(str(tmp_path / "m.json")) == json.loads(json.dumps(report))
+    assert (tmp_path / "m.prom").read_text(encoding="utf-8") == text
+    assert rm.load_report(str(tmp_path / "missing.json")) is None
+
+    m.reset()
+    assert m.report()["counters"] == []
+
+
+def _resp(body, status="200 OK"):
+    body = body.encode("utf-8")
+    return f"HTTP/1.1 {status}\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+
+
+@pytest.mark.web
+@pytest.mark.parametrize("backend", ["threads", "asyncio"])
+def test_crawl_writes_a_run_report(raw_http_server, monkeypatch, tmp_path, backend, capsys):
+    state = {}
+
+    def survey(headers):
+        rows = "".join(
+            f'<tr><td>U</td><td>P</td><td>d</td><td>Accepted on 1 Jan</td><td>c</td>'
+            f'<td><a href="{state["base"]}/result/{rid}">x</a></td></tr>'
+            for rid in (61, 62, 63)
+        )
+        return _resp(f"<table>{rows}</table>")
+
+    base = raw_http_server({
+        "/survey/?page=1": survey,
+        "/result/61": _resp("<dl><dt>Undergrad GPA</dt><dd>3.50</dd></dl>"),
+        "/result/62": _resp("", status="404 Not Found"),
+    })
+    state["base"] = base
+    monkeypatch.setattr(su, "BASE_URL", base + "/survey/")
+    monkeypatch.setattr(su, "load_existing_ids_from_db", lambda bits: su.ResultIdIndex([63]))
+    monkeypatch.setattr(su, "DETAIL_BACKEND", backend)
+    monkeypatch.setattr(su, "SURVEY_PAGES", 1)
+    monkeypatch.setattr(su, "USE_HTTP_CACHE", False)
+    monkeypatch.setattr(su, "UPDATE_OUTPUT_JSON", str(tmp_path / "update.json"))
+    monkeypatch.setattr(su, "METRICS_PROM", str(tmp_path / "scrape_metrics.prom"))
+    su.scrape_data(resume=False)
+
+    report = rm.load_report(su.METRICS_JSON)
+    assert report["run"]["rows"] == 2
+    assert report["run"]["dedup_hit_rate"] == pytest.approx(1 / 3, abs=1e-3)
+    counters = {
+        (c["name"], tuple(sorted(c["labels"].items()))): c["value"] for c in report["counters"]
+    }
+    assert counters[("details", (("outcome", "ok"),))] == 1
+    assert counters[("details", (("error", "HTTP 404"), ("outcome", "failed")))] == 1
+    assert counters[("fetch_responses", (("status", "200"), ("url_class", "survey")))] == 1
+    assert counters[("fetch_responses", (("status", "404"), ("url_class", "result")))] == 1
+    hists = {(h["name"], tuple(h["labels"].values())): h for h in report["histograms"]}
+    assert hists[("fetch_seconds", ("result",))]["count"] == 2
+    assert hists[("fetch_bytes", ("survey",))]["count"] == 1
+    assert hists[("parse_seconds", ("survey",))]["count"] == 1
+    assert hists[("checkpoint_seconds", ("compact",))]["count"] == 1
+    prom = (tmp_path / "scrape_metrics.prom").read_text(encoding="utf-8")
+    assert "gradcafe_scrape_run_rows 2" in prom
+    assert "[metrics] result_p50=" in capsys.readouterr().out
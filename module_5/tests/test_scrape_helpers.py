@@ -1,13 +1,13 @@
 import pytest
 
+import src.scrape_update as su
 from src.scrape_update import (
     _normalize_none,
     _canonical_result_url,
     _valid_result_url,
-    _extract_float,
-    _extract_int,
     _degree_level,
 )
+from src.result_schema import extract_float as _extract_float, extract_int as _extract_int
 
 
 @pytest.mark.analysis
@@ -32,6 +32,15 @@ def test_valid_url():
     assert not _valid_result_url("https://example.com/test")
 
 
+@pytest.mark.analysis
+def test_result_urls_of_a_local_stand_in(monkeypatch):
+    assert not _valid_result_url("http://127.0.0.1:8765/result/7")
+    monkeypatch.setattr(su, "BASE_URL", "http://127.0.0.1:8765/survey/")
+    assert _canonical_result_url("http://127.0.0.1:8765/result/7#x") == "http://127.0.0.1:8765/result/7"
+    assert _valid_result_url("http://127.0.0.1:8765/result/7")
+    assert _canonical_result_url("/result/7") == "https://www.thegradcafe.com/result/7"
+
+
 @pytest.mark.analysis
 def test_extract_numbers():
     assert _extract_float("GPA 3.45") == "3.45"
@@ -0,0 +1,156 @@
+import json
+import threading
+
+import pytest
+
+import src.scrape_update as su
+from src import record_journal
+from src.record_journal import RecordJournal
+from src.result_index import ResultIdIndex
+
+
+ROWS_PER_PAGE = 3
+NEW_PAGES = 5  # pages 1-5 hold new rows; later pages repeat page 5
+
+
+def _survey_html(page: int) -> str:
+    page = min(page, NEW_PAGES)
+    rows = "".join(
+        "<tr>"
+        f"<td>Uni {page}-{k}</td><td>Program {k}</td><td>2026-02-10</td>"
+        "<td>Accepted on 29 Jan</td><td>note</td>"
+        f'<td><a href="/result/{page * 100 + k}">x</a></td>'
+        "</tr>"
+        for k in range(ROWS_PER_PAGE)
+    )
+    return f"<table>{rows}</table>"
+
+
+def _fake_detail(url: str) -> dict:
+    rid = int(url.rsplit("/", 1)[1])
+    return {**su._empty_detail(), "degree": "Masters", "degree_level": "Masters", "gpa": f"3.{rid % 10}"}
+
+
+@pytest.fixture()
+def fake_site(monkeypatch, tmp_path):
+    out = tmp_path / "update.json"
+    fetched = []
+    monkeypatch.setattr(su, "load_existing_ids_from_db", lambda bits: ResultIdIndex([100]))
+    monkeypatch.setattr(su, "_fetch_page", lambda url: _survey_html(int(url.rsplit("=", 1)[1])))
+    monkeypatch.setattr(su, "_parse_result_page", lambda url: fetched.append(url) or _fake_detail(url))
+    monkeypatch.setattr(su, "UPDATE_OUTPUT_JSON", str(out))
+    monkeypatch.setattr(su, "SURVEY_PAGES", 20)
+    monkeypatch.setattr(su, "CHUNK_SURVEY_PAGES", 2)
+    monkeypatch.setattr(su, "PIPELINE_QUEUE_SIZE", 2)
+    return out, fetched
+
+
+def _run(out, mode, monkeypatch):
+    monkeypatch.setattr(su, "CRAWL_MODE", mode)
+    su.scrape_data()
+    rows = json.loads(out.read_text(encoding="utf-8"))
+    for r in rows:
+        r.pop("scraped_at")
+    return rows
+
+
+@pytest.mark.integration
+def test_pipelined_mode_matches_chunked_output(fake_site, monkeypatch, capsys):
+    out, fetched = fake_site
+
+    chunked = _run(out, "chunked", monkeypatch)
+    fetched.clear()
+    pipelined = _run(out, "pipelined", monkeypatch)
+
+    # 5 pages x 3 rows minus the one already in the DB
+    assert len(pipelined) == 14
+    assert pipelined == chunked
+    assert sorted(fetched) == sorted(r["entry_url"] for r in pipelined)
+    assert all(r["degree_level"] == "Masters" for r in pipelined)
+
+    text = capsys.readouterr().out
+    assert text.count("[early stop]") == 2
+    assert "[checkpoint] chunks 1-" in text
+    assert "mode=pipelined rows=14" in text and "rows_per_sec=" in text
+
+
+@pytest.mark.integration
+def test_pipeline_checkpoint_waits_for_closed_chunks(monkeypatch, tmp_path):
+    journal = RecordJournal(str(tmp_path / "cp.jsonl"))
+    commits = []
+    commit = journal.commit
+    monkeypatch.setattr(journal, "commit", lambda: commits.append(1) or commit())
+    monkeypatch.setattr(su, "_JOURNAL", journal)
+    gate = threading.Event()
+    monkeypatch.setattr(su, "_parse_result_page", lambda url: gate.wait() and _fake_detail(url))
+
+    records = []
+    pipe = su._DetailPipeline(records, workers=1, queue_size=4)
+    pipe.add({"entry_url": "https://www.thegradcafe.com/result/1"}, chunk=0)
+    pipe.close_chunks(1)
+    assert not commits  # chunk 0 still has a fetch in flight
+
+    gate.set()
+    pipe.finish()
+    assert len(commits) == 1
+    journal.close()
+    saved, enriched, _ = record_journal.replay(journal.path)
+    assert saved[0]["gpa"] == "3.1" and enriched == {0}
+    assert (pipe.updated, pipe.failed) == (1, 0)
+
+
+@pytest.mark.integration
+def test_pipeline_counts_worker_errors_as_failed(monkeypatch, tmp_path):
+    monkeypatch.setattr(su, "UPDATE_OUTPUT_JSON", str(tmp_path / "cp.json"))
+
+    def boom(url):
+        raise RuntimeError("parse exploded")
+
+    monkeypatch.setattr(su, "_parse_result_page", boom)
+    pipe = su._DetailPipeline([], workers=2, queue_size=1)
+    pipe.add({"entry_url": "https://www.thegradcafe.com/result/7"}, chunk=0)
+    pipe.finish()
+    assert (pipe.updated, pipe.failed) == (0, 1)
+
+
+@pytest.mark.integration
+def test_pipeline_cancel_drops_queued_fetches(monkeypatch):
+    started, gate, fetched = threading.Event(), threading.Event(), []
+
+    def fetch(url):
+        started.set()
+        gate.wait()
+        fetched.append(url)
+        return _fake_detail(url)
+
+    monkeypatch.setattr(su, "_parse_result_page", fetch)
+    records = []
+    pipe = su._DetailPipeline(records, workers=1, queue_size=4)
+    for rid in (1, 2, 3):
+        pipe.add({"entry_url": f"https://www.thegradcafe.com/result/{rid}"}, chunk=0)
+    started.wait()
+    finish = pipe.finish
+    monkeypatch.setattr(pipe, "finish", lambda: gate.set() or finish())
+
+    assert pipe.cancel() == 2  # /result/1 was in flight and completes
+    assert fetched == ["https://www.thegradcafe.com/result/1"]
+    assert pipe.pending() == [1, 2] and (pipe.updated, pipe.failed) == (1, 0)
+
+
+@pytest.mark.integration
+def test_pipeline_emits_rows_outside_its_lock(monkeypatch):
+    monkeypatch.setattr(su, "_parse_result_page", _fake_detail)
+    records, held = [], []
+
+    class Stream:
+        closed = False
+
+        def put(self, rec):
+            held.append(pipe.lock.locked())
+
+    monkeypatch.setattr(su, "DEAD_LETTERS", {"https://www.thegradcafe.com/result/2"})
+    pipe = su._DetailPipeline(records, workers=1, queue_size=4, stream=Stream())
+    pipe.add({"entry_url": "https://www.thegradcafe.com/result/1"}, chunk=0)
+    pipe.add({"entry_url": "https://www.thegradcafe.com/result/2"}, chunk=0)
+    pipe.finish()
+    assert held == [False, False] and records == [None, None]
@@ -0,0 +1,114 @@
+import io
+import json
+import threading
+import time
+
+import pytest
+
+import src.scrape_update as su
+import src.survey_backfill as sb
+
+
+@pytest.mark.analysis
+def test_shard_ranges_cover_the_pages_in_order():
+    assert sb.shard_ranges(range(1, 11), 3) == [range(1, 5), range(5, 8), range(8, 11)]
+    assert sb.shard_ranges(range(4, 6), 8) == [range(4, 5), range(5, 6)]
+    assert sb.shard_ranges(range(1, 1), 4) == []
+
+
+@pytest.mark.analysis
+def test_pages_come_out_in_order_and_failed_shards_retry_alone(tmp_path, capsys):
+    ckpt = str(tmp_path / "shards")
+    fetched = []
+    lock = threading.Lock()
+
+    def fetch(page):
+        # later shards answer first, so the merge has to wait for page order
+        time.sleep(0.02 * (10 - page) / 10)
+        with lock:
+            fetched.append(page)
+        return None if page == 7 else [{"page": page}]
+
+    out = list(sb.backfill(range(1, 10), fetch, shards=3, checkpoint_dir=ckpt))
+    assert [p for p, _ in out] == list(range(1, 10))
+    assert out[6] == (7, None) and out[0] == (1, [{"page": 1}])
+    assert sorted(fetched) == list(range(1, 10))
+    assert "1 pages failed" in capsys.readouterr().out
+    assert sorted(sb.load_checkpoints(ckpt)) == [1, 2, 3, 4, 5, 6, 8, 9]
+
+    # Rerun: only the failed page is fetched; once complete the checkpoints go
+    fetched.clear()
+    log = io.StringIO()
+    out = list(sb.backfill(range(1, 10), lambda p: fetch(p) or [{"page": p}], 3, ckpt, log=log))
+    assert fetched == [7] and out[6] == (7, [{"page": 7}])
+    assert "shard 7-9: fetched=1 from_checkpoint=2 failed=0" in log.getvalue()
+    assert capsys.readouterr().out == ""  # the caller's log, not stdout
+    assert not (tmp_path / "shards").exists()
+
+
+@pytest.mark.analysis
+def test_backfill_stops_early_and_reraises_shard_errors(tmp_path):
+    ckpt = str(tmp_path / "shards")
+    pages = sb.backfill(range(1, 201), lambda p: [{"page": p}], shards=2, checkpoint_dir=ckpt,
+                        min_interval_s=0.001)
+    assert next(pages) == (1, [{"page": 1}])
+    pages.close()  # shards stop after their current fetch; their pages stay checkpointed
+    kept = sb.load_checkpoints(ckpt)
+    assert 1 in kept and len(kept) < 200
+
+    # a torn last line is ignored
+    with open(tmp_path / "shards" / "shard-1-100.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"page": 99, "ro')
+    assert sb.load_checkpoints(ckpt) == kept
+
+    def boom(page):
+        raise RuntimeError(f"parser crashed on {page}")
+
+    with pytest.raises(RuntimeError, match="parser crashed"):
+        list(sb.backfill(range(300, 303), boom, shards=1, checkpoint_dir=ckpt))
+
+
+def _survey_html(*rids):
+    rows = "".join(
+        f'<tr><td>U</td><td>P</td><td>d</td><td>Accepted on 1 Jan</td><td>c</td>'
+        f'<td><a href="/result/{rid}">x</a></td></tr>'
+        for rid in rids
+    )
+    return f"<table>{rows}</table>"
+
+
+@pytest.mark.integration
+def test_backfill_crawl_reads_every_page_and_drops_shifted_rows(monkeypatch, tmp_path):
+    # Pages 3-4 list nothing new, which would end a chunked crawl early.
+    # Result 85 moved from page 5 to page 6 between the shards' fetches.
+    listing = {1: (90, 89), 2: (88, 87), 3: (), 4: (), 5: (86, 85), 6: (85, 84)}
+    fail = {6}
+    monkeypatch.setattr(su, "CRAWL_MODE", "backfill")
+    monkeypatch.setattr(su, "BACKFILL_SHARDS", 3)
+    monkeypatch.setattr(su, "SURVEY_PAGES", 6)
+    monkeypatch.setattr(su, "FETCH_DETAILS", False)
+    monkeypatch.setattr(su, "load_existing_ids_from_db", lambda bits: su.ResultIdIndex([]))
+    monkeypatch.setattr(su, "UPDATE_OUTPUT_JSON", str(tmp_path / "update.json"))
+    fetches = []
+
+    def fetch(url):
+        page = int(url.rsplit("=", 1)[1])
+        fetches.append(page)
+        if page in fail:
+            raise su.FetchError(url, "timeout")
+        return _survey_html(*listing[page])
+
+    monkeypatch.setattr(su, "_fetch_page", fetch)
+    su.scrape_data(resume=False)
+    rows = json.loads((tmp_path / "update.json").read_text(encoding="utf-8"))
+    assert [su._result_id(r["entry_url"]) for r in rows] == [90, 89, 88, 87, 86, 85]
+    assert sorted(set(fetches)) == [1, 2, 3, 4, 5, 6]
+
+    # The next run (resume, the default) re-reads only the page that failed
+    fail.clear()
+    fetches.clear()
+    su.scrape_data(resume=True)
+    rows = json.loads((tmp_path / "update.json").read_text(encoding="utf-8"))
+    assert [su._result_id(r["entry_url"]) for r in rows] == [90, 89, 88, 87, 86, 85, 84]
+    assert fetches == [6]
+    assert not (tmp_path / "backfill_shards").exists()
@@ -0,0 +1,245 @@
+import runpy
+import sys
+import threading
+
+import pytest
+
+import src.load_update as lu
+import src.scrape_update as su
+import src.update_stream as us
+from src.db import connect_db
+
+
+def _survey_html(*rids):
+    rows = "".join(
+        f'<tr><td>U</td><td>P</td><td>d</td><td>Accepted on 1 Jan</td><td>c</td>'
+        f'<td><a href="/result/{rid}">x</a></td></tr>'
+        for rid in rids
+    )
+    return f"<table>{rows}</table>"
+
+
+@pytest.fixture()
+def crawl(monkeypatch, tmp_path):
+    """One survey page with results 71-74 (73 already stored, 74 fails its detail page)."""
+    monkeypatch.setattr(su, "load_existing_ids_from_db", lambda bits: su.ResultIdIndex([73]))
+    monkeypatch.setattr(su, "SURVEY_PAGES", 1)
+    monkeypatch.setattr(su, "UPDATE_OUTPUT_JSON", str(tmp_path / "update.json"))
+
+    def fetch(url):
+        if "page=" in url:
+            return _survey_html(71, 72, 73, 74)
+        if url.endswith("/74"):
+            raise su.FetchError(url, "timeout")
+        return "<dl><dt>Undergrad GPA</dt><dd>3.40</dd></dl>"
+
+    monkeypatch.setattr(su, "_fetch_page", fetch)
+    return tmp_path
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("mode", ["chunked", "pipelined"])
+def test_iter_scraped_streams_rows_without_the_json(crawl, monkeypatch, mode):
+    monkeypatch.setattr(su, "CRAWL_MODE", mode)
+    rows = list(su.iter_scraped())
+
+    assert sorted(su._result_id(r["entry_url"]) for r in rows) == [71, 72, 74]
+    assert {r["entry_url"][-2:]: r["detail_error"] for r in rows}["74"] == "timeout"
+    assert all(r["gpa"] == "3.40" for r in rows if r["detail_error"] is None)
+    assert not (crawl / "update.json").exists()
+    assert not (crawl / "update.jsonl").exists()  # finished: nothing left to resume
+
+
+@pytest.mark.integration
+def test_iter_scraped_keeps_the_json_on_request(crawl, monkeypatch):
+    monkeypatch.setattr(su, "STREAM_KEEP_JSON", True)
+    monkeypatch.setattr(su, "FETCH_DETAILS", False)
+    rows = list(su.iter_scraped())
+    assert len(rows) == 3 and not any(r.get("gpa") for r in rows)
+    assert len(su.load_data(str(crawl / "update.json"))) == 3
+
+
+@pytest.mark.integration
+def test_iter_scraped_stops_early_and_reraises(crawl, monkeypatch):
+    monkeypatch.setattr(su, "STREAM_QUEUE_SIZE", 1)
+    rows = su.iter_scraped()
+    assert next(rows)["entry_url"]
+    rows.close()  # stops the crawl and waits for it
+    assert not any(t.name == "scrape-stream" for t in threading.enumerate())
+    # The journal stays behind for a resume
+    assert (crawl / "update.jsonl").exists()
+
+    def boom(resume, stream):
+        raise RuntimeError("crawl failed")
+
+    monkeypatch.setattr(su, "scrape_data", boom)
+    with pytest.raises(RuntimeError, match="crawl failed"):
+        list(su.iter_scraped())
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("mode", ["chunked", "pipelined"])
+def test_a_failed_load_stops_the_crawl_before_run_returns(crawl, monkeypatch, tmp_path, mode):
+    monkeypatch.setattr(su, "CRAWL_MODE", mode)
+    monkeypatch.setattr(su, "STREAM_QUEUE_SIZE", 1)
+    monkeypatch.setattr(su, "SURVEY_PAGES", 50)
+    monkeypatch.setattr(su, "CHUNK_SURVEY_PAGES", 1)
+    pages = []
+
+    def fetch(url):
+        if "page=" in url:
+            pages.append(url)
+            return _survey_html(100 + len(pages))
+        return "<dl><dt>Undergrad GPA</dt><dd>3.40</dd></dl>"
+
+    def load(rows, size, log=None):
+        next(iter(rows))
+        raise RuntimeError("load failed")
+
+    monkeypatch.setattr(su, "_fetch_page", fetch)
+    monkeypatch.setattr(lu, "load_batches", load)
+    path = tmp_path / "run.log"
+    with path.open("w", encoding="utf-8") as log:
+        with pytest.raises(RuntimeError, match="load failed"):
+            us.run(state=su.RunState(log=log))
+
+    # Nothing of the run outlives it: no crawl thread, no writes after run_state
+    assert not any(t.name == "scrape-stream" for t in threading.enumerate())
+    assert len(pages) < 50
+    assert "[interrupt] Stream consumer stopped" in path.read_text(encoding="utf-8")
+    assert (crawl / "update.jsonl").exists()  # kept for a resume
+
+
+class _FakeConn:
+    """executemany sink: URLs in ``stored`` are duplicates and do not count."""
+
+    def __init__(self, stored=()):
+        self.stored = set(stored)
+        self.batches = []
+        self.commits = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        conn = self
+
+        class _Cur:
+            rowcount = 0
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def executemany(self, sql, rows, returning=False):
+                assert "ON CONFLICT (url) DO NOTHING" in sql and returning
+                conn.batches.append([r["url"] for r in rows])
+                # One result set per statement: the inserted url, or none for a duplicate
+                self.results = [[(r["url"],)] if r["url"] not in conn.stored else [] for r in rows]
+                self.rowcount = len(rows)  # what a summed rowcount would claim
+
+            def fetchall(self):
+                return self.results[0]
+
+            def nextset(self):
+                self.results.pop(0)
+                return True if self.results else None
+
+        return _Cur()
+
+    def commit(self):
+        self.commits += 1
+
+
+@pytest.mark.db
+def test_load_batches_commits_each_batch(capsys):
+    conn = _FakeConn(stored={"u2"})
+    entries = ({"entry_url": f"u{k}", "GPA": "3.5", "start_term": "Fall"} for k in range(5))
+    assert lu.load_batches(entries, batch_size=2, connect=lambda: conn) == 4
+    assert conn.batches == [["u0", "u1"], ["u2", "u3"], ["u4"]]
+    assert conn.commits == 3
+    assert "[load] batch of 2: inserted 1 (total 3)" in capsys.readouterr().out
+    assert lu.load_batches([], connect=lambda: conn) == 0
+
+
+@pytest.mark.db
+def test_load_batches_counts_inserts_on_postgres():
+    urls = [f"https://www.thegradcafe.com/result/98765432{k}" for k in range(3)]
+    try:
+        with connect_db() as conn, conn.cursor() as cur:
+            cur.execute("INSERT INTO applicants (url) VALUES (%s);", (urls[1],))
+        entries = [{"entry_url": u, "GPA": "3.5"} for u in urls]
+        assert lu.load_batches(entries, batch_size=2) == 2
+        assert lu.load_batches(entries, batch_size=2) == 0
+    finally:
+        with connect_db() as conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM applicants WHERE url = ANY(%s);", (urls,))
+
+
+@pytest.mark.integration
+def test_streaming_update_end_to_end(crawl, monkeypatch, capsys):
+    conn = _FakeConn()
+    real_load = lu.load_batches
+    monkeypatch.setattr(
+        lu, "load_batches", lambda rows, size, log=None: real_load(rows, size, lambda: conn, log)
+    )
+
+    result = us.run(batch_size=2)
+    assert sorted(u for b in conn.batches for u in b) == [
+        f"https://www.thegradcafe.com/result/{rid}" for rid in (71, 72, 74)
+    ]
+    assert result.inserted == 3
+    assert result.failures == [
+        {"entry_url": "https://www.thegradcafe.com/result/74", "detail_error": "timeout"}
+    ]
+    counts = {name: (s.rows_in, s.rows_out) for name, s in result.stages.items()}
+    assert counts == {"scrape": (4, 3), "clean": (3, 3), "load": (3, 3)}
+    stage_seconds = sum(s.seconds for s in result.stages.values())
+    assert stage_seconds == pytest.approx(result.seconds)
+    assert result.to_dict()["stages"]["load"]["rows_out"] == 3
+    out = capsys.readouterr().out
+    assert "[pipeline] scrape " in out and "inserted=3 failed_details=1" in out
+    assert "✅ Inserted 3 new rows into applicants." in out
+
+    # Command line: options reach scrape_update before the run starts
+    monkeypatch.setattr(su, "STREAM_QUEUE_SIZE", su.STREAM_QUEUE_SIZE)
+    monkeypatch.setattr(su, "STREAM_KEEP_JSON", su.STREAM_KEEP_JSON)
+    monkeypatch.setattr(sys, "argv", ["update_stream", "--batch-size", "5", "--queue-size", "7",
+                                      "--keep-json"])
+    sys.modules.pop("src.update_stream", None)
+    runpy.run_module("src.update_stream", run_name="__main__")
+    assert (su.STREAM_QUEUE_SIZE, su.STREAM_KEEP_JSON) == (7, True)
+    assert len(conn.batches) == 3 and len(conn.batches[-1]) == 3  # one batch of up to 5
+    assert (crawl / "update.json").exists()
+
+
+@pytest.mark.integration
+def test_each_run_gets_its_own_state_and_log(crawl, monkeypatch, capsys, tmp_path):
+    conn = _FakeConn()
+    real_load = lu.load_batches
+    monkeypatch.setattr(
+        lu, "load_batches", lambda rows, size, log=None: real_load(rows, size, lambda: conn, log)
+    )
+    before = (su.RATE_CONTROLLER, su.RETRY_BUDGET, su.RETRY_BREAKER, su.RUN_METRICS,
+              su.METRICS_JSON)
+
+    logs = []
+    for k in range(2):
+        path = tmp_path / f"run{k}.log"
+        with path.open("w", encoding="utf-8") as log:
+            state = su.RunState(log=log, metrics_json=str(tmp_path / f"metrics{k}.json"))
+            assert us.run(batch_size=2, state=state).inserted == 3
+        assert state.metrics.counter("dedup_lookups") == 4  # not carried over from run 0
+        assert (tmp_path / f"metrics{k}.json").exists()
+        logs.append(path.read_text(encoding="utf-8"))
+
+    assert all("✅ Inserted 3 new rows" in text and "[pipeline] scrape " in text for text in logs)
+    assert capsys.readouterr().out == ""  # nothing reached the process's stdout
+    after = (su.RATE_CONTROLLER, su.RETRY_BUDGET, su.RETRY_BREAKER, su.RUN_METRICS,
+             su.METRICS_JSON)
+    assert after == before and su._LOG is None and su._HTTP_CACHE is None